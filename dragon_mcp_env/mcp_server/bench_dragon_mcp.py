@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Dragon MCP Benchmark Suite
+Hermetic latency/throughput benchmarks for every tool and hosted endpoint.
+
+All RPC traffic goes to a local fake node (dragon_fake_node.py) with
+configurable injected latency and error rates, so runs are reproducible and
+need no network. Results are written as JSON and can be compared against a
+saved baseline to catch performance regressions.
+
+Usage:
+    python bench_dragon_mcp.py --iterations 50 --output bench_results.json
+    python bench_dragon_mcp.py --baseline bench_baseline.json --save-baseline
+    python bench_dragon_mcp.py --baseline bench_baseline.json   # exit 1 on regression
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import asyncio
+import argparse
+import platform
+import tempfile
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+# Add current directory to path to import dragon_mcp
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dragon_fake_node import FakeNode, use_fake_node
+
+# Well-known throwaway key (anvil/hardhat account #0) - only ever used against the fake node
+BENCH_PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+BENCH_API_KEY = "bench-key"
+BENCH_TX_HASH = "0x" + "ab" * 32
+BENCH_USER = "0x1234567890123456789012345678901234567890"
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def start_environment(args: argparse.Namespace) -> FakeNode:
+    """Start the fake node and point every chain and key at it before dragon_mcp is imported"""
+    node = FakeNode(
+        latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate, error_mode=args.error_mode, seed=args.seed,
+    ).start()
+    use_fake_node(node)
+    os.environ["PRIVATE_KEY"] = BENCH_PRIVATE_KEY
+    os.environ["DRAGON_MCP_API_KEY"] = BENCH_API_KEY
+    os.environ["DRAGON_MCP_RATE_LIMIT"] = str(10**9)
+    os.environ.setdefault("DRAGON_MCP_STARTUP", "lazy")
+    os.environ.setdefault("DRAGON_MCP_DATA_DIR", tempfile.mkdtemp(prefix="dragon-bench-"))
+    # Configured addresses keep per-tool RPC counts free of background discovery
+    os.environ.setdefault("DRAGON_MCP_ADDRESS_SOURCE", "config")
+    return node
+
+def tool_scenarios(dragon_mcp) -> Dict[str, Callable[[], Awaitable[Any]]]:
+    return {
+        "tool.get_dragon_price[sonic]": lambda: dragon_mcp.get_dragon_price("sonic"),
+        "tool.get_dragon_price[arbitrum]": lambda: dragon_mcp.get_dragon_price("arbitrum"),
+        "tool.check_oracle_health": lambda: dragon_mcp.check_oracle_health(),
+        "tool.get_price_history[sonic]": lambda: dragon_mcp.get_price_history("sonic", interval_seconds=60),
+        "tool.update_oracle_price[sonic]": lambda: dragon_mcp.update_oracle_price("sonic"),
+        "tool.get_lottery_stats[sonic]": lambda: dragon_mcp.get_lottery_stats("sonic"),
+        "tool.get_global_jackpot[sonic]": lambda: dragon_mcp.get_global_jackpot(["sonic"]),
+        "tool.simulate_lottery[sonic]": lambda: dragon_mcp.simulate_lottery(1000.0, "sonic"),
+        "tool.test_lottery_entry[sonic]": lambda: dragon_mcp.test_lottery_entry("sonic", BENCH_USER, 100.0),
+        "tool.check_layerzero_status[sonic]": lambda: dragon_mcp.check_layerzero_status(BENCH_TX_HASH, "sonic"),
+        "tool.estimate_layerzero_fee": lambda: dragon_mcp.estimate_layerzero_fee("sonic", "arbitrum", 64),
+        "tool.get_vrf_stats": lambda: dragon_mcp.get_vrf_stats(),
+    }
+
+def hosted_scenarios(client) -> Dict[str, Callable[[], Awaitable[Any]]]:
+    headers = {"Authorization": f"Bearer {BENCH_API_KEY}"}
+    return {
+        "http.GET /health": lambda: client.get("/health"),
+        "http.POST /oracle/price": lambda: client.post("/oracle/price", json={"chain": "sonic"}, headers=headers),
+        "http.GET /oracle/health": lambda: client.get("/oracle/health", headers=headers),
+        "http.GET /lottery/stats/{chain}": lambda: client.get("/lottery/stats/sonic", headers=headers),
+        "http.POST /lottery/simulate": lambda: client.post(
+            "/lottery/simulate", json={"usd_amount": 1000.0, "chain": "sonic"}, headers=headers),
+        "http.POST /layerzero/status": lambda: client.post(
+            "/layerzero/status", json={"tx_hash": BENCH_TX_HASH, "chain": "sonic"}, headers=headers),
+        "http.GET /layerzero/fee/{source}/{dest}": lambda: client.get("/layerzero/fee/sonic/base", headers=headers),
+        "http.POST /mcp/call/get_lottery_stats": lambda: client.post(
+            "/mcp/call/get_lottery_stats", json={"chain": "sonic"}, headers=headers),
+    }
+
+def _is_error(result: Any) -> bool:
+    status = getattr(result, "status_code", None)
+    if status is not None:
+        return status >= 400
+    return isinstance(result, dict) and "error" in result
+
+async def run_scenario(call: Callable[[], Awaitable[Any]], node: FakeNode, iterations: int,
+                       warmup: int, concurrency: int) -> Dict[str, Any]:
+    for _ in range(warmup):
+        await call()
+
+    latencies: List[float] = []
+    errors = 0
+    remaining = iterations
+    node.reset_stats()
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            result = await call()
+            latencies.append(time.perf_counter() - started)
+            errors += _is_error(result)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    rpc = node.snapshot()
+
+    return {
+        "iterations": iterations,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "ops_per_sec": round(iterations / elapsed, 2),
+        "rpc_per_op": round(rpc["total"] / iterations, 3),
+        "rpc_methods": {
+            f"{chain}:{method}": round(count / iterations, 3)
+            for chain, methods in rpc["requests"].items() for method, count in methods.items()
+        },
+        "error_rate": round(errors / iterations, 4),
+    }
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Regressions: latency beyond tolerance (with 0.5 ms slack) or more RPCs per op"""
+    regressions = []
+    for name, current in results["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        for metric in ("p50_ms", "p99_ms"):
+            limit = previous[metric] * (1 + tolerance) + 0.5
+            if current[metric] > limit:
+                regressions.append(f"{name}: {metric} {previous[metric]} -> {current[metric]}")
+        if current["rpc_per_op"] > previous["rpc_per_op"] + 0.01:
+            regressions.append(f"{name}: rpc_per_op {previous['rpc_per_op']} -> {current['rpc_per_op']}")
+    return regressions
+
+def print_table(results: Dict[str, Any]) -> None:
+    print(f"\n{'scenario':<44} {'p50 ms':>9} {'p99 ms':>9} {'ops/s':>9} {'rpc/op':>7} {'err':>6}")
+    print("-" * 88)
+    for name, r in results["results"].items():
+        print(f"{name:<44} {r['p50_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['ops_per_sec']:>9.1f} "
+              f"{r['rpc_per_op']:>7.2f} {r['error_rate']:>6.1%}")
+
+async def run_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    node = start_environment(args)
+    import dragon_mcp
+    node.register_abis(list(dragon_mcp.CONTRACT_ABIS.values()))
+    dragon_mcp.ensure_web3_stack()
+    dragon_mcp.web3_manager.compile_calls()
+
+    scenarios: List[Tuple[str, Callable[[], Awaitable[Any]]]] = list(tool_scenarios(dragon_mcp).items())
+    client = None
+    try:
+        import httpx
+        import deploy_hosted_dragon_mcp
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=deploy_hosted_dragon_mcp.app), base_url="http://bench"
+        )
+        scenarios += list(hosted_scenarios(client).items())
+    except ImportError as e:
+        print(f"⚠️  Skipping hosted endpoints: {e}")
+
+    selected = [(n, c) for n, c in scenarios if not args.only or any(f in n for f in args.only)]
+    results = {}
+    try:
+        for name, call in selected:
+            results[name] = await run_scenario(call, node, args.iterations, args.warmup, args.concurrency)
+            print(f"  ✓ {name}")
+    finally:
+        if client is not None:
+            await client.aclose()
+        node.stop()
+
+    return {
+        "meta": {
+            "timestamp": int(time.time()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            "error_mode": args.error_mode,
+        },
+        "results": results,
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Hermetic Dragon MCP benchmarks")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Injected RPC latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-mode", choices=["rpc", "http429"], default="rpc")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="*", help="Run scenarios whose name contains any of these")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results to --baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative latency increase")
+    args = parser.parse_args()
+
+    print("🐉 DRAGON MCP BENCHMARKS")
+    print(f"Fake node latency {args.latency_ms}ms ±{args.jitter_ms}ms, error rate {args.error_rate:.1%}")
+    results = asyncio.run(run_benchmarks(args))
+    print_table(results)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📄 Results written to {args.output}")
+
+    if args.baseline and args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"📌 Baseline saved to {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\n❌ REGRESSIONS:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print("\n✅ No regressions against baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
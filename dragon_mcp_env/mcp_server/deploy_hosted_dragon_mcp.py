@@ -8,10 +8,13 @@ This version runs as a web service that can be accessed by multiple Cursor insta
 
 import os
 import json
+import time
 import asyncio
-from typing import Any, Dict
-from fastapi import FastAPI, HTTPException, Depends, Header
+from typing import Any, Dict, Iterator, List, Optional
+from fastapi import FastAPI, HTTPException, Depends, Header, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
 from pydantic import BaseModel
 import uvicorn
 
@@ -19,14 +22,42 @@ import uvicorn
 from dragon_mcp import (
     get_dragon_price,
     check_oracle_health,
+    get_keeper_status,
+    get_oracle_sources,
     update_oracle_price,
+    get_price_history,
     get_lottery_stats,
+    get_global_jackpot,
+    get_lottery_activity,
+    get_contract_registry,
     simulate_lottery,
     test_lottery_entry,
+    simulate_entries,
     check_layerzero_status,
     estimate_layerzero_fee,
-    request_vrf_randomness
+    request_vrf_randomness,
+    get_vrf_request,
+    get_vrf_stats,
+    get_bulk_claimable,
+    get_fee_flows,
+    snapshot_balances,
+    get_startup_report,
+    get_server_metrics,
+    start_warmup,
+    keeper,
+    keeper_update,
+    signer_address,
+    web3_manager,
+    CHAIN_IDS,
+    WRITE_TIMEOUT
 )
+import dragon_revenue
+import dragon_snapshot
+import dragon_metrics
+import dragon_tracing
+import dragon_resilience
+from dragon_writequeue import QueueFull, WriteQueues
+from dragon_profiling import LoopWatchdog, StackSampler
 
 # FastAPI app
 app = FastAPI(
@@ -44,6 +75,68 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Deadline for one hosted request; clients may ask for less with X-Request-Timeout (seconds)
+REQUEST_TIMEOUT = float(os.getenv("DRAGON_MCP_REQUEST_TIMEOUT", "30"))
+
+def request_deadline(request: Request) -> float:
+    try:
+        requested = float(request.headers.get("x-request-timeout", REQUEST_TIMEOUT))
+    except ValueError:
+        return REQUEST_TIMEOUT
+    return min(requested, REQUEST_TIMEOUT) if requested > 0 else REQUEST_TIMEOUT
+
+# Streaming routes answer 200 before the body is computed, so a request
+# deadline would cut them off midway; each batch gets its own instead
+STREAMING_PATHS = {"/revenue/claimable", "/snapshot/balances"}
+
+def timed_batches(batches: Iterator[Any], seconds: float) -> Iterator[Any]:
+    """Items of `batches`, each computed under a deadline of its own"""
+    while True:
+        # The deadline must not span the yield: each next() runs in a fresh context copy
+        with dragon_resilience.deadline(seconds):
+            try:
+                batch = next(batches)
+            except StopIteration:
+                return
+        yield batch
+
+# Request latency, in-flight and trace instrumentation; every RPC made while
+# serving the request inherits its deadline
+@app.middleware("http")
+async def observe_request(request: Request, call_next):
+    dragon_metrics.INFLIGHT.inc("http")
+    started = time.perf_counter()
+    status = 500
+    # Root span per request; continues the caller's trace if it sent a traceparent
+    with dragon_tracing.span(
+        f"{request.method} {request.url.path}",
+        kind="server",
+        traceparent=request.headers.get("traceparent"),
+        **{"http.method": request.method, "http.target": request.url.path}
+    ) as span:
+        try:
+            streaming = request.url.path in STREAMING_PATHS
+            with dragon_resilience.deadline(None if streaming else request_deadline(request)):
+                response = await call_next(request)
+            status = response.status_code
+            if span.traceparent:
+                response.headers["traceparent"] = span.traceparent
+            return response
+        finally:
+            # Use the route template, not the raw path, to keep label cardinality bounded
+            route = getattr(request.scope.get("route"), "path", "unmatched")
+            span.set_attribute("http.route", route)
+            span.set_attribute("http.status_code", status)
+            if status >= 500:
+                span.set_error(f"HTTP {status}")
+            dragon_metrics.HTTP_LATENCY.observe(
+                time.perf_counter() - started,
+                request.method,
+                route,
+                str(status)
+            )
+            dragon_metrics.INFLIGHT.dec("http")
+
 # Security configuration
 VALID_API_KEYS = {
     os.getenv("DRAGON_MCP_API_KEY", "dev-key-12345"): "development",
@@ -53,7 +146,7 @@ VALID_API_KEYS = {
 
 # Rate limiting (simple in-memory store)
 request_counts = {}
-RATE_LIMIT = 100  # requests per hour
+RATE_LIMIT = int(os.getenv("DRAGON_MCP_RATE_LIMIT", "100"))  # requests per hour
 
 # Request/Response models
 class DragonPriceRequest(BaseModel):
@@ -72,6 +165,26 @@ class LayerZeroStatusRequest(BaseModel):
     tx_hash: str
     chain: str
 
+class LotteryEntryRequest(BaseModel):
+    user_address: str
+    dragon_amount: float
+    chain: str = "sonic"
+
+class ClaimableRequest(BaseModel):
+    users: List[str]
+    chain: str = "sonic"
+    epochs: Optional[List[int]] = None
+    tokens: Optional[List[str]] = None
+    chunk_size: int = 200
+    recheck_unclaimed: bool = True
+
+class BalanceSnapshotRequest(BaseModel):
+    addresses: List[str]
+    chains: Optional[List[str]] = None
+    tokens: Optional[List[str]] = None
+    blocks: Optional[Dict[str, int]] = None
+    chunk_size: int = 250
+
 # Authentication dependency
 async def verify_api_key(authorization: str = Header(None)):
     if not authorization or not authorization.startswith("Bearer "):
@@ -93,11 +206,78 @@ async def check_rate_limit(api_key_type: str = Depends(verify_api_key)):
     request_counts[api_key_type] = current_count + 1
     return api_key_type
 
+# Transactions from one signer on one chain run one at a time; at most this
+# many may wait before further writes are rejected with 503. Queued writes
+# do not use the request deadline: each may wait WRITE_QUEUE_WAIT seconds for
+# its turn, then has WRITE_TIMEOUT seconds to send and confirm
+WRITE_QUEUE_SIZE = int(os.getenv("DRAGON_MCP_WRITE_QUEUE_SIZE", "8"))
+WRITE_QUEUE_WAIT = float(os.getenv("DRAGON_MCP_WRITE_QUEUE_WAIT", "300"))
+write_queues = WriteQueues(WRITE_QUEUE_SIZE, WRITE_QUEUE_WAIT, WRITE_TIMEOUT)
+
+async def queued_write(chain: str, run, merge_key: Optional[str] = None):
+    """Run a transaction-sending tool call through the signer's write queue; returns (result, queue report)"""
+    signer = await asyncio.to_thread(signer_address)
+    if signer is None:
+        # No key: the tool only reports that, nothing is sent
+        return await run(), None
+    try:
+        return await write_queues.submit(signer, chain, run, merge_key)
+    except QueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+# Log callbacks that block the event loop longer than this (0 disables)
+SLOW_CALLBACK_MS = float(os.getenv("DRAGON_MCP_SLOW_CALLBACK_MS", "250"))
+loop_watchdog = LoopWatchdog(SLOW_CALLBACK_MS / 1000) if SLOW_CALLBACK_MS > 0 else None
+profile_lock = asyncio.Lock()
+
+# Load the web3 stack in the background so the first request doesn't pay for it
+@app.on_event("startup")
+async def warm_up_web3():
+    # Keeper updates share the signer's write queue (and merge) with /oracle/update.
+    # They run keeper_update, as in stdio, so reverts and pending receipts are
+    # judged the same way on both paths
+    loop = asyncio.get_running_loop()
+    keeper.update = lambda chain: asyncio.run_coroutine_threadsafe(queued_write(
+        chain, lambda: asyncio.to_thread(keeper_update, chain), merge_key="updatePrice"), loop).result()[0]
+    start_warmup()
+    if loop_watchdog:
+        loop_watchdog.start()
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "Dragon MCP Server"}
 
+# Prometheus scrape endpoint (authenticated, not rate limited)
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint(_: str = Depends(verify_api_key)):
+    return PlainTextResponse(
+        dragon_metrics.REGISTRY.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+# Sampling profiler over the live event loop and worker threads (admin only)
+@app.get("/debug/profile", response_class=PlainTextResponse)
+async def profile_endpoint(
+    seconds: float = Query(10.0, gt=0, le=60),
+    interval_ms: float = Query(10.0, ge=1, le=1000),
+    api_key_type: str = Depends(verify_api_key)
+):
+    if api_key_type != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    if profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    async with profile_lock:
+        sampler = StackSampler(
+            interval=interval_ms / 1000,
+            loop_thread_id=loop_watchdog.loop_thread_id if loop_watchdog else None
+        )
+        # The sampler thread is excluded from its own samples
+        await asyncio.to_thread(sampler.run, seconds)
+
+    return PlainTextResponse(sampler.collapsed(), headers={"X-Profile-Samples": str(sampler.samples)})
+
 # Oracle endpoints
 @app.post("/oracle/price", response_model=DragonPriceResponse)
 async def get_price_endpoint(
@@ -122,6 +302,18 @@ async def oracle_health_endpoint(_: str = Depends(check_rate_limit)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/oracle/sources/{chain}")
+async def oracle_sources_endpoint(chain: str, _: str = Depends(check_rate_limit)):
+    try:
+        result = await get_oracle_sources(chain)
+        return {"success": "error" not in result, "data": result}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/oracle/keeper")
+async def oracle_keeper_endpoint(_: str = Depends(verify_api_key)):
+    return {"success": True, "data": await get_keeper_status()}
+
 @app.post("/oracle/update")
 async def update_price_endpoint(
     request: DragonPriceRequest,
@@ -132,8 +324,12 @@ async def update_price_endpoint(
         raise HTTPException(status_code=403, detail="Admin access required")
     
     try:
-        result = await update_oracle_price(request.chain)
-        return {"success": True, "data": result}
+        # Concurrent identical updates share one updatePrice transaction
+        result, queue = await queued_write(
+            request.chain, lambda: update_oracle_price(request.chain), merge_key="updatePrice")
+        return {"success": True, "data": result, "queue": queue}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -160,6 +356,25 @@ async def simulate_lottery_endpoint(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/lottery/entry")
+async def lottery_entry_endpoint(
+    request: LotteryEntryRequest,
+    api_key_type: str = Depends(check_rate_limit)
+):
+    # Sends a real transaction from the server's signer
+    if api_key_type != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    try:
+        result, queue = await queued_write(
+            request.chain,
+            lambda: test_lottery_entry(request.chain, request.user_address, request.dragon_amount))
+        return {"success": True, "data": result, "queue": queue}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # LayerZero endpoints
 @app.post("/layerzero/status")
 async def layerzero_status_endpoint(
@@ -189,7 +404,6 @@ async def estimate_fee_endpoint(
 @app.post("/vrf/request")
 async def vrf_request_endpoint(
     chain: str = "arbitrum",
-    num_words: int = 1,
     api_key_type: str = Depends(check_rate_limit)
 ):
     # Only team/admin can request VRF
@@ -197,11 +411,93 @@ async def vrf_request_endpoint(
         raise HTTPException(status_code=403, detail="Team access required for VRF")
     
     try:
-        result = await request_vrf_randomness(chain, num_words)
+        result, queue = await queued_write(chain, lambda: request_vrf_randomness(chain))
+        return {"success": True, "data": result, "queue": queue}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/vrf/request/{handle}")
+async def vrf_status_endpoint(handle: str, _: str = Depends(check_rate_limit)):
+    try:
+        result = await get_vrf_request(handle)
+        return {"success": True, "data": result}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/vrf/stats")
+async def vrf_stats_endpoint(_: str = Depends(check_rate_limit)):
+    try:
+        result = await get_vrf_stats()
         return {"success": True, "data": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/writes")
+async def write_queues_endpoint(_: str = Depends(verify_api_key)):
+    """Per signer and chain write queue depth, merges and rejections"""
+    return {"success": True, "data": write_queues.snapshot()}
+
+# Revenue endpoints
+@app.post("/revenue/claimable")
+async def revenue_claimable_endpoint(
+    request: ClaimableRequest,
+    http_request: Request,
+    _: str = Depends(check_rate_limit)
+):
+    """Stream claimable rows as NDJSON: a header line, then one line per user/epoch/token"""
+    if not web3_manager.has_address(request.chain, "revenue_distributor"):
+        raise HTTPException(status_code=404, detail=f"No veDRAGON revenue distributor configured for {request.chain}")
+    try:
+        users = [web3_manager.resolve_address(request.chain, "user", user) for user in request.users]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def lines():
+        chunks = timed_batches(dragon_revenue.iter_claimable(
+            web3_manager, request.chain, users, request.epochs, request.tokens,
+            max(1, request.chunk_size), request.recheck_unclaimed), request_deadline(http_request))
+        try:
+            yield json.dumps(next(chunks)) + "\n"
+            for rows in chunks:
+                yield "".join(json.dumps(row) + "\n" for row in rows)
+        except Exception as e:
+            # Headers are already sent; report the failure in-band
+            yield json.dumps({"error": f"Failed to compute claimable revenue: {str(e)}"}) + "\n"
+
+    return StreamingResponse(iterate_in_threadpool(lines()), media_type="application/x-ndjson")
+
+# Snapshot endpoints
+@app.post("/snapshot/balances")
+async def snapshot_balances_endpoint(
+    request: BalanceSnapshotRequest,
+    http_request: Request,
+    _: str = Depends(check_rate_limit)
+):
+    """Stream a columnar balance snapshot as NDJSON: a header line, then one line per chunk"""
+    chains = request.chains or list(CHAIN_IDS)
+    unknown = [c for c in chains if c not in CHAIN_IDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unsupported chains: {', '.join(unknown)}")
+    try:
+        holders = [dragon_snapshot.normalize_address(a) for a in request.addresses]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def lines():
+        records = timed_batches(dragon_snapshot.iter_snapshot(
+            web3_manager, chains, holders, request.tokens, max(1, request.chunk_size), request.blocks),
+            request_deadline(http_request))
+        try:
+            for record in records:
+                yield json.dumps(record, separators=(",", ":")) + "\n"
+        except Exception as e:
+            # Headers are already sent; report the failure in-band
+            yield json.dumps({"error": f"Failed to snapshot balances: {str(e)}"}) + "\n"
+
+    return StreamingResponse(iterate_in_threadpool(lines()), media_type="application/x-ndjson")
+
 # MCP-compatible endpoints
 @app.get("/mcp/tools")
 async def list_tools(_: str = Depends(verify_api_key)):
@@ -259,10 +555,24 @@ async def call_tool(
     tool_map = {
         "get_dragon_price": get_dragon_price,
         "check_oracle_health": check_oracle_health,
+        "get_keeper_status": get_keeper_status,
+        "get_oracle_sources": get_oracle_sources,
+        "get_price_history": get_price_history,
         "get_lottery_stats": get_lottery_stats,
+        "get_global_jackpot": get_global_jackpot,
+        "get_lottery_activity": get_lottery_activity,
         "simulate_lottery": simulate_lottery,
         "check_layerzero_status": check_layerzero_status,
-        "estimate_layerzero_fee": estimate_layerzero_fee
+        "estimate_layerzero_fee": estimate_layerzero_fee,
+        "get_startup_report": get_startup_report,
+        "get_server_metrics": get_server_metrics,
+        "get_contract_registry": get_contract_registry,
+        "get_vrf_request": get_vrf_request,
+        "get_vrf_stats": get_vrf_stats,
+        "get_bulk_claimable": get_bulk_claimable,
+        "get_fee_flows": get_fee_flows,
+        "snapshot_balances": snapshot_balances,
+        "simulate_entries": simulate_entries
     }
     
     if tool_name not in tool_map:
@@ -274,15 +584,74 @@ async def call_tool(
         # Call tool with appropriate arguments
         if tool_name == "get_dragon_price":
             result = await tool_func(request_data.get("chain", "sonic"))
-        elif tool_name == "check_oracle_health":
+        elif tool_name in ("check_oracle_health", "get_keeper_status"):
             result = await tool_func()
+        elif tool_name == "get_oracle_sources":
+            result = await tool_func(request_data.get("chain", "sonic"))
+        elif tool_name == "get_price_history":
+            result = await tool_func(
+                request_data.get("chain", "sonic"),
+                request_data.get("start"),
+                request_data.get("end"),
+                request_data.get("interval_seconds"),
+                request_data.get("window", 20),
+                request_data.get("limit", 100)
+            )
         elif tool_name == "get_lottery_stats":
             result = await tool_func(request_data["chain"])
+        elif tool_name == "get_global_jackpot":
+            result = await tool_func(request_data.get("chains"))
+        elif tool_name == "get_lottery_activity":
+            result = await tool_func(request_data.get("chain", "sonic"))
+        elif tool_name == "get_vrf_request":
+            result = await tool_func(request_data["handle"])
+        elif tool_name == "get_vrf_stats":
+            result = await tool_func()
+        elif tool_name == "get_bulk_claimable":
+            # No output_path here: remote callers must not write server files
+            result = await tool_func(
+                request_data.get("chain", "sonic"),
+                request_data["users"],
+                request_data.get("epochs"),
+                request_data.get("tokens"),
+                chunk_size=request_data.get("chunk_size", 200),
+                recheck_unclaimed=request_data.get("recheck_unclaimed", True),
+                max_rows=request_data.get("max_rows", 1000)
+            )
+        elif tool_name == "get_fee_flows":
+            result = await tool_func(
+                request_data.get("chains"),
+                request_data.get("start"),
+                request_data.get("end"),
+                request_data.get("interval_seconds", 86400)
+            )
+        elif tool_name == "snapshot_balances":
+            # Inline addresses only: remote callers must not read or write server files
+            result = await tool_func(
+                request_data["addresses"],
+                chains=request_data.get("chains"),
+                tokens=request_data.get("tokens"),
+                blocks=request_data.get("blocks"),
+                chunk_size=request_data.get("chunk_size", 250),
+                max_rows=request_data.get("max_rows", 1000)
+            )
+        elif tool_name == "get_contract_registry":
+            result = await tool_func(request_data.get("chains"), request_data.get("refresh", False))
         elif tool_name == "simulate_lottery":
             result = await tool_func(
                 request_data["usd_amount"],
                 request_data.get("chain", "sonic")
             )
+        elif tool_name == "simulate_entries":
+            result = await tool_func(
+                request_data["chain"],
+                request_data["user_address"],
+                request_data["amounts"],
+                request_data.get("mode", "probability"),
+                request_data.get("holdings"),
+                request_data.get("overrides"),
+                request_data.get("block")
+            )
         elif tool_name == "check_layerzero_status":
             result = await tool_func(
                 request_data["tx_hash"],
@@ -294,8 +663,19 @@ async def call_tool(
                 request_data["dest_chain"],
                 request_data.get("payload_size", 32)
             )
+        elif tool_name == "get_startup_report":
+            result = await tool_func(
+                request_data.get("profile_imports", False),
+                request_data.get("top", 15)
+            )
+        elif tool_name == "get_server_metrics":
+            result = await tool_func(request_data.get("output_format", "summary"))
         
-        return {"success": True, "data": result}
+        response = {"success": True, "data": result}
+        current = dragon_tracing.current_span()
+        if current is not None:
+            response["trace_id"] = current.trace_id
+        return response
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Dragon Lottery Activity
+Live per-chain lottery aggregates maintained incrementally from events.
+
+A background indexer follows OmniDragonLotteryManager and DragonJackpotVault
+logs with eth_getLogs:
+
+    InstantLotteryProcessed(user, swapAmountUSD, won, reward)   entries, USD volume, wins, rewards
+    JackpotAdded(token, amount)                                  jackpot inflows
+    JackpotPaid(token, winner, winAmount, rolloverAmount)        jackpot payouts
+
+InstantLotteryProcessed with a zero swap amount is the manager confirming
+the payout of an entry it already reported, so it is not counted again.
+
+Each event is added once to a ring of fixed-width time buckets (a day of
+one-minute buckets by default) and to a running total per reporting window
+(5 minutes, 1 hour, 24 hours). As time advances, the bucket leaving each
+window is subtracted from that window's total, so memory is fixed and
+reading every window is O(1) however busy the chain is; history is never
+rescanned.
+
+Event times are block timestamps interpolated between the two ends of each
+polled block range: exact enough for minute buckets, at two header reads
+per poll instead of one per event.
+
+With an event directory, every counted event is also appended to a
+per-chain dragon_columns.ColumnStore (EVENT_COLUMNS), which keeps the full
+history for export (dragon_export.py) after it has left the ring.
+"""
+
+import os
+import time
+import bisect
+import functools
+import threading
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import dragon_metrics
+import dragon_ratelimit
+from dragon_codec import keccak256, decode_uint, WORD
+
+EVENTS = {
+    "entry": "InstantLotteryProcessed(address,uint256,bool,uint256)",   # lottery manager
+    "added": "JackpotAdded(address,uint256)",                           # jackpot vault
+    "paid": "JackpotPaid(address,address,uint256,uint256)",             # jackpot vault
+}
+@functools.lru_cache(maxsize=None)
+def topics() -> Dict[str, str]:
+    """topic0 per event name (hashed on first use; keccak pulls in eth_utils)"""
+    return {name: "0x" + keccak256(signature.encode()).hex() for name, signature in EVENTS.items()}
+
+@functools.lru_cache(maxsize=None)
+def event_names() -> Dict[str, str]:
+    return {topic: name for name, topic in topics().items()}
+
+# Summed columns per bucket; token amounts are in whole tokens (18 decimals)
+FIELDS = (
+    "entries", "usd_volume", "wins", "rewards",
+    "jackpot_adds", "jackpot_added", "jackpot_added_dragon",
+    "jackpot_payouts", "jackpot_paid", "jackpot_rollover",
+)
+# Histogram upper bounds (the last bin is everything above)
+ENTRY_USD_BOUNDS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 10000)
+REWARD_BOUNDS = (0.001, 0.01, 0.1, 1, 10, 100, 1000, 10000)
+
+_COLUMN = {name: i for i, name in enumerate(FIELDS)}
+_ENTRY_HIST = len(FIELDS)
+_REWARD_HIST = _ENTRY_HIST + len(ENTRY_USD_BOUNDS) + 1
+WIDTH = _REWARD_HIST + len(REWARD_BOUNDS) + 1
+
+# Stored event rows (dtypes as strings so numpy is only imported with a store)
+EVENT_COLUMNS = {
+    "time": "<f8",
+    "block": "<u8",
+    "event": "u1",        # index into EVENTS
+    "account": "S20",     # entrant (entry), winner (paid), empty for added
+    "token": "S20",       # jackpot token (added, paid); address(0) stands for DRAGON
+    "usd": "<f8",         # entry swap amount in USD
+    "won": "u1",
+    "amount": "<f8",      # reward (entry), amount added, or amount paid; whole tokens
+    "rollover": "<f8",    # amount rolled over (paid)
+}
+_EVENT_CODES = {name: i for i, name in enumerate(EVENTS)}
+
+ACTIVITY_EVENTS = dragon_metrics.REGISTRY.register(dragon_metrics.Counter(
+    "dragon_lottery_events_total", "Lottery and jackpot events aggregated", ["chain", "event"]))
+
+def _histogram(counts: Sequence[float], bounds: Sequence[float]) -> List[Dict[str, Any]]:
+    return [{"le": bound, "count": int(count)} for bound, count in zip(list(bounds) + ["+Inf"], counts)]
+
+class ActivityRing:
+    """
+    Fixed ring of time buckets with O(1) running totals per window.
+
+    `buckets` x WIDTH doubles hold the per-bucket sums; `stamps` records which
+    bucket number each slot currently holds. Not thread-safe by itself;
+    ActivityIndexer serializes access with its lock.
+    """
+
+    def __init__(self, bucket_seconds: int = 60, buckets: int = 1440,
+                 windows: Sequence[int] = (300, 3600, 86400)):
+        if max(windows) > bucket_seconds * buckets:
+            raise ValueError("Every window must fit in the ring")
+        self.bucket_seconds = bucket_seconds
+        self.buckets = buckets
+        self.data = array("d", bytes(8 * buckets * WIDTH))
+        self.stamps = array("q", [-1]) * buckets
+        self.windows = {window: max(1, window // bucket_seconds) for window in windows}
+        self.totals = {window: array("d", bytes(8 * WIDTH)) for window in windows}
+        self.head: Optional[int] = None
+
+    def _clear(self, slot: int, bucket: int) -> None:
+        start = slot * WIDTH
+        self.data[start:start + WIDTH] = array("d", bytes(8 * WIDTH))
+        self.stamps[slot] = bucket
+
+    def advance(self, now: float) -> None:
+        """Move the head to `now`, retiring buckets that fall out of each window"""
+        bucket = int(now // self.bucket_seconds)
+        if self.head is None or bucket - self.head >= self.buckets:
+            # First use, or idle longer than the ring: nothing is still in any window
+            for window in self.totals:
+                self.totals[window] = array("d", bytes(8 * WIDTH))
+            self.stamps = array("q", [-1]) * self.buckets
+            self.data = array("d", bytes(8 * self.buckets * WIDTH))
+            self.head = bucket
+            return
+        for step in range(self.head + 1, bucket + 1):
+            for window, span in self.windows.items():
+                leaving = step - span
+                slot = leaving % self.buckets
+                if self.stamps[slot] == leaving:
+                    start, total = slot * WIDTH, self.totals[window]
+                    for column in range(WIDTH):
+                        total[column] -= self.data[start + column]
+            self._clear(step % self.buckets, step)
+        self.head = max(self.head, bucket)
+
+    def add(self, timestamp: float, values: Dict[int, float]) -> bool:
+        """Add column values at `timestamp`; False if it is older than the ring"""
+        bucket = int(timestamp // self.bucket_seconds)
+        if self.head is None or bucket > self.head:
+            self.advance(timestamp)
+        if bucket <= self.head - self.buckets:
+            return False
+        slot = bucket % self.buckets
+        if self.stamps[slot] != bucket:
+            self._clear(slot, bucket)
+        start = slot * WIDTH
+        for column, value in values.items():
+            self.data[start + column] += value
+        for window, span in self.windows.items():
+            if bucket > self.head - span:
+                total = self.totals[window]
+                for column, value in values.items():
+                    total[column] += value
+        return True
+
+    def window(self, window: int, now: float) -> Dict[str, Any]:
+        """Aggregates over the last `window` seconds (call advance(now) first)"""
+        total = self.totals[window]
+        span = self.windows[window]
+        # The newest bucket is only partly elapsed
+        elapsed = min(self.bucket_seconds, max(0.0, now - self.head * self.bucket_seconds))
+        seconds = (span - 1) * self.bucket_seconds + elapsed
+        values = {name: total[i] for name, i in _COLUMN.items()}
+        entries = values["entries"]
+        report = {name: (int(round(value)) if name in ("entries", "wins", "jackpot_adds", "jackpot_payouts")
+                         else round(value, 6)) for name, value in values.items()}
+        report.update({
+            "entries_per_minute": round(entries / (seconds / 60), 4) if seconds > 0 else 0.0,
+            "win_rate": round(values["wins"] / entries, 6) if entries else None,
+            "avg_entry_usd": round(values["usd_volume"] / entries, 4) if entries else None,
+            "avg_reward": round(values["rewards"] / values["wins"], 6) if values["wins"] else None,
+            "jackpot_net": round(values["jackpot_added"] - values["jackpot_paid"], 6),
+            "entry_usd_histogram": _histogram(total[_ENTRY_HIST:_REWARD_HIST], ENTRY_USD_BOUNDS),
+            "reward_histogram": _histogram(total[_REWARD_HIST:WIDTH], REWARD_BOUNDS),
+        })
+        return report
+
+def _words(data: str) -> List[int]:
+    raw = bytes.fromhex(data[2:])
+    return [decode_uint(raw[i:i + WORD]) for i in range(0, len(raw), WORD)]
+
+def event_values(name: str, log: Dict[str, Any], wrapped_native: Optional[str]) -> Optional[Dict[int, float]]:
+    """Column increments for one decoded log, or None if it is not counted"""
+    words = _words(log["data"])
+    if name == "entry":
+        usd_amount, won, reward = words[0], words[1], words[2]
+        if usd_amount == 0:
+            return None  # payout confirmation of an entry already counted
+        usd = usd_amount / 1e6  # swapAmountUSD is scaled by 1e6
+        values = {_COLUMN["entries"]: 1, _COLUMN["usd_volume"]: usd}
+        values[_ENTRY_HIST + bisect.bisect_left(ENTRY_USD_BOUNDS, usd)] = 1
+        if won:
+            values[_COLUMN["wins"]] = 1
+            values[_COLUMN["rewards"]] = reward / 1e18
+            values[_REWARD_HIST + bisect.bisect_left(REWARD_BOUNDS, reward / 1e18)] = 1
+        return values
+    token = "0x" + log["topics"][1][-40:]
+    if name == "added":
+        values = {_COLUMN["jackpot_adds"]: 1}
+        if int(token, 16) == 0:
+            values[_COLUMN["jackpot_added_dragon"]] = words[0] / 1e18  # address(0) stands for DRAGON
+        elif token == wrapped_native:
+            values[_COLUMN["jackpot_added"]] = words[0] / 1e18
+        return values
+    values = {_COLUMN["jackpot_payouts"]: 1}
+    if token == wrapped_native:
+        values[_COLUMN["jackpot_paid"]] = words[0] / 1e18
+        values[_COLUMN["jackpot_rollover"]] = words[1] / 1e18
+    return values
+
+def _address_bytes(topic: str) -> bytes:
+    return bytes.fromhex(topic[-40:])
+
+def event_row(name: str, log: Dict[str, Any], timestamp: float) -> tuple:
+    """One EVENT_COLUMNS row for a counted log"""
+    words = _words(log["data"])
+    topics = log["topics"]
+    row = [timestamp, int(log["blockNumber"], 16), _EVENT_CODES[name], b"", b"", 0.0, 0, 0.0, 0.0]
+    if name == "entry":
+        row[3] = _address_bytes(topics[1]) if len(topics) > 1 else b""
+        row[5], row[6], row[7] = words[0] / 1e6, int(bool(words[1])), words[2] / 1e18
+    else:
+        row[4] = _address_bytes(topics[1])
+        row[7] = words[0] / 1e18
+        if name == "paid":
+            row[3] = _address_bytes(topics[2]) if len(topics) > 2 else b""
+            row[8] = words[1] / 1e18
+    return tuple(row)
+
+class ActivityIndexer:
+    """
+    Background log follower feeding one ActivityRing per chain.
+
+    `manager` is the Web3Manager (request, get_logs, get_block_header,
+    resolve_address, has_address). Each tracked chain gets its own daemon
+    thread, started on first use, which backfills the longest window and
+    then polls at background RPC priority. With `event_directory`, counted
+    events are also stored per chain; after a restart indexing resumes from
+    the store's cursor if that is older than the backfill window.
+    """
+
+    def __init__(self, manager: Any, block_times: Dict[str, float], poll_interval: float = 5.0,
+                 max_range: int = 2000, confirmations: int = 2, bucket_seconds: int = 60,
+                 windows: Sequence[int] = (300, 3600, 86400), event_directory: Optional[str] = None):
+        self.manager = manager
+        self.block_times = block_times
+        self.poll_interval = poll_interval
+        self.max_range = max_range
+        self.confirmations = confirmations
+        self.bucket_seconds = bucket_seconds
+        self.windows = tuple(sorted(windows))
+        self.event_directory = event_directory
+        self.event_stores: Dict[str, Any] = {}
+        self.rings: Dict[str, ActivityRing] = {}
+        self.status: Dict[str, Dict[str, Any]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._threads: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def track(self, chain: str) -> None:
+        """Start following `chain` if it is not followed yet"""
+        with self._lock:
+            thread = self._threads.get(chain)
+            if thread is not None and thread.is_alive():
+                return
+            if chain not in self.rings:
+                buckets = -(-max(self.windows) // self.bucket_seconds)
+                self.rings[chain] = ActivityRing(self.bucket_seconds, buckets, self.windows)
+                self.status[chain] = {"backfilled": False, "events": 0, "last_block": None, "error": None}
+            thread = threading.Thread(target=self._run, args=(chain,), name=f"dragon-activity-{chain}", daemon=True)
+            self._threads[chain] = thread
+            thread.start()
+
+    def _run(self, chain: str) -> None:
+        with dragon_ratelimit.priority(dragon_ratelimit.BACKGROUND):
+            while True:
+                try:
+                    caught_up = self.poll(chain)
+                    self.status[chain]["error"] = None
+                except Exception as e:
+                    self.status[chain]["error"] = f"{type(e).__name__}: {e}"[:300]
+                    caught_up = True
+                if caught_up:
+                    time.sleep(self.poll_interval)
+
+    def _addresses(self, chain: str) -> List[str]:
+        return [self.manager.resolve_address(chain, kind) for kind in ("lottery", "jackpot")
+                if self.manager.has_address(chain, kind)]
+
+    def event_store(self, chain: str) -> Optional[Any]:
+        """The chain's event ColumnStore, or None without an event directory or numpy"""
+        if not self.event_directory:
+            return None
+        store = self.event_stores.get(chain)
+        if store is None:
+            try:
+                from dragon_columns import ColumnStore
+            except ImportError:
+                self.event_directory = None
+                return None
+            contract = ",".join(self._addresses(chain))
+            store = self.event_stores[chain] = ColumnStore(
+                os.path.join(self.event_directory, chain), contract, EVENT_COLUMNS)
+        return store
+
+    def poll(self, chain: str) -> bool:
+        """Ingest the next block range; True once caught up with the head"""
+        head = int(self.manager.request(chain, "eth_blockNumber", []), 16) - self.confirmations
+        store = self.event_store(chain)
+        start = self._cursors.get(chain)
+        if start is None:
+            # Backfill the longest window, or from the stored events if they stop earlier
+            start = max(0, head - int(max(self.windows) / self.block_times.get(chain, 1.0)))
+            if store is not None and store.next_block is not None:
+                start = min(start, store.next_block)
+        if start > head:
+            return True
+        end = min(head, start + self.max_range - 1)
+        addresses = self._addresses(chain)
+        if not addresses:
+            raise ValueError(f"No lottery manager or jackpot vault configured for {chain}")
+        logs = self.manager.get_logs(chain, {"address": addresses, "topics": [list(topics().values())],
+                                             "fromBlock": start, "toBlock": end})
+        rows: Optional[List[tuple]] = [] if store is not None else None
+        if logs:
+            self.ingest(chain, logs, self._clock(chain, start, end), rows)
+        if store is not None:
+            stored = store.next_block or 0
+            if end + 1 > stored:
+                rows = sorted((row for row in rows if row[1] >= stored), key=lambda row: row[1])
+                store.append({name: [row[i] for row in rows] for i, name in enumerate(EVENT_COLUMNS)}, end + 1)
+        self._cursors[chain] = end + 1
+        status = self.status[chain]
+        status["last_block"] = end
+        if end >= head:
+            status["backfilled"] = True
+        return end >= head
+
+    def _clock(self, chain: str, start: int, end: int) -> Callable[[int], float]:
+        """Block number -> timestamp, interpolated between the range's end headers"""
+        first = int(self.manager.get_block_header(chain, start)["timestamp"], 16)
+        if end == start:
+            return lambda number: first
+        last = int(self.manager.get_block_header(chain, end)["timestamp"], 16)
+        rate = (last - first) / (end - start)
+        return lambda number: first + (number - start) * rate
+
+    def ingest(self, chain: str, logs: List[Dict[str, Any]], clock: Callable[[int], float],
+               rows: Optional[List[tuple]] = None) -> int:
+        """Add decoded logs to the chain's ring (and their rows to `rows`); returns how many were counted"""
+        try:
+            wrapped = self.manager.resolve_address(chain, "wrapped_native")
+        except ValueError:
+            wrapped = None
+        emitters = {kind: self.manager.resolve_address(chain, kind) if self.manager.has_address(chain, kind) else None
+                    for kind in ("lottery", "jackpot")}
+        ring, counted = self.rings[chain], 0
+        for log in logs:
+            name = event_names().get(log["topics"][0] if log.get("topics") else None)
+            if name is None or log.get("removed"):
+                continue
+            # Only count each event from the contract that defines it
+            if log["address"].lower() != emitters["lottery" if name == "entry" else "jackpot"]:
+                continue
+            values = event_values(name, log, wrapped)
+            if values is None:
+                continue
+            timestamp = clock(int(log["blockNumber"], 16))
+            if rows is not None:
+                rows.append(event_row(name, log, timestamp))
+            with self._lock:
+                if ring.add(timestamp, values):
+                    counted += 1
+            ACTIVITY_EVENTS.inc(chain, name)
+        self.status[chain]["events"] += counted
+        return counted
+
+    def report(self, chain: str, now: Optional[float] = None) -> Dict[str, Any]:
+        """Every window's aggregates for `chain` (O(1) in the number of events)"""
+        now = time.time() if now is None else now
+        ring = self.rings[chain]
+        with self._lock:
+            ring.advance(now)
+            windows = {f"{window}s": ring.window(window, now) for window in self.windows}
+        return {"chain": chain, "bucket_seconds": self.bucket_seconds, "windows": windows,
+                "indexer": dict(self.status[chain])}
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Dragon Chain Cache
+Disk-backed cache for chain data that can no longer change.
+
+Receipts, logs and block headers at or below a chain's finalized block are
+immutable, so once fetched they can be served forever. Entries live in one
+SQLite database (WAL mode) under the data directory, keyed by chain, kind
+and key (transaction hash, block number, log filter), so every tool and
+every server process on the host shares them.
+
+Only callers decide what is finalized; this module just stores JSON values.
+The database is bounded by size: when it grows past `max_bytes` the least
+recently used entries are deleted until it is back under 90% of the limit.
+Hits only write back their access time when it is more than `touch_interval`
+seconds old, so repeat reads stay read-only.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+import dragon_metrics
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    chain TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (chain, kind, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+"""
+
+class ChainCache:
+    """Size-bounded SQLite store of finalized chain data shared across processes"""
+
+    def __init__(self, path: str, max_bytes: int = 256 << 20, touch_interval: float = 60.0,
+                 evict_every: int = 64):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self.evict_every = evict_every
+        self._local = threading.local()
+        self._puts = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections are not shareable)"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                connection.execute("DROP TABLE IF EXISTS entries")
+                connection.executescript(_SCHEMA)
+                connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._local.connection = connection
+        return connection
+
+    def get(self, chain: str, kind: str, key: str) -> Optional[Any]:
+        """Cached value, or None on a miss"""
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT value, accessed FROM entries WHERE chain = ? AND kind = ? AND key = ?",
+            (chain, kind, key),
+        ).fetchone()
+        dragon_metrics.cache_lookup(f"chain_{kind}", row is not None)
+        if row is None:
+            return None
+        now = time.time()
+        if now - row[1] > self.touch_interval:
+            try:
+                connection.execute(
+                    "UPDATE entries SET accessed = ? WHERE chain = ? AND kind = ? AND key = ?",
+                    (now, chain, kind, key),
+                )
+            except sqlite3.OperationalError:
+                pass  # Another process holds the write lock; the LRU order can wait
+        return json.loads(row[0])
+
+    def put(self, chain: str, kind: str, key: str, value: Any) -> None:
+        """Store a value that will never change"""
+        encoded = json.dumps(value, separators=(",", ":"))
+        self._connection().execute(
+            "INSERT OR REPLACE INTO entries (chain, kind, key, value, size, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+            (chain, kind, key, encoded, len(encoded), time.time()),
+        )
+        with self._lock:
+            self._puts += 1
+            due = self._puts % self.evict_every == 0
+        if due:
+            self.evict()
+
+    def get_many(self, chain: str, kind: str, keys: List[str]) -> Dict[str, Any]:
+        """Cached values for the keys that are present (one query per 500 keys)"""
+        connection = self._connection()
+        found: Dict[str, Any] = {}
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            for key, value in connection.execute(
+                    f"SELECT key, value FROM entries WHERE chain = ? AND kind = ? AND key IN ({placeholders})",
+                    (chain, kind, *batch)):
+                found[key] = json.loads(value)
+        dragon_metrics.CACHE_REQUESTS.inc(f"chain_{kind}", "hit", amount=len(found))
+        dragon_metrics.CACHE_REQUESTS.inc(f"chain_{kind}", "miss", amount=len(keys) - len(found))
+        return found
+
+    def put_many(self, chain: str, kind: str, items: Dict[str, Any]) -> None:
+        """Store several immutable values in one transaction"""
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        for key, value in items.items():
+            encoded = json.dumps(value, separators=(",", ":"))
+            rows.append((chain, kind, key, encoded, len(encoded), now))
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(
+                "INSERT OR REPLACE INTO entries (chain, kind, key, value, size, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                rows)
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        with self._lock:
+            before = self._puts
+            self._puts += len(rows)
+            due = before // self.evict_every != self._puts // self.evict_every
+        if due:
+            self.evict()
+
+    def size(self) -> int:
+        """Bytes of stored values"""
+        return int(self._connection().execute("SELECT total(size) FROM entries").fetchone()[0])
+
+    def evict(self) -> int:
+        """Drop least recently used entries while over max_bytes; returns how many"""
+        connection = self._connection()
+        total = self.size()
+        if total <= self.max_bytes:
+            return 0
+        excess = total - int(self.max_bytes * 0.9)
+        victims = []
+        for chain, kind, key, size in connection.execute(
+                "SELECT chain, kind, key, size FROM entries ORDER BY accessed"):
+            victims.append((chain, kind, key))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany("DELETE FROM entries WHERE chain = ? AND kind = ? AND key = ?", victims)
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return len(victims)
+
+    def stats(self) -> Dict[str, Any]:
+        connection = self._connection()
+        kinds = {
+            kind: {"entries": count, "bytes": int(size)}
+            for kind, count, size in connection.execute(
+                "SELECT kind, count(*), total(size) FROM entries GROUP BY kind")
+        }
+        return {"path": self.path, "max_bytes": self.max_bytes, "kinds": kinds}
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM entries")
+
+def cache_path(data_dir: str) -> str:
+    return os.path.join(data_dir, "chain_cache.sqlite")
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Dragon Codec
+Precompiled ABI encoders/decoders for fixed-layout contract calls.
+
+Most Dragon views take and return only static types (uintN, intN, bool,
+address, bytesN and tuples of those), so their calldata is a selector plus
+32-byte words and their return data is a fixed sequence of words. Compiling
+the layout once lets Web3Manager issue raw eth_calls without going through
+web3's contract-function machinery on every call.
+
+Multicall3's aggregate3 takes and returns dynamic arrays, so it gets a
+small hand-written encoder and decoder at the end of this module.
+"""
+
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+WORD = 32
+_UINT256_MOD = 1 << 256
+
+def keccak256(data: bytes) -> bytes:
+    # eth_utils ships with web3; imported here so this module stays cheap to load
+    from eth_utils import keccak
+    return keccak(data)
+
+def canonical_type(param: Dict[str, Any]) -> str:
+    """Canonical ABI type string of a parameter (tuples expanded)"""
+    abi_type = param["type"]
+    if abi_type.startswith("tuple"):
+        inner = ",".join(canonical_type(c) for c in param["components"])
+        return f"({inner}){abi_type[len('tuple'):]}"
+    return abi_type
+
+def function_signature(entry: Dict[str, Any]) -> str:
+    """Signature used for the selector, e.g. `balanceOf(address)`"""
+    return f"{entry['name']}({','.join(canonical_type(p) for p in entry['inputs'])})"
+
+def function_selector(signature: str) -> bytes:
+    """First four bytes of keccak256(signature)"""
+    return keccak256(signature.encode())[:4]
+
+def _is_static_elementary(abi_type: str) -> bool:
+    if abi_type in ("bool", "address"):
+        return True
+    if abi_type.startswith(("uint", "int")):
+        return "[" not in abi_type
+    if abi_type.startswith("bytes") and abi_type != "bytes":
+        return "[" not in abi_type
+    return False
+
+def is_static(param: Dict[str, Any]) -> bool:
+    """True if the parameter has a fixed 32-byte-word layout"""
+    if param["type"] == "tuple":
+        return all(is_static(c) for c in param["components"])
+    return _is_static_elementary(param["type"])
+
+# ================================
+# WORD ENCODERS / DECODERS
+# ================================
+
+def encode_uint(value: int) -> bytes:
+    return int(value).to_bytes(WORD, "big")
+
+def encode_int(value: int) -> bytes:
+    return (int(value) % _UINT256_MOD).to_bytes(WORD, "big")
+
+def encode_bool(value: bool) -> bytes:
+    return encode_uint(1 if value else 0)
+
+def encode_address(value: str) -> bytes:
+    raw = bytes.fromhex(value[2:] if value[:2] in ("0x", "0X") else value)
+    if len(raw) != 20:
+        raise ValueError(f"Invalid address: {value}")
+    return raw.rjust(WORD, b"\0")
+
+def encode_fixed_bytes(value: Any) -> bytes:
+    raw = bytes.fromhex(value[2:]) if isinstance(value, str) else bytes(value)
+    return raw.ljust(WORD, b"\0")
+
+def decode_uint(word: bytes) -> int:
+    return int.from_bytes(word, "big")
+
+def decode_int(word: bytes) -> int:
+    return int.from_bytes(word, "big", signed=True)
+
+def decode_bool(word: bytes) -> bool:
+    return word != bytes(WORD)
+
+def decode_address(word: bytes) -> str:
+    from eth_utils import to_checksum_address
+    return to_checksum_address(word[12:])
+
+def _word_codec(abi_type: str) -> Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]:
+    if abi_type == "bool":
+        return encode_bool, decode_bool
+    if abi_type == "address":
+        return encode_address, decode_address
+    if abi_type.startswith("uint"):
+        return encode_uint, decode_uint
+    if abi_type.startswith("int"):
+        return encode_int, decode_int
+    size = int(abi_type[len("bytes"):])
+    return encode_fixed_bytes, lambda word: word[:size]
+
+def _flatten(params: Sequence[Dict[str, Any]]) -> List[Tuple[Callable, Callable]]:
+    codecs = []
+    for param in params:
+        if param["type"] == "tuple":
+            codecs.extend(_flatten(param["components"]))
+        else:
+            codecs.append(_word_codec(param["type"]))
+    return codecs
+
+def _shape(params: Sequence[Dict[str, Any]]) -> List[Any]:
+    """Nesting of flattened words: None for a word, a list for a tuple"""
+    return [_shape(p["components"]) if p["type"] == "tuple" else None for p in params]
+
+def _rebuild(values: List[Any], shape: List[Any], cursor: List[int]) -> Tuple:
+    out = []
+    for node in shape:
+        if node is None:
+            out.append(values[cursor[0]])
+            cursor[0] += 1
+        else:
+            out.append(_rebuild(values, node, cursor))
+    return tuple(out)
+
+class CompiledCall:
+    """Selector, cached calldata and fixed-layout codec for one ABI function"""
+
+    __slots__ = (
+        "name", "signature", "selector", "calldata", "input_types", "output_types",
+        "_encoders", "_input_decoders", "_decoders", "_output_encoders", "_shape", "_flat", "_size",
+    )
+
+    def __init__(self, entry: Dict[str, Any]):
+        self.name = entry["name"]
+        self.signature = function_signature(entry)
+        self.selector = function_selector(self.signature)
+        self.input_types = [canonical_type(p) for p in entry["inputs"]]
+        self.output_types = [canonical_type(p) for p in entry["outputs"]]
+        self._encoders = [enc for enc, _ in _flatten(entry["inputs"])]
+        self._input_decoders = [dec for _, dec in _flatten(entry["inputs"])]
+        self._decoders = [dec for _, dec in _flatten(entry["outputs"])]
+        self._output_encoders = [enc for enc, _ in _flatten(entry["outputs"])]
+        self._shape = _shape(entry["outputs"])
+        self._flat = all(node is None for node in self._shape)
+        self._size = len(self._decoders) * WORD
+        # Zero-argument calls always send the same bytes
+        self.calldata = "0x" + self.selector.hex() if not entry["inputs"] else None
+
+    def encode(self, *args: Any) -> str:
+        """Hex calldata for the given (already flattened) arguments"""
+        if self.calldata is not None and not args:
+            return self.calldata
+        if len(args) != len(self._encoders):
+            raise ValueError(f"{self.signature} expects {len(self._encoders)} arguments, got {len(args)}")
+        return "0x" + (self.selector + b"".join(enc(arg) for enc, arg in zip(self._encoders, args))).hex()
+
+    def decode(self, data: Any) -> Any:
+        """
+        Decode return data the way web3 does: a single output is returned
+        bare, several outputs (or a struct) come back as a tuple.
+        """
+        if isinstance(data, str):
+            data = bytes.fromhex(data[2:] if data[:2] in ("0x", "0X") else data)
+        if len(data) < self._size:
+            raise ValueError(
+                f"Could not decode {self.signature} return data: expected {self._size} bytes, "
+                f"got {len(data)} (is the contract deployed on this chain?)"
+            )
+        values = [dec(data[i * WORD:(i + 1) * WORD]) for i, dec in enumerate(self._decoders)]
+        if not self._flat:
+            values = list(_rebuild(values, self._shape, [0]))
+        return values[0] if len(values) == 1 else tuple(values)
+
+    def decode_input(self, data: Any) -> Tuple:
+        """Decode calldata arguments (flattened) - the inverse of encode()"""
+        if isinstance(data, str):
+            data = bytes.fromhex(data[2:] if data[:2] in ("0x", "0X") else data)
+        words = data[4:]
+        return tuple(dec(words[i * WORD:(i + 1) * WORD]) for i, dec in enumerate(self._input_decoders))
+
+    def encode_output(self, *values: Any) -> bytes:
+        """Encode flattened return values - used by local RPC stand-ins"""
+        if len(values) != len(self._output_encoders):
+            raise ValueError(f"{self.signature} returns {len(self._output_encoders)} words, got {len(values)}")
+        return b"".join(enc(value) for enc, value in zip(self._output_encoders, values))
+
+def compile_abi(abi: Sequence[Dict[str, Any]]) -> Dict[str, CompiledCall]:
+    """Compile every view/pure function whose inputs and outputs are all static"""
+    compiled = {}
+    for entry in abi:
+        if entry.get("type") != "function" or entry.get("stateMutability") not in ("view", "pure"):
+            continue
+        if all(is_static(p) for p in entry["inputs"]) and all(is_static(p) for p in entry["outputs"]):
+            compiled[entry["name"]] = CompiledCall(entry)
+    return compiled
+
+# ================================
+# MULTICALL3
+# ================================
+
+# Multicall3 is deployed at the same address on every supported chain
+MULTICALL3_ADDRESS = "0xca11bde05977b3631167028862be2a173976ca11"
+AGGREGATE3_SELECTOR = bytes.fromhex("82ad56cb")       # aggregate3((address,bool,bytes)[])
+GET_BLOCK_NUMBER_CALLDATA = bytes.fromhex("42cbb15c")  # getBlockNumber()
+
+def _pad(data: bytes) -> bytes:
+    return data + bytes(-len(data) % WORD)
+
+def encode_aggregate3(calls: Sequence[Tuple[str, bool, bytes]]) -> str:
+    """Calldata for aggregate3 over (target, allow_failure, calldata) triples"""
+    elements = [
+        encode_address(target) + encode_bool(allow_failure) + encode_uint(3 * WORD)
+        + encode_uint(len(data)) + _pad(data)
+        for target, allow_failure, data in calls
+    ]
+    offsets, position = [], len(elements) * WORD
+    for element in elements:
+        offsets.append(encode_uint(position))
+        position += len(element)
+    body = encode_uint(WORD) + encode_uint(len(elements)) + b"".join(offsets) + b"".join(elements)
+    return "0x" + (AGGREGATE3_SELECTOR + body).hex()
+
+def decode_aggregate3_input(data: bytes) -> List[Tuple[str, bool, bytes]]:
+    """(target, allow_failure, calldata) triples from aggregate3 calldata"""
+    body = data[4:]
+    start = decode_uint(body[:WORD]) + WORD
+    count = decode_uint(body[start - WORD:start])
+    calls = []
+    for i in range(count):
+        element = start + decode_uint(body[start + i * WORD:start + (i + 1) * WORD])
+        target = "0x" + body[element + 12:element + WORD].hex()
+        allow_failure = decode_bool(body[element + WORD:element + 2 * WORD])
+        data_start = element + decode_uint(body[element + 2 * WORD:element + 3 * WORD])
+        length = decode_uint(body[data_start:data_start + WORD])
+        calls.append((target, allow_failure, bytes(body[data_start + WORD:data_start + WORD + length])))
+    return calls
+
+def encode_aggregate3_output(results: Sequence[Tuple[bool, bytes]]) -> bytes:
+    """aggregate3 return data for (success, return_data) pairs - used by local RPC stand-ins"""
+    elements = [
+        encode_bool(success) + encode_uint(2 * WORD) + encode_uint(len(data)) + _pad(data)
+        for success, data in results
+    ]
+    offsets, position = [], len(elements) * WORD
+    for element in elements:
+        offsets.append(encode_uint(position))
+        position += len(element)
+    return encode_uint(WORD) + encode_uint(len(elements)) + b"".join(offsets) + b"".join(elements)
+
+def decode_aggregate3(data: Any) -> List[Tuple[bool, bytes]]:
+    """(success, return_data) pairs from aggregate3 return data"""
+    if isinstance(data, str):
+        data = bytes.fromhex(data[2:] if data[:2] in ("0x", "0X") else data)
+    if len(data) < 2 * WORD:
+        raise ValueError(f"Could not decode aggregate3 return data: got {len(data)} bytes "
+                         f"(is Multicall3 deployed on this chain?)")
+    start = decode_uint(data[:WORD]) + WORD
+    count = decode_uint(data[start - WORD:start])
+    results = []
+    for i in range(count):
+        element = start + decode_uint(data[start + i * WORD:start + (i + 1) * WORD])
+        success = decode_bool(data[element:element + WORD])
+        data_start = element + decode_uint(data[element + WORD:element + 2 * WORD])
+        length = decode_uint(data[data_start:data_start + WORD])
+        results.append((success, bytes(data[data_start + WORD:data_start + WORD + length])))
+    return results
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Dragon Column Store
+Append-only per-column files for event indexers.
+
+A store is a directory with one file per column (raw little-endian values
+of a fixed dtype) plus meta.json holding the committed row count, the next
+block to index and the contract the rows came from. Rows are written before
+the meta file, so a crash leaves at most an uncommitted tail that is
+truncated on open. Times never decrease, so a time range is located with
+searchsorted over a memory-mapped column.
+
+load() maps the committed rows read-only without touching the files, so
+another process (the exporter) can read a store while its indexer appends.
+"""
+
+import os
+import json
+import threading
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+META_FILE = "meta.json"
+
+def read_meta(directory: str) -> Dict[str, Any]:
+    path = os.path.join(directory, META_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def load(directory: str, schema: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Read-only memory maps of the committed rows of the store in `directory`"""
+    rows = int(read_meta(directory).get("rows", 0))
+    columns = {}
+    for name, dtype in schema.items():
+        dtype = np.dtype(dtype)
+        path = os.path.join(directory, f"{name}.col")
+        if rows and os.path.getsize(path) >= rows * dtype.itemsize:
+            columns[name] = np.memmap(path, dtype=dtype, mode="r", shape=(rows,))
+        else:
+            columns[name] = np.empty(0, dtype=dtype)
+    return columns
+
+class ColumnStore:
+    """Append-only columns described by `schema` (name -> dtype) under `directory`"""
+
+    def __init__(self, directory: str, contract: str, schema: Dict[str, Any]):
+        self.directory = directory
+        self.schema = {name: np.dtype(dtype) for name, dtype in schema.items()}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._meta_path = os.path.join(directory, META_FILE)
+        meta = read_meta(directory)
+        if meta.get("contract") != contract.lower():
+            # Events of another deployment do not belong with these
+            meta = {"contract": contract.lower(), "rows": 0, "next_block": None}
+        self.meta = meta
+        for name, dtype in self.schema.items():
+            path = self._column_path(name)
+            with open(path, "ab") as f:
+                f.truncate(meta["rows"] * dtype.itemsize)
+        self._save_meta()
+        self._views: Optional[Dict[str, np.ndarray]] = None
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.col")
+
+    def _save_meta(self) -> None:
+        partial = self._meta_path + ".tmp"
+        with open(partial, "w") as f:
+            json.dump(self.meta, f)
+        os.replace(partial, self._meta_path)
+
+    @property
+    def rows(self) -> int:
+        return self.meta["rows"]
+
+    @property
+    def next_block(self) -> Optional[int]:
+        return self.meta["next_block"]
+
+    def append(self, columns: Dict[str, Any], next_block: int) -> None:
+        """Append rows (in block order) and advance the indexing cursor to `next_block`"""
+        count = len(columns["time"])
+        with self._lock:
+            if count:
+                last = self.last_time()
+                times = np.asarray(columns["time"], dtype=np.float64)
+                times = np.maximum.accumulate(np.maximum(times, last if last is not None else -np.inf))
+                columns = dict(columns, time=times)
+                for name, dtype in self.schema.items():
+                    with open(self._column_path(name), "ab") as f:
+                        f.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+            self.meta["rows"] += count
+            self.meta["next_block"] = next_block
+            self._save_meta()
+            self._views = None
+
+    def last_time(self) -> Optional[float]:
+        rows = self.rows
+        if not rows:
+            return None
+        dtype = self.schema["time"]
+        with open(self._column_path("time"), "rb") as f:
+            f.seek((rows - 1) * dtype.itemsize)
+            return float(np.frombuffer(f.read(dtype.itemsize), dtype=dtype)[0])
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Read-only memory maps of every committed column"""
+        with self._lock:
+            if self._views is None:
+                rows = self.rows
+                self._views = {
+                    name: np.memmap(self._column_path(name), dtype=dtype, mode="r", shape=(rows,))
+                    if rows else np.empty(0, dtype=dtype)
+                    for name, dtype in self.schema.items()
+                }
+            return self._views
+
+    def range(self, start: float, end: float) -> Dict[str, np.ndarray]:
+        """Column slices with start <= time < end (views, not copies)"""
+        columns = self.columns()
+        times = columns["time"]
+        lo = int(np.searchsorted(times, start, side="left"))
+        hi = int(np.searchsorted(times, end, side="left"))
+        return {name: column[lo:hi] for name, column in columns.items()}
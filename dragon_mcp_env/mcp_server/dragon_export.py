@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Dragon Export
+Columnar export of indexed on-chain data for notebooks.
+
+Reads what the server has already indexed under DRAGON_MCP_DATA_DIR and
+writes one file per dataset, chain and UTC day:
+
+    prices     price_history/<chain>.prices    oracle price samples
+    fees       fee_flows/<chain>/              omniDRAGON fee distributions
+    activity   activity_events/<chain>/        lottery entries, jackpot adds and payouts
+
+    <out>/<dataset>/chain=<chain>/date=YYYY-MM-DD/part-0.arrow
+
+Arrow IPC files are written uncompressed, so read_dataset() (or
+pa.memory_map + pa.ipc.open_file) maps them without copying; Parquet
+(--format parquet) is smaller but is decoded on read. The chain=/date=
+directories are Hive partitions, so pyarrow.dataset reads the tree too.
+
+Only complete days are written: a day is complete once the store holds a
+row after it. Each run starts after the newest exported day of every chain,
+so incremental exports only add partitions and never rewrite one. Files are
+written under a temporary name and renamed into place.
+
+The stores are mapped read-only while the server keeps appending to them;
+nothing here calls RPC or the server.
+
+    python dragon_export.py --out ~/dragon_export
+    python dragon_export.py --out ~/dragon_export --format parquet --datasets fees --chains sonic
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+
+DAY = 86400
+FORMATS = {"arrow": "part-0.arrow", "parquet": "part-0.parquet"}
+
+# ================================
+# SOURCES
+# ================================
+
+def _prices(data_dir: str) -> Dict[str, Any]:
+    directory = os.path.join(data_dir, "price_history")
+    names = sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+    return {name[:-len(".prices")]: os.path.join(directory, name) for name in names if name.endswith(".prices")}
+
+def _stores(data_dir: str, name: str) -> Dict[str, Any]:
+    directory = os.path.join(data_dir, name)
+    names = sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+    return {chain: os.path.join(directory, chain) for chain in names
+            if os.path.exists(os.path.join(directory, chain, "meta.json"))}
+
+def _load_prices(path: str) -> Dict[str, np.ndarray]:
+    from dragon_history import load
+    records = load(path)
+    return {name: records[name] for name in records.dtype.names}
+
+def _load_fees(path: str) -> Dict[str, np.ndarray]:
+    import dragon_columns
+    import dragon_fees
+    return dragon_columns.load(path, dragon_fees.COLUMNS)
+
+def _load_activity(path: str) -> Dict[str, np.ndarray]:
+    import dragon_columns
+    import dragon_activity
+    return dragon_columns.load(path, dragon_activity.EVENT_COLUMNS)
+
+def _labels(dataset: str) -> Dict[str, Sequence[str]]:
+    """Integer-coded columns and their labels (written as dictionary columns)"""
+    if dataset == "prices":
+        from dragon_history import SOURCES
+        return {"source": SOURCES}
+    if dataset == "fees":
+        from dragon_fees import CATEGORIES
+        return {"category": CATEGORIES}
+    from dragon_activity import EVENTS
+    return {"event": tuple(EVENTS)}
+
+DATASETS = {
+    "prices": (_prices, _load_prices),
+    "fees": (lambda data_dir: _stores(data_dir, "fee_flows"), _load_fees),
+    "activity": (lambda data_dir: _stores(data_dir, "activity_events"), _load_activity),
+}
+BOOLEANS = {"valid", "won"}
+ADDRESSES = {"account", "token"}
+
+# ================================
+# CONVERSION
+# ================================
+
+def _addresses(values: np.ndarray, present: Optional[np.ndarray] = None) -> pa.Array:
+    """20-byte addresses as 0x strings; null where not `present` (default: all-zero, i.e. unset)"""
+    raw = np.ascontiguousarray(values).view(np.uint8).reshape(-1, 20)
+    if present is None:
+        present = raw.any(axis=1)
+    return pa.array(["0x" + row.tobytes().hex() if keep else None for row, keep in zip(raw, present)],
+                    type=pa.string())
+
+def to_table(dataset: str, columns: Dict[str, np.ndarray]) -> pa.Table:
+    """Arrow table of stored columns: times as UTC timestamps, codes as dictionaries"""
+    labels = _labels(dataset)
+    arrays, names = [], []
+    for name, values in columns.items():
+        values = np.asarray(values)
+        if name == "time":
+            array = pa.array(np.round(values * 1e6).astype(np.int64), type=pa.timestamp("us", tz="UTC"))
+        elif name in labels:
+            array = pa.DictionaryArray.from_arrays(pa.array(values.astype(np.int32)),
+                                                   pa.array(list(labels[name]), type=pa.string()))
+        elif name in BOOLEANS:
+            array = pa.array(values.astype(bool))
+        elif name == "token" and dataset == "activity":
+            # Entries have no token; address(0) on jackpot events stands for DRAGON
+            array = _addresses(values, np.asarray(columns["event"]) != 0)
+        elif name in ADDRESSES:
+            array = _addresses(values)
+        else:
+            array = pa.array(values)
+        arrays.append(array)
+        names.append(name)
+    return pa.Table.from_arrays(arrays, names=names)
+
+# ================================
+# PARTITIONS
+# ================================
+
+def _date(day: int) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(day * DAY))
+
+def _day(date: str) -> int:
+    return int(np.datetime64(date, "D").astype(np.int64))
+
+def exported_dates(chain_dir: str) -> List[str]:
+    """Dates already exported under a chain directory, oldest first"""
+    if not os.path.isdir(chain_dir):
+        return []
+    return sorted(name[len("date="):] for name in os.listdir(chain_dir)
+                  if name.startswith("date=") and any(
+                      os.path.exists(os.path.join(chain_dir, name, part)) for part in FORMATS.values()))
+
+def write_partition(table: pa.Table, path: str, fmt: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial = path + ".tmp"
+    if fmt == "arrow":
+        with pa.OSFile(partial, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        import pyarrow.parquet as pq
+        pq.write_table(table, partial)
+    os.replace(partial, path)
+
+def export_chain(dataset: str, chain: str, columns: Dict[str, np.ndarray], out_dir: str,
+                 fmt: str = "arrow") -> Dict[str, Any]:
+    """Write the complete days of one chain not exported yet"""
+    chain_dir = os.path.join(out_dir, dataset, f"chain={chain}")
+    times = columns["time"]
+    written: List[str] = []
+    rows = 0
+    if len(times):
+        done = exported_dates(chain_dir)
+        first = int(times[0] // DAY)
+        if done:
+            first = max(first, _day(done[-1]) + 1)
+        last = int(times[-1] // DAY)  # the newest day may still be filling
+        if first < last:
+            bounds = np.searchsorted(times, np.arange(first, last + 1, dtype=np.float64) * DAY, side="left")
+            for i, day in enumerate(range(first, last)):
+                lo, hi = int(bounds[i]), int(bounds[i + 1])
+                if hi == lo:
+                    continue
+                table = to_table(dataset, {name: column[lo:hi] for name, column in columns.items()})
+                date = _date(day)
+                write_partition(table, os.path.join(chain_dir, f"date={date}", FORMATS[fmt]), fmt)
+                written.append(date)
+                rows += hi - lo
+    return {"partitions": written, "rows": rows}
+
+def export(data_dir: str, out_dir: str, datasets: Optional[Sequence[str]] = None,
+           chains: Optional[Sequence[str]] = None, fmt: str = "arrow") -> Dict[str, Any]:
+    """Export every selected dataset and chain found under `data_dir`"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; use one of {', '.join(FORMATS)}")
+    summary: Dict[str, Any] = {"output": out_dir, "format": fmt, "datasets": {}}
+    for dataset in datasets or DATASETS:
+        if dataset not in DATASETS:
+            raise ValueError(f"Unknown dataset {dataset!r}; use any of {', '.join(DATASETS)}")
+        find, load = DATASETS[dataset]
+        report = summary["datasets"][dataset] = {}
+        for chain, path in find(data_dir).items():
+            if chains and chain not in chains:
+                continue
+            report[chain] = export_chain(dataset, chain, load(path), out_dir, fmt)
+    return summary
+
+def read_dataset(out_dir: str, dataset: str, chains: Optional[Sequence[str]] = None,
+                 start: Optional[str] = None, end: Optional[str] = None) -> pa.Table:
+    """
+    One table of exported partitions (dates start..end inclusive, YYYY-MM-DD)
+    with a `chain` column. Arrow files are memory-mapped, so column buffers
+    point into the page cache instead of being copied.
+    """
+    root = os.path.join(os.path.expanduser(out_dir), dataset)
+    tables = []
+    for name in sorted(os.listdir(root)) if os.path.isdir(root) else []:
+        chain = name[len("chain="):]
+        if not name.startswith("chain=") or (chains and chain not in chains):
+            continue
+        for date in exported_dates(os.path.join(root, name)):
+            if (start and date < start) or (end and date > end):
+                continue
+            directory = os.path.join(root, name, f"date={date}")
+            if os.path.exists(os.path.join(directory, FORMATS["arrow"])):
+                table = pa.ipc.open_file(pa.memory_map(os.path.join(directory, FORMATS["arrow"]))).read_all()
+            else:
+                import pyarrow.parquet as pq
+                table = pq.read_table(os.path.join(directory, FORMATS["parquet"]))
+            tags = pa.DictionaryArray.from_arrays(pa.array(np.zeros(table.num_rows, dtype=np.int32)),
+                                                  pa.array([chain]))
+            tables.append(table.append_column("chain", tags))
+    if not tables:
+        raise ValueError(f"No exported {dataset} partitions under {out_dir}")
+    return pa.concat_tables(tables)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Export indexed Dragon data to Arrow IPC or Parquet")
+    parser.add_argument("--data-dir", default=os.path.expanduser(os.getenv("DRAGON_MCP_DATA_DIR", "~/.cache/dragon_mcp")),
+                        help="Server data directory (DRAGON_MCP_DATA_DIR)")
+    parser.add_argument("--out", default="dragon_export", help="Export root")
+    parser.add_argument("--format", choices=list(FORMATS), default="arrow")
+    parser.add_argument("--datasets", help=f"Comma-separated subset of {','.join(DATASETS)}")
+    parser.add_argument("--chains", help="Comma-separated chains (default: every indexed chain)")
+    args = parser.parse_args()
+
+    def split(value: Optional[str]) -> Optional[List[str]]:
+        return [item.strip() for item in value.split(",") if item.strip()] if value else None
+
+    try:
+        summary = export(args.data_dir, os.path.expanduser(args.out), split(args.datasets), split(args.chains),
+                         args.format)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(summary, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+"""
+Dragon Fake Node
+Local JSON-RPC stand-in serving canned omniDRAGON chain state.
+
+One HTTP server answers for every chain at http://127.0.0.1:<port>/<chain>.
+eth_call is answered by function selector for the ABIs in dragon_mcp.py,
+so any configured contract address works; Multicall3 aggregate3 batches
+are unpacked and answered the same way. Latency and error injection are
+configurable, as is a provider-style per-chain request rate cap that
+answers HTTP 429 above it, and every request is counted per chain and method so
+benchmarks can report RPC amplification.
+
+Usage:
+    python dragon_fake_node.py --port 8545 --latency-ms 40 --error-rate 0.01
+"""
+
+import os
+import json
+import time
+import random
+import argparse
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dragon_codec import (
+    CompiledCall, function_selector, function_signature, is_static, keccak256, encode_uint,
+    MULTICALL3_ADDRESS, AGGREGATE3_SELECTOR, GET_BLOCK_NUMBER_CALLDATA, WORD,
+    decode_aggregate3_input, encode_aggregate3_output,
+)
+
+CHAIN_IDS = {
+    "sonic": 146,
+    "ethereum": 1,
+    "arbitrum": 42161,
+    "base": 8453,
+    "avalanche": 43114,
+}
+
+BLOCK_TIMES = {
+    "sonic": 0.4,
+    "ethereum": 12.0,
+    "arbitrum": 0.25,
+    "base": 2.0,
+    "avalanche": 2.0,
+}
+
+GET_TIMESTAMP_CALLDATA = function_selector("getCurrentBlockTimestamp()")
+
+# Blocks between the head and the "finalized" tag
+FINALITY_LAG = 2
+
+def fake_address(name: str) -> str:
+    """Deterministic address standing in for a deployed contract"""
+    return "0x" + keccak256(name.encode())[:20].hex()
+
+def _oracle_config() -> bytes:
+    """getOracleConfig(): four fresh feeds weighted 40/20/20/20, Band symbol "S", a Pyth id"""
+    head = b""
+    for source, weight in (("chainlink", 4000), ("band", 2000), ("api3", 2000), ("pyth", 2000)):
+        head += encode_uint(int(fake_address(f"feed:{source}"), 16)) + encode_uint(weight) + encode_uint(1) + encode_uint(3600)
+    symbol = b"S"
+    return (head + encode_uint(18 * WORD) + keccak256(b"pyth:DRAGON/USD")
+            + encode_uint(len(symbol)) + symbol.ljust(WORD, b"\0"))
+
+def canned_results() -> Dict[str, Callable[[Tuple], Tuple]]:
+    """
+    Flattened return values per function name, given the decoded call
+    arguments; functions with dynamic layouts get the raw calldata and
+    return encoded bytes.
+    """
+    now = lambda: int(time.time()) - 30
+    return {
+        "totalSupply": lambda args: (6_942_000 * 10**18,),
+        "balanceOf": lambda args: (1_000 * 10**18,),
+        "getFees": lambda args: (690, 241, 69, 1000, 690, 241, 69, 1000),
+        "getAggregatedPrice": lambda args: (42 * 10**14, True, now()),
+        "getLatestPrice": lambda args: (42 * 10**14, now()),
+        "getNativeTokenPrice": lambda args: (45 * 10**6, True, now()),
+        # OmniDragonPriceOracle sources: four feeds near $0.0042
+        "getOracleStatus": lambda args: (True, False, False, False, 4, 2000),
+        "getOracleConfig": lambda calldata: _oracle_config(),
+        "isFresh": lambda args: (True,),
+        "latestPrice": lambda args: (42 * 10**14,),
+        "lastPriceUpdate": lambda args: (now(),),
+        "latestRoundData": lambda args: (7, 42 * 10**4, now(), now(), 7),
+        "decimals": lambda args: (8,),
+        "getReferenceData": lambda calldata: encode_uint(425 * 10**13) + encode_uint(now()) + encode_uint(now()),
+        "read": lambda args: (419 * 10**13, now()),
+        "getPriceUnsafe": lambda args: (420, 1, -5, now()),
+        "calculateWinProbability": lambda args: (True, min(args[1] // 10**6 * 4, 100_000)),
+        "getInstantLotteryConfig": lambda args: (True, 10 * 10**6, 100_000, 100 * 10**6),
+        "jackpotBalances": lambda args: (1_250 * 10**18,),
+        "quoteSimple": lambda args: (2 * 10**15, 0),
+        "checkRequestStatus": lambda args: (False, True, "0x" + "11" * 20, 0, now(), False),
+        # veDRAGON revenue: three closed epochs, epoch 0 already claimed by everyone
+        "currentEpoch": lambda args: (3,),
+        "epochEndTime": lambda args: (1_700_000_000 + args[0] * 604_800,),
+        "getClaimable": lambda args: (0 if args[1] == 0 else 10**18 * (args[1] + 1),),
+        "hasUserClaimed": lambda args: (args[1] == 0,),
+        # Registry discovery: stable per-name placeholder addresses
+        **{name: (lambda args, name=name: (fake_address(name),)) for name in (
+            "getPriceOracle", "getWrappedNativeToken", "getLayerZeroEndpoint",
+            "jackpotVault", "lotteryManager", "revenueDistributor",
+            "wrappedNativeToken", "rewardToken",
+        )},
+    }
+
+class FakeNode:
+    """Threaded JSON-RPC server with canned state, injected latency and error rates"""
+
+    def __init__(self, abis: Optional[List[List[Dict[str, Any]]]] = None, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 error_mode: str = "rpc", seed: int = 0, rate_limit: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_mode = error_mode
+        # Requests per second per chain before answering 429 (0: unlimited), one second of burst
+        self.rate_limit = rate_limit
+        self.rejected: Dict[str, int] = defaultdict(int)
+        self._allowance: Dict[str, Tuple[float, float]] = {}
+        self.started = time.time()
+        self.stats: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.results = canned_results()
+        self.calls: Dict[bytes, Tuple[Dict[str, Any], Optional[CompiledCall]]] = {}
+        self.nonces: Dict[str, int] = defaultdict(int)
+        self.mined: Dict[Tuple[str, str], int] = {}
+        # Sent transactions stay unmined for receipt_delay seconds, then get receipt_status
+        self.receipt_delay = 0.0
+        self.receipt_status = 1
+        self.sent: Dict[Tuple[str, str], float] = {}
+        # Account state for eth_getCode/eth_getStorageAt (fork simulation); empty by default
+        self.code: Dict[str, str] = {}
+        self.storage: Dict[Tuple[str, int], int] = {}
+        # Logs served by eth_getLogs per chain; empty by default (see add_log)
+        self.logs: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.register_abis(abis or [])
+
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; without this Nagle adds ~40ms per reply
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.rstrip("/") == "/stats":
+                    self._reply(200, node.snapshot())
+                else:
+                    self._reply(404, {"error": "not found"})
+
+            def do_POST(self):
+                chain = self.path.strip("/").split("/")[0] or "sonic"
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"null")
+                status, payload = node.handle(chain, body)
+                self._reply(status, payload)
+
+            def _reply(self, status: int, payload: Any):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    # ================================
+    # LIFECYCLE
+    # ================================
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    def url(self, chain: str) -> str:
+        return f"http://{self.server.server_address[0]}:{self.port}/{chain}"
+
+    def start(self) -> "FakeNode":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="dragon-fake-node", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = {chain: dict(methods) for chain, methods in self.stats.items()}
+        return {"requests": requests, "total": sum(sum(m.values()) for m in requests.values()),
+                "rejected": dict(self.rejected)}
+
+    def total_requests(self) -> int:
+        return self.snapshot()["total"]
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats.clear()
+            self.rejected.clear()
+
+    # ================================
+    # JSON-RPC
+    # ================================
+
+    def register_abis(self, abis: List[List[Dict[str, Any]]]) -> None:
+        """Answer eth_call for these ABIs (can be called after start)"""
+        for abi in abis:
+            for entry in abi:
+                if entry.get("type") != "function":
+                    continue
+                static = all(is_static(p) for p in entry["inputs"] + entry["outputs"])
+                compiled = CompiledCall(entry) if static else None
+                self.calls[function_selector(function_signature(entry))] = (entry, compiled)
+
+    def block_number(self, chain: str) -> int:
+        return 1_000_000 + int((time.time() - self.started) / BLOCK_TIMES.get(chain, 1.0))
+
+    def handle(self, chain: str, body: Any) -> Tuple[int, Any]:
+        """Answer one request or batch; returns (HTTP status, payload)"""
+        requests = body if isinstance(body, list) else [body]
+        if self.rate_limit and not self._admit(chain, len(requests)):
+            return 429, {"jsonrpc": "2.0", "id": None, "error": {"code": 429, "message": "Too Many Requests"}}
+        delay = self.latency + (self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+        responses = []
+        for request in requests:
+            method = request.get("method", "")
+            with self._lock:
+                self.stats[chain][method] += 1
+                fail = self.error_rate > 0 and self._random.random() < self.error_rate
+            if fail and self.error_mode == "http429":
+                return 429, {"jsonrpc": "2.0", "id": request.get("id"),
+                             "error": {"code": 429, "message": "Too Many Requests"}}
+            if fail:
+                responses.append({"jsonrpc": "2.0", "id": request.get("id"),
+                                  "error": {"code": -32005, "message": "limit exceeded"}})
+                continue
+            responses.append(self._dispatch(chain, request))
+        return 200, responses if isinstance(body, list) else responses[0]
+
+    def _admit(self, chain: str, count: int) -> bool:
+        """Take `count` requests from the chain's token bucket"""
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._allowance.get(chain, (self.rate_limit, now))
+            tokens = min(self.rate_limit, tokens + (now - updated) * self.rate_limit)
+            if tokens < count:
+                self._allowance[chain] = (tokens, now)
+                self.rejected[chain] += 1
+                return False
+            self._allowance[chain] = (tokens - count, now)
+            return True
+
+    def _dispatch(self, chain: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        method = request.get("method", "")
+        params = request.get("params") or []
+        handler = getattr(self, "rpc_" + method, None)
+        if handler is None:
+            return {"jsonrpc": "2.0", "id": request.get("id"),
+                    "error": {"code": -32601, "message": f"Method {method} not supported by fake node"}}
+        try:
+            result = handler(chain, params)
+        except Exception as e:
+            return {"jsonrpc": "2.0", "id": request.get("id"),
+                    "error": {"code": 3, "message": f"execution reverted: {e}"}}
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+    def rpc_web3_clientVersion(self, chain, params):
+        return "DragonFakeNode/1.0"
+
+    def rpc_net_version(self, chain, params):
+        return str(CHAIN_IDS.get(chain, 1))
+
+    def rpc_eth_chainId(self, chain, params):
+        return hex(CHAIN_IDS.get(chain, 1))
+
+    def rpc_eth_blockNumber(self, chain, params):
+        return hex(self.block_number(chain))
+
+    def rpc_eth_gasPrice(self, chain, params):
+        return hex(1_000_000_000)
+
+    def rpc_eth_estimateGas(self, chain, params):
+        return hex(150_000)
+
+    def rpc_eth_getTransactionCount(self, chain, params):
+        return hex(self.nonces[params[0].lower()])
+
+    def rpc_eth_getBalance(self, chain, params):
+        return hex(0)
+
+    def rpc_eth_getCode(self, chain, params):
+        return self.code.get(params[0].lower(), "0x")
+
+    def rpc_eth_getStorageAt(self, chain, params):
+        return "0x" + self.storage.get((params[0].lower(), int(params[1], 16)), 0).to_bytes(32, "big").hex()
+
+    def rpc_eth_getBlockByNumber(self, chain, params):
+        tag = params[0]
+        if tag in ("finalized", "safe"):
+            number = self.block_number(chain) - FINALITY_LAG
+        else:
+            number = self.block_number(chain) if not str(tag).startswith("0x") else int(tag, 16)
+        return self._block(chain, number)
+
+    def rpc_eth_getBlockByHash(self, chain, params):
+        return self._block(chain, int(params[0][-8:], 16))
+
+    def rpc_eth_call(self, chain, params):
+        data = params[0].get("data") or params[0].get("input") or "0x"
+        calldata = bytes.fromhex(data[2:])
+        if (params[0].get("to") or "").lower() == MULTICALL3_ADDRESS and calldata[:4] == AGGREGATE3_SELECTOR:
+            return "0x" + self._aggregate3(chain, calldata).hex()
+        return "0x" + self._call(calldata).hex()
+
+    def _aggregate3(self, chain: str, calldata: bytes) -> bytes:
+        results = []
+        for _, allow_failure, inner in decode_aggregate3_input(calldata):
+            try:
+                if inner == GET_BLOCK_NUMBER_CALLDATA:
+                    results.append((True, encode_uint(self.block_number(chain))))
+                elif inner == GET_TIMESTAMP_CALLDATA:
+                    results.append((True, encode_uint(int(time.time()))))
+                else:
+                    results.append((True, self._call(inner)))
+            except ValueError:
+                if not allow_failure:
+                    raise ValueError("Multicall3: call failed")
+                results.append((False, b""))
+        return encode_aggregate3_output(results)
+
+    def _call(self, calldata: bytes) -> bytes:
+        entry, compiled = self.calls.get(calldata[:4], (None, None))
+        if entry is None:
+            raise ValueError(f"unknown selector 0x{calldata[:4].hex()}")
+        if not entry["outputs"]:
+            return b""
+        canned = self.results.get(entry["name"])
+        if canned is None:
+            raise ValueError(f"no canned result for {entry['name']}")
+        if compiled is None:
+            return canned(calldata)
+        return compiled.encode_output(*canned(compiled.decode_input(calldata)))
+
+    def rpc_eth_sendRawTransaction(self, chain, params):
+        tx_hash = "0x" + keccak256(bytes.fromhex(params[0][2:])).hex()
+        with self._lock:
+            self.sent.setdefault((chain, tx_hash), time.monotonic())
+        return tx_hash
+
+    def rpc_eth_getTransactionReceipt(self, chain, params):
+        tx_hash = params[0]
+        with self._lock:
+            sent = self.sent.get((chain, tx_hash.lower()))
+            if sent is not None and time.monotonic() - sent < self.receipt_delay:
+                return None
+            # Mined one block before it was first asked about, and stays there
+            number = self.mined.setdefault((chain, tx_hash.lower()), self.block_number(chain) - 1)
+        block_hash = self._block_hash(chain, number)
+        log = {
+            "address": "0x6f475642a6e85809b1c36fa62763669b1b48dd5b",
+            "topics": ["0x" + keccak256(b"PacketSent(bytes,bytes,address)").hex()],
+            "data": "0x" + "00" * 160,
+            "blockNumber": hex(number),
+            "blockHash": block_hash,
+            "transactionHash": tx_hash,
+            "transactionIndex": "0x0",
+            "logIndex": "0x0",
+            "removed": False,
+        }
+        return {
+            "transactionHash": tx_hash,
+            "transactionIndex": "0x0",
+            "blockHash": block_hash,
+            "blockNumber": hex(number),
+            "from": "0x" + "11" * 20,
+            "to": "0x" + "22" * 20,
+            "cumulativeGasUsed": hex(120_000),
+            "gasUsed": hex(120_000),
+            "effectiveGasPrice": hex(1_000_000_000),
+            "contractAddress": None,
+            "logs": [log],
+            "logsBloom": "0x" + "00" * 256,
+            "status": hex(self.receipt_status),
+            "type": "0x2",
+        }
+
+    def add_log(self, chain: str, address: str, topics: List[str], data: str, block: Optional[int] = None) -> None:
+        """Serve a log from eth_getLogs (default: in the current head block)"""
+        number = self.block_number(chain) if block is None else block
+        with self._lock:
+            index = len(self.logs[chain])
+            self.logs[chain].append({
+                "address": address.lower(), "topics": topics, "data": data,
+                "blockNumber": hex(number), "blockHash": self._block_hash(chain, number),
+                "transactionHash": "0x" + keccak256(f"{chain}:log:{index}".encode()).hex(),
+                "transactionIndex": "0x0", "logIndex": hex(index), "removed": False,
+            })
+
+    def rpc_eth_getLogs(self, chain, params):
+        query = params[0] if params else {}
+        head = self.block_number(chain)
+        block = lambda tag, default: default if tag in (None, "latest", "finalized", "safe") else int(tag, 16)
+        start, end = block(query.get("fromBlock"), head), block(query.get("toBlock"), head)
+        addresses = query.get("address")
+        if isinstance(addresses, str):
+            addresses = [addresses]
+        addresses = {a.lower() for a in addresses} if addresses else None
+        wanted = query.get("topics") or []
+        matches = []
+        with self._lock:
+            logs = list(self.logs.get(chain, ()))
+        for log in logs:
+            if not start <= int(log["blockNumber"], 16) <= end:
+                continue
+            if addresses is not None and log["address"] not in addresses:
+                continue
+            if all(want is None or log["topics"][i] in (want if isinstance(want, list) else [want])
+                   for i, want in enumerate(wanted) if i < len(log["topics"])):
+                matches.append(log)
+        return sorted(matches, key=lambda log: int(log["blockNumber"], 16))
+
+    def _block_hash(self, chain: str, number: int) -> str:
+        return "0x" + keccak256(f"{chain}:{number}".encode()).hex()[:56] + f"{number:08x}"
+
+    def _block(self, chain: str, number: int) -> Dict[str, Any]:
+        timestamp = int(self.started + (number - 1_000_000) * BLOCK_TIMES.get(chain, 1.0))
+        return {
+            "number": hex(number),
+            "hash": self._block_hash(chain, number),
+            "parentHash": self._block_hash(chain, number - 1),
+            "timestamp": hex(timestamp),
+            "miner": "0x" + "00" * 20,
+            "gasLimit": hex(30_000_000),
+            "gasUsed": hex(1_000_000),
+            "baseFeePerGas": hex(1_000_000_000),
+            "extraData": "0x",
+            "logsBloom": "0x" + "00" * 256,
+            "nonce": "0x0000000000000000",
+            "difficulty": "0x0",
+            "totalDifficulty": "0x0",
+            "size": hex(1_000),
+            "sha3Uncles": "0x" + "00" * 32,
+            "stateRoot": "0x" + "00" * 32,
+            "receiptsRoot": "0x" + "00" * 32,
+            "transactionsRoot": "0x" + "00" * 32,
+            "mixHash": "0x" + "00" * 32,
+            "transactions": [],
+            "uncles": [],
+        }
+
+def use_fake_node(node: FakeNode) -> None:
+    """Point every RPC_URL_<CHAIN> variable at `node`; call before importing dragon_mcp"""
+    for chain in CHAIN_IDS:
+        os.environ[f"RPC_URL_{chain.upper()}"] = node.url(chain)
+
+# Well-known throwaway key (anvil/hardhat account #0) - only ever used against a fake node
+FAKE_PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+
+_shared_node: Optional[FakeNode] = None
+
+def fake_dragon_mcp():
+    """
+    (node, dragon_mcp) for offline tests: one fake node per process.
+
+    The first call points every chain, the signer and a throwaway data
+    directory at the node before dragon_mcp is imported, with configured
+    addresses and lazy startup so nothing runs in the background.
+    """
+    global _shared_node
+    if _shared_node is None:
+        import tempfile
+        node = FakeNode().start()
+        use_fake_node(node)
+        os.environ["PRIVATE_KEY"] = FAKE_PRIVATE_KEY
+        os.environ["DRAGON_MCP_STARTUP"] = "lazy"
+        os.environ["DRAGON_MCP_ADDRESS_SOURCE"] = "config"
+        os.environ["DRAGON_MCP_SIDECAR"] = "off"
+        os.environ["DRAGON_MCP_DATA_DIR"] = tempfile.mkdtemp(prefix="dragon-test-")
+        os.environ.setdefault("REVENUE_DISTRIBUTOR_ADDRESS", fake_address("revenueDistributor"))
+        import dragon_mcp
+        node.register_abis(list(dragon_mcp.CONTRACT_ABIS.values()))
+        dragon_mcp.ensure_web3_stack()
+        dragon_mcp.web3_manager.compile_calls()
+        _shared_node = node
+    import dragon_mcp
+    return _shared_node, dragon_mcp
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local JSON-RPC stand-in for Dragon MCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8545)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-mode", choices=["rpc", "http429"], default="rpc")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests/sec per chain before 429s")
+    args = parser.parse_args()
+
+    from dragon_mcp import CONTRACT_ABIS
+
+    node = FakeNode(
+        list(CONTRACT_ABIS.values()), host=args.host, port=args.port,
+        latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate, error_mode=args.error_mode, rate_limit=args.rate_limit,
+    )
+    print(f"🐉 Dragon fake node on http://{args.host}:{node.port}/<chain>")
+    for chain in CHAIN_IDS:
+        print(f"   RPC_URL_{chain.upper()}={node.url(chain)}")
+    try:
+        node.server.serve_forever()
+    except KeyboardInterrupt:
+        node.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Dragon Fee Flows
+Columnar store and vectorized reports of omniDRAGON fee distributions.
+
+omniDRAGON splits every buy and sell fee between the jackpot vault, the
+veDRAGON revenue distributor and a burn, announcing each part with
+ImmediateDistributionExecuted (jackpot, revenue) or TokensBurned (burn) and
+an EventCategory (BUY_JACKPOT ... SELL_BURN).
+
+FeeIndexer follows those events per chain in a background thread and appends
+them to a FeeStore (a dragon_columns.ColumnStore): one append-only file per
+column (time, block, category, amount) plus a small meta file holding the
+committed row count and the next block to index. Times come from the block
+range's end headers by interpolation and never decrease, so a time range is
+located with searchsorted over a memory-mapped column.
+
+fee_report() groups any selection by (chain, period, category) with a single
+np.bincount, so a multi-month report over every chain costs a few vectorized
+passes over local data and no RPC.
+"""
+
+import os
+import time
+import threading
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+import dragon_metrics
+import dragon_ratelimit
+from dragon_codec import keccak256, decode_uint
+from dragon_columns import ColumnStore
+
+# EventCategory in omniDRAGON.sol, in declaration order
+CATEGORIES = ("buy_jackpot", "buy_revenue", "buy_burn", "sell_jackpot", "sell_revenue", "sell_burn")
+SIDES = ("buy", "sell")
+FLOWS = ("jackpot", "veDRAGON", "burn")
+
+EVENTS = {
+    "distribution": "ImmediateDistributionExecuted(address,uint256,uint8)",
+    "burn": "TokensBurned(uint256,uint8)",
+}
+TOPICS = {name: "0x" + keccak256(signature.encode()).hex() for name, signature in EVENTS.items()}
+
+COLUMNS = {
+    "time": np.dtype("<f8"),      # unix seconds (interpolated within an indexed range)
+    "block": np.dtype("<u8"),
+    "category": np.dtype("u1"),   # index into CATEGORIES
+    "amount": np.dtype("<f8"),    # whole DRAGON (18 decimals)
+}
+
+# Upper bound on periods per report: the grouping arrays grow with it, rows or not
+MAX_PERIODS = 10_000
+
+FEE_EVENTS = dragon_metrics.REGISTRY.register(dragon_metrics.Counter(
+    "dragon_fee_events_total", "omniDRAGON fee distribution events stored", ["chain", "category"]))
+
+# ================================
+# COLUMNAR STORE
+# ================================
+
+class FeeStore(ColumnStore):
+    """Append-only fee event columns for one chain under `directory`"""
+
+    def __init__(self, directory: str, contract: str):
+        super().__init__(directory, contract, COLUMNS)
+
+# ================================
+# REPORTS
+# ================================
+
+def split(fees: Sequence[int]) -> Dict[str, float]:
+    """Configured (jackpot, veDRAGON, burn, total) basis points as shares of the fee"""
+    jackpot, vedragon, burn, total = (int(v) for v in fees)
+    if not total:
+        return {flow: 0.0 for flow in FLOWS}
+    # The contract gives the burn whatever the other two leave
+    return {"jackpot": jackpot / total, "veDRAGON": vedragon / total, "burn": 1 - (jackpot + vedragon) / total}
+
+def _flows(sums: np.ndarray) -> Dict[str, Any]:
+    """Totals by side and flow from per-category sums (..., 6)"""
+    by_side = sums.reshape(sums.shape[:-1] + (2, 3))
+    result: Dict[str, Any] = {flow: round(float(by_side[..., i].sum()), 6) for i, flow in enumerate(FLOWS)}
+    result["total"] = round(float(sums.sum()), 6)
+    for s, side in enumerate(SIDES):
+        result[side] = {flow: round(float(by_side[..., s, i].sum()), 6) for i, flow in enumerate(FLOWS)}
+    return result
+
+def compare(sums: np.ndarray, configured: Dict[str, Sequence[int]]) -> Dict[str, Any]:
+    """Actual flow shares per side against the configured getFees() split"""
+    by_side = sums.reshape(2, 3)
+    result = {}
+    for s, side in enumerate(SIDES):
+        total = float(by_side[s].sum())
+        expected = split(configured[side])
+        entry: Dict[str, Any] = {"distributed": round(total, 6), "configured_bps": dict(zip(
+            FLOWS + ("total",), (int(v) for v in configured[side])))}
+        if total > 0:
+            entry["flows"] = {
+                flow: {
+                    "actual_share": round(float(by_side[s, i]) / total, 6),
+                    "expected_share": round(expected[flow], 6),
+                    "deviation_bps": round((float(by_side[s, i]) / total - expected[flow]) * 10000, 2),
+                }
+                for i, flow in enumerate(FLOWS)
+            }
+        result[side] = entry
+    return result
+
+def fee_report(selections: Dict[str, Dict[str, np.ndarray]], start: float, end: float, interval: float,
+               configured: Optional[Dict[str, Dict[str, Sequence[int]]]] = None) -> Dict[str, Any]:
+    """
+    Fee flows per period and per chain for column selections keyed by chain,
+    compared with each chain's `configured` buy/sell fees where given.
+
+    All selections are grouped at once: every row gets the key
+    (chain, period, category) and np.bincount sums the amounts per key.
+    Raises ValueError unless start < end and the range fits in MAX_PERIODS.
+    """
+    if not end > start or not interval > 0:
+        raise ValueError("start must be before end and interval positive")
+    periods = int(np.ceil((end - start) / interval))
+    if periods > MAX_PERIODS:
+        raise ValueError(f"{periods} periods requested; at most {MAX_PERIODS} are allowed")
+    configured = configured or {}
+    chains = list(selections)
+    width = len(CATEGORIES)
+    keys, weights = [], []
+    for c, chain in enumerate(chains):
+        columns = selections[chain]
+        period = ((columns["time"] - start) // interval).astype(np.int64)
+        np.clip(period, 0, periods - 1, out=period)
+        keys.append((c * periods + period) * width + columns["category"])
+        weights.append(columns["amount"])
+    size = len(chains) * periods * width
+    if keys:
+        key, weight = np.concatenate(keys), np.concatenate(weights)
+        sums = np.bincount(key, weights=weight, minlength=size).reshape(len(chains), periods, width)
+        counts = np.bincount(key, minlength=size).reshape(len(chains), periods, width)
+    else:
+        sums = np.zeros((0, periods, width))
+        counts = np.zeros((0, periods, width), dtype=np.int64)
+
+    all_chains = sums.sum(axis=0) if len(chains) else np.zeros((periods, width))
+    all_counts = counts.sum(axis=(0, 2)) if len(chains) else np.zeros(periods, dtype=np.int64)
+    by_chain = {}
+    for c, chain in enumerate(chains):
+        totals = sums[c].sum(axis=0)
+        by_chain[chain] = dict(_flows(totals), events=int(counts[c].sum()))
+        if chain in configured:
+            by_chain[chain]["vs_configured"] = compare(totals, configured[chain])
+    return {
+        "totals": _flows(all_chains.sum(axis=0)),
+        "chains": by_chain,
+        "periods": [
+            dict(_flows(all_chains[p]), start=start + p * interval, events=int(all_counts[p]))
+            for p in range(periods) if all_counts[p]
+        ],
+    }
+
+# ================================
+# INDEXER
+# ================================
+
+def decode(log: Dict[str, Any]) -> Optional[tuple]:
+    """(category, amount in DRAGON) for a fee event, or None"""
+    topics = log.get("topics") or []
+    if not topics or log.get("removed"):
+        return None
+    amount = decode_uint(bytes.fromhex(log["data"][2:66])) / 1e18
+    if topics[0] == TOPICS["distribution"] and len(topics) > 2:
+        return int(topics[2], 16), amount
+    if topics[0] == TOPICS["burn"] and len(topics) > 1:
+        return int(topics[1], 16), amount
+    return None
+
+class FeeIndexer:
+    """
+    Background follower of omniDRAGON fee events into one FeeStore per chain.
+
+    `manager` is the Web3Manager (request, get_logs, get_block_header,
+    resolve_address). A chain's thread starts on first use, backfills
+    `backfill_seconds` of history (or resumes from the stored cursor) in
+    `max_range`-block steps, then polls at background RPC priority.
+    """
+
+    def __init__(self, manager: Any, directory: str, block_times: Dict[str, float],
+                 poll_interval: float = 30.0, max_range: int = 5000, confirmations: int = 2,
+                 backfill_seconds: float = 90 * 86400):
+        self.manager = manager
+        self.directory = directory
+        self.block_times = block_times
+        self.poll_interval = poll_interval
+        self.max_range = max_range
+        self.confirmations = confirmations
+        self.backfill_seconds = backfill_seconds
+        self.stores: Dict[str, FeeStore] = {}
+        self.status: Dict[str, Dict[str, Any]] = {}
+        self._threads: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def store(self, chain: str) -> FeeStore:
+        with self._lock:
+            store = self.stores.get(chain)
+            if store is None:
+                contract = self.manager.resolve_address(chain, "omnidragon")
+                store = self.stores[chain] = FeeStore(os.path.join(self.directory, chain), contract)
+                self.status[chain] = {"caught_up": False, "head_block": None, "error": None}
+            return store
+
+    def track(self, chain: str) -> None:
+        """Start following `chain` if it is not followed yet"""
+        self.store(chain)
+        with self._lock:
+            thread = self._threads.get(chain)
+            if thread is not None and thread.is_alive():
+                return
+            thread = threading.Thread(target=self._run, args=(chain,), name=f"dragon-fees-{chain}", daemon=True)
+            self._threads[chain] = thread
+            thread.start()
+
+    def _run(self, chain: str) -> None:
+        with dragon_ratelimit.priority(dragon_ratelimit.BACKGROUND):
+            while True:
+                try:
+                    caught_up = self.poll(chain)
+                    self.status[chain]["error"] = None
+                except Exception as e:
+                    self.status[chain]["error"] = f"{type(e).__name__}: {e}"[:300]
+                    caught_up = True
+                if caught_up:
+                    time.sleep(self.poll_interval)
+
+    def poll(self, chain: str) -> bool:
+        """Store the next block range; True once caught up with the head"""
+        store = self.store(chain)
+        head = int(self.manager.request(chain, "eth_blockNumber", []), 16) - self.confirmations
+        self.status[chain]["head_block"] = head
+        start = store.next_block
+        if start is None:
+            start = max(0, head - int(self.backfill_seconds / self.block_times.get(chain, 1.0)))
+        if start > head:
+            self.status[chain]["caught_up"] = True
+            return True
+        end = min(head, start + self.max_range - 1)
+        logs = self.manager.get_logs(chain, {
+            "address": self.manager.resolve_address(chain, "omnidragon"),
+            "topics": [list(TOPICS.values())], "fromBlock": start, "toBlock": end})
+        rows = [(int(log["blockNumber"], 16), *event) for log in logs
+                if (event := decode(log)) is not None and event[0] < len(CATEGORIES)]
+        rows.sort(key=lambda row: row[0])
+        columns = {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+        if rows:
+            blocks = np.array([row[0] for row in rows], dtype=np.uint64)
+            clock = self._clock(chain, start, end)
+            columns = {
+                "time": clock(blocks.astype(np.float64)),
+                "block": blocks,
+                "category": np.array([row[1] for row in rows], dtype=np.uint8),
+                "amount": np.array([row[2] for row in rows], dtype=np.float64),
+            }
+            for category in columns["category"]:
+                FEE_EVENTS.inc(chain, CATEGORIES[category])
+        store.append(columns, end + 1)
+        self.status[chain]["caught_up"] = end >= head
+        return end >= head
+
+    def _clock(self, chain: str, start: int, end: int) -> Callable[[np.ndarray], np.ndarray]:
+        """Block numbers -> timestamps, interpolated between the range's end headers"""
+        first = int(self.manager.get_block_header(chain, start)["timestamp"], 16)
+        if end == start:
+            return lambda blocks: np.full(len(blocks), float(first))
+        last = int(self.manager.get_block_header(chain, end)["timestamp"], 16)
+        rate = (last - first) / (end - start)
+        return lambda blocks: first + (blocks - start) * rate
+
+    def coverage(self, chain: str) -> Dict[str, Any]:
+        """Stored rows and indexing progress for `chain`"""
+        store = self.store(chain)
+        columns = store.columns()
+        report = dict(self.status[chain], rows=store.rows, next_block=store.next_block)
+        if store.rows:
+            report["first_event_time"] = float(columns["time"][0])
+            report["last_event_time"] = float(columns["time"][-1])
+        return report
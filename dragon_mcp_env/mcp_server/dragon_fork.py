@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Dragon Fork Simulation
+Local EVM (py-evm) execution against chain state fetched on demand.
+
+A Fork pins one chain block. Contract calls run in py-evm; every account
+and storage slot the EVM touches is fetched from the node once, kept in
+memory for the life of the fork, and (for finalized blocks) stored in the
+shared chain cache so later processes skip the RPC too. After the first
+run of a call, repeat runs with different arguments or state overrides are
+pure local CPU work.
+
+Each run executes inside a snapshot that is reverted afterwards, so writes
+and overrides never leak into the next run. Untouched state shows through
+from the fork source at read time instead of being copied into py-evm's
+tries, which is what makes the revert safe.
+
+State overrides use the eth_call stateOverride shape:
+
+    {"0xtoken": {"balance": 0, "nonce": 1, "code": "0x...", "stateDiff": {"0x0": "0x1"}}}
+
+Requires py-evm (`pip install py-evm`).
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import rlp
+from eth_utils import keccak, to_canonical_address, big_endian_to_int, int_to_big_endian
+from eth.constants import BLANK_ROOT_HASH
+from eth.db.account import AccountDB
+from eth.db.atomic import AtomicDB
+from eth.exceptions import VMError
+from eth.rlp.accounts import Account
+from eth.vm.execution_context import ExecutionContext
+from eth.vm.forks.cancun.state import CancunState
+from eth.vm.message import Message
+
+DEFAULT_GAS = 30_000_000
+
+ERROR_SELECTOR = bytes.fromhex("08c379a0")  # Error(string)
+PANIC_SELECTOR = bytes.fromhex("4e487b71")  # Panic(uint256)
+
+# OpenZeppelin 5 ERC20 namespaced storage (ERC-7201 "openzeppelin.storage.ERC20")
+OZ5_ERC20_STORAGE = 0x52c63247e1f47db19d5ce0460030c497f067ca4cebf71ba98eeadabe20bace00
+
+def _int(value: Any) -> int:
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+def _word(value: int) -> bytes:
+    return int(value).to_bytes(32, "big")
+
+def revert_reason(output: bytes) -> Optional[str]:
+    """Decoded Error(string) or Panic(uint256) revert data, else None"""
+    if output[:4] == ERROR_SELECTOR and len(output) >= 68:
+        length = big_endian_to_int(output[36:68])
+        return output[68:68 + length].decode(errors="replace")
+    if output[:4] == PANIC_SELECTOR and len(output) >= 36:
+        return f"Panic(0x{big_endian_to_int(output[4:36]):02x})"
+    return None
+
+class ForkSource:
+    """Accounts and storage at one block, fetched once through Web3Manager"""
+
+    def __init__(self, manager: Any, chain: str, block: int):
+        self.manager = manager
+        self.chain = chain
+        self.block = block
+        self.accounts: Dict[bytes, Tuple[bytes, bytes]] = {}
+        self.storage: Dict[Tuple[bytes, int], int] = {}
+        self.fetches = {"accounts": 0, "slots": 0}
+        self._lock = threading.Lock()
+
+    def account(self, address: bytes) -> Tuple[bytes, bytes]:
+        """(RLP-encoded account, code); b"" for an empty account"""
+        cached = self.accounts.get(address)
+        if cached is None:
+            state = self.manager.get_account_state(self.chain, "0x" + address.hex(), self.block)
+            code = bytes.fromhex(state["code"][2:])
+            nonce, balance = _int(state["nonce"]), _int(state["balance"])
+            encoded = b""
+            if nonce or balance or code:
+                encoded = rlp.encode(Account(nonce, balance, BLANK_ROOT_HASH, keccak(code)), sedes=Account)
+            cached = (encoded, code)
+            with self._lock:
+                self.accounts[address] = cached
+                self.fetches["accounts"] += 1
+        return cached
+
+    def slot(self, address: bytes, slot: int) -> int:
+        value = self.storage.get((address, slot))
+        if value is None:
+            value = self.manager.get_storage_at(self.chain, "0x" + address.hex(), slot, self.block)
+            with self._lock:
+                self.storage[(address, slot)] = value
+                self.fetches["slots"] += 1
+        return value
+
+class ForkAccountDB(AccountDB):
+    """AccountDB whose untouched accounts and slots come from a ForkSource"""
+
+    source: ForkSource = None
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._code_loaded = set()
+
+    def _get_encoded_account(self, address: bytes, from_journal: bool = True) -> bytes:
+        encoded = super()._get_encoded_account(address, from_journal)
+        if encoded:
+            return encoded
+        encoded, code = self.source.account(address)
+        if code and address not in self._code_loaded:
+            # Code is keyed by hash, so it can live below the journal for good
+            self._raw_store_db[keccak(code)] = code
+            self._code_loaded.add(address)
+        return encoded
+
+    def get_storage(self, address: bytes, slot: int, from_journal: bool = True) -> int:
+        store = self._get_address_store(address)
+        key = int_to_big_endian(slot)
+        layers = (store._journal_storage, store._locked_changes) if from_journal else (store._locked_changes,)
+        for layer in layers:
+            # Only values written during this run live in the journals; the
+            # trie below them reads empty for every slot
+            written = layer._journal[key]
+            if written is None:
+                continue
+            if not isinstance(written, bytes) or not written:
+                return 0  # Deleted or wiped
+            return rlp.decode(written, sedes=rlp.sedes.big_endian_int)
+        return self.source.slot(address, slot)
+
+    def set_storage(self, address: bytes, slot: int, value: int) -> None:
+        super().set_storage(address, slot, value)
+        if not value:
+            # py-evm drops zero writes to slots it sees as empty; record the zero so the fork value stays hidden
+            self._get_address_store(address)._journal_storage[int_to_big_endian(slot)] = b""
+
+class CallResult:
+    """Outcome of one simulated call"""
+
+    __slots__ = ("success", "output", "gas_used", "logs", "error", "seconds")
+
+    def __init__(self, success: bool, output: bytes, gas_used: int, logs: List[Tuple[bytes, List[int], bytes]],
+                 error: Optional[str], seconds: float):
+        self.success = success
+        self.output = output
+        self.gas_used = gas_used
+        self.logs = logs
+        self.error = error
+        self.seconds = seconds
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "success": self.success,
+            "output": "0x" + self.output.hex(),
+            "gas_used": self.gas_used,
+            "logs": [{"address": "0x" + address.hex(), "topics": [hex(t) for t in topics]}
+                     for address, topics, _ in self.logs],
+            "error": self.error,
+            "seconds": round(self.seconds, 6),
+        }
+
+class Fork:
+    """py-evm state forked from `chain` at `block`"""
+
+    def __init__(self, manager: Any, chain: str, block: int, chain_id: int):
+        self.chain = chain
+        self.block = block
+        self.source = ForkSource(manager, chain, block)
+        header = manager.get_block_header(chain, block)
+        if header is None:
+            raise ValueError(f"Block {block} not found on {chain}")
+        context = ExecutionContext(
+            coinbase=to_canonical_address(header["miner"]),
+            timestamp=_int(header["timestamp"]),
+            block_number=block,
+            difficulty=_int(header.get("difficulty") or 0),
+            mix_hash=bytes.fromhex((header.get("mixHash") or "0x" + "00" * 32)[2:]),
+            gas_limit=max(_int(header["gasLimit"]), DEFAULT_GAS),
+            prev_hashes=[bytes.fromhex(header["parentHash"][2:])],
+            chain_id=chain_id,
+            base_fee_per_gas=_int(header.get("baseFeePerGas") or 0),
+            excess_blob_gas=_int(header.get("excessBlobGas") or 0),
+        )
+        account_db = type("ForkAccountDB", (ForkAccountDB,), {"source": self.source})
+        state_class = type("ForkState", (CancunState,), {"account_db_class": account_db})
+        self.state = state_class(AtomicDB(), context, BLANK_ROOT_HASH)
+        self.runs = 0
+        self.balance_layouts: Dict[str, Optional[Tuple[str, int]]] = {}
+        self._lock = threading.Lock()
+
+    def call(self, to: str, data: bytes, sender: Optional[str] = None, value: int = 0,
+             overrides: Optional[Dict[str, Dict[str, Any]]] = None, gas: int = DEFAULT_GAS) -> CallResult:
+        """Execute a call on top of the fork; all state changes are discarded afterwards"""
+        target = to_canonical_address(to)
+        origin = to_canonical_address(sender) if sender else b"\0" * 20
+        with self._lock:
+            started = time.perf_counter()
+            snapshot = self.state.snapshot()
+            try:
+                self._apply_overrides(overrides or {})
+                for address in (origin, target, *(bytes(19) + bytes([i]) for i in range(1, 11))):
+                    self.state.mark_address_warm(address)
+                message = Message(gas=gas, to=target, sender=origin, value=value, data=data,
+                                  code=self.state.get_code(target))
+                context = self.state.get_transaction_context_class()(gas_price=0, origin=origin)
+                try:
+                    computation = self.state.computation_class.apply_message(self.state, message, context)
+                except VMError as e:
+                    return CallResult(False, b"", 0, [], str(e), time.perf_counter() - started)
+                error = None
+                if computation.is_error:
+                    error = revert_reason(computation.output) or repr(computation.error)
+                return CallResult(
+                    computation.is_success, computation.output, computation.get_gas_used(),
+                    [(address, list(topics), data) for address, topics, data in computation.get_log_entries()],
+                    error, time.perf_counter() - started)
+            finally:
+                self.state.revert(snapshot)
+                self.state.clear_transient_storage()
+                self.runs += 1
+
+    def _apply_overrides(self, overrides: Dict[str, Dict[str, Any]]) -> None:
+        for address, fields in overrides.items():
+            canonical = to_canonical_address(address)
+            if "balance" in fields:
+                self.state.set_balance(canonical, _int(fields["balance"]))
+            if "nonce" in fields:
+                self.state.set_nonce(canonical, _int(fields["nonce"]))
+            if "code" in fields:
+                self.state.set_code(canonical, bytes.fromhex(fields["code"][2:]))
+            for slot, value in (fields.get("stateDiff") or {}).items():
+                self.state.set_storage(canonical, _int(slot), _int(value))
+
+    # ================================
+    # ERC-20 BALANCE OVERRIDES
+    # ================================
+
+    @staticmethod
+    def _mapping_slot(layout: Tuple[str, int], holder: str) -> int:
+        kind, base = layout
+        key = _word(int(holder, 16))
+        parts = key + _word(base) if kind == "solidity" else _word(base) + key
+        return big_endian_to_int(keccak(parts))
+
+    def _uint_view(self, token: str, selector: bytes, args: bytes = b"",
+                   overrides: Optional[Dict[str, Dict[str, Any]]] = None) -> Optional[int]:
+        result = self.call(token, selector + args, overrides=overrides)
+        return big_endian_to_int(result.output[:32]) if result.success and len(result.output) >= 32 else None
+
+    def balance_layout(self, token: str, holder: str) -> Optional[Tuple[str, int]]:
+        """
+        Storage layout of `token`'s balance mapping, found by writing a
+        sentinel to candidate slots until balanceOf returns it: Solidity and
+        Vyper mappings at slots 0-31, and OpenZeppelin 5 namespaced storage.
+        None when balanceOf is not a plain mapping read.
+        """
+        token = token.lower()
+        if token not in self.balance_layouts:
+            selector, args = keccak(b"balanceOf(address)")[:4], _word(int(holder, 16))
+            sentinel = 0x5E7_1E7_1E7
+            found = None
+            candidates = [("solidity", OZ5_ERC20_STORAGE)]
+            candidates += [(kind, base) for base in range(32) for kind in ("solidity", "vyper")]
+            for layout in candidates:
+                slot = self._mapping_slot(layout, holder)
+                override = {token: {"stateDiff": {hex(slot): sentinel}}}
+                if self._uint_view(token, selector, args, override) == sentinel:
+                    found = layout
+                    break
+            self.balance_layouts[token] = found
+        return self.balance_layouts[token]
+
+    def balance_override(self, token: str, holder: str, amount: int,
+                         adjust_supply: bool = True) -> Tuple[Dict[str, Any], bool]:
+        """
+        stateDiff setting `holder`'s balance of `token` to `amount`, and
+        whether totalSupply was moved by the same difference (OpenZeppelin
+        layouts keep it two slots after the balance mapping)
+        """
+        layout = self.balance_layout(token, holder)
+        if layout is None:
+            raise ValueError(f"Could not locate the balance mapping of {token}; pass raw stateDiff overrides instead")
+        diff = {hex(self._mapping_slot(layout, holder)): amount}
+        supply_adjusted = False
+        if adjust_supply and layout[0] == "solidity":
+            supply_selector = keccak(b"totalSupply()")[:4]
+            supply = self._uint_view(token, supply_selector)
+            balance = self._uint_view(token, keccak(b"balanceOf(address)")[:4], _word(int(holder, 16)))
+            supply_slot = layout[1] + 2
+            probe = {token: {"stateDiff": {hex(supply_slot): supply + 1}}} if supply is not None else None
+            if probe and balance is not None and self._uint_view(token, supply_selector, overrides=probe) == supply + 1:
+                diff[hex(supply_slot)] = max(0, supply - balance + amount)
+                supply_adjusted = True
+        return {token.lower(): {"stateDiff": diff}}, supply_adjusted
+
+    def stats(self) -> Dict[str, Any]:
+        return {"chain": self.chain, "block": self.block, "runs": self.runs,
+                "accounts_cached": len(self.source.accounts), "slots_cached": len(self.source.storage),
+                "rpc_fetches": dict(self.source.fetches)}
+
+def merge_overrides(*layers: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Combine stateOverride dicts; later layers win, stateDiffs are merged per slot"""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for layer in layers:
+        for address, fields in (layer or {}).items():
+            entry = merged.setdefault(address.lower(), {})
+            for name, value in fields.items():
+                if name == "stateDiff":
+                    entry.setdefault("stateDiff", {}).update(value)
+                else:
+                    entry[name] = value
+    return merged
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Dragon Price History
+Per-chain oracle price history in memory-mapped NumPy ring buffers.
+
+Each chain has one file of fixed-width records (sample time, block, price,
+oracle timestamp, validity, source) behind a small header holding the
+capacity and the number of records ever written. The file is opened with
+np.memmap, so a restart maps it back instantly instead of reloading samples,
+and once full the oldest samples are overwritten in place.
+
+Queries never copy the whole buffer: the ring is viewed as at most two
+chronological segments, ranges are located with searchsorted on the sample
+times, and OHLC bars and rolling statistics are computed with vectorized
+NumPy operations over the selected slice.
+"""
+
+import os
+import time
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+MAGIC = b"DRGNHIST"
+VERSION = 1
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("record_size", "<u4"),
+    ("capacity", "<u8"),
+    ("written", "<u8"),
+    ("reserved", "V32"),
+])
+
+RECORD_DTYPE = np.dtype([
+    ("time", "<f8"),        # unix seconds the sample was taken
+    ("block", "<u8"),       # block number the price was read at (0 = latest, unknown)
+    ("price", "<f8"),       # USD
+    ("oracle_time", "<i8"), # timestamp reported by the oracle
+    ("valid", "u1"),
+    ("source", "u1"),
+], align=True)
+
+SOURCES = ("unknown", "primary_oracle", "secondary_oracle")
+
+def source_code(source: str) -> int:
+    if source.startswith("secondary_oracle"):
+        return 2
+    return SOURCES.index(source) if source in SOURCES else 0
+
+class PriceHistory:
+    """Ring buffer of price samples for one chain, persisted to `path`"""
+
+    def __init__(self, path: str, capacity: int = 1 << 20):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER_DTYPE.itemsize:
+            header = np.memmap(path, dtype=HEADER_DTYPE, mode="r+", shape=(1,))
+            if (header["magic"][0] != MAGIC or header["version"][0] != VERSION
+                    or header["record_size"][0] != RECORD_DTYPE.itemsize):
+                raise ValueError(f"{path} is not a version {VERSION} price history file")
+            capacity = int(header["capacity"][0])
+        else:
+            with open(path, "wb") as f:
+                f.truncate(HEADER_DTYPE.itemsize + capacity * RECORD_DTYPE.itemsize)
+            header = np.memmap(path, dtype=HEADER_DTYPE, mode="r+", shape=(1,))
+            header["magic"] = MAGIC
+            header["version"] = VERSION
+            header["record_size"] = RECORD_DTYPE.itemsize
+            header["capacity"] = capacity
+            header["written"] = 0
+            header.flush()
+
+        self.capacity = capacity
+        self._header = header
+        self._records = np.memmap(path, dtype=RECORD_DTYPE, mode="r+",
+                                  offset=HEADER_DTYPE.itemsize, shape=(capacity,))
+
+    @property
+    def written(self) -> int:
+        return int(self._header["written"][0])
+
+    def __len__(self) -> int:
+        return min(self.written, self.capacity)
+
+    def append(self, price: float, valid: bool, oracle_time: int, source: str,
+               block: int = 0, sample_time: Optional[float] = None) -> None:
+        with self._lock:
+            written = self.written
+            now = time.time() if sample_time is None else sample_time
+            if written:
+                # Keep sample times non-decreasing so range queries can binary search
+                now = max(now, float(self._records[(written - 1) % self.capacity]["time"]))
+            self._records[written % self.capacity] = (now, block, price, oracle_time, valid, source_code(source))
+            self._header["written"] = written + 1
+
+    def flush(self) -> None:
+        self._records.flush()
+        self._header.flush()
+
+    def _segments(self) -> List[np.ndarray]:
+        """Record views in chronological order (one, or two once the ring has wrapped)"""
+        written = self.written
+        if written <= self.capacity:
+            return [self._records[:written]]
+        head = written % self.capacity
+        return [self._records[head:], self._records[:head]]
+
+    def range(self, start: Optional[float] = None, end: Optional[float] = None) -> np.ndarray:
+        """Records with start <= time <= end as one array (copies only the selection)"""
+        parts = []
+        for segment in self._segments():
+            times = segment["time"]
+            lo = 0 if start is None else int(np.searchsorted(times, start, side="left"))
+            hi = len(segment) if end is None else int(np.searchsorted(times, end, side="right"))
+            if hi > lo:
+                parts.append(segment[lo:hi])
+        if not parts:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.concatenate(parts) if len(parts) > 1 else np.array(parts[0])
+
+def load(path: str) -> np.ndarray:
+    """Every record of a history file in chronological order, mapped read-only"""
+    header = np.memmap(path, dtype=HEADER_DTYPE, mode="r", shape=(1,))
+    if (header["magic"][0] != MAGIC or header["version"][0] != VERSION
+            or header["record_size"][0] != RECORD_DTYPE.itemsize):
+        raise ValueError(f"{path} is not a version {VERSION} price history file")
+    capacity, written = int(header["capacity"][0]), int(header["written"][0])
+    records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_DTYPE.itemsize, shape=(capacity,))
+    if written <= capacity:
+        return records[:written]
+    head = written % capacity
+    return np.concatenate([records[head:], records[:head]])
+
+def ohlc(records: np.ndarray, interval: float) -> List[Dict[str, Any]]:
+    """Open/high/low/close bars of valid prices per `interval` seconds"""
+    records = records[records["valid"] == 1]
+    if not len(records):
+        return []
+    prices = records["price"]
+    buckets = np.floor(records["time"] / interval).astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(records)] - 1
+    highs = np.maximum.reduceat(prices, starts)
+    lows = np.minimum.reduceat(prices, starts)
+    return [
+        {
+            "start": int(buckets[s] * interval),
+            "open": float(prices[s]),
+            "high": float(h),
+            "low": float(l),
+            "close": float(prices[e]),
+            "samples": int(e - s + 1),
+        }
+        for s, e, h, l in zip(starts, ends, highs, lows)
+    ]
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over `window` samples (shorter at the start)"""
+    sums = np.cumsum(values)
+    sums[window:] = sums[window:] - sums[:-window]
+    counts = np.minimum(np.arange(1, len(values) + 1), window)
+    return sums / counts
+
+def statistics(records: np.ndarray, window: int = 20, stale_after: float = 3600) -> Dict[str, Any]:
+    """Price, rolling deviation, volatility and staleness statistics for a selection"""
+    if not len(records):
+        return {"samples": 0}
+    valid = records[records["valid"] == 1]
+    stats: Dict[str, Any] = {
+        "samples": int(len(records)),
+        "valid_samples": int(len(valid)),
+        "invalid_ratio": round(1 - len(valid) / len(records), 6),
+        "first_time": float(records["time"][0]),
+        "last_time": float(records["time"][-1]),
+    }
+    if not len(valid):
+        return stats
+
+    prices = valid["price"]
+    window = max(1, min(window, len(prices)))
+    mean = _rolling_mean(prices, window)
+    deviation = np.divide(prices - mean, mean, out=np.zeros_like(prices), where=mean != 0) * 100
+    positive = prices[prices > 0]
+    returns = np.diff(np.log(positive)) if len(positive) > 1 else np.empty(0)
+    staleness = valid["time"] - valid["oracle_time"]
+
+    stats.update({
+        "price": {
+            "last": float(prices[-1]),
+            "min": float(prices.min()),
+            "max": float(prices.max()),
+            "mean": float(prices.mean()),
+            "std": float(prices.std()),
+        },
+        "rolling_deviation": {
+            "window": window,
+            "current_percent": float(deviation[-1]),
+            "max_abs_percent": float(np.abs(deviation).max()),
+            "rolling_std_last": float(prices[-window:].std()),
+        },
+        "volatility": {
+            "log_return_std": float(returns.std()) if len(returns) else 0.0,
+            "max_abs_log_return": float(np.abs(returns).max()) if len(returns) else 0.0,
+        },
+        "staleness_seconds": {
+            "last": float(staleness[-1]),
+            "mean": float(staleness.mean()),
+            "p95": float(np.percentile(staleness, 95)),
+            "max": float(staleness.max()),
+            "stale_ratio": round(float((staleness > stale_after).mean()), 6),
+        },
+    })
+    return stats
+
+def samples(records: np.ndarray, limit: int) -> List[Dict[str, Any]]:
+    """The last `limit` records as dicts"""
+    if limit <= 0:
+        return []
+    return [
+        {
+            "time": float(r["time"]),
+            "block": int(r["block"]),
+            "price_usd": float(r["price"]),
+            "oracle_timestamp": int(r["oracle_time"]),
+            "is_valid": bool(r["valid"]),
+            "source": SOURCES[r["source"]] if r["source"] < len(SOURCES) else "unknown",
+        }
+        for r in records[-limit:]
+    ]
+
+class HistoryStore:
+    """Lazily opened PriceHistory per chain under `directory`"""
+
+    def __init__(self, directory: str, capacity: int = 1 << 20):
+        self.directory = directory
+        self.capacity = capacity
+        self._chains: Dict[str, PriceHistory] = {}
+        self._lock = threading.Lock()
+
+    def chain(self, chain: str) -> PriceHistory:
+        if not chain or os.sep in chain or (os.altsep and os.altsep in chain) or chain in (".", ".."):
+            raise ValueError(f"Invalid chain name: {chain!r}")
+        with self._lock:
+            history = self._chains.get(chain)
+            if history is None:
+                history = PriceHistory(os.path.join(self.directory, f"{chain}.prices"), self.capacity)
+                self._chains[chain] = history
+            return history
+
+    def flush(self) -> None:
+        with self._lock:
+            for history in self._chains.values():
+                history.flush()
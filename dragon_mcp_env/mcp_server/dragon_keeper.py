@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Dragon Oracle Keeper
+Background scheduler for oracle updatePrice transactions.
+
+One watcher thread checks every configured chain each interval (with
+jitter, so several servers do not poll in lockstep). A check is one oracle
+snapshot: how far the live sources' weighted average is from the stored
+price, how old the stored price is, and isFresh(). An update is scheduled
+when the deviation or the age crosses its threshold, or the oracle reports
+itself stale, unless:
+- an update for that chain is already in flight (the trigger is coalesced
+  into it),
+- the chain is cooling down after an update or backing off after failures,
+- the circuit breaker or emergency mode is on, or the update would trip the
+  breaker (updatePrice would not move the price),
+- the gas price is above the chain's ceiling.
+
+Updates run in their own threads so a slow confirmation on one chain does
+not delay checks on the others. Failures back off exponentially with
+jitter. In dry-run mode every decision is recorded but nothing is sent.
+
+The check, gas price and update are callables supplied by the server, so
+the hosted server can route updates through its write queue.
+"""
+
+import time
+import random
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+import dragon_metrics
+import dragon_ratelimit
+
+KEEPER_CHECKS = dragon_metrics.REGISTRY.register(dragon_metrics.Counter(
+    "dragon_keeper_checks_total", "Oracle keeper checks by decision", ["chain", "decision"]))
+KEEPER_UPDATES = dragon_metrics.REGISTRY.register(dragon_metrics.Counter(
+    "dragon_keeper_updates_total", "Oracle updates sent by the keeper by outcome", ["chain", "outcome"]))
+
+class ChainState:
+    """Scheduling state and recent decisions for one chain"""
+
+    def __init__(self, history: int = 50):
+        self.inflight = False
+        self.last_update: Optional[float] = None
+        self.next_attempt = 0.0
+        self.failures = 0
+        self.coalesced = 0
+        self.last_check: Optional[Dict[str, Any]] = None
+        self.decisions: deque = deque(maxlen=history)
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        report = {
+            "inflight": self.inflight,
+            "last_update": self.last_update,
+            "consecutive_failures": self.failures,
+            "coalesced_triggers": self.coalesced,
+            "last_check": self.last_check,
+            "recent_decisions": list(self.decisions),
+        }
+        if self.next_attempt > now:
+            report["next_attempt_in_seconds"] = round(self.next_attempt - now, 1)
+        return report
+
+class Keeper:
+    """
+    Deviation- and staleness-triggered oracle updates.
+
+    `check(chain)` returns a dict with deviation_bps, age_seconds, is_fresh,
+    circuit_breaker_active, emergency_mode and would_trip_breaker.
+    `gas_price(chain)` returns gwei; `update(chain)` sends updatePrice and
+    returns the tool-style result ({"success": True, ...} or {"error": ...}).
+    """
+
+    def __init__(self, check: Callable[[str], Dict[str, Any]], gas_price: Callable[[str], float],
+                 update: Callable[[str], Dict[str, Any]], chains: List[str], interval: float = 30.0,
+                 jitter: float = 0.2, deviation_bps: float = 100.0, stale_seconds: float = 3000.0,
+                 max_gas_gwei: Optional[Callable[[str], float]] = None, min_interval: float = 60.0,
+                 backoff: float = 30.0, max_backoff: float = 900.0, dry_run: bool = False):
+        self.check = check
+        self.gas_price = gas_price
+        self.update = update
+        self.chains = list(chains)
+        self.interval = interval
+        self.jitter = jitter
+        self.deviation_bps = deviation_bps
+        self.stale_seconds = stale_seconds
+        self.max_gas_gwei = max_gas_gwei or (lambda chain: 0.0)
+        self.min_interval = min_interval
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.dry_run = dry_run
+        self.states: Dict[str, ChainState] = {chain: ChainState() for chain in self.chains}
+        self._lock = threading.Lock()
+        self._random = random.Random()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the watcher thread (once)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="dragon-keeper", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        with dragon_ratelimit.priority(dragon_ratelimit.BACKGROUND):
+            while True:
+                for chain in self.chains:
+                    self.tick(chain)
+                time.sleep(self.interval * (1 + self._random.uniform(-self.jitter, self.jitter)))
+
+    def _record(self, chain: str, decision: str, reason: str, now: float) -> str:
+        self.states[chain].decisions.append({"time": round(now, 3), "decision": decision, "reason": reason})
+        KEEPER_CHECKS.inc(chain, decision)
+        return decision
+
+    def triggers(self, snapshot: Dict[str, Any]) -> List[str]:
+        """Thresholds the snapshot crosses"""
+        reasons = []
+        deviation = snapshot.get("deviation_bps")
+        if deviation is not None and abs(deviation) >= self.deviation_bps:
+            reasons.append(f"deviation {abs(deviation):.1f} bps >= {self.deviation_bps:g}")
+        age = snapshot.get("age_seconds")
+        if age is not None and age >= self.stale_seconds:
+            reasons.append(f"price age {age:.0f}s >= {self.stale_seconds:g}s")
+        if snapshot.get("is_fresh") is False:
+            reasons.append("isFresh() is false")
+        return reasons
+
+    def tick(self, chain: str, now: Optional[float] = None) -> str:
+        """Check one chain and schedule an update if needed; returns the decision"""
+        now = time.time() if now is None else now
+        state = self.states[chain]
+        try:
+            snapshot = self.check(chain)
+        except Exception as e:
+            return self._record(chain, "check_failed", f"{type(e).__name__}: {e}"[:300], now)
+        state.last_check = dict(snapshot, checked_at=round(now, 3))
+
+        reasons = self.triggers(snapshot)
+        if not reasons:
+            return self._record(chain, "ok", "within thresholds", now)
+        reason = "; ".join(reasons)
+        with self._lock:
+            if state.inflight:
+                state.coalesced += 1
+                return self._record(chain, "coalesced", f"{reason} (update already in flight)", now)
+        if snapshot.get("emergency_mode"):
+            return self._record(chain, "blocked", f"{reason}; emergency mode is on", now)
+        if snapshot.get("circuit_breaker_active"):
+            return self._record(chain, "blocked", f"{reason}; circuit breaker is active", now)
+        if snapshot.get("would_trip_breaker"):
+            return self._record(chain, "blocked", f"{reason}; update would trip the circuit breaker", now)
+        if now < state.next_attempt:
+            waiting = "backing off" if state.failures else "cooling down"
+            return self._record(chain, "deferred", f"{reason}; {waiting} for {state.next_attempt - now:.0f}s", now)
+
+        ceiling = self.max_gas_gwei(chain)
+        if ceiling > 0:
+            try:
+                gwei = self.gas_price(chain)
+            except Exception as e:
+                return self._record(chain, "check_failed", f"gas price: {type(e).__name__}: {e}"[:300], now)
+            if gwei > ceiling:
+                return self._record(chain, "gas_too_high", f"{reason}; gas {gwei:.2f} gwei > {ceiling:g}", now)
+
+        if self.dry_run:
+            # Pace dry runs like real updates so the log shows what would be sent
+            state.next_attempt = now + self.min_interval
+            return self._record(chain, "would_update", reason, now)
+
+        with self._lock:
+            if state.inflight:
+                state.coalesced += 1
+                return self._record(chain, "coalesced", f"{reason} (update already in flight)", now)
+            state.inflight = True
+        # Recorded first so the update's own outcome always follows it in the log
+        decision = self._record(chain, "update", reason, now)
+        threading.Thread(target=self._send, args=(chain,), name=f"dragon-keeper-{chain}", daemon=True).start()
+        return decision
+
+    def _send(self, chain: str) -> None:
+        state = self.states[chain]
+        try:
+            try:
+                result = self.update(chain)
+            except Exception as e:
+                result = {"error": f"{type(e).__name__}: {e}"}
+            now = time.time()
+            if result.get("success"):
+                state.failures = 0
+                state.last_update = now
+                state.next_attempt = now + self.min_interval
+                KEEPER_UPDATES.inc(chain, "success")
+                detail = result.get("tx_hash", "")
+            else:
+                state.failures += 1
+                delay = min(self.max_backoff, self.backoff * 2 ** (state.failures - 1))
+                state.next_attempt = now + delay * self._random.uniform(0.5, 1.0)
+                KEEPER_UPDATES.inc(chain, "failed")
+                detail = str(result.get("error", "update did not succeed"))[:300]
+            state.decisions.append({"time": round(now, 3), "decision": "sent" if result.get("success") else "failed",
+                                    "reason": detail})
+        finally:
+            with self._lock:
+                state.inflight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "mode": "dry-run" if self.dry_run else "on",
+            "running": self._thread is not None and self._thread.is_alive(),
+            "interval_seconds": self.interval,
+            "deviation_bps": self.deviation_bps,
+            "stale_seconds": self.stale_seconds,
+            "chains": {chain: dict(state.snapshot(now), max_gas_gwei=self.max_gas_gwei(chain) or None)
+                       for chain, state in self.states.items()},
+        }
@@ -7,12 +7,22 @@ Author: 0xakita.eth
 """
 
 import os
+import sys
 import json
+import math
+import time
+import atexit
 import asyncio
-from typing import Any, Dict, List, Optional, Union
+import inspect
+import functools
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
+from collections import OrderedDict
 from dataclasses import dataclass
 from decimal import Decimal
 
+_MODULE_IMPORT_STARTED = time.perf_counter()
+
 # Load environment variables from .env file
 try:
     from dotenv import load_dotenv
@@ -21,40 +31,225 @@ except ImportError:
     pass  # dotenv is optional
 
 try:
-    import httpx
+    # MCP SDK imports - needed up front to answer initialize/tools/list
+    from mcp.server.fastmcp import FastMCP
+
+    MCP_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️  Missing dependencies: {e}")
+    print("📦 Install with: pip install 'mcp[cli]' web3 httpx")
+    MCP_AVAILABLE = False
+
+if not MCP_AVAILABLE:
+    exit(1)
+
+import dragon_metrics
+import dragon_tracing
+import dragon_replay
+import dragon_resilience
+import dragon_ratelimit
+import dragon_registry
+import dragon_chaincache
+import dragon_sidecar
+import dragon_vrf
+import dragon_activity
+import dragon_keeper
+import dragon_revenue
+import dragon_snapshot
+from dragon_codec import (
+    CompiledCall, compile_abi, MULTICALL3_ADDRESS, GET_BLOCK_NUMBER_CALLDATA,
+    encode_aggregate3, decode_aggregate3, decode_uint, encode_address, encode_uint, function_selector,
+)
+
+if TYPE_CHECKING:
     from web3 import Web3
     from web3.contract import Contract
-    from eth_account import Account
-    
+
+# The web3 stack (web3, eth_account) takes seconds to import, so it is loaded
+# on first tool use or by a background warm-up thread instead of at import.
+Web3 = None
+Account = None
+poa_middleware = None
+
+# Startup mode: "warm" (load web3 in a background thread once tools are
+# registered), "lazy" (load on first tool use) or "eager" (load before serving)
+STARTUP_MODE = os.getenv("DRAGON_MCP_STARTUP", "warm").lower()
+
+_web3_stack_lock = threading.Lock()
+_web3_stack_error: Optional[BaseException] = None
+_startup_timings: Dict[str, Any] = {"mode": STARTUP_MODE}
+
+def _load_web3_stack() -> None:
+    """Import web3 and eth_account and bind them as module globals"""
+    global Web3, Account, poa_middleware
+
+    timings = {}
+    started = time.perf_counter()
+    from web3 import Web3 as _Web3
+    timings["web3"] = time.perf_counter() - started
+
+    mark = time.perf_counter()
+    from eth_account import Account as _Account
+    timings["eth_account"] = time.perf_counter() - mark
+
     # Handle different web3.py versions for POA middleware
     try:
         # Web3.py v7+ uses ExtraDataToPOAMiddleware
         from web3.middleware.proof_of_authority import ExtraDataToPOAMiddleware
-        poa_middleware = ExtraDataToPOAMiddleware
+        _poa_middleware = ExtraDataToPOAMiddleware
     except ImportError:
         try:
             # Older versions use geth_poa_middleware
             from web3.middleware import geth_poa_middleware
-            poa_middleware = geth_poa_middleware
+            _poa_middleware = geth_poa_middleware
         except ImportError:
             # Fallback for very old versions
-            poa_middleware = None
-    
-    # MCP SDK imports
-    from mcp.server.fastmcp import FastMCP
-    
-    MCP_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️  Missing dependencies: {e}")
-    print("📦 Install with: pip install 'mcp[cli]' web3 httpx")
-    MCP_AVAILABLE = False
+            _poa_middleware = None
 
-if not MCP_AVAILABLE:
-    exit(1)
+    Web3, Account, poa_middleware = _Web3, _Account, _poa_middleware
+    _startup_timings["web3_stack_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    _startup_timings["web3_stack_imports_ms"] = {
+        name: round(seconds * 1000, 2) for name, seconds in timings.items()
+    }
+    _startup_timings["web3_stack_ready_after_ms"] = round(
+        (time.perf_counter() - _MODULE_IMPORT_STARTED) * 1000, 2
+    )
+
+def ensure_web3_stack() -> None:
+    """Load the web3 stack if it is not loaded yet (thread-safe, idempotent)"""
+    global _web3_stack_error
+
+    if Web3 is not None:
+        return
+    with _web3_stack_lock:
+        if Web3 is not None:
+            return
+        if _web3_stack_error is not None:
+            raise ImportError(f"web3 stack unavailable: {_web3_stack_error}")
+        try:
+            _load_web3_stack()
+        except ImportError as e:
+            _web3_stack_error = e
+            raise
+
+_signer_address: Optional[str] = None
+
+def signer_address() -> Optional[str]:
+    """Address of the PRIVATE_KEY account that signs every transaction (None without a key)"""
+    global _signer_address
+    if _signer_address is None and PRIVATE_KEY:
+        ensure_web3_stack()
+        _signer_address = Account.from_key(PRIVATE_KEY).address
+    return _signer_address
+
+def start_warmup() -> threading.Thread:
+    """Load the web3 stack in a daemon thread so the first tool call is fast"""
+    def _warm():
+        with dragon_ratelimit.priority(dragon_ratelimit.BACKGROUND):
+            try:
+                ensure_web3_stack()
+                web3_manager.compile_calls()
+                start_indexers()
+                # Revalidate addresses loaded from the registry snapshot
+                for chain in list(web3_manager.registry.chains):
+                    if RPC_URLS.get(chain):
+                        try:
+                            web3_manager.get_web3(chain)
+                        except Exception as e:
+                            print(f"⚠️  Registry revalidation skipped for {chain}: {e}", file=sys.stderr)
+            except ImportError as e:
+                print(f"⚠️  Web3 warm-up failed: {e}", file=sys.stderr)
+
+    thread = threading.Thread(target=_warm, name="dragon-web3-warmup", daemon=True)
+    thread.start()
+    return thread
 
 # Initialize FastMCP server
 mcp = FastMCP("Dragon MCP")
 
+# Every registered tool by name (the sidecar dispatches through this)
+TOOLS: Dict[str, Callable[..., Any]] = {}
+
+# Tools that describe this process and always run locally
+LOCAL_TOOLS = {"get_startup_report"}
+
+_sidecar: Optional[dragon_sidecar.SidecarClient] = None
+
+def sidecar_client() -> Optional[dragon_sidecar.SidecarClient]:
+    """Client for the shared sidecar, or None when DRAGON_MCP_SIDECAR is off"""
+    global _sidecar
+    if _sidecar is None and SIDECAR_MODE in ("on", "auto"):
+        _sidecar = dragon_sidecar.SidecarClient(SIDECAR_SOCKET, spawn=SIDECAR_MODE == "auto")
+    return _sidecar
+
+def dragon_tool(requires_web3: bool = True, write: bool = False) -> Callable:
+    """
+    Register an async function as an MCP tool.
+
+    Tools that talk to a chain first make sure the web3 stack is loaded; the
+    import runs in a worker thread so the event loop keeps answering requests.
+    Write tools (which send transactions) run under WRITE_TIMEOUT instead of
+    the caller's deadline.
+    """
+    def decorator(func):
+        name = func.__name__
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if "first_tool_call_ms" not in _startup_timings:
+                _startup_timings["first_tool_call_ms"] = round(
+                    (time.perf_counter() - _MODULE_IMPORT_STARTED) * 1000, 2
+                )
+
+            status = "error"
+            dragon_metrics.INFLIGHT.inc("tool")
+            started = time.perf_counter()
+            try:
+                with dragon_tracing.span(f"tool {name}", kind="server", **{"mcp.tool": name}) as span:
+                    sidecar = sidecar_client() if name not in LOCAL_TOOLS else None
+                    if sidecar is not None:
+                        try:
+                            result = await sidecar.call(
+                                name, dict(signature.bind(*args, **kwargs).arguments),
+                                WRITE_TIMEOUT if write else TOOL_TIMEOUT)
+                            span.set_attribute("sidecar", True)
+                            if not (isinstance(result, dict) and "error" in result):
+                                status = "ok"
+                            return result
+                        except dragon_sidecar.SidecarUnavailable as e:
+                            # Not sent, so running it here cannot double-execute
+                            span.set_attribute("sidecar.fallback", str(e))
+                        except dragon_sidecar.SidecarError as e:
+                            span.set_error(str(e))
+                            return {"error": f"Sidecar call failed: {e}"}
+
+                    if requires_web3 and Web3 is None:
+                        try:
+                            with dragon_tracing.span("load web3 stack"):
+                                await asyncio.to_thread(ensure_web3_stack)
+                        except ImportError as e:
+                            span.set_error(str(e))
+                            return {"error": str(e)}
+
+                    with dragon_resilience.write_deadline(WRITE_TIMEOUT) if write else \
+                            dragon_resilience.deadline(TOOL_TIMEOUT):
+                        result = await func(*args, **kwargs)
+                    if not (isinstance(result, dict) and "error" in result):
+                        status = "ok"
+                    else:
+                        span.set_error(str(result["error"]))
+                    return result
+            finally:
+                dragon_metrics.TOOL_LATENCY.observe(time.perf_counter() - started, name)
+                dragon_metrics.TOOL_CALLS.inc(name, status)
+                dragon_metrics.INFLIGHT.dec("tool")
+
+        TOOLS[name] = wrapper
+        return mcp.tool()(wrapper)
+
+    return decorator
+
 # ================================
 # CONFIGURATION & CONSTANTS
 # ================================
@@ -69,6 +264,20 @@ RPC_URLS = {
 }
 
 PRIVATE_KEY = os.getenv("PRIVATE_KEY")
+
+# Local state (price history, caches) lives under the data directory
+DATA_DIR = os.path.expanduser(os.getenv("DRAGON_MCP_DATA_DIR", "~/.cache/dragon_mcp"))
+PRICE_HISTORY_ENABLED = os.getenv("DRAGON_MCP_PRICE_HISTORY", "1") != "0"
+PRICE_HISTORY_CAPACITY = int(os.getenv("DRAGON_MCP_PRICE_HISTORY_CAPACITY", str(1 << 20)))
+# omniDRAGON fee flow store (get_fee_flows): history indexed on first use,
+# chains followed from startup, poll interval and blocks per eth_getLogs
+FEE_FLOWS_ENABLED = os.getenv("DRAGON_MCP_FEE_FLOWS", "1") != "0"
+FEE_BACKFILL_DAYS = float(os.getenv("DRAGON_MCP_FEE_BACKFILL_DAYS", "90"))
+FEE_CHAINS = [c.strip() for c in os.getenv("DRAGON_MCP_FEE_CHAINS", "").split(",") if c.strip()]
+FEE_POLL_INTERVAL = float(os.getenv("DRAGON_MCP_FEE_POLL_INTERVAL", "30"))
+FEE_LOG_RANGE = int(os.getenv("DRAGON_MCP_FEE_LOG_RANGE", "5000"))
+CHAIN_CACHE_ENABLED = os.getenv("DRAGON_MCP_CHAIN_CACHE", "1") != "0"
+CHAIN_CACHE_MB = int(os.getenv("DRAGON_MCP_CHAIN_CACHE_MB", "256"))
 ETHERSCAN_API_KEYS = {
     "ethereum": os.getenv("ETHERSCAN_API_KEY"),
     "arbitrum": os.getenv("ARBISCAN_API_KEY"),
@@ -124,6 +333,77 @@ JACKPOT_VAULTS = {
     "avalanche": "0x...",
 }
 
+# Wrapped native token each chain's jackpot is denominated in
+WRAPPED_NATIVE = {
+    "sonic": os.getenv("WRAPPED_NATIVE_SONIC", "0x039e2fB66102314Ce7b64Ce5Ce3E5183bc94aD38"),          # wS
+    "ethereum": os.getenv("WRAPPED_NATIVE_ETHEREUM", "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"),    # WETH
+    "arbitrum": os.getenv("WRAPPED_NATIVE_ARBITRUM", "0x82aF49447D8a07e3bd95BD0d56f35241523fBab1"),    # WETH
+    "base": os.getenv("WRAPPED_NATIVE_BASE", "0x4200000000000000000000000000000000000006"),            # WETH
+    "avalanche": os.getenv("WRAPPED_NATIVE_AVALANCHE", "0xB31f66AA3C1e785363F0875A1B74E27b85FD66c7"),  # WAVAX
+}
+
+# Approximate block times (seconds); cached chain reads stay fresh for one block
+BLOCK_TIMES = {
+    "sonic": 1.0,
+    "ethereum": 12.0,
+    "arbitrum": 0.25,
+    "base": 2.0,
+    "avalanche": 2.0,
+}
+
+# Confirmations treated as final on nodes that do not support the "finalized" block tag
+FINALITY_DEPTHS = {
+    "sonic": 1,
+    "ethereum": 64,
+    "arbitrum": 3600,
+    "base": 900,
+    "avalanche": 1,
+}
+
+# Upstream RPC timeout, and the default deadline for one tool call (RPCs never outlive it)
+RPC_TIMEOUT = float(os.getenv("DRAGON_MCP_RPC_TIMEOUT", "10"))
+TOOL_TIMEOUT = float(os.getenv("DRAGON_MCP_TOOL_TIMEOUT", "60"))
+# Transaction writes replace the tool/request deadline with their own budget,
+# long enough to wait out the receipt: a broadcast transaction is never
+# reported as failed just because the caller's read-sized deadline ran out
+RECEIPT_TIMEOUT = float(os.getenv("DRAGON_MCP_RECEIPT_TIMEOUT", "120"))
+WRITE_TIMEOUT = float(os.getenv("DRAGON_MCP_WRITE_TIMEOUT", str(RECEIPT_TIMEOUT + 60)))
+
+# Per-chain circuit breaker: open after this many consecutive transport
+# failures, then probe again after the reset timeout (doubling per failed probe)
+BREAKER_FAILURES = int(os.getenv("DRAGON_MCP_BREAKER_FAILURES", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("DRAGON_MCP_BREAKER_RESET_SECONDS", "15"))
+
+# Client-side RPC throttling per endpoint (see dragon_ratelimit.py). Rates are
+# off (0) unless set; DRAGON_MCP_RPC_RPS_<CHAIN> etc. override per chain.
+RATE_LIMIT_RETRIES = int(os.getenv("DRAGON_MCP_RPC_RATE_LIMIT_RETRIES", "3"))
+
+def rate_limit_setting(name: str, chain: str, default: str) -> float:
+    return float(os.getenv(f"{name}_{chain.upper()}", os.getenv(name, default)))
+
+# Optional shared backend for stdio servers: "off", "on" (use it when it is
+# running) or "auto" (start it on first use); see dragon_sidecar.py
+SIDECAR_MODE = os.getenv("DRAGON_MCP_SIDECAR", "off").lower()
+SIDECAR_SOCKET = os.path.expanduser(os.getenv("DRAGON_MCP_SIDECAR_SOCKET", os.path.join(DATA_DIR, "sidecar.sock")))
+SIDECAR_TTL = float(os.getenv("DRAGON_MCP_SIDECAR_TTL", "1.0"))
+
+# Native token USD prices move slowly relative to blocks; cache them longer
+NATIVE_PRICE_TTL = float(os.getenv("DRAGON_MCP_NATIVE_PRICE_TTL", "60"))
+
+# EVM chain IDs (OmniDragonRegistry keys chains by uint16 chain id)
+CHAIN_IDS = {
+    "sonic": 146,
+    "ethereum": 1,
+    "arbitrum": 42161,
+    "base": 8453,
+    "avalanche": 43114,
+}
+
+# Where contract addresses come from: "registry" (discovered on-chain via
+# OmniDragonRegistry/omniDRAGON and snapshotted, falling back to the values
+# above) or "config" (only the values above)
+ADDRESS_SOURCE = os.getenv("DRAGON_MCP_ADDRESS_SOURCE", "registry").lower()
+
 # LayerZero V2 Configuration
 LAYERZERO_ENDPOINTS = {
     "sonic": "0x6F475642a6e85809B1c36Fa62763669b1b48DD5B",      # Sonic LayerZero endpoint
@@ -141,9 +421,61 @@ LAYERZERO_EIDS = {
     "sonic": 30332,  # Sonic EID
 }
 
-# Chainlink VRF V2.5 Configuration  
-VRF_COORDINATORS = {
-    "arbitrum": "",  # Arbitrum VRF Coordinator V2.5
+# Chainlink VRF V2.5: OmniDragonVRFConsumerV2_5 on Arbitrum talks to the VRF
+# coordinator; ChainlinkVRFIntegratorV2_5 on other chains relays requests to
+# it over LayerZero
+VRF_CONSUMERS = {
+    "arbitrum": os.getenv("VRF_CONSUMER_ADDRESS", ""),
+}
+
+VRF_INTEGRATORS = {
+    "sonic": os.getenv("VRF_INTEGRATOR_SONIC", os.getenv("VRF_INTEGRATOR_ADDRESS", "")),
+    "ethereum": os.getenv("VRF_INTEGRATOR_ETHEREUM", os.getenv("VRF_INTEGRATOR_ADDRESS", "")),
+    "base": os.getenv("VRF_INTEGRATOR_BASE", os.getenv("VRF_INTEGRATOR_ADDRESS", "")),
+    "avalanche": os.getenv("VRF_INTEGRATOR_AVALANCHE", os.getenv("VRF_INTEGRATOR_ADDRESS", "")),
+}
+
+# Background VRF tracking: poll interval, how long to follow a request, and
+# how long (and how many) finished requests stay queryable
+VRF_POLL_INTERVAL = float(os.getenv("DRAGON_MCP_VRF_POLL_INTERVAL", "5"))
+VRF_TRACK_TIMEOUT = float(os.getenv("DRAGON_MCP_VRF_TRACK_TIMEOUT", "3600"))
+VRF_RETENTION = float(os.getenv("DRAGON_MCP_VRF_RETENTION", "86400"))
+VRF_MAX_FINISHED = int(os.getenv("DRAGON_MCP_VRF_MAX_FINISHED", "1000"))
+
+# Live lottery activity (get_lottery_activity): chains followed from startup
+# (others start on their first query), poll interval and blocks kept back from
+# the head so short reorgs are not counted
+ACTIVITY_CHAINS = [c.strip() for c in os.getenv("DRAGON_MCP_ACTIVITY_CHAINS", "").split(",") if c.strip()]
+ACTIVITY_POLL_INTERVAL = float(os.getenv("DRAGON_MCP_ACTIVITY_POLL_INTERVAL", "5"))
+ACTIVITY_CONFIRMATIONS = int(os.getenv("DRAGON_MCP_ACTIVITY_CONFIRMATIONS", "2"))
+# Keep every counted event under DATA_DIR/activity_events for dragon_export.py (needs numpy)
+ACTIVITY_EVENTS_ENABLED = os.getenv("DRAGON_MCP_ACTIVITY_EVENTS", "1") != "0"
+
+# Oracle keeper: "off", "dry-run" (decide and record only) or "on" (send
+# updatePrice). Updates trigger on deviation from the sources or the primary
+# price, or on price age; DRAGON_MCP_KEEPER_MAX_GAS_GWEI[_<CHAIN>] caps gas.
+KEEPER_MODE = os.getenv("DRAGON_MCP_KEEPER", "off").lower()
+KEEPER_CHAINS = [c.strip() for c in os.getenv("DRAGON_MCP_KEEPER_CHAINS", "").split(",") if c.strip()]
+KEEPER_INTERVAL = float(os.getenv("DRAGON_MCP_KEEPER_INTERVAL", "30"))
+KEEPER_JITTER = float(os.getenv("DRAGON_MCP_KEEPER_JITTER", "0.2"))
+KEEPER_DEVIATION_BPS = float(os.getenv("DRAGON_MCP_KEEPER_DEVIATION_BPS", "100"))
+KEEPER_STALE_SECONDS = float(os.getenv("DRAGON_MCP_KEEPER_STALE_SECONDS", "3000"))
+KEEPER_MIN_INTERVAL = float(os.getenv("DRAGON_MCP_KEEPER_MIN_INTERVAL", "60"))
+KEEPER_BACKOFF_SECONDS = float(os.getenv("DRAGON_MCP_KEEPER_BACKOFF_SECONDS", "30"))
+KEEPER_MAX_BACKOFF_SECONDS = float(os.getenv("DRAGON_MCP_KEEPER_MAX_BACKOFF_SECONDS", "900"))
+
+# redDRAGON (ERC-4626 vault shares) and veDRAGON per chain
+REDDRAGON_CONTRACTS = {
+    "sonic": os.getenv("REDDRAGON_ADDRESS", ""),
+}
+
+VEDRAGON_CONTRACTS = {
+    "sonic": os.getenv("VEDRAGON_ADDRESS", ""),
+}
+
+# veDRAGONRevenueDistributor per chain (normally discovered via omniDRAGON)
+REVENUE_DISTRIBUTORS = {
+    "sonic": os.getenv("REVENUE_DISTRIBUTOR_ADDRESS", ""),
 }
 
 # ================================
@@ -184,6 +516,160 @@ OMNIDRAGON_ABI = [
         ],
         "stateMutability": "view",
         "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "jackpotVault",
+        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "lotteryManager",
+        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "revenueDistributor",
+        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+_MESSAGING_FEE = {
+    "components": [
+        {"internalType": "uint256", "name": "nativeFee", "type": "uint256"},
+        {"internalType": "uint256", "name": "lzTokenFee", "type": "uint256"}
+    ],
+    "internalType": "struct MessagingFee", "name": "fee", "type": "tuple"
+}
+
+VRF_INTEGRATOR_ABI = [
+    {
+        "inputs": [],
+        "name": "quoteSimple",
+        "outputs": [_MESSAGING_FEE],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "requestRandomWordsSimple",
+        "outputs": [
+            {"components": [
+                {"internalType": "bytes32", "name": "guid", "type": "bytes32"},
+                {"internalType": "uint64", "name": "nonce", "type": "uint64"},
+                _MESSAGING_FEE
+            ], "internalType": "struct MessagingReceipt", "name": "receipt", "type": "tuple"},
+            {"internalType": "uint64", "name": "requestId", "type": "uint64"}
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    },
+    {
+        "inputs": [{"internalType": "uint64", "name": "requestId", "type": "uint64"}],
+        "name": "checkRequestStatus",
+        "outputs": [
+            {"internalType": "bool", "name": "fulfilled", "type": "bool"},
+            {"internalType": "bool", "name": "exists", "type": "bool"},
+            {"internalType": "address", "name": "provider", "type": "address"},
+            {"internalType": "uint256", "name": "randomWord", "type": "uint256"},
+            {"internalType": "uint256", "name": "timestamp", "type": "uint256"},
+            {"internalType": "bool", "name": "expired", "type": "bool"}
+        ],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+VRF_CONSUMER_ABI = [
+    {
+        "inputs": [],
+        "name": "requestRandomWordsLocal",
+        "outputs": [{"internalType": "uint256", "name": "requestId", "type": "uint256"}],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    }
+]
+
+REVENUE_DISTRIBUTOR_ABI = [
+    {
+        "inputs": [],
+        "name": "currentEpoch",
+        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [{"internalType": "uint256", "name": "epoch", "type": "uint256"}],
+        "name": "epochEndTime",
+        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "wrappedNativeToken",
+        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "rewardToken",
+        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"internalType": "address", "name": "user", "type": "address"},
+            {"internalType": "uint256", "name": "epoch", "type": "uint256"},
+            {"internalType": "address", "name": "token", "type": "address"}
+        ],
+        "name": "getClaimable",
+        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"internalType": "address", "name": "user", "type": "address"},
+            {"internalType": "uint256", "name": "epoch", "type": "uint256"},
+            {"internalType": "address", "name": "token", "type": "address"}
+        ],
+        "name": "hasUserClaimed",
+        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+REGISTRY_ABI = [
+    {
+        "inputs": [{"internalType": "uint16", "name": "_chainId", "type": "uint16"}],
+        "name": "getPriceOracle",
+        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [{"internalType": "uint16", "name": "_chainId", "type": "uint16"}],
+        "name": "getWrappedNativeToken",
+        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [{"internalType": "uint16", "name": "_chainId", "type": "uint16"}],
+        "name": "getLayerZeroEndpoint",
+        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
+        "stateMutability": "view",
+        "type": "function"
     }
 ]
 
@@ -226,6 +712,75 @@ ORACLE_ABI = [
         "outputs": [{"internalType": "bool", "name": "success", "type": "bool"}],
         "stateMutability": "nonpayable",
         "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "getOracleStatus",
+        "outputs": [
+            {"internalType": "bool", "name": "initialized", "type": "bool"},
+            {"internalType": "bool", "name": "circuitBreakerActive_", "type": "bool"},
+            {"internalType": "bool", "name": "emergencyMode_", "type": "bool"},
+            {"internalType": "bool", "name": "inGracePeriod", "type": "bool"},
+            {"internalType": "uint256", "name": "activeOracles", "type": "uint256"},
+            {"internalType": "uint256", "name": "maxDeviation", "type": "uint256"}
+        ],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "getOracleConfig",
+        "outputs": [
+            {"components": [
+                {"internalType": "address", "name": "feedAddress", "type": "address"},
+                {"internalType": "uint256", "name": "weight", "type": "uint256"},
+                {"internalType": "bool", "name": "isActive", "type": "bool"},
+                {"internalType": "uint256", "name": "maxStaleness", "type": "uint256"}
+            ], "internalType": "struct OmniDragonPriceOracle.OracleConfig", "name": "chainlink", "type": "tuple"},
+            {"components": [
+                {"internalType": "address", "name": "feedAddress", "type": "address"},
+                {"internalType": "uint256", "name": "weight", "type": "uint256"},
+                {"internalType": "bool", "name": "isActive", "type": "bool"},
+                {"internalType": "uint256", "name": "maxStaleness", "type": "uint256"}
+            ], "internalType": "struct OmniDragonPriceOracle.OracleConfig", "name": "band", "type": "tuple"},
+            {"components": [
+                {"internalType": "address", "name": "feedAddress", "type": "address"},
+                {"internalType": "uint256", "name": "weight", "type": "uint256"},
+                {"internalType": "bool", "name": "isActive", "type": "bool"},
+                {"internalType": "uint256", "name": "maxStaleness", "type": "uint256"}
+            ], "internalType": "struct OmniDragonPriceOracle.OracleConfig", "name": "api3", "type": "tuple"},
+            {"components": [
+                {"internalType": "address", "name": "feedAddress", "type": "address"},
+                {"internalType": "uint256", "name": "weight", "type": "uint256"},
+                {"internalType": "bool", "name": "isActive", "type": "bool"},
+                {"internalType": "uint256", "name": "maxStaleness", "type": "uint256"}
+            ], "internalType": "struct OmniDragonPriceOracle.OracleConfig", "name": "pyth", "type": "tuple"},
+            {"internalType": "string", "name": "bandSymbol", "type": "string"},
+            {"internalType": "bytes32", "name": "pythId", "type": "bytes32"}
+        ],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "isFresh",
+        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "latestPrice",
+        "outputs": [{"internalType": "int256", "name": "", "type": "int256"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "lastPriceUpdate",
+        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
     }
 ]
 
@@ -306,21 +861,141 @@ class LotteryStats:
     min_entry_usd: float
     max_win_chance_ppm: int
 
+def _block_param(method: str, params: Any) -> Optional[Any]:
+    """Block tag/number a request targets, for trace attributes"""
+    if not isinstance(params, (list, tuple)) or not params:
+        return None
+    if method in ("eth_call", "eth_getBalance", "eth_getCode", "eth_getStorageAt") and len(params) > 1:
+        return params[-1]
+    if method in ("eth_getBlockByNumber", "eth_getBlockByHash"):
+        return params[0]
+    if method == "eth_getLogs" and isinstance(params[0], dict):
+        return f"{params[0].get('fromBlock')}..{params[0].get('toBlock')}"
+    return None
+
+# ERC-20 reads shared by redDRAGON and veDRAGON
+TOKEN_ABI = [entry for entry in OMNIDRAGON_ABI if entry["name"] in ("totalSupply", "balanceOf")]
+
+# ABI per contract type handled by Web3Manager
+CONTRACT_ABIS = {
+    "omnidragon": OMNIDRAGON_ABI,
+    "oracle": ORACLE_ABI,
+    "lottery": LOTTERY_MANAGER_ABI,
+    "jackpot": JACKPOT_VAULT_ABI,
+    "registry": REGISTRY_ABI,
+    "vrf_integrator": VRF_INTEGRATOR_ABI,
+    "vrf_consumer": VRF_CONSUMER_ABI,
+    "revenue_distributor": REVENUE_DISTRIBUTOR_ABI,
+    "reddragon": TOKEN_ABI,
+    "vedragon": TOKEN_ABI,
+}
+
+# Configured addresses per contract type, used when the registry has no answer
+CONFIGURED_ADDRESSES = {
+    "omnidragon": OMNIDRAGON_CONTRACTS,
+    "oracle": {"sonic": ORACLE_CONTRACTS["primary"]["sonic"], **ORACLE_CONTRACTS["secondary"]},
+    "lottery": LOTTERY_MANAGERS,
+    "jackpot": JACKPOT_VAULTS,
+    "registry": REGISTRY_CONTRACTS,
+    "wrapped_native": WRAPPED_NATIVE,
+    "layerzero_endpoint": LAYERZERO_ENDPOINTS,
+    "revenue_distributor": REVENUE_DISTRIBUTORS,
+    "reddragon": REDDRAGON_CONTRACTS,
+    "vedragon": VEDRAGON_CONTRACTS,
+    "vrf_integrator": VRF_INTEGRATORS,
+    "vrf_consumer": VRF_CONSUMERS,
+}
+
+def _validate_address(address: str, contract_type: str, chain: str) -> str:
+    """Lower-cased address, or ValueError naming the bad config value"""
+    try:
+        if len(address) != 42 or not address.startswith("0x"):
+            raise ValueError("expected 0x-prefixed 20-byte hex")
+        int(address, 16)
+    except ValueError as e:
+        raise ValueError(f"Invalid contract address '{address}' for {contract_type} on {chain}: {e}")
+    return address.lower()
+
+# Upper bound on cached Contract objects (get_contract accepts arbitrary addresses)
+CONTRACT_CACHE_SIZE = int(os.getenv("DRAGON_MCP_CONTRACT_CACHE_SIZE", "64"))
+
 class Web3Manager:
     """Manages Web3 connections and contract interactions"""
     
     def __init__(self):
         self.connections = {}
-        self.contracts = {}
+        self.contracts = OrderedDict()
+        self.compiled = {}
+        self._addresses = {}
+        self._lock = threading.Lock()
+        self.recorder, self.replayer = dragon_replay.from_env()
+        self._no_multicall = set()
+        self.breakers: Dict[str, dragon_resilience.CircuitBreaker] = {}
+        self.limiters: Dict[str, dragon_ratelimit.EndpointLimiter] = {}
+        self._checksums = {}
+        self._finalized: Dict[str, Tuple[int, float]] = {}
+        self._chain_cache = None
+        self._registry_refreshes = {}
+        self.registry = dragon_registry.RegistrySnapshot(
+            dragon_registry.snapshot_path(DATA_DIR),
+            {chain: [chain_id, REGISTRY_CONTRACTS.get(chain, "").lower(), OMNIDRAGON_CONTRACTS.get(chain, "").lower()]
+             for chain, chain_id in CHAIN_IDS.items()},
+        )
+        if ADDRESS_SOURCE == "registry":
+            for chain, entry in self.registry.load().items():
+                self._apply_discovered(chain, entry["addresses"])
         
-    def get_web3(self, chain: str) -> Web3:
+    def breaker(self, chain: str) -> dragon_resilience.CircuitBreaker:
+        """Circuit breaker guarding every RPC to `chain`"""
+        breaker = self.breakers.get(chain)
+        if breaker is None:
+            with self._lock:
+                breaker = self.breakers.setdefault(chain, dragon_resilience.CircuitBreaker(
+                    chain, failure_threshold=BREAKER_FAILURES, reset_timeout=BREAKER_RESET_SECONDS
+                ))
+        return breaker
+
+    def limiter(self, chain: str) -> dragon_ratelimit.EndpointLimiter:
+        """Client-side rate limiter for `chain`'s RPC endpoint"""
+        limiter = self.limiters.get(chain)
+        if limiter is None:
+            with self._lock:
+                if chain not in self.limiters:
+                    self.limiters[chain] = dragon_ratelimit.EndpointLimiter(
+                        chain,
+                        rps=rate_limit_setting("DRAGON_MCP_RPC_RPS", chain, "0"),
+                        units_per_second=rate_limit_setting("DRAGON_MCP_RPC_CUPS", chain, "0"),
+                        concurrency=int(rate_limit_setting("DRAGON_MCP_RPC_CONCURRENCY", chain, "8")),
+                        max_concurrency=int(rate_limit_setting("DRAGON_MCP_RPC_MAX_CONCURRENCY", chain, "64")),
+                        backoff=rate_limit_setting("DRAGON_MCP_RPC_BACKOFF_SECONDS", chain, "0.25"),
+                    )
+                limiter = self.limiters[chain]
+        return limiter
+
+    def get_web3(self, chain: str) -> "Web3":
         """Get Web3 instance for specified chain"""
         if chain not in self.connections:
+            # Known-bad chain: fail now rather than inside is_connected()
+            self.breaker(chain).raise_if_open()
+            ensure_web3_stack()
             rpc_url = RPC_URLS.get(chain)
+            if not rpc_url and self.replayer is not None:
+                rpc_url = f"http://replay.invalid/{chain}"
             if not rpc_url:
                 raise ValueError(f"No RPC URL configured for chain: {chain}")
                 
-            w3 = Web3(Web3.HTTPProvider(rpc_url))
+            provider = Web3.HTTPProvider(rpc_url, request_kwargs={"timeout": RPC_TIMEOUT})
+            retry = getattr(provider, "exception_retry_configuration", None)
+            if retry is not None:
+                # Let 429s reach _send, which backs off through the rate limiter
+                # instead of retrying blindly while holding a slot
+                provider.exception_retry_configuration = type(retry)(
+                    errors=[e for e in retry.errors if e.__name__ != "HTTPError"],
+                    retries=retry.retries, backoff_factor=retry.backoff_factor,
+                    method_allowlist=retry.method_allowlist,
+                )
+            self._instrument(chain, provider)
+            w3 = Web3(provider)
             
             # Add PoA middleware for chains that need it
             if chain in ["base", "arbitrum", "sonic"] and poa_middleware:
@@ -330,56 +1005,736 @@ class Web3Manager:
                 raise ConnectionError(f"Failed to connect to {chain} RPC")
                 
             self.connections[chain] = w3
+            self.schedule_registry_refresh(chain)
             
         return self.connections[chain]
+
+    def _instrument(self, chain: str, provider: Any) -> None:
+        """Route every request made through `provider` (contract calls and raw RPCs) via _send"""
+        send = provider.make_request
+        if self.replayer is not None:
+            send = self.replayer.sender(chain)
+        elif self.recorder is not None:
+            send = self.recorder.wrap(chain, send)
+
+        def make_request(method, params):
+            return self._send(chain, method, params, send)
+
+        provider.make_request = make_request
+
+        # Cap each HTTP attempt at the time left before the caller's deadline
+        request_kwargs = getattr(provider, "get_request_kwargs", None)
+        if request_kwargs is not None:
+            def get_request_kwargs():
+                kwargs = dict(request_kwargs())
+                left = dragon_resilience.remaining()
+                if left is not None:
+                    if left <= 0:
+                        raise dragon_resilience.DeadlineExceeded(f"Deadline exceeded calling {chain}")
+                    kwargs["timeout"] = min(kwargs.get("timeout", RPC_TIMEOUT), left)
+                return kwargs
+
+            provider.get_request_kwargs = get_request_kwargs
+
+    def _send(self, chain: str, method: str, params: Any, send: Callable) -> Any:
+        """
+        Send one JSON-RPC request upstream through the chain's rate limiter,
+        retrying up to RATE_LIMIT_RETRIES times when the provider rate limits it
+        """
+        limiter = self.limiter(chain)
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            dragon_resilience.check_deadline(chain, method)
+            admitted_at = limiter.acquire(method)
+            retry_after = None
+            try:
+                response = self._send_once(chain, method, params, send)
+                retry_after = dragon_ratelimit.response_signal(response)
+                if retry_after is None or attempt == RATE_LIMIT_RETRIES:
+                    return response
+            except Exception as e:
+                retry_after = dragon_ratelimit.exception_signal(e)
+                if retry_after is None or attempt == RATE_LIMIT_RETRIES:
+                    raise
+            finally:
+                limiter.release(admitted_at, retry_after)
+
+    def _send_once(self, chain: str, method: str, params: Any, send: Callable) -> Any:
+        """
+        Send one JSON-RPC request upstream, recording latency, errors and a
+        trace span. Fails fast when the caller's deadline has passed or the
+        chain's circuit breaker is open.
+        """
+        dragon_resilience.check_deadline(chain, method)
+        breaker = self.breaker(chain)
+        breaker.before_call()
+        dragon_metrics.INFLIGHT.inc("rpc")
+        started = time.perf_counter()
+        error_code = None
+        with dragon_tracing.span(f"rpc {method}", kind="client", chain=chain, **{"rpc.method": method}) as span:
+            try:
+                if span.recording:
+                    block = _block_param(method, params)
+                    if block is not None:
+                        span.set_attribute("rpc.block", block)
+                    span.set_attribute("rpc.request_bytes", len(json.dumps(params, default=str)))
+                response = send(method, params)
+                error = response.get("error") if isinstance(response, dict) else None
+                if error is not None:
+                    error_code = str(error.get("code", "rpc_error")) if isinstance(error, dict) else "rpc_error"
+                    span.set_error(f"JSON-RPC error {error_code}")
+                if span.recording:
+                    span.set_attribute("rpc.response_bytes", len(json.dumps(response, default=str)))
+                breaker.record_success()
+                return response
+            except Exception as e:
+                error_code = type(e).__name__
+                if not dragon_resilience.is_transport_failure(e) or dragon_ratelimit.exception_signal(e) is not None:
+                    # A 429 means the endpoint is up but busy; the rate limiter handles it
+                    breaker.release_probe()
+                    raise
+                left = dragon_resilience.remaining()
+                if left is not None and left <= 0:
+                    # Timed out because the caller ran out of time, not because the chain is down
+                    breaker.release_probe()
+                    dragon_resilience.DEADLINES_EXCEEDED.inc(chain)
+                    raise dragon_resilience.DeadlineExceeded(f"Deadline exceeded during {method} on {chain}") from e
+                breaker.record_failure(e)
+                raise
+            finally:
+                dragon_metrics.observe_rpc(chain, method, time.perf_counter() - started, error_code)
+                dragon_metrics.INFLIGHT.dec("rpc")
+
+    def compile_calls(self) -> Dict[str, Dict[str, CompiledCall]]:
+        """Precompute selectors and decoders for every fixed-layout function in CONTRACT_ABIS"""
+        if not self.compiled:
+            ensure_web3_stack()
+            self.compiled = {
+                contract_type: compile_abi(abi) for contract_type, abi in CONTRACT_ABIS.items()
+            }
+        return self.compiled
+
+    def resolve_address(self, chain: str, contract_type: str, address: str = None) -> str:
+        """
+        Contract address, lower-cased: the given one, else discovered via the
+        registry, else configured. Resolved addresses are cached, so repeat
+        calls are a dict lookup.
+        """
+        if address is not None:
+            return _validate_address(address, contract_type, chain)
+
+        cached = self._addresses.get((chain, contract_type))
+        if cached:
+            return cached
+
+        configured = CONFIGURED_ADDRESSES.get(contract_type)
+        if configured is None:
+            raise ValueError(f"Unknown contract type: {contract_type}")
+        resolved = configured.get(chain)
+        if not resolved:
+            raise ValueError(f"No address found for {contract_type} on {chain}")
+
+        resolved = _validate_address(resolved, contract_type, chain)
+        self._addresses[(chain, contract_type)] = resolved
+        return resolved
+
+    def has_address(self, chain: str, contract_type: str) -> bool:
+        try:
+            self.resolve_address(chain, contract_type)
+            return True
+        except ValueError:
+            return False
+
+    def _apply_discovered(self, chain: str, addresses: Dict[str, str]) -> None:
+        """Install checksummed addresses from the registry (replacing config values)"""
+        for contract_type, checksummed in addresses.items():
+            self._addresses[(chain, contract_type)] = checksummed.lower()
+            self._checksums[(chain, contract_type)] = checksummed
+
+    def refresh_registry(self, chain: str) -> Dict[str, Any]:
+        """Re-read `chain`'s addresses from the registry in one batch and update the snapshot"""
+        chain_id = CHAIN_IDS.get(chain)
+        if chain_id is None:
+            raise ValueError(f"No chain id configured for {chain}")
+        with dragon_tracing.span("registry refresh", chain=chain):
+            block, results = self.multicall(chain, dragon_registry.discovery_calls(chain_id))
+        addresses, errors = dragon_registry.parse_discovery(results)
+        self._apply_discovered(chain, addresses)
+        changed = self.registry.update(chain, block, addresses, errors)
+        return {"chain": chain, "block": block, "addresses": addresses, "errors": errors, "changed": changed}
+
+    def schedule_registry_refresh(self, chain: str) -> None:
+        """Revalidate `chain`'s addresses in a background thread, once per process"""
+        if ADDRESS_SOURCE != "registry" or chain not in CHAIN_IDS:
+            return
+        with self._lock:
+            if chain in self._registry_refreshes:
+                return
+            self._registry_refreshes[chain] = None
+
+        def _refresh():
+            try:
+                with dragon_resilience.deadline(TOOL_TIMEOUT), dragon_ratelimit.priority(dragon_ratelimit.BACKGROUND):
+                    self._registry_refreshes[chain] = self.refresh_registry(chain)
+            except Exception as e:
+                self._registry_refreshes[chain] = {"chain": chain, "error": str(e)}
+
+        threading.Thread(target=_refresh, name=f"dragon-registry-{chain}", daemon=True).start()
     
-    def get_contract(self, chain: str, contract_type: str, address: str = None) -> Contract:
+    def get_contract(self, chain: str, contract_type: str, address: str = None) -> "Contract":
         """Get contract instance"""
         w3 = self.get_web3(chain)
-        
-        # Determine contract address and ABI
-        if contract_type == "omnidragon":
-            address = address or OMNIDRAGON_CONTRACTS.get(chain)
-            abi = OMNIDRAGON_ABI
-        elif contract_type == "oracle":
-            if chain == "sonic":
-                address = address or ORACLE_CONTRACTS["primary"]["sonic"]
-            else:
-                address = address or ORACLE_CONTRACTS["secondary"].get(chain)
-            abi = ORACLE_ABI
-        elif contract_type == "lottery":
-            address = address or LOTTERY_MANAGERS.get(chain)
-            abi = LOTTERY_MANAGER_ABI
-        elif contract_type == "jackpot":
-            address = address or JACKPOT_VAULTS.get(chain)
-            abi = JACKPOT_VAULT_ABI
-        else:
-            raise ValueError(f"Unknown contract type: {contract_type}")
+        resolved = self.resolve_address(chain, contract_type, address)
             
-        if not address:
-            raise ValueError(f"No address found for {contract_type} on {chain}")
+        cache_key = f"{chain}:{contract_type}:{resolved}"
+        with dragon_tracing.span("cache contract", chain=chain, **{"cache.key": cache_key}) as span:
+            with self._lock:
+                contract = self.contracts.get(cache_key)
+                if contract is not None:
+                    self.contracts.move_to_end(cache_key)
+            span.set_attribute("cache.hit", contract is not None)
+        dragon_metrics.cache_lookup("contract", contract is not None)
+        if contract is not None:
+            return contract
+
+        try:
+            checksum_address = self._checksums.get((chain, contract_type)) if address is None else None
+            if checksum_address is None or checksum_address.lower() != resolved:
+                checksum_address = Web3.to_checksum_address(resolved)
+                if address is None:
+                    self._checksums[(chain, contract_type)] = checksum_address
+            contract = w3.eth.contract(
+                address=checksum_address,
+                abi=CONTRACT_ABIS[contract_type]
+            )
+        except ValueError as e:
+            raise ValueError(f"Invalid contract address '{resolved}' for {contract_type} on {chain}: {e}")
+
+        with self._lock:
+            self.contracts[cache_key] = contract
+            while len(self.contracts) > CONTRACT_CACHE_SIZE:
+                self.contracts.popitem(last=False)
             
-        cache_key = f"{chain}:{contract_type}:{address}"
-        if cache_key not in self.contracts:
+        return contract
+
+    def request(self, chain: str, method: str, params: List[Any]) -> Any:
+        """Send a raw JSON-RPC request and return its result"""
+        w3 = self.get_web3(chain)
+        response = w3.provider.make_request(method, params)
+        if "error" in response:
+            error = response["error"]
+            message = error.get("message", error) if isinstance(error, dict) else error
+            raise ValueError(f"{method} failed on {chain}: {message}")
+        return response["result"]
+
+    def call_view(self, chain: str, contract_type: str, function: str, *args: Any,
+                  address: str = None, block: Union[int, str] = "latest") -> Any:
+        """
+        Call a fixed-layout view as a raw eth_call.
+
+        Calldata for zero-argument views is computed once; return data is
+        decoded word by word. Results match `contract.functions.<fn>().call()`.
+        """
+        call = self.compile_calls()[contract_type].get(function)
+        if call is None:
+            raise ValueError(f"{function} is not a fixed-layout view of {contract_type}")
+
+        target = self.resolve_address(chain, contract_type, address)
+        block_id = hex(block) if isinstance(block, int) else block
+        result = self.request(chain, "eth_call", [{"to": target, "data": call.encode(*args)}, block_id])
+        return call.decode(result)
+
+    def multicall(self, chain: str, calls: List[Tuple[str, str, Tuple]],
+                  block: Union[int, str] = "latest") -> Tuple[int, List[Tuple[bool, Any]]]:
+        """
+        Batch fixed-layout views into one Multicall3 aggregate3 eth_call.
+
+        `calls` are (contract_type, function, args) triples. Returns the block
+        number the batch executed at and a (success, value) pair per call;
+        a failed call carries its error instead of a value. `block` is a
+        number or a tag ("latest", "finalized", "safe", "pending"). Chains
+        without Multicall3 fall back to one eth_call per view, pinned to the
+        block the tag names.
+        """
+        compiled = self.compile_calls()
+        prepared = []
+        for contract_type, function, args in calls:
+            call = compiled[contract_type].get(function)
+            if call is None:
+                raise ValueError(f"{function} is not a fixed-layout view of {contract_type}")
+            prepared.append((call, self.resolve_address(chain, contract_type), args))
+
+        if chain in self._no_multicall:
+            return self._call_each(chain, prepared, block)
+
+        block_id = hex(block) if isinstance(block, int) else block
+        batch = [(MULTICALL3_ADDRESS, False, GET_BLOCK_NUMBER_CALLDATA)]
+        batch += [(target, True, bytes.fromhex(call.encode(*args)[2:])) for call, target, args in prepared]
+        with dragon_tracing.span("multicall aggregate3", chain=chain, **{"multicall.calls": len(prepared)}):
+            result = self.request(chain, "eth_call", [{"to": MULTICALL3_ADDRESS, "data": encode_aggregate3(batch)}, block_id])
+            if result in ("0x", None):
+                # No Multicall3 contract on this chain
+                self._no_multicall.add(chain)
+                return self._call_each(chain, prepared, block)
+            (_, block_word), *returns = decode_aggregate3(result)
+
+        values = []
+        for (call, _, _), (success, data) in zip(prepared, returns):
             try:
-                checksum_address = Web3.to_checksum_address(address)
-                self.contracts[cache_key] = w3.eth.contract(
-                    address=checksum_address,
-                    abi=abi
-                )
+                if not success:
+                    raise ValueError(f"{call.signature} reverted on {chain}")
+                values.append((True, call.decode(data)))
             except ValueError as e:
-                raise ValueError(f"Invalid contract address '{address}' for {contract_type} on {chain}: {e}")
-            
-        return self.contracts[cache_key]
+                values.append((False, e))
+        return decode_uint(block_word), values
+
+    def _call_each(self, chain: str, prepared: List[Tuple[CompiledCall, str, Tuple]],
+                   block: Union[int, str]) -> Tuple[int, List[Tuple[bool, Any]]]:
+        """multicall() without Multicall3: pin the block, then one eth_call per view"""
+        if block == "latest":
+            number = int(self.request(chain, "eth_blockNumber", []), 16)
+        elif isinstance(block, str) and not block.startswith("0x"):
+            # "finalized", "safe", "pending" or "earliest": pin the block the tag names now
+            header = self.request(chain, "eth_getBlockByNumber", [block, False])
+            if not header or header.get("number") is None:
+                raise ValueError(f"No {block} block on {chain}")
+            number = int(header["number"], 16)
+        else:
+            number = int(block, 16) if isinstance(block, str) else block
+        values = []
+        for call, target, args in prepared:
+            try:
+                data = self.request(chain, "eth_call", [{"to": target, "data": call.encode(*args)}, hex(number)])
+                values.append((True, call.decode(data)))
+            except ValueError as e:
+                values.append((False, e))
+        return number, values
+
+    # ================================
+    # FINALIZED DATA
+    # ================================
+
+    @property
+    def chain_cache(self) -> Optional[dragon_chaincache.ChainCache]:
+        """Shared on-disk cache of finalized receipts, logs and headers (None when disabled)"""
+        if self._chain_cache is None and CHAIN_CACHE_ENABLED:
+            with self._lock:
+                if self._chain_cache is None:
+                    self._chain_cache = dragon_chaincache.ChainCache(
+                        dragon_chaincache.cache_path(DATA_DIR), max_bytes=CHAIN_CACHE_MB << 20)
+        return self._chain_cache
+
+    def finalized_block(self, chain: str, at_least: int = 0) -> int:
+        """
+        Latest finalized block known for `chain`. Finality only moves forward,
+        so the node is asked again only when `at_least` is above the known
+        value, at most once per block time.
+        """
+        known, checked_at = self._finalized.get(chain, (-1, 0.0))
+        if known >= at_least or time.monotonic() - checked_at < BLOCK_TIMES.get(chain, 1.0):
+            return known
+        try:
+            block = self.request(chain, "eth_getBlockByNumber", ["finalized", False])
+            number = int(block["number"], 16)
+        except (ValueError, TypeError, KeyError):
+            # Node without the finalized tag: fall back to a confirmation depth
+            number = int(self.request(chain, "eth_blockNumber", []), 16) - FINALITY_DEPTHS.get(chain, 64)
+        number = max(number, known)
+        self._finalized[chain] = (number, time.monotonic())
+        return number
+
+    def _cached_rpc(self, chain: str, kind: str, key: str, method: str, params: List[Any],
+                    block_of: Callable[[Any], Optional[int]]) -> Any:
+        """Serve `method` from the chain cache, storing the result once its block is final"""
+        cache = self.chain_cache
+        if cache is not None:
+            cached = cache.get(chain, kind, key)
+            if cached is not None:
+                return cached
+        result = self.request(chain, method, params)
+        block = block_of(result) if result is not None else None
+        if cache is not None and block is not None and block <= self.finalized_block(chain, block):
+            cache.put(chain, kind, key, result)
+        return result
+
+    def get_receipt(self, chain: str, tx_hash: str) -> Optional[Dict[str, Any]]:
+        """Raw transaction receipt (None if not mined); finalized receipts come from disk"""
+        tx_hash = tx_hash.lower() if tx_hash.startswith("0x") else "0x" + tx_hash.lower()
+        return self._cached_rpc(chain, "receipt", tx_hash, "eth_getTransactionReceipt", [tx_hash],
+                                lambda receipt: int(receipt["blockNumber"], 16) if receipt.get("blockNumber") else None)
+
+    def get_block_header(self, chain: str, number: int) -> Optional[Dict[str, Any]]:
+        """Raw block header (without transactions); finalized headers come from disk"""
+        return self._cached_rpc(chain, "block", str(number), "eth_getBlockByNumber", [hex(number), False],
+                                lambda block: number)
+
+    def get_logs(self, chain: str, filter_params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Raw logs for a filter. Filters over an explicit numeric block range
+        ending at or below the finalized block are cached.
+        """
+        params = {k: hex(v) if isinstance(v, int) else v for k, v in filter_params.items()}
+        from_block, to_block = params.get("fromBlock"), params.get("toBlock")
+        if all(isinstance(b, str) and b.startswith("0x") for b in (from_block, to_block)):
+            last = int(to_block, 16)
+            key = json.dumps(params, sort_keys=True, separators=(",", ":")).lower()
+            return self._cached_rpc(chain, "logs", key, "eth_getLogs", [params], lambda logs: last)
+        return self.request(chain, "eth_getLogs", [params])
+
+    def get_account_state(self, chain: str, address: str, block: int) -> Dict[str, Any]:
+        """Raw balance, nonce and code of an account at `block`; finalized state comes from disk"""
+        cache = self.chain_cache
+        key = f"{block}:{address.lower()}"
+        if cache is not None:
+            cached = cache.get(chain, "account", key)
+            if cached is not None:
+                return cached
+        block_id = hex(block)
+        state = {
+            "balance": self.request(chain, "eth_getBalance", [address, block_id]),
+            "nonce": self.request(chain, "eth_getTransactionCount", [address, block_id]),
+            "code": self.request(chain, "eth_getCode", [address, block_id]),
+        }
+        if cache is not None and block <= self.finalized_block(chain, block):
+            cache.put(chain, "account", key, state)
+        return state
+
+    def get_storage_at(self, chain: str, address: str, slot: int, block: int) -> int:
+        """Storage slot value at `block`; finalized slots come from disk"""
+        key = f"{block}:{address.lower()}:{slot:x}"
+        value = self._cached_rpc(chain, "storage", key, "eth_getStorageAt", [address, hex(slot), hex(block)],
+                                 lambda value: block)
+        return int(value, 16)
+
+# Price history store, opened on first use (needs numpy)
+_price_history = None
+_price_history_lock = threading.Lock()
+
+def get_price_history_store():
+    """Per-chain price history under DATA_DIR, or None when disabled or numpy is missing"""
+    global _price_history
+    if _price_history is None and PRICE_HISTORY_ENABLED:
+        with _price_history_lock:
+            if _price_history is None:
+                try:
+                    from dragon_history import HistoryStore
+                except ImportError:
+                    return None
+                _price_history = HistoryStore(os.path.join(DATA_DIR, "price_history"), PRICE_HISTORY_CAPACITY)
+                atexit.register(_price_history.flush)
+    return _price_history
+
+# Fee flow indexer, created on first use (needs numpy)
+_fee_indexer = None
+_fee_indexer_lock = threading.Lock()
+
+def get_fee_indexer():
+    """dragon_fees.FeeIndexer storing under DATA_DIR, or None when disabled or numpy is missing"""
+    global _fee_indexer
+    if _fee_indexer is None and FEE_FLOWS_ENABLED:
+        with _fee_indexer_lock:
+            if _fee_indexer is None:
+                try:
+                    import dragon_fees
+                except ImportError:
+                    return None
+                _fee_indexer = dragon_fees.FeeIndexer(
+                    web3_manager, os.path.join(DATA_DIR, "fee_flows"), BLOCK_TIMES,
+                    poll_interval=FEE_POLL_INTERVAL, max_range=FEE_LOG_RANGE,
+                    confirmations=ACTIVITY_CONFIRMATIONS, backfill_seconds=FEE_BACKFILL_DAYS * 86400)
+    return _fee_indexer
+
+# Whether start_indexers() ran in this process (lazy startup never calls it)
+_indexers_started = False
+
+def start_indexers() -> None:
+    """Start the event indexers and the oracle keeper configured to run from startup"""
+    global _indexers_started
+    _indexers_started = True
+    for chain in ACTIVITY_CHAINS:
+        activity_indexer.track(chain)
+    indexer = get_fee_indexer() if FEE_CHAINS else None
+    for chain in FEE_CHAINS if indexer is not None else []:
+        indexer.track(chain)
+    if KEEPER_MODE == "dry-run" or (KEEPER_MODE == "on" and PRIVATE_KEY):
+        if acquire_keeper_lock():
+            keeper.start()
+        else:
+            print("🔒 Oracle keeper already runs in another process for this signer", file=sys.stderr)
+
+# Held for the life of the process by the one keeper per signer on this host
+_keeper_lock = None
+
+def acquire_keeper_lock() -> bool:
+    """Take the per-signer keeper lock under DATA_DIR (like the sidecar's spawn lock); False if held elsewhere"""
+    global _keeper_lock
+    if _keeper_lock is not None:
+        return True
+    import fcntl
+    owner = signer_address() if KEEPER_MODE == "on" else "dry-run"
+    os.makedirs(DATA_DIR, exist_ok=True)
+    lock = open(os.path.join(DATA_DIR, f"keeper-{owner.lower()}.lock"), "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return False
+    _keeper_lock = lock
+    return True
+
+# Oracle source reader, created on first use; remembers each chain's feed addresses
+_oracle_sources = None
+
+def get_oracle_sources_reader():
+    """dragon_oracle.OracleSources over the shared Web3Manager"""
+    global _oracle_sources
+    if _oracle_sources is None:
+        import dragon_oracle
+        _oracle_sources = dragon_oracle.OracleSources(web3_manager)
+    return _oracle_sources
+
+# Local EVM forks per (chain, block), created on first use (needs py-evm)
+FORK_CACHE_SIZE = int(os.getenv("DRAGON_MCP_FORK_CACHE_SIZE", "4"))
+_forks: "OrderedDict[Tuple[str, int], Any]" = OrderedDict()
+_forks_lock = threading.Lock()
+
+def get_fork(chain: str, block: int):
+    """dragon_fork.Fork pinned at `block`, reused across calls; ImportError without py-evm"""
+    import dragon_fork
+    with _forks_lock:
+        fork = _forks.get((chain, block))
+        if fork is not None:
+            _forks.move_to_end((chain, block))
+            return fork
+    fork = dragon_fork.Fork(web3_manager, chain, block, CHAIN_IDS[chain])
+    with _forks_lock:
+        fork = _forks.setdefault((chain, block), fork)
+        while len(_forks) > FORK_CACHE_SIZE:
+            _forks.popitem(last=False)
+    return fork
+
+def _record_price(chain: str, price_data: Dict[str, Any]) -> None:
+    """Append a price reading to the chain's history; never fails the caller"""
+    if "price_usd" not in price_data:
+        return
+    try:
+        store = get_price_history_store()
+        if store is not None:
+            store.chain(chain).append(
+                price_data["price_usd"], bool(price_data.get("is_valid")),
+                int(price_data.get("timestamp") or 0), price_data.get("source", "unknown"),
+            )
+    except Exception:
+        pass
 
 # Global Web3 manager instance
 web3_manager = Web3Manager()
 
+# Background tracker for VRF requests sent by this process
+vrf_tracker = dragon_vrf.VRFTracker(web3_manager, poll_interval=VRF_POLL_INTERVAL, timeout=VRF_TRACK_TIMEOUT,
+                                    retention=VRF_RETENTION, max_finished=VRF_MAX_FINISHED)
+
+# Incremental lottery and jackpot aggregates per chain
+activity_indexer = dragon_activity.ActivityIndexer(
+    web3_manager, BLOCK_TIMES, poll_interval=ACTIVITY_POLL_INTERVAL, confirmations=ACTIVITY_CONFIRMATIONS,
+    event_directory=os.path.join(DATA_DIR, "activity_events") if ACTIVITY_EVENTS_ENABLED else None)
+
+class ChainReadCache:
+    """
+    Values read from chain, kept for a TTL. Concurrent misses for the same
+    key share one fetch (run in a worker thread) instead of each hitting RPC.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._values: Dict[Any, Tuple[float, Any]] = {}
+        self._inflight: Dict[Any, "asyncio.Future"] = {}
+
+    def peek(self, key: Any) -> Optional[Any]:
+        entry = self._values.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def put(self, key: Any, value: Any, ttl: float) -> None:
+        self._values[key] = (time.monotonic() + ttl, value)
+
+    async def get(self, key: Any, ttl: float, fetch: Callable[[], Any]) -> Any:
+        with dragon_tracing.span(f"cache {self.name}", **{"cache.key": str(key)}) as span:
+            value = self.peek(key)
+            span.set_attribute("cache.hit", value is not None)
+            dragon_metrics.cache_lookup(self.name, value is not None)
+            if value is not None:
+                return value
+
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(asyncio.to_thread(fetch))
+                self._inflight[key] = task
+
+                def store(done: "asyncio.Future") -> None:
+                    self._inflight.pop(key, None)
+                    if not done.cancelled() and done.exception() is None:
+                        self.put(key, done.result(), ttl)
+
+                task.add_done_callback(store)
+            else:
+                span.set_attribute("cache.coalesced", True)
+            return await asyncio.shield(task)
+
+# Jackpot reads are fresh for one block; native prices for NATIVE_PRICE_TTL
+_jackpot_cache = ChainReadCache("jackpot")
+_native_prices = ChainReadCache("native_price")
+
+def wait_for_receipt(w3: "Web3", tx_hash: Any) -> Tuple[Optional[Any], Optional[str]]:
+    """
+    Receipt of a broadcast transaction, or (None, why) if none arrived in time.
+
+    Never raises: once a transaction is out, callers report its hash as
+    pending rather than an error that invites a duplicate retry.
+    """
+    try:
+        return w3.eth.wait_for_transaction_receipt(tx_hash, timeout=RECEIPT_TIMEOUT), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"[:300]
+
+def pending_result(tx_hash: Any, why: str, chain: str) -> Dict[str, Any]:
+    """Tool result for a transaction that was sent but not (yet) confirmed"""
+    return {
+        "success": True,
+        "status": "pending",
+        "tx_hash": "0x" + tx_hash.hex().removeprefix("0x"),
+        "chain": chain,
+        "note": f"Sent, but no receipt yet ({why}); check the hash before sending again"
+    }
+
+def send_oracle_update(chain: str):
+    """Sign and send oracle updatePrice(), then wait for it; returns (tx_hash, receipt or None, why)"""
+    w3 = web3_manager.get_web3(chain)
+    account = Account.from_key(PRIVATE_KEY)
+    oracle = web3_manager.get_contract(chain, "oracle")
+    
+    # Build transaction
+    tx = oracle.functions.updatePrice().build_transaction({
+        'from': account.address,
+        'nonce': w3.eth.get_transaction_count(account.address, "pending"),
+        'gas': 500000,
+        'gasPrice': w3.eth.gas_price
+    })
+    
+    # Sign and send
+    signed_tx = account.sign_transaction(tx)
+    tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+    
+    # Wait for confirmation
+    return (tx_hash, *wait_for_receipt(w3, tx_hash))
+
+# Primary oracle price for the keeper's cross-chain deviation check
+_primary_price = ChainReadCache("primary_price")
+
+def keeper_check(chain: str) -> Dict[str, Any]:
+    """Oracle snapshot the keeper decides on (see dragon_keeper.Keeper)"""
+    try:
+        sources = get_oracle_sources_reader().read(chain)
+    except Exception:
+        sources = None
+    if sources is not None:
+        status = sources["status"]
+        return {
+            "deviation_bps": sources["aggregate"].get("deviation_from_latest_bps"),
+            "age_seconds": sources["block_timestamp"] - status["last_update"] if status["last_update"] else None,
+            "is_fresh": status["is_fresh"],
+            "circuit_breaker_active": status["circuit_breaker_active"],
+            "emergency_mode": status["emergency_mode"],
+            "would_trip_breaker": sources["aggregate"].get("update_would_trip_breaker", False),
+            "source": "oracle_sources",
+        }
+
+    # Secondary oracles have no local sources: compare with the primary's price
+    _, ((ok, aggregated), (fresh_ok, fresh)) = web3_manager.multicall(
+        chain, [("oracle", "getAggregatedPrice", ()), ("oracle", "isFresh", ())])
+    if not ok:
+        raise aggregated
+    price, valid, timestamp = aggregated
+    primary = _primary_price.peek("sonic")
+    if primary is None:
+        primary = web3_manager.call_view("sonic", "oracle", "getAggregatedPrice")
+        _primary_price.put("sonic", primary, KEEPER_INTERVAL)
+    snapshot = {
+        "deviation_bps": None,
+        "age_seconds": time.time() - timestamp if valid and timestamp else None,
+        "is_fresh": fresh if fresh_ok else valid,
+        "source": "primary_oracle",
+    }
+    if valid and primary[1] and primary[0] > 0:
+        snapshot["deviation_bps"] = round((price - primary[0]) * 10000 / primary[0], 2)
+    return snapshot
+
+def keeper_gas_price(chain: str) -> float:
+    """Current gas price in gwei"""
+    return int(web3_manager.request(chain, "eth_gasPrice", []), 16) / 1e9
+
+def keeper_update(chain: str) -> Dict[str, Any]:
+    """Send updatePrice() and report a revert or missing receipt (the hosted server runs this through its write queue)"""
+    tx_hash, receipt, why = send_oracle_update(chain)
+    if receipt is None:
+        return pending_result(tx_hash, why, chain)
+    if receipt.status != 1:
+        return {"error": f"updatePrice reverted in {tx_hash.hex()}", "chain": chain}
+    return {"success": True, "tx_hash": tx_hash.hex(), "gas_used": receipt.gasUsed, "chain": chain}
+
+# Oracle keeper: schedules updatePrice when thresholds are crossed (off by default)
+keeper = dragon_keeper.Keeper(
+    keeper_check, keeper_gas_price, keeper_update,
+    KEEPER_CHAINS or [c for c in CHAIN_IDS if c in CONFIGURED_ADDRESSES["oracle"]],
+    interval=KEEPER_INTERVAL, jitter=KEEPER_JITTER, deviation_bps=KEEPER_DEVIATION_BPS,
+    stale_seconds=KEEPER_STALE_SECONDS,
+    max_gas_gwei=lambda chain: rate_limit_setting("DRAGON_MCP_KEEPER_MAX_GAS_GWEI", chain, "0"),
+    min_interval=KEEPER_MIN_INTERVAL, backoff=KEEPER_BACKOFF_SECONDS, max_backoff=KEEPER_MAX_BACKOFF_SECONDS,
+    dry_run=KEEPER_MODE == "dry-run")
+
+def _read_jackpot(chain: str) -> Dict[str, Any]:
+    """Jackpot balance in the chain's wrapped native token, valued with the (cached) native price"""
+    wrapped = web3_manager.resolve_address(chain, "wrapped_native")
+
+    calls = [("jackpot", "jackpotBalances", (wrapped,))]
+    native = _native_prices.peek(chain)
+    dragon_metrics.cache_lookup("native_price", native is not None)
+    if native is None:
+        calls.append(("oracle", "getNativeTokenPrice", ()))
+    block, results = web3_manager.multicall(chain, calls)
+
+    ok, balance = results[0]
+    if not ok:
+        raise balance
+    if native is None:
+        ok, value = results[1]
+        if ok:
+            price, is_valid, timestamp = value
+            native = {"price_usd": float(price) / 1e8, "is_valid": bool(is_valid), "timestamp": timestamp}
+        else:
+            native = {"price_usd": None, "is_valid": False, "error": str(value)}
+        _native_prices.put(chain, native, NATIVE_PRICE_TTL)
+
+    balance_native = float(balance) / 1e18
+    price_usd = native["price_usd"] if native["is_valid"] else None
+    return {
+        "chain": chain,
+        "block": block,
+        "wrapped_native": wrapped,
+        "balance_native": balance_native,
+        "native_price_usd": price_usd,
+        "balance_usd": balance_native * price_usd if price_usd is not None else None,
+    }
+
+async def get_jackpot_snapshot(chain: str) -> Dict[str, Any]:
+    """Cached jackpot valuation for one chain (re-read at most once per block)"""
+    return await _jackpot_cache.get(chain, BLOCK_TIMES.get(chain, 1.0), functools.partial(_read_jackpot, chain))
+
 # ================================
 # ORACLE MONITORING TOOLS
 # ================================
 
-@mcp.tool()
+@dragon_tool()
 async def get_dragon_price(chain: str = "sonic") -> Dict[str, Any]:
     """
     Get DRAGON price from oracle network.
@@ -401,11 +1756,10 @@ async def get_dragon_price(chain: str = "sonic") -> Dict[str, Any]:
         # Get price from appropriate oracle
         if chain == "sonic":
             # Primary oracle on Sonic - multi-source aggregation
-            oracle = web3_manager.get_contract("sonic", "oracle")
-            
             # Get aggregated price
             try:
-                price, success, timestamp = oracle.functions.getAggregatedPrice().call()
+                price, success, timestamp = await asyncio.to_thread(
+                    web3_manager.call_view, "sonic", "oracle", "getAggregatedPrice")
                 results["price_data"] = {
                     "price_usd": float(price) / 1e18,  # Convert from 18 decimals
                     "is_valid": success,
@@ -415,7 +1769,8 @@ async def get_dragon_price(chain: str = "sonic") -> Dict[str, Any]:
                 
                 # Get native token price (SONIC/USD) 
                 try:
-                    native_price, native_valid, native_ts = oracle.functions.getNativeTokenPrice().call()
+                    native_price, native_valid, native_ts = await asyncio.to_thread(
+                        web3_manager.call_view, "sonic", "oracle", "getNativeTokenPrice")
                     results["native_token"] = {
                         "price_usd": float(native_price) / 1e8,  # Usually 8 decimals
                         "is_valid": native_valid,
@@ -429,10 +1784,9 @@ async def get_dragon_price(chain: str = "sonic") -> Dict[str, Any]:
                 
         else:
             # Secondary oracle - queries primary via LayerZero lzRead
-            oracle = web3_manager.get_contract(chain, "oracle")
-            
             try:
-                price, success, timestamp = oracle.functions.getAggregatedPrice().call()
+                price, success, timestamp = await asyncio.to_thread(
+                    web3_manager.call_view, chain, "oracle", "getAggregatedPrice")
                 results["price_data"] = {
                     "price_usd": float(price) / 1e18,
                     "is_valid": success,
@@ -442,6 +1796,8 @@ async def get_dragon_price(chain: str = "sonic") -> Dict[str, Any]:
             except Exception as e:
                 results["price_data"] = {"error": str(e)}
         
+        _record_price(chain, results["price_data"])
+
         # Determine health status
         if results["price_data"].get("is_valid"):
             results["health_status"] = "healthy"
@@ -458,7 +1814,7 @@ async def get_dragon_price(chain: str = "sonic") -> Dict[str, Any]:
             "chain": chain
         }
 
-@mcp.tool()
+@dragon_tool()
 async def check_oracle_health() -> Dict[str, Any]:
     """
     Monitor health of oracle network across all chains.
@@ -533,7 +1889,31 @@ async def check_oracle_health() -> Dict[str, Any]:
             "overall_status": "error"
         }
 
-@mcp.tool()
+@dragon_tool()
+async def get_oracle_sources(chain: str = "sonic") -> Dict[str, Any]:
+    """
+    Break the DRAGON oracle price down by source.
+    
+    Reads the oracle's status, configuration and freshness together with the
+    latest Chainlink, Band, API3 and Pyth values behind it in one Multicall3
+    call, and judges each source the way the oracle's weighted average does.
+    
+    Args:
+        chain: Chain whose OmniDragonPriceOracle to inspect
+    
+    Returns:
+        Oracle status, each source's price, age, weight and deviation from the
+        weighted average, flags for stale, failed or breaker-tripping sources,
+        and alerts
+    """
+    if chain not in CHAIN_IDS:
+        return {"error": f"Unsupported chain: {chain}", "supported_chains": list(CHAIN_IDS)}
+    try:
+        return await asyncio.to_thread(get_oracle_sources_reader().read, chain)
+    except Exception as e:
+        return {"error": f"Failed to read oracle sources: {str(e)}", "chain": chain}
+
+@dragon_tool(write=True)
 async def update_oracle_price(chain: str = "sonic") -> Dict[str, Any]:
     """
     Manually trigger oracle price update.
@@ -542,45 +1922,114 @@ async def update_oracle_price(chain: str = "sonic") -> Dict[str, Any]:
         chain: Chain to update (sonic for primary, others for secondary)
         
     Returns:
-        Transaction result and updated price data
+        Transaction result and updated price data, or status "pending" with
+        the hash when the receipt does not arrive in time
     """
     if not PRIVATE_KEY:
         return {"error": "No private key configured for transactions"}
         
     try:
-        w3 = web3_manager.get_web3(chain)
-        account = Account.from_key(PRIVATE_KEY)
-        oracle = web3_manager.get_contract(chain, "oracle")
-        
-        # Build transaction
-        tx = oracle.functions.updatePrice().build_transaction({
-            'from': account.address,
-            'nonce': w3.eth.get_transaction_count(account.address),
-            'gas': 500000,
-            'gasPrice': w3.eth.gas_price
-        })
-        
-        # Sign and send
-        signed_tx = account.sign_transaction(tx)
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        
-        # Wait for confirmation
-        receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-        
-        # Get updated price
-        updated_price = await get_dragon_price(chain)
-        
+        # Off the event loop: confirmation can take minutes
+        tx_hash, receipt, why = await asyncio.to_thread(send_oracle_update, chain)
+    except Exception as e:
         return {
-            "success": True,
-            "tx_hash": tx_hash.hex(),
-            "gas_used": receipt.gasUsed,
-            "updated_price": updated_price,
+            "error": f"Failed to update oracle price: {str(e)}",
             "chain": chain
         }
-        
+
+    # Sent: from here on report the hash, never an error that invites a resend
+    if receipt is None:
+        return pending_result(tx_hash, why, chain)
+    if receipt.status != 1:
+        return {"error": f"updatePrice reverted in {tx_hash.hex()}", "status": "reverted",
+                "tx_hash": tx_hash.hex(), "chain": chain}
+    try:
+        # Get updated price
+        updated_price = await get_dragon_price(chain)
+    except Exception as e:
+        updated_price = {"error": f"Failed to read the updated price: {str(e)}"}
+
+    return {
+        "success": True,
+        "tx_hash": tx_hash.hex(),
+        "gas_used": receipt.gasUsed,
+        "updated_price": updated_price,
+        "chain": chain
+    }
+
+@dragon_tool(requires_web3=False)
+async def get_keeper_status() -> Dict[str, Any]:
+    """
+    State of the oracle keeper (DRAGON_MCP_KEEPER=dry-run or on).
+    
+    Returns:
+        Mode, thresholds, and per chain: the last oracle check, whether an
+        update is in flight, backoff, coalesced triggers and recent decisions
+    """
+    if KEEPER_MODE not in ("dry-run", "on"):
+        return {"error": "Oracle keeper is off (set DRAGON_MCP_KEEPER=dry-run or on)"}
+    report = keeper.snapshot()
+    if report["running"]:
+        pass
+    elif not _indexers_started:
+        report["note"] = "Not started: the keeper starts with warm or eager startup, never with DRAGON_MCP_STARTUP=lazy"
+    elif _keeper_lock is None:
+        report["note"] = "Not running in this process; only one keeper per signer runs on a host (see keeper-*.lock in DATA_DIR)"
+    return report
+
+@dragon_tool(requires_web3=False)
+async def get_price_history(chain: str = "sonic", start: Optional[float] = None,
+                            end: Optional[float] = None, interval_seconds: Optional[float] = None,
+                            window: int = 20, limit: int = 100) -> Dict[str, Any]:
+    """
+    Query recorded DRAGON oracle prices for a chain.
+
+    Every get_dragon_price / check_oracle_health reading is recorded.
+
+    Args:
+        chain: Chain whose history to query
+        start: Unix timestamp to start from (default: 24 hours ago)
+        end: Unix timestamp to end at (default: now)
+        interval_seconds: If set, return OHLC bars of this width instead of raw samples
+        window: Number of samples in the rolling deviation window
+        limit: Maximum number of samples or bars returned (the most recent are kept)
+
+    Returns:
+        Samples or OHLC bars plus deviation, volatility and staleness statistics
+    """
+    if chain not in CHAIN_IDS:
+        return {"error": f"Unsupported chain: {chain}", "supported_chains": list(CHAIN_IDS)}
+    try:
+        store = get_price_history_store()
+        if store is None:
+            return {"error": "Price history is disabled (set DRAGON_MCP_PRICE_HISTORY=1 and install numpy)"}
+
+        import dragon_history
+        now = time.time()
+        start = now - 86400 if start is None else start
+        end = now if end is None else end
+        history = store.chain(chain)
+        records = await asyncio.to_thread(history.range, start, end)
+
+        result = {
+            "chain": chain,
+            "start": start,
+            "end": end,
+            "stored_samples": len(history),
+            "capacity": history.capacity,
+            "statistics": dragon_history.statistics(records, window=window),
+        }
+        if interval_seconds:
+            bars = dragon_history.ohlc(records, interval_seconds)
+            result["interval_seconds"] = interval_seconds
+            result["ohlc"] = bars[-limit:] if limit > 0 else []
+        else:
+            result["samples"] = dragon_history.samples(records, limit)
+        return result
+
     except Exception as e:
         return {
-            "error": f"Failed to update oracle price: {str(e)}",
+            "error": f"Failed to query price history: {str(e)}",
             "chain": chain
         }
 
@@ -588,7 +2037,7 @@ async def update_oracle_price(chain: str = "sonic") -> Dict[str, Any]:
 # LOTTERY SYSTEM TOOLS  
 # ================================
 
-@mcp.tool()
+@dragon_tool()
 async def get_lottery_stats(chain: str) -> Dict[str, Any]:
     """
     Get lottery statistics for a specific chain.
@@ -600,20 +2049,16 @@ async def get_lottery_stats(chain: str) -> Dict[str, Any]:
         Lottery configuration, jackpot balances, and activity stats
     """
     try:
-        lottery = web3_manager.get_contract(chain, "lottery")
-        jackpot = web3_manager.get_contract(chain, "jackpot")
-        omnidragon = web3_manager.get_contract(chain, "omnidragon")
-        
         # Get lottery configuration
-        is_active, min_entry, max_win_chance, base_reward = lottery.functions.getInstantLotteryConfig().call()
+        is_active, min_entry, max_win_chance, base_reward = await asyncio.to_thread(
+            web3_manager.call_view, chain, "lottery", "getInstantLotteryConfig"
+        )
         
-        # Get jackpot balance (in wrapped native token)
-        w3 = web3_manager.get_web3(chain)
-        wrapped_native = "0x4200000000000000000000000000000000000006"  # Example: WETH on Base
-        jackpot_balance = jackpot.functions.jackpotBalances(wrapped_native).call()
+        # Get jackpot balance (in the chain's wrapped native token) and its USD value
+        jackpot = await get_jackpot_snapshot(chain)
         
         # Get DRAGON token stats
-        dragon_total_supply = omnidragon.functions.totalSupply().call()
+        dragon_total_supply = await asyncio.to_thread(web3_manager.call_view, chain, "omnidragon", "totalSupply")
         
         return {
             "chain": chain,
@@ -624,8 +2069,11 @@ async def get_lottery_stats(chain: str) -> Dict[str, Any]:
                 "base_reward_usd": float(base_reward) / 1e6
             },
             "jackpot": {
-                "balance_native": float(jackpot_balance) / 1e18,
-                "balance_usd": None  # Would need oracle to calculate
+                "balance_native": jackpot["balance_native"],
+                "balance_usd": jackpot["balance_usd"],
+                "native_price_usd": jackpot["native_price_usd"],
+                "wrapped_native": jackpot["wrapped_native"],
+                "block": jackpot["block"]
             },
             "dragon_token": {
                 "total_supply": float(dragon_total_supply) / 1e18,
@@ -640,7 +2088,80 @@ async def get_lottery_stats(chain: str) -> Dict[str, Any]:
             "chain": chain
         }
 
-@mcp.tool()
+@dragon_tool()
+async def get_global_jackpot(chains: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Value the jackpot vaults on every chain and total them in USD.
+
+    Chains are read concurrently, one Multicall3 batch each. Results are
+    cached for one block per chain, so repeat queries don't re-read them.
+
+    Args:
+        chains: Chains to include (default: every chain with a configured jackpot vault)
+
+    Returns:
+        Per-chain balances in wrapped native token and USD, plus the global USD total
+    """
+    try:
+        chains = chains or [c for c in JACKPOT_VAULTS if web3_manager.has_address(c, "jackpot")]
+        snapshots = await asyncio.gather(*(get_jackpot_snapshot(c) for c in chains), return_exceptions=True)
+
+        report = {
+            "chains": {},
+            "total_usd": 0.0,
+            "unpriced_chains": [],
+            "errors": {},
+            "timestamp": int(time.time())
+        }
+        for chain, snapshot in zip(chains, snapshots):
+            if isinstance(snapshot, Exception):
+                report["errors"][chain] = str(snapshot)
+                continue
+            report["chains"][chain] = snapshot
+            if snapshot["balance_usd"] is None:
+                report["unpriced_chains"].append(chain)
+            else:
+                report["total_usd"] += snapshot["balance_usd"]
+
+        if not report["chains"]:
+            return {"error": "Failed to read any jackpot vault", "errors": report["errors"]}
+        return report
+
+    except Exception as e:
+        return {"error": f"Failed to value global jackpot: {str(e)}"}
+
+@dragon_tool()
+async def get_lottery_activity(chain: str = "sonic") -> Dict[str, Any]:
+    """
+    Live lottery participation and jackpot flows for a chain.
+    
+    Aggregates over the last 5 minutes, hour and day are kept up to date from
+    InstantLotteryProcessed, JackpotAdded and JackpotPaid events by a
+    background indexer, so reading them makes no RPC. The first call for a
+    chain starts its indexer, which backfills a day of events first;
+    `indexer.backfilled` says when the windows are complete.
+    
+    Args:
+        chain: Chain to report
+    
+    Returns:
+        Per window: entries and entries per minute, USD volume, win rate,
+        rewards, jackpot inflows and payouts, entry size and reward histograms
+    """
+    if chain not in CHAIN_IDS:
+        return {"error": f"Unsupported chain: {chain}", "supported_chains": list(CHAIN_IDS)}
+    if not (web3_manager.has_address(chain, "lottery") or web3_manager.has_address(chain, "jackpot")):
+        return {"error": f"No lottery manager or jackpot vault configured for {chain}"}
+
+    try:
+        activity_indexer.track(chain)
+        # The report waits on the indexer's lock, which ingestion holds
+        return await asyncio.to_thread(activity_indexer.report, chain)
+
+    except Exception as e:
+        return {"error": f"Failed to read lottery activity: {str(e)}", "chain": chain}
+
+@dragon_tool()
 async def simulate_lottery(usd_amount: float, chain: str = "sonic") -> Dict[str, Any]:
     """
     Simulate lottery win probability for a given USD amount.
@@ -653,8 +2174,6 @@ async def simulate_lottery(usd_amount: float, chain: str = "sonic") -> Dict[str,
         Win probability and expected rewards
     """
     try:
-        lottery = web3_manager.get_contract(chain, "lottery")
-        
         # Convert USD to contract format (6 decimals)
         usd_amount_scaled = int(usd_amount * 1e6)
         
@@ -662,9 +2181,9 @@ async def simulate_lottery(usd_amount: float, chain: str = "sonic") -> Dict[str,
         test_user = "0x1234567890123456789012345678901234567890"
         
         # Get win probability
-        has_chance, win_chance_ppm = lottery.functions.calculateWinProbability(
-            test_user, usd_amount_scaled
-        ).call()
+        has_chance, win_chance_ppm = await asyncio.to_thread(
+            web3_manager.call_view, chain, "lottery", "calculateWinProbability", test_user, usd_amount_scaled
+        )
         
         # Calculate win percentage
         win_percentage = float(win_chance_ppm) / 10000  # PPM to percentage
@@ -697,7 +2216,7 @@ async def simulate_lottery(usd_amount: float, chain: str = "sonic") -> Dict[str,
             "chain": chain
         }
 
-@mcp.tool()
+@dragon_tool(write=True)
 async def test_lottery_entry(chain: str, user_address: str, dragon_amount: float) -> Dict[str, Any]:
     """
     Test a lottery entry transaction.
@@ -716,7 +2235,7 @@ async def test_lottery_entry(chain: str, user_address: str, dragon_amount: float
             "note": "Set PRIVATE_KEY environment variable to execute transactions"
         }
         
-    try:
+    def send():
         w3 = web3_manager.get_web3(chain)
         account = Account.from_key(PRIVATE_KEY)
         lottery = web3_manager.get_contract(chain, "lottery")
@@ -730,7 +2249,7 @@ async def test_lottery_entry(chain: str, user_address: str, dragon_amount: float
             dragon_amount_wei
         ).build_transaction({
             'from': account.address,
-            'nonce': w3.eth.get_transaction_count(account.address),
+            'nonce': w3.eth.get_transaction_count(account.address, "pending"),
             'gas': 500000,
             'gasPrice': w3.eth.gas_price
         })
@@ -743,7 +2262,7 @@ async def test_lottery_entry(chain: str, user_address: str, dragon_amount: float
         except Exception as sim_error:
             simulation_success = False
             simulation_error = str(sim_error)
-            
+        
         if not simulation_success:
             return {
                 "simulation_failed": True,
@@ -756,7 +2275,17 @@ async def test_lottery_entry(chain: str, user_address: str, dragon_amount: float
         tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
         
         # Wait for confirmation
-        receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+        return (tx_hash, *wait_for_receipt(w3, tx_hash))
+        
+    try:
+        # Off the event loop: confirmation can take minutes
+        sent = await asyncio.to_thread(send)
+        if isinstance(sent, dict):
+            return sent
+        tx_hash, receipt, why = sent
+        if receipt is None:
+            return dict(pending_result(tx_hash, why, chain), user_address=user_address,
+                        dragon_amount=dragon_amount)
         
         return {
             "success": True,
@@ -774,11 +2303,99 @@ async def test_lottery_entry(chain: str, user_address: str, dragon_amount: float
             "chain": chain
         }
 
+@dragon_tool()
+async def simulate_entries(chain: str, user_address: str, amounts: List[float], mode: str = "probability",
+                           holdings: Optional[Dict[str, float]] = None,
+                           overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+                           block: Optional[int] = None) -> Dict[str, Any]:
+    """
+    What-if lottery sweeps on a local fork of chain state.
+    
+    Runs OmniDragonLotteryManager in a local EVM at one block, once per
+    amount. Contract state is fetched once and cached, so repeat runs make
+    no RPC; nothing is ever sent.
+    
+    Args:
+        chain: Chain to fork
+        user_address: User entering the lottery
+        amounts: USD amounts ("probability") or DRAGON amounts ("entry")
+        mode: "probability" runs calculateWinProbability; "entry" dry-runs
+              processEntryWithDragon as called by the DRAGON token
+        holdings: Token balances to give the user first, e.g. {"vedragon": 5000}
+                  (dragon, reddragon, vedragon; whole tokens)
+        overrides: Extra eth_call-style state overrides
+        block: Block to fork at (default: latest finalized)
+    
+    Returns:
+        Result per amount, local execution time and fork cache statistics
+    """
+    if mode not in ("probability", "entry"):
+        return {"error": f"Unknown mode: {mode} (use probability or entry)"}
+    if chain not in CHAIN_IDS:
+        return {"error": f"Unsupported chain: {chain}", "supported_chains": list(CHAIN_IDS)}
+
+    def run() -> Dict[str, Any]:
+        user = _validate_address(user_address, "user", chain)
+        fork = get_fork(chain, block if block is not None else web3_manager.finalized_block(chain))
+        lottery = web3_manager.resolve_address(chain, "lottery")
+
+        import dragon_fork
+        layers, supply_adjusted = [], {}
+        for name, amount in (holdings or {}).items():
+            if name not in dragon_snapshot.TOKENS:
+                raise ValueError(f"Unknown token: {name} (choose from {', '.join(dragon_snapshot.TOKENS)})")
+            token = web3_manager.resolve_address(chain, dragon_snapshot.TOKENS[name])
+            layer, supply_adjusted[name] = fork.balance_override(token, user, int(amount * 10**18))
+            layers.append(layer)
+        state = dragon_fork.merge_overrides(*layers, overrides or {})
+
+        if mode == "probability":
+            signature, sender, scale = "calculateWinProbability(address,uint256)", None, 10**6
+        else:
+            # Only the DRAGON token may call processEntryWithDragon
+            signature, scale = "processEntryWithDragon(address,uint256)", 10**18
+            sender = web3_manager.resolve_address(chain, "omnidragon")
+        selector = function_selector(signature)
+
+        results = []
+        for amount in amounts:
+            data = selector + encode_address(user) + encode_uint(int(amount * scale))
+            outcome = fork.call(lottery, data, sender=sender, overrides=state)
+            row = {"amount": amount, "success": outcome.success, "seconds": round(outcome.seconds, 6)}
+            if not outcome.success:
+                row["error"] = outcome.error
+            elif mode == "probability":
+                # The contract returns (baseProbability, boostedProbability) in PPM
+                base, boosted = decode_uint(outcome.output[:32]), decode_uint(outcome.output[32:64])
+                row.update(base_ppm=base, boosted_ppm=boosted, win_percentage=boosted / 10000)
+            else:
+                row.update(gas_used=outcome.gas_used, events=len(outcome.logs))
+            results.append(row)
+
+        return {
+            "chain": chain,
+            "block": fork.block,
+            "mode": mode,
+            "user_address": user,
+            "holdings": holdings or {},
+            "total_supply_adjusted": supply_adjusted,
+            "results": results,
+            "local_seconds": round(sum(row["seconds"] for row in results), 6),
+            "fork": fork.stats(),
+        }
+
+    try:
+        return await asyncio.to_thread(run)
+    except ImportError:
+        return {"error": "Fork simulation needs py-evm (pip install py-evm)"}
+    except Exception as e:
+        return {"error": f"Failed to simulate entries: {str(e)}", "chain": chain}
+
 # ================================
 # LAYERZERO & CROSS-CHAIN TOOLS
 # ================================
 
-@mcp.tool()
+@dragon_tool()
 async def check_layerzero_status(tx_hash: str, chain: str) -> Dict[str, Any]:
     """
     Check status of LayerZero cross-chain message.
@@ -791,10 +2408,8 @@ async def check_layerzero_status(tx_hash: str, chain: str) -> Dict[str, Any]:
         Message status and delivery information
     """
     try:
-        w3 = web3_manager.get_web3(chain)
-        
-        # Get transaction receipt
-        receipt = w3.eth.get_transaction_receipt(tx_hash)
+        # Finalized receipts come from the shared chain cache without any RPC
+        receipt = await asyncio.to_thread(web3_manager.get_receipt, chain, tx_hash)
         
         if not receipt:
             return {
@@ -805,25 +2420,26 @@ async def check_layerzero_status(tx_hash: str, chain: str) -> Dict[str, Any]:
         
         # Parse LayerZero events from logs
         layerzero_events = []
-        for log in receipt.logs:
+        for log in receipt["logs"]:
             # Look for common LayerZero event signatures
-            if len(log.topics) > 0:
-                topic = log.topics[0].hex()
-                if "layerzero" in topic.lower() or len(log.data) > 64:  # Simplified detection
+            if len(log["topics"]) > 0:
+                topic = log["topics"][0][2:]
+                data = log["data"][2:]
+                if "layerzero" in topic.lower() or len(data) > 128:  # Simplified detection (> 64 bytes)
                     layerzero_events.append({
                         "topic": topic,
-                        "data": log.data.hex(),
-                        "address": log.address
+                        "data": data,
+                        "address": Web3.to_checksum_address(log["address"])
                     })
         
         return {
             "tx_hash": tx_hash,
             "chain": chain,
-            "status": "confirmed" if receipt.status == 1 else "failed",
-            "block_number": receipt.blockNumber,
-            "gas_used": receipt.gasUsed,
+            "status": "confirmed" if int(receipt["status"], 16) == 1 else "failed",
+            "block_number": int(receipt["blockNumber"], 16),
+            "gas_used": int(receipt["gasUsed"], 16),
             "layerzero_events": layerzero_events,
-            "logs_count": len(receipt.logs)
+            "logs_count": len(receipt["logs"])
         }
         
     except Exception as e:
@@ -833,7 +2449,7 @@ async def check_layerzero_status(tx_hash: str, chain: str) -> Dict[str, Any]:
             "chain": chain
         }
 
-@mcp.tool()
+@dragon_tool(requires_web3=False)
 async def estimate_layerzero_fee(source_chain: str, dest_chain: str, payload_size: int = 32) -> Dict[str, Any]:
     """
     Estimate LayerZero V2 messaging fee.
@@ -885,22 +2501,30 @@ async def estimate_layerzero_fee(source_chain: str, dest_chain: str, payload_siz
 # VRF TOOLS
 # ================================
 
-@mcp.tool()
-async def request_vrf_randomness(chain: str = "arbitrum", num_words: int = 1) -> Dict[str, Any]:
+@dragon_tool(write=True)
+async def request_vrf_randomness(chain: str = "arbitrum") -> Dict[str, Any]:
     """
     Request Chainlink VRF V2.5 randomness.
     
+    On Arbitrum the request goes straight to OmniDragonVRFConsumerV2_5 (the
+    signer must be an authorized local caller); on other chains it goes
+    through ChainlinkVRFIntegratorV2_5 and LayerZero, paying the quoted fee.
+    Returns as soon as the transaction is sent; fulfilment is tracked in the
+    background.
+    
     Args:
-        chain: Chain to request from (currently only Arbitrum supported)
-        num_words: Number of random words (1-500)
+        chain: Chain to request from
         
     Returns:
-        VRF request details
+        Handle for get_vrf_request, transaction hash and fee paid
     """
-    if chain != "arbitrum":
+    local = chain == vrf_tracker.consumer_chain
+    contract_type = "vrf_consumer" if local else "vrf_integrator"
+    if not web3_manager.has_address(chain, contract_type):
         return {
-            "error": "VRF currently only supported on Arbitrum",
-            "supported_chains": ["arbitrum"]
+            "error": f"No VRF {'consumer' if local else 'integrator'} configured for {chain}",
+            "supported_chains": [c for c in CHAIN_IDS if web3_manager.has_address(
+                c, "vrf_consumer" if c == vrf_tracker.consumer_chain else "vrf_integrator")]
         }
         
     if not PRIVATE_KEY:
@@ -909,14 +2533,42 @@ async def request_vrf_randomness(chain: str = "arbitrum", num_words: int = 1) ->
             "note": "Set PRIVATE_KEY environment variable"
         }
     
+    def send():
+        w3 = web3_manager.get_web3(chain)
+        account = Account.from_key(PRIVATE_KEY)
+        contract = web3_manager.get_contract(chain, contract_type)
+        
+        fee = 0
+        if local:
+            function = contract.functions.requestRandomWordsLocal()
+        else:
+            fee, _ = web3_manager.call_view(chain, "vrf_integrator", "quoteSimple")
+            function = contract.functions.requestRandomWordsSimple()
+        
+        tx = function.build_transaction({
+            'from': account.address,
+            'value': fee,
+            'nonce': w3.eth.get_transaction_count(account.address, "pending"),
+            'gas': 500000,
+            'gasPrice': w3.eth.gas_price
+        })
+        signed_tx = account.sign_transaction(tx)
+        return fee, "0x" + w3.eth.send_raw_transaction(signed_tx.raw_transaction).hex().removeprefix("0x")
+        
     try:
+        # Off the event loop: the RPCs can wait on the endpoint's rate limiter
+        fee, tx_hash = await asyncio.to_thread(send)
+        
+        request = vrf_tracker.track(chain, "local" if local else "cross_chain", tx_hash)
         return {
             "success": True,
-            "simulation": True,
+            "handle": request.handle,
+            "tx_hash": tx_hash,
             "chain": chain,
-            "num_words": num_words,
-            "estimated_cost": "0.002 ETH (~$5)",
-            "note": "VRF integration ready - implement with actual contract deployment"
+            "mode": request.mode,
+            "fee_native": fee / 1e18,
+            "status": request.status,
+            "note": "Poll get_vrf_request with the handle for fulfilment"
         }
         
     except Exception as e:
@@ -925,6 +2577,405 @@ async def request_vrf_randomness(chain: str = "arbitrum", num_words: int = 1) ->
             "chain": chain
         }
 
+@dragon_tool(requires_web3=False)
+async def get_vrf_request(handle: str) -> Dict[str, Any]:
+    """
+    Status of a VRF request sent by request_vrf_randomness.
+    
+    Args:
+        handle: Handle returned by request_vrf_randomness
+        
+    Returns:
+        Current stage, block timestamps and latency per stage, and the
+        random words once delivered
+    """
+    request = vrf_tracker.get(handle)
+    if request is None:
+        return {"error": f"Unknown VRF request handle: {handle}"}
+    return request.report()
+
+@dragon_tool(requires_web3=False)
+async def get_vrf_stats() -> Dict[str, Any]:
+    """
+    VRF request outcomes and latency percentiles.
+    
+    Returns:
+        Requests by status (including expired and timed out) and p50/p90/p99
+        seconds for the LayerZero request hop, VRF fulfilment, the
+        LayerZero response hop and end to end
+    """
+    try:
+        return vrf_tracker.stats()
+    except Exception as e:
+        return {"error": f"Failed to collect VRF stats: {str(e)}"}
+
+# ================================
+# REVENUE TOOLS
+# ================================
+
+@dragon_tool()
+async def get_bulk_claimable(chain: str, users: List[str], epochs: Optional[List[int]] = None,
+                             tokens: Optional[List[str]] = None, output_path: Optional[str] = None,
+                             chunk_size: int = 200, recheck_unclaimed: bool = True,
+                             max_rows: int = 1000) -> Dict[str, Any]:
+    """
+    veDRAGON revenue claimable per user, epoch and token, for payout reports.
+    
+    Reads are batched through Multicall3 at one pinned block. Closed epochs
+    are final, so entitlements are cached on disk and repeat reports only
+    re-check whether unclaimed rows have since been claimed.
+    
+    Args:
+        chain: Chain of the veDRAGONRevenueDistributor
+        users: User addresses
+        epochs: Epochs to report (default: every closed epoch)
+        tokens: Fee tokens (default: the distributor's wrapped native and reward tokens)
+        output_path: Also write every row to this JSONL file
+        chunk_size: User/epoch/token rows per multicall
+        recheck_unclaimed: Re-read the claimed flag of cached unclaimed rows
+        max_rows: Rows to include in the response (totals always cover all)
+        
+    Returns:
+        Per-token totals, pinned block, and up to max_rows rows (amounts in wei)
+    """
+    if not web3_manager.has_address(chain, "revenue_distributor"):
+        return {"error": f"No veDRAGON revenue distributor configured for {chain}"}
+    try:
+        users = [web3_manager.resolve_address(chain, "user", user) for user in users]
+    except ValueError as e:
+        return {"error": str(e)}
+
+    def run() -> Dict[str, Any]:
+        rows_iter = dragon_revenue.iter_claimable(
+            web3_manager, chain, users, epochs, tokens, max(1, chunk_size), recheck_unclaimed)
+        header = next(rows_iter)
+        totals: Dict[str, Dict[str, Any]] = {}
+        kept: List[Dict[str, Any]] = []
+        count = 0
+        out = open(output_path, "w") if output_path else None
+        try:
+            for rows in rows_iter:
+                dragon_revenue.summarize(rows, totals)
+                count += len(rows)
+                if out is not None:
+                    out.writelines(json.dumps(row) + "\n" for row in rows)
+                kept.extend(rows[:max(0, max_rows - len(kept))])
+        finally:
+            if out is not None:
+                out.close()
+        for stats in totals.values():
+            stats["claimable_native"] = stats["claimable"] / 1e18
+        return {**header, "rows_total": count, "totals": totals, "rows": kept,
+                "truncated": count > len(kept), "output_path": output_path}
+
+    try:
+        return await asyncio.to_thread(run)
+    except Exception as e:
+        return {"error": f"Failed to compute claimable revenue: {str(e)}", "chain": chain}
+
+@dragon_tool()
+async def get_fee_flows(chains: Optional[List[str]] = None, start: Optional[float] = None,
+                        end: Optional[float] = None, interval_seconds: float = 86400) -> Dict[str, Any]:
+    """
+    Jackpot, veDRAGON and burn fee flows from omniDRAGON per period and chain.
+    
+    Fee distribution events are indexed in the background into a local
+    columnar store, so reports over months answer without RPC. The first
+    query for a chain starts its indexer (DRAGON_MCP_FEE_BACKFILL_DAYS of
+    history); `coverage` shows how far each chain has been indexed.
+    
+    Args:
+        chains: Chains to include (default: every chain with omniDRAGON configured)
+        start: Unix timestamp to start from (default: 30 days ago)
+        end: Unix timestamp to end at (default: now)
+        interval_seconds: Period width for the per-period totals (default: one day;
+            widened when the range would need more than 10,000 periods)
+    
+    Returns:
+        Totals by flow and side, per-chain totals with actual vs configured
+        getFees() split, per-period totals (DRAGON) and indexing coverage
+    """
+    indexer = get_fee_indexer()
+    if indexer is None:
+        return {"error": "Fee flows are disabled (set DRAGON_MCP_FEE_FLOWS=1 and install numpy)"}
+    chains = chains or [c for c in CHAIN_IDS if web3_manager.has_address(c, "omnidragon")]
+    unknown = [c for c in chains if c not in CHAIN_IDS]
+    if unknown:
+        return {"error": f"Unsupported chains: {unknown}", "supported_chains": list(CHAIN_IDS)}
+    if interval_seconds <= 0:
+        return {"error": "interval_seconds must be positive"}
+    now = time.time()
+    start = now - 30 * 86400 if start is None else start
+    end = now if end is None else end
+    if start >= end:
+        return {"error": "start must be before end"}
+    import dragon_fees
+    requested_interval = interval_seconds
+    # Widen the periods so the report never exceeds MAX_PERIODS of them
+    interval_seconds = max(interval_seconds, math.ceil((end - start) / dragon_fees.MAX_PERIODS))
+
+    async def configured(chain: str) -> Dict[str, Any]:
+        buy, sell = await asyncio.to_thread(web3_manager.call_view, chain, "omnidragon", "getFees")
+        return {"buy": buy, "sell": sell}
+
+    try:
+        for chain in chains:
+            indexer.track(chain)
+        fees = await asyncio.gather(*(configured(c) for c in chains), return_exceptions=True)
+
+        def run() -> Dict[str, Any]:
+            selections = {chain: indexer.store(chain).range(start, end) for chain in chains}
+            report = dragon_fees.fee_report(selections, start, end, interval_seconds, {
+                chain: value for chain, value in zip(chains, fees) if not isinstance(value, Exception)})
+            result = {"start": start, "end": end, "interval_seconds": interval_seconds}
+            if interval_seconds != requested_interval:
+                result["note"] = f"interval_seconds raised from {requested_interval} to stay within {dragon_fees.MAX_PERIODS} periods"
+            return {**result, **report,
+                    "coverage": {chain: indexer.coverage(chain) for chain in chains}}
+
+        report = await asyncio.to_thread(run)
+        errors = {chain: f"getFees failed: {value}" for chain, value in zip(chains, fees) if isinstance(value, Exception)}
+        if errors:
+            report["errors"] = errors
+        return report
+
+    except Exception as e:
+        return {"error": f"Failed to report fee flows: {str(e)}"}
+
+# ================================
+# SNAPSHOT TOOLS
+# ================================
+
+@dragon_tool()
+async def snapshot_balances(addresses: Optional[List[str]] = None, addresses_path: Optional[str] = None,
+                            chains: Optional[List[str]] = None, tokens: Optional[List[str]] = None,
+                            output_path: Optional[str] = None, blocks: Optional[Dict[str, int]] = None,
+                            chunk_size: int = 250, max_rows: int = 1000) -> Dict[str, Any]:
+    """
+    Snapshot DRAGON, redDRAGON and veDRAGON balances of many holders.
+    
+    Every chain is pinned to one block and read in Multicall3 chunks, so
+    100k holders take a few hundred calls per chain. With output_path the
+    snapshot streams to a JSONL file of columnar chunks in bounded memory.
+    
+    Args:
+        addresses: Holder addresses
+        addresses_path: File with one holder address per line (or CSV, first column)
+        chains: Chains to snapshot (default: all)
+        tokens: Any of dragon, reddragon, vedragon (default: all three)
+        output_path: Write one columnar record per chunk to this JSONL file
+        blocks: Block number per chain (default: latest when the snapshot starts)
+        chunk_size: Addresses per multicall batch (each reads every token)
+        max_rows: Addresses whose balances are included in the response
+        
+    Returns:
+        Pinned blocks, per chain/token totals and holder counts, and columnar
+        balances (wei) for up to max_rows addresses
+    """
+    if (addresses is None) == (addresses_path is None):
+        return {"error": "Pass exactly one of addresses or addresses_path"}
+    chains = chains or list(CHAIN_IDS)
+    unknown = [c for c in chains if c not in CHAIN_IDS]
+    if unknown:
+        return {"error": f"Unsupported chains: {', '.join(unknown)}", "supported_chains": list(CHAIN_IDS)}
+    try:
+        holders = (dragon_snapshot.read_addresses(addresses_path) if addresses_path
+                   else [dragon_snapshot.normalize_address(a) for a in addresses])
+    except (OSError, ValueError) as e:
+        return {"error": str(e)}
+
+    def run() -> Dict[str, Any]:
+        records = dragon_snapshot.iter_snapshot(web3_manager, chains, holders, tokens, max(1, chunk_size), blocks)
+        header = next(records)
+        totals: Dict[str, Dict[str, Dict[str, int]]] = {}
+        kept = {"addresses": [], "balances": {}}
+        count, failed_chunks = 0, []
+        out = open(output_path, "w") if output_path else None
+        try:
+            if out is not None:
+                out.write(json.dumps(header) + "\n")
+            for record in records:
+                dragon_snapshot.summarize(record, totals)
+                count += len(record["addresses"])
+                if "errors" in record:
+                    failed_chunks.append({"offset": record["offset"], "errors": record["errors"]})
+                if out is not None:
+                    out.write(json.dumps(record, separators=(",", ":")) + "\n")
+                room = max(0, max_rows - len(kept["addresses"]))
+                if room:
+                    kept["addresses"] += record["addresses"][:room]
+                    for chain, columns in record["balances"].items():
+                        for token, column in columns.items():
+                            kept["balances"].setdefault(chain, {}).setdefault(token, []).extend(column[:room])
+        finally:
+            if out is not None:
+                out.close()
+        return {**header, "addresses_total": count, "totals": totals, **kept,
+                "truncated": count > len(kept["addresses"]), "failed_chunks": failed_chunks[:20],
+                "output_path": output_path}
+
+    try:
+        return await asyncio.to_thread(run)
+    except Exception as e:
+        return {"error": f"Failed to snapshot balances: {str(e)}"}
+
+# ================================
+# DIAGNOSTIC TOOLS
+# ================================
+
+def _parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """Parse `python -X importtime` stderr into per-module timings"""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            modules.append({
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            })
+        except ValueError:
+            continue
+    return modules
+
+async def _profile_cold_import(top: int) -> Dict[str, Any]:
+    """Import this module plus the web3 stack in a fresh interpreter under -X importtime"""
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, DRAGON_MCP_STARTUP="lazy")
+    code = (
+        "import time; t = time.perf_counter(); import dragon_mcp; "
+        "m = time.perf_counter(); dragon_mcp.ensure_web3_stack(); "
+        "print(round((m - t) * 1000, 2), round((time.perf_counter() - m) * 1000, 2))"
+    )
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "-X", "importtime", "-c", code,
+        cwd=module_dir, env=env,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=120)
+    if proc.returncode != 0:
+        raise RuntimeError(stderr.decode(errors="replace").strip().splitlines()[-1])
+
+    module_ms, web3_stack_ms = (float(v) for v in stdout.decode().split()[-2:])
+    modules = _parse_importtime(stderr.decode(errors="replace"))
+    top_level = [m for m in modules if m["depth"] == 0]
+    return {
+        "server_module_ms": module_ms,
+        "web3_stack_ms": web3_stack_ms,
+        "modules_imported": len(modules),
+        "top_level": sorted(top_level, key=lambda m: m["cumulative_ms"], reverse=True)[:top],
+        "slowest_self": sorted(modules, key=lambda m: m["self_ms"], reverse=True)[:top],
+    }
+
+@dragon_tool(requires_web3=False)
+async def get_startup_report(profile_imports: bool = False, top: int = 15) -> Dict[str, Any]:
+    """
+    Report server startup timings.
+
+    Args:
+        profile_imports: Also profile a cold import in a fresh interpreter
+            with `-X importtime` (takes a few seconds)
+        top: Number of modules to list in the import profile
+
+    Returns:
+        Startup mode, phase timings and, optionally, the slowest imports
+    """
+    try:
+        report = {
+            "startup": dict(_startup_timings),
+            "web3_stack_loaded": Web3 is not None,
+            "modules_loaded": len(sys.modules),
+            "python": sys.version.split()[0],
+        }
+        if profile_imports:
+            report["import_profile"] = await _profile_cold_import(top)
+        return report
+
+    except Exception as e:
+        return {"error": f"Failed to build startup report: {str(e)}"}
+
+@dragon_tool(requires_web3=False)
+async def get_server_metrics(output_format: str = "summary") -> Dict[str, Any]:
+    """
+    Report tool latency, RPC usage and cache metrics for this process.
+
+    Args:
+        output_format: "summary" for JSON percentiles, "prometheus" for exposition text
+
+    Returns:
+        Per-tool latency, per-chain RPC counts/latency/errors, cache hit ratios
+        circuit breaker states and rate limiter states
+    """
+    try:
+        if output_format == "prometheus":
+            return {"format": "prometheus", "metrics": dragon_metrics.REGISTRY.render()}
+        report = dragon_metrics.summary()
+        report["circuit_breakers"] = {
+            chain: breaker.snapshot() for chain, breaker in web3_manager.breakers.items()
+        }
+        report["rate_limiters"] = {
+            chain: limiter.snapshot() for chain, limiter in web3_manager.limiters.items()
+        }
+        if web3_manager.chain_cache is not None:
+            report["chain_cache"] = web3_manager.chain_cache.stats()
+        return report
+
+    except Exception as e:
+        return {"error": f"Failed to collect metrics: {str(e)}"}
+
+@dragon_tool()
+async def get_contract_registry(chains: List[str] = None, refresh: bool = False) -> Dict[str, Any]:
+    """
+    Show the contract addresses in use and where they came from.
+
+    Args:
+        chains: Chains to report (default: every chain with a chain id)
+        refresh: Re-read the addresses from OmniDragonRegistry now
+
+    Returns:
+        Resolved addresses per chain, the snapshot file and each chain's
+        last discovery (block, time, per-contract errors)
+    """
+    try:
+        chains = chains or list(CHAIN_IDS)
+        refreshed = {}
+        if refresh:
+            for chain in chains:
+                try:
+                    refreshed[chain] = await asyncio.to_thread(web3_manager.refresh_registry, chain)
+                except Exception as e:
+                    refreshed[chain] = {"error": str(e)}
+
+        discovered = web3_manager.registry.describe()
+        resolved = {}
+        for chain in chains:
+            addresses = {}
+            for contract_type in CONFIGURED_ADDRESSES:
+                try:
+                    addresses[contract_type] = web3_manager.resolve_address(chain, contract_type)
+                except ValueError:
+                    continue
+            resolved[chain] = {
+                "chain_id": CHAIN_IDS.get(chain),
+                "source": "registry" if discovered["chains"].get(chain, {}).get("addresses") else "config",
+                "addresses": addresses,
+            }
+
+        report = {
+            "address_source": ADDRESS_SOURCE,
+            "chains": resolved,
+            "snapshot": discovered,
+        }
+        if refresh:
+            report["refreshed"] = refreshed
+        return report
+
+    except Exception as e:
+        return {"error": f"Failed to read contract registry: {str(e)}"}
+
 # ================================
 # RESOURCES & PROMPTS
 # ================================
@@ -951,11 +3002,13 @@ Monitor the Dragon ecosystem effectively:
 
 🔮 ORACLE HEALTH:
 - Use check_oracle_health() for network-wide status
+- Use get_oracle_sources() to see which feed (Chainlink, Band, API3, Pyth) is off, stale or failing
 - Monitor price consistency across chains (<5% deviation)
 - Check oracle response times and validity
 
 🎲 LOTTERY SYSTEM:
 - Use get_lottery_stats() for each chain
+- Use get_lottery_activity() for entries/min, USD volume, win rate and jackpot flows
 - Monitor jackpot growth and entry volume
 - Verify win probability calculations
 
@@ -1004,11 +3057,23 @@ Test the Dragon ecosystem comprehensively:
    - Multi-chain lottery coordination
 """
 
+# Tools, resources and prompts are registered; the server can answer
+# initialize/tools/list from here on without the web3 stack.
+_startup_timings["module_import_ms"] = round((time.perf_counter() - _MODULE_IMPORT_STARTED) * 1000, 2)
+
 # ================================
 # MAIN FUNCTION
 # ================================
 
 if __name__ == "__main__":
+    # Fail fast on missing dependencies without paying for the import itself
+    import importlib.util
+    missing_packages = [name for name in ("web3", "eth_account") if importlib.util.find_spec(name) is None]
+    if missing_packages:
+        print(f"⚠️  Missing dependencies: {', '.join(missing_packages)}")
+        print("📦 Install with: pip install 'mcp[cli]' web3 httpx")
+        exit(1)
+
     # Environment validation
     missing_vars = []
     if not PRIVATE_KEY:
@@ -1022,6 +3087,23 @@ if __name__ == "__main__":
         print(f"⚠️  Missing environment variables: {', '.join(missing_vars)}")
         print("Some functionality may be limited.")
     
+    # Optional metrics dump for stdio mode (no HTTP endpoint to scrape)
+    metrics_file = os.getenv("DRAGON_MCP_METRICS_FILE")
+    if metrics_file:
+        dragon_metrics.start_file_dump(metrics_file, float(os.getenv("DRAGON_MCP_METRICS_INTERVAL", "15")))
+
+    if sidecar_client() is not None:
+        # Thin client: the sidecar owns web3, RPC connections and caches
+        print(f"🔗 Forwarding tool calls to sidecar at {SIDECAR_SOCKET} ({SIDECAR_MODE})", file=sys.stderr)
+    elif STARTUP_MODE == "eager":
+        ensure_web3_stack()
+        start_indexers()
+    elif STARTUP_MODE == "warm":
+        start_warmup()
+    elif KEEPER_MODE in ("dry-run", "on"):
+        print(f"⚠️  DRAGON_MCP_KEEPER={KEEPER_MODE} is ignored with DRAGON_MCP_STARTUP=lazy: "
+              "the oracle keeper only starts with warm or eager startup", file=sys.stderr)
+
     print("🐉 Dragon MCP Starting...")
     print("📊 Cross-chain lottery ecosystem")
     print("🔮 Oracle & price monitoring")
@@ -1030,4 +3112,4 @@ if __name__ == "__main__":
     print("✨ Ready for AI interactions!")
     
     # Run the MCP server
-    mcp.run(transport="stdio")
\ No newline at end of file
+    mcp.run(transport="stdio")
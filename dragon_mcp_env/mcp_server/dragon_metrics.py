@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Dragon Metrics
+Minimal in-process Prometheus metrics for the Dragon MCP server.
+
+Counters, gauges and histograms are plain dicts keyed by label tuples and
+guarded by one lock each, so recording a sample costs well under a
+microsecond. Metrics render in the Prometheus text exposition format for the
+hosted `/metrics` endpoint or a periodic file dump in stdio mode.
+"""
+
+import os
+import time
+import atexit
+import bisect
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from cache hits up to full HTTP timeouts
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set"""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def items(self) -> List[Tuple[Tuple[str, ...], float]]:
+        with self._lock:
+            return list(self._values.items())
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for labels, value in sorted(self.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+class Gauge(Counter):
+    """Value that can go up and down per label set"""
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram per label set"""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def summary(self, *labels: str) -> Optional[Dict[str, float]]:
+        """Count, mean and bucket-estimated p50/p99 for one label set"""
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                return None
+            counts, total, count = list(state[0]), state[1], state[2]
+        return {
+            "count": count,
+            "mean": total / count,
+            "p50": self._quantile(counts, count, 0.5),
+            "p99": self._quantile(counts, count, 0.99),
+        }
+
+    def _quantile(self, counts: List[int], count: int, q: float) -> float:
+        rank, seen = q * count, 0
+        for index, bucket_count in enumerate(counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def label_sets(self) -> List[Tuple[str, ...]]:
+        with self._lock:
+            return list(self._values)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            snapshot = [(labels, list(state[0]), state[1], state[2]) for labels, state in self._values.items()]
+        for labels, counts, total, count in sorted(snapshot):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+class Registry:
+    """Ordered collection of metrics rendered together"""
+
+    def __init__(self):
+        self.metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        lines.extend(_render_cache_ratios())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+
+# ================================
+# DRAGON METRICS
+# ================================
+
+TOOL_LATENCY = REGISTRY.register(Histogram(
+    "dragon_tool_duration_seconds", "MCP tool latency", ["tool"]))
+TOOL_CALLS = REGISTRY.register(Counter(
+    "dragon_tool_calls_total", "MCP tool invocations by outcome", ["tool", "status"]))
+RPC_REQUESTS = REGISTRY.register(Counter(
+    "dragon_rpc_requests_total", "JSON-RPC requests sent upstream", ["chain", "method"]))
+RPC_LATENCY = REGISTRY.register(Histogram(
+    "dragon_rpc_duration_seconds", "JSON-RPC round-trip latency", ["chain", "method"]))
+RPC_ERRORS = REGISTRY.register(Counter(
+    "dragon_rpc_errors_total", "JSON-RPC failures by error code or exception", ["chain", "method", "code"]))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "dragon_cache_requests_total", "Cache lookups by result", ["cache", "result"]))
+INFLIGHT = REGISTRY.register(Gauge(
+    "dragon_inflight_requests", "Requests currently being served", ["kind"]))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    "dragon_http_request_duration_seconds", "Hosted API request latency", ["method", "route", "status"]))
+
+def _render_cache_ratios() -> List[str]:
+    totals: Dict[str, List[float]] = {}
+    for (cache, result), value in CACHE_REQUESTS.items():
+        entry = totals.setdefault(cache, [0.0, 0.0])
+        entry[0 if result == "hit" else 1] += value
+    if not totals:
+        return []
+    lines = [
+        "# HELP dragon_cache_hit_ratio Fraction of cache lookups that hit",
+        "# TYPE dragon_cache_hit_ratio gauge",
+    ]
+    for cache, (hits, misses) in sorted(totals.items()):
+        ratio = hits / (hits + misses) if hits + misses else 0.0
+        lines.append(f'dragon_cache_hit_ratio{{cache="{_escape(cache)}"}} {_format_value(round(ratio, 6))}')
+    return lines
+
+def cache_lookup(cache: str, hit: bool) -> None:
+    """Record one cache lookup"""
+    CACHE_REQUESTS.inc(cache, "hit" if hit else "miss")
+
+def observe_rpc(chain: str, method: str, seconds: float, error_code: Optional[str] = None) -> None:
+    """Record one upstream JSON-RPC round trip"""
+    RPC_REQUESTS.inc(chain, method)
+    RPC_LATENCY.observe(seconds, chain, method)
+    if error_code is not None:
+        RPC_ERRORS.inc(chain, method, error_code)
+
+def summary() -> Dict[str, object]:
+    """Compact JSON-friendly view of the main metrics"""
+    tools = {}
+    for labels in TOOL_LATENCY.label_sets():
+        stats = TOOL_LATENCY.summary(*labels)
+        stats["errors"] = TOOL_CALLS.value(labels[0], "error")
+        tools[labels[0]] = stats
+
+    rpc: Dict[str, Dict[str, object]] = {}
+    for labels in RPC_LATENCY.label_sets():
+        rpc.setdefault(labels[0], {})[labels[1]] = RPC_LATENCY.summary(*labels)
+    errors: Dict[str, Dict[str, float]] = {}
+    for (chain, method, code), value in RPC_ERRORS.items():
+        errors.setdefault(chain, {})[f"{method}:{code}"] = value
+
+    caches = {}
+    for (cache, result), value in CACHE_REQUESTS.items():
+        caches.setdefault(cache, {"hit": 0.0, "miss": 0.0})[result] = value
+    for stats in caches.values():
+        total = stats["hit"] + stats["miss"]
+        stats["hit_ratio"] = stats["hit"] / total if total else 0.0
+
+    return {
+        "tools": tools,
+        "rpc": rpc,
+        "rpc_errors": errors,
+        "caches": caches,
+        "in_flight": {labels[0]: value for labels, value in INFLIGHT.items()},
+    }
+
+# ================================
+# STDIO-MODE DUMP
+# ================================
+
+def write_metrics_file(path: str) -> None:
+    """Atomically write the exposition text (node_exporter textfile-collector friendly)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(REGISTRY.render())
+    os.replace(tmp_path, path)
+
+def start_file_dump(path: str, interval: float = 15.0) -> threading.Thread:
+    """Dump metrics to `path` every `interval` seconds and once more at exit"""
+    def _loop():
+        while True:
+            time.sleep(interval)
+            try:
+                write_metrics_file(path)
+            except OSError:
+                pass
+
+    atexit.register(write_metrics_file, path)
+    thread = threading.Thread(target=_loop, name="dragon-metrics-dump", daemon=True)
+    thread.start()
+    return thread
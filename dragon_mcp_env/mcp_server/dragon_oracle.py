@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Dragon Oracle Sources
+Per-source breakdown of OmniDragonPriceOracle in one Multicall3 round trip.
+
+The oracle averages Chainlink, Band, API3 and Pyth feeds weighted by their
+configured weights, skipping sources that are inactive, unreadable,
+non-positive or older than their maxStaleness. OracleSources reads the
+oracle's getOracleStatus, getOracleConfig, isFresh, latestPrice and
+lastPriceUpdate together with every feed's latest value in a single
+aggregate3 eth_call, then re-applies the contract's validity rules so each
+source's contribution and deviation can be seen.
+
+Feed addresses come from getOracleConfig, which is in the same batch, so
+the addresses used are the ones seen on the previous read of that chain.
+They rarely change; when the config read back differs (or on the first read)
+the feeds are read again at the same block, costing a second round trip.
+
+getOracleConfig returns a string and Band's getReferenceData takes two, so
+those two calls are encoded and decoded here rather than through
+CompiledCall.
+"""
+
+import threading
+from typing import Any, Dict, List, Tuple
+
+from dragon_codec import (
+    CompiledCall, WORD, compile_abi, decode_aggregate3, decode_bool, decode_uint,
+    encode_aggregate3, encode_uint, function_selector, MULTICALL3_ADDRESS, GET_BLOCK_NUMBER_CALLDATA,
+)
+
+SOURCES = ("chainlink", "band", "api3", "pyth")
+ZERO_ADDRESS = "0x" + "00" * 20
+ZERO_ID = "0x" + "00" * 32
+GET_TIMESTAMP_CALLDATA = function_selector("getCurrentBlockTimestamp()")
+ORACLE_CONFIG_SELECTOR = function_selector("getOracleConfig()")
+BAND_SELECTOR = function_selector("getReferenceData(string,string)")
+
+# Fixed-layout views of the underlying feeds (Band is encoded by hand)
+FEED_ABI = [
+    {
+        "inputs": [],
+        "name": "latestRoundData",
+        "outputs": [
+            {"internalType": "uint80", "name": "roundId", "type": "uint80"},
+            {"internalType": "int256", "name": "answer", "type": "int256"},
+            {"internalType": "uint256", "name": "startedAt", "type": "uint256"},
+            {"internalType": "uint256", "name": "updatedAt", "type": "uint256"},
+            {"internalType": "uint80", "name": "answeredInRound", "type": "uint80"}
+        ],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "decimals",
+        "outputs": [{"internalType": "uint8", "name": "", "type": "uint8"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "read",
+        "outputs": [
+            {"internalType": "int224", "name": "value", "type": "int224"},
+            {"internalType": "uint32", "name": "timestamp", "type": "uint32"}
+        ],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [{"internalType": "bytes32", "name": "id", "type": "bytes32"}],
+        "name": "getPriceUnsafe",
+        "outputs": [{"components": [
+            {"internalType": "int64", "name": "price", "type": "int64"},
+            {"internalType": "uint64", "name": "conf", "type": "uint64"},
+            {"internalType": "int32", "name": "expo", "type": "int32"},
+            {"internalType": "uint256", "name": "publishTime", "type": "uint256"}
+        ], "internalType": "struct PythStructs.Price", "name": "price", "type": "tuple"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"internalType": "string", "name": "_base", "type": "string"},
+            {"internalType": "string", "name": "_quote", "type": "string"}
+        ],
+        "name": "getReferenceData",
+        "outputs": [{"components": [
+            {"internalType": "uint256", "name": "rate", "type": "uint256"},
+            {"internalType": "uint256", "name": "lastUpdatedBase", "type": "uint256"},
+            {"internalType": "uint256", "name": "lastUpdatedQuote", "type": "uint256"}
+        ], "internalType": "struct IStdReference.ReferenceData", "name": "", "type": "tuple"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+]
+FEED_CALLS: Dict[str, CompiledCall] = compile_abi(FEED_ABI)
+
+# ================================
+# DYNAMIC ENCODING
+# ================================
+
+def _encode_string(value: str) -> bytes:
+    raw = value.encode()
+    return encode_uint(len(raw)) + raw + bytes(-len(raw) % WORD)
+
+def encode_band_query(base: str, quote: str = "USD") -> bytes:
+    """Calldata for getReferenceData(base, quote)"""
+    first, second = _encode_string(base), _encode_string(quote)
+    return BAND_SELECTOR + encode_uint(2 * WORD) + encode_uint(2 * WORD + len(first)) + first + second
+
+def decode_oracle_config(data: bytes) -> Dict[str, Any]:
+    """getOracleConfig(): four (feed, weight, isActive, maxStaleness) structs, the Band symbol and Pyth id"""
+    if len(data) < 18 * WORD:
+        raise ValueError(f"Could not decode getOracleConfig return data: got {len(data)} bytes")
+    words = [data[i:i + WORD] for i in range(0, 18 * WORD, WORD)]
+    config: Dict[str, Any] = {}
+    for i, source in enumerate(SOURCES):
+        feed, weight, active, staleness = words[4 * i:4 * i + 4]
+        config[source] = {
+            "feed": "0x" + feed[12:].hex(),
+            "weight": decode_uint(weight),
+            "active": decode_bool(active),
+            "max_staleness": decode_uint(staleness),
+        }
+    offset = decode_uint(words[16])
+    length = decode_uint(data[offset:offset + WORD])
+    config["band_symbol"] = data[offset + WORD:offset + WORD + length].decode(errors="replace")
+    config["pyth_id"] = "0x" + words[17].hex()
+    return config
+
+def _to_18(value: int, decimals: int) -> int:
+    """Scale a feed answer to 18 decimals, truncating like the contract"""
+    if decimals <= 18:
+        return value * 10 ** (18 - decimals)
+    return int(value / 10 ** (decimals - 18))
+
+# ================================
+# READS
+# ================================
+
+def _feed_calls(config: Dict[str, Any]) -> List[Tuple[str, str, bytes]]:
+    """(source, target, calldata) for every feed that can be read"""
+    calls = []
+    chainlink, band, api3, pyth = (config[s]["feed"] for s in SOURCES)
+    if chainlink != ZERO_ADDRESS:
+        calls.append(("chainlink", chainlink, bytes.fromhex(FEED_CALLS["latestRoundData"].encode()[2:])))
+        calls.append(("chainlink_decimals", chainlink, bytes.fromhex(FEED_CALLS["decimals"].encode()[2:])))
+    if band != ZERO_ADDRESS:
+        calls.append(("band", band, encode_band_query(config["band_symbol"])))
+    if api3 != ZERO_ADDRESS:
+        calls.append(("api3", api3, bytes.fromhex(FEED_CALLS["read"].encode()[2:])))
+    if pyth != ZERO_ADDRESS and config["pyth_id"] != ZERO_ID:
+        calls.append(("pyth", pyth, bytes.fromhex(FEED_CALLS["getPriceUnsafe"].encode(config["pyth_id"])[2:])))
+    return calls
+
+def _decode_feeds(calls: List[Tuple[str, str, bytes]], returns: List[Tuple[bool, bytes]]) -> Dict[str, Any]:
+    """Raw (answer, decimals, updated_at) per source, or the error reading it"""
+    results: Dict[str, Any] = dict(zip((name for name, _, _ in calls), returns))
+    feeds: Dict[str, Any] = {}
+    for source in SOURCES:
+        if source not in results:
+            continue
+        success, data = results[source]
+        try:
+            if not success:
+                raise ValueError("call reverted")
+            if source == "chainlink":
+                _, answer, _, updated, _ = FEED_CALLS["latestRoundData"].decode(data)
+                ok, raw = results["chainlink_decimals"]
+                if not ok:
+                    raise ValueError("decimals() reverted")
+                feeds[source] = {"answer": answer, "decimals": FEED_CALLS["decimals"].decode(raw), "updated_at": updated}
+            elif source == "band":
+                if len(data) < 3 * WORD:
+                    raise ValueError(f"expected {3 * WORD} bytes, got {len(data)}")
+                feeds[source] = {"answer": decode_uint(data[:WORD]), "decimals": 18,
+                                 "updated_at": decode_uint(data[WORD:2 * WORD])}
+            elif source == "api3":
+                value, timestamp = FEED_CALLS["read"].decode(data)
+                feeds[source] = {"answer": value, "decimals": 18, "updated_at": timestamp}
+            else:
+                price, conf, expo, publish_time = FEED_CALLS["getPriceUnsafe"].decode(data)
+                feeds[source] = {"answer": price, "decimals": -expo, "updated_at": publish_time, "confidence": conf}
+        except ValueError as e:
+            feeds[source] = {"error": str(e)}
+    return feeds
+
+def breakdown(config: Dict[str, Any], feeds: Dict[str, Any], status: Tuple, latest_price: int,
+              block_time: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Each source's price, age, validity and deviation as the contract would
+    judge it at `block_time`, plus the weighted average of the valid ones.
+    """
+    initialized, breaker, emergency, grace, active_count, max_deviation = status
+    sources: Dict[str, Any] = {}
+    weighted, total_weight = 0, 0
+    for source in SOURCES:
+        settings = config[source]
+        feed = feeds.get(source)
+        entry: Dict[str, Any] = {**settings, "valid": False, "flags": []}
+        flags = entry["flags"]
+        if not settings["active"]:
+            flags.append("inactive")
+        if feed is None:
+            flags.append("no_feed")
+        elif "error" in feed:
+            flags.append("read_failed")
+            entry["error"] = feed["error"]
+        else:
+            price = _to_18(feed["answer"], feed["decimals"])
+            age = block_time - feed["updated_at"]
+            entry.update({"price_usd": price / 1e18, "updated_at": feed["updated_at"], "age_seconds": age})
+            if "confidence" in feed:
+                entry["confidence_usd"] = _to_18(feed["confidence"], feed["decimals"]) / 1e18
+            if feed["answer"] <= 0 or feed["updated_at"] == 0:
+                flags.append("non_positive")
+            elif age > settings["max_staleness"]:
+                flags.append("stale")
+            else:
+                entry["valid"] = True
+                entry["_price"] = price
+                if settings["active"]:
+                    weighted += price * settings["weight"]
+                    total_weight += settings["weight"]
+        sources[source] = entry
+
+    average = weighted // total_weight if total_weight else None
+    for entry in sources.values():
+        price = entry.pop("_price", None)
+        entry["contributing"] = entry["valid"] and entry["active"] and price is not None and total_weight > 0
+        entry["weight_share"] = round(entry["weight"] / total_weight, 6) if entry["contributing"] else 0.0
+        if price is not None and average:
+            entry["deviation_bps"] = round((price - average) * 10000 / average, 2)
+        if price is not None and latest_price > 0:
+            from_latest = abs(price - latest_price) * 10000 // latest_price
+            entry["deviation_from_latest_bps"] = round((price - latest_price) * 10000 / latest_price, 2)
+            if from_latest > max_deviation:
+                # updatePrice trips the circuit breaker past maxPriceDeviation
+                entry["flags"].append("beyond_breaker_threshold")
+
+    aggregate: Dict[str, Any] = {
+        "weighted_average_usd": average / 1e18 if average is not None else None,
+        "valid_sources": sum(1 for e in sources.values() if e["contributing"]),
+        "active_sources": active_count,
+    }
+    if average is not None and latest_price > 0:
+        deviation = abs(average - latest_price) * 10000 // latest_price
+        aggregate["deviation_from_latest_bps"] = round((average - latest_price) * 10000 / latest_price, 2)
+        aggregate["update_would_trip_breaker"] = bool(
+            initialized and not grace and not breaker and deviation > max_deviation)
+    return sources, aggregate
+
+class OracleSources:
+    """Reads an oracle and its feeds per chain, remembering feed addresses between reads"""
+
+    def __init__(self, manager: Any):
+        self.manager = manager
+        self._configs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _aggregate(self, chain: str, batch: List[Tuple[str, bool, bytes]], block: str) -> List[Tuple[bool, bytes]]:
+        result = self.manager.request(chain, "eth_call", [{"to": MULTICALL3_ADDRESS, "data": encode_aggregate3(batch)}, block])
+        if result in ("0x", None):
+            raise ValueError(f"Multicall3 is not deployed on {chain}")
+        return decode_aggregate3(result)
+
+    def read(self, chain: str) -> Dict[str, Any]:
+        oracle = self.manager.resolve_address(chain, "oracle")
+        views = self.manager.compile_calls()["oracle"]
+        names = ("getOracleStatus", "isFresh", "latestPrice", "lastPriceUpdate")
+        with self._lock:
+            cached = self._configs.get(chain)
+        feed_calls = _feed_calls(cached) if cached else []
+        batch = [(MULTICALL3_ADDRESS, False, GET_BLOCK_NUMBER_CALLDATA),
+                 (MULTICALL3_ADDRESS, False, GET_TIMESTAMP_CALLDATA),
+                 (oracle, False, ORACLE_CONFIG_SELECTOR)]
+        batch += [(oracle, True, bytes.fromhex(views[name].encode()[2:])) for name in names]
+        batch += [(target, True, data) for _, target, data in feed_calls]
+
+        returns = self._aggregate(chain, batch, "latest")
+        block, block_time = decode_uint(returns[0][1]), decode_uint(returns[1][1])
+        config = decode_oracle_config(returns[2][1])
+        values = {}
+        for name, (success, data) in zip(names, returns[3:3 + len(names)]):
+            values[name] = views[name].decode(data) if success else None
+        round_trips = 1
+        if config != cached:
+            # Feeds changed (or first read): read the current ones at the same block
+            feed_calls = _feed_calls(config)
+            feed_returns = self._aggregate(chain, [(t, True, d) for _, t, d in feed_calls], hex(block)) \
+                if feed_calls else []
+            round_trips = 2 if feed_calls else 1
+            with self._lock:
+                self._configs[chain] = config
+        else:
+            feed_returns = returns[3 + len(names):]
+        feeds = _decode_feeds(feed_calls, feed_returns)
+
+        status = values["getOracleStatus"]
+        if status is None:
+            raise ValueError(f"getOracleStatus reverted on {chain}")
+        latest_price = values["latestPrice"] or 0
+        sources, aggregate = breakdown(config, feeds, status, latest_price, block_time)
+        initialized, breaker, emergency, grace, _, max_deviation = status
+        alerts = []
+        if breaker:
+            alerts.append("Circuit breaker is active: the oracle reports no price until it is reset")
+        if emergency:
+            alerts.append("Emergency mode: the oracle returns the owner-set emergency price")
+        if values["isFresh"] is False:
+            alerts.append("Stored price is stale (isFresh() is false)")
+        if not aggregate["valid_sources"]:
+            alerts.append("No valid source: updatePrice() would revert")
+        if aggregate.get("update_would_trip_breaker"):
+            alerts.append(f"Weighted average is {aggregate['deviation_from_latest_bps']} bps from the stored "
+                          f"price; updatePrice() would trip the circuit breaker")
+        for source, entry in sources.items():
+            for flag in entry["flags"]:
+                if flag in ("stale", "read_failed", "non_positive") and entry["active"]:
+                    alerts.append(f"{source}: {flag.replace('_', ' ')}")
+        return {
+            "chain": chain,
+            "oracle": oracle,
+            "block": block,
+            "block_timestamp": block_time,
+            "round_trips": round_trips,
+            "status": {
+                "initialized": initialized,
+                "circuit_breaker_active": breaker,
+                "emergency_mode": emergency,
+                "in_grace_period": grace,
+                "is_fresh": values["isFresh"],
+                "max_deviation_bps": max_deviation,
+                "latest_price_usd": latest_price / 1e18,
+                "last_update": values["lastPriceUpdate"],
+            },
+            "aggregate": aggregate,
+            "sources": sources,
+            "band_symbol": config["band_symbol"],
+            "pyth_price_id": config["pyth_id"],
+            "alerts": alerts,
+        }
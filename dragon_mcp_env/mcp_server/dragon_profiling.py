@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Dragon Profiling
+Low-overhead diagnostics for the live hosted server.
+
+- StackSampler periodically snapshots every thread's Python stack with
+  sys._current_frames() and aggregates them as collapsed stacks, the input
+  format of flamegraph.pl, speedscope and inferno.
+- LoopWatchdog detects callbacks that block the asyncio event loop: a
+  heartbeat task runs on the loop and a watcher thread captures the loop
+  thread's stack when the heartbeat falls behind, which points straight at
+  the synchronous call (typically a web3 request) that stalled it.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from collections import Counter
+from typing import Dict, List, Optional
+
+import dragon_metrics
+
+logger = logging.getLogger("dragon_mcp.profiling")
+
+LOOP_STALLS = dragon_metrics.REGISTRY.register(dragon_metrics.Histogram(
+    "dragon_event_loop_stall_seconds", "Event loop stalls longer than the slow-callback threshold",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)))
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+def _collapse(frame) -> List[str]:
+    stack = []
+    while frame is not None:
+        stack.append(_frame_label(frame))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+class StackSampler:
+    """Statistical sampler over all Python threads"""
+
+    def __init__(self, interval: float = 0.01, loop_thread_id: Optional[int] = None):
+        self.interval = interval
+        self.loop_thread_id = loop_thread_id
+        self.samples = 0
+        self.stacks: Counter = Counter()
+
+    def _thread_names(self) -> Dict[int, str]:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        if self.loop_thread_id in names:
+            names[self.loop_thread_id] = f"event-loop[{names[self.loop_thread_id]}]"
+        return names
+
+    def run(self, seconds: float) -> "StackSampler":
+        """Sample for `seconds` from the calling thread (which is excluded)"""
+        own_id = threading.get_ident()
+        names = self._thread_names()
+        deadline = time.monotonic() + seconds
+        next_sample = time.monotonic()
+        while next_sample < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if thread_id not in names:
+                    names = self._thread_names()
+                root = names.get(thread_id, f"thread-{thread_id}")
+                self.stacks[";".join([root] + _collapse(frame))] += 1
+            self.samples += 1
+            next_sample += self.interval
+            time.sleep(max(0.0, next_sample - time.monotonic()))
+        return self
+
+    def collapsed(self) -> str:
+        """`frame;frame;frame count` lines, heaviest first"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+class LoopWatchdog:
+    """Logs the loop thread's stack whenever the event loop is blocked for longer than `threshold`"""
+
+    def __init__(self, threshold: float = 0.25):
+        self.threshold = threshold
+        self.stalls = 0
+        self._beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+
+    @property
+    def loop_thread_id(self) -> Optional[int]:
+        return self._loop_thread_id
+
+    def start(self) -> None:
+        """Start from inside the running event loop"""
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        threading.Thread(target=self._watch, name="dragon-loop-watchdog", daemon=True).start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _heartbeat(self) -> None:
+        period = self.threshold / 4
+        while True:
+            self._beat = time.monotonic()
+            await asyncio.sleep(period)
+
+    def _watch(self) -> None:
+        period = self.threshold / 4
+        stalled_since = None
+        while not self._stop.wait(period):
+            behind = time.monotonic() - self._beat
+            if behind > self.threshold and stalled_since is None:
+                stalled_since = self._beat
+                frame = sys._current_frames().get(self._loop_thread_id)
+                stack = "".join(traceback.format_stack(frame)) if frame is not None else "<unavailable>\n"
+                logger.warning(
+                    "Event loop blocked for %.0f ms (threshold %.0f ms); loop thread stack:\n%s",
+                    behind * 1000, self.threshold * 1000, stack
+                )
+            elif behind <= self.threshold and stalled_since is not None:
+                duration = self._beat - stalled_since
+                self.stalls += 1
+                LOOP_STALLS.observe(duration)
+                logger.warning("Event loop stall ended after %.0f ms", duration * 1000)
+                stalled_since = None
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Dragon Rate Limiting
+Client-side throttling of upstream RPC calls, one limiter per endpoint.
+
+Each limiter combines:
+- Token buckets for requests per second and compute units per second
+  (weighted per method like provider pricing tables); both are optional.
+- A concurrency limit adjusted by AIMD: it grows by 1/limit per successful
+  call (about +1 per round trip of the whole window) and halves when the
+  provider signals rate limiting (HTTP 429 or a JSON-RPC limit error), at
+  most once per round trip, so one burst of 429s counts as one signal.
+- A priority queue: callers are let through in order of priority, then
+  arrival, so interactive tool calls overtake background polling and
+  indexing work waiting on the same endpoint.
+
+A rate-limit response also pauses the endpoint for its Retry-After (or a
+short back-off), and Web3Manager retries the call once the limiter admits
+it again. Throughput converges on what the provider actually allows
+instead of oscillating between bursts and error storms.
+
+The caller's priority is a context variable like the deadline in
+dragon_resilience: it flows into asyncio.to_thread workers, and background
+threads mark themselves with priority(BACKGROUND).
+"""
+
+import re
+import time
+import heapq
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import dragon_metrics
+import dragon_resilience
+
+INTERACTIVE, BACKGROUND = 0, 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+# Approximate compute units per method (unlisted methods cost DEFAULT_UNITS)
+METHOD_UNITS = {
+    "eth_chainId": 0,
+    "net_version": 0,
+    "eth_blockNumber": 10,
+    "eth_feeHistory": 10,
+    "eth_getTransactionReceipt": 15,
+    "eth_getBlockByNumber": 16,
+    "eth_getStorageAt": 17,
+    "eth_getBalance": 19,
+    "eth_gasPrice": 19,
+    "eth_maxPriorityFeePerGas": 10,
+    "eth_call": 26,
+    "eth_getCode": 26,
+    "eth_getTransactionCount": 26,
+    "eth_getLogs": 75,
+    "eth_estimateGas": 87,
+    "eth_sendRawTransaction": 250,
+}
+DEFAULT_UNITS = 20
+
+# JSON-RPC error codes and messages providers use for rate limiting
+RATE_LIMIT_CODES = {429, -32005, -32029, -32090}
+_RATE_LIMIT_MESSAGE = re.compile(
+    r"rate.?limit|too many requests|limit exceeded|exceeded .*(capacity|quota|units)|compute units", re.I)
+
+CONCURRENCY_LIMIT = dragon_metrics.REGISTRY.register(dragon_metrics.Gauge(
+    "dragon_rpc_concurrency_limit", "AIMD-adjusted concurrent RPC limit per endpoint", ["chain"]))
+RATE_LIMITED = dragon_metrics.REGISTRY.register(dragon_metrics.Counter(
+    "dragon_rpc_rate_limited_total", "RPC responses that signalled provider rate limiting", ["chain"]))
+QUEUE_WAIT = dragon_metrics.REGISTRY.register(dragon_metrics.Histogram(
+    "dragon_rpc_queue_seconds", "Time RPC calls waited for the client-side limiter", ["chain", "priority"]))
+
+# ================================
+# PRIORITY
+# ================================
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar("dragon_priority", default=INTERACTIVE)
+
+@contextmanager
+def priority(level: int) -> Iterator[int]:
+    """Run the block's RPCs at `level` (INTERACTIVE or BACKGROUND)"""
+    token = _priority.set(level)
+    try:
+        yield level
+    finally:
+        _priority.reset(token)
+
+def current_priority() -> int:
+    return _priority.get()
+
+# ================================
+# RATE LIMIT SIGNALS
+# ================================
+
+def _retry_after(headers: Any) -> float:
+    try:
+        return max(0.0, float(headers.get("Retry-After", 0)))
+    except (TypeError, ValueError, AttributeError):
+        return 0.0  # HTTP-date form or no headers: use the default back-off
+
+def response_signal(response: Any) -> Optional[float]:
+    """Retry-after seconds (0 if unspecified) when a JSON-RPC response is a rate-limit error, else None"""
+    error = response.get("error") if isinstance(response, dict) else None
+    if not isinstance(error, dict):
+        return None
+    if error.get("code") in RATE_LIMIT_CODES or _RATE_LIMIT_MESSAGE.search(str(error.get("message", ""))):
+        data = error.get("data")
+        if isinstance(data, dict) and "retry_after" in data:
+            return _retry_after({"Retry-After": data["retry_after"]})
+        return 0.0
+    return None
+
+def exception_signal(error: BaseException) -> Optional[float]:
+    """Retry-after seconds (0 if unspecified) when an exception is an HTTP 429, else None"""
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) != 429:
+        return None
+    return _retry_after(getattr(response, "headers", None))
+
+# ================================
+# LIMITER
+# ================================
+
+class TokenBucket:
+    """Refilling bucket of `rate` tokens per second holding at most `capacity` (callers hold the lock)"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` tokens are available (a call larger than the bucket waits for a full one)"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+class EndpointLimiter:
+    """Token buckets, AIMD concurrency and a priority queue for one RPC endpoint"""
+
+    def __init__(self, name: str, rps: float = 0.0, units_per_second: float = 0.0, concurrency: int = 8,
+                 min_concurrency: int = 1, max_concurrency: int = 64, backoff: float = 0.25):
+        self.name = name
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max(max_concurrency, min_concurrency)
+        self.limit = float(min(max(concurrency, min_concurrency), self.max_concurrency))
+        self.backoff = backoff
+        self.requests = TokenBucket(rps) if rps > 0 else None
+        self.units = TokenBucket(units_per_second) if units_per_second > 0 else None
+        self.inflight = 0
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.admitted = 0
+        self.rate_limited = 0
+        self._waiters: list = []  # heap of (priority, seq)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        CONCURRENCY_LIMIT.set(name, value=self.limit)
+
+    def acquire(self, method: str) -> float:
+        """
+        Block until a call to `method` may be sent, then take its slot and
+        tokens. Returns the admission time to pass back to release().
+        Raises DeadlineExceeded if the caller's deadline passes while queued.
+        """
+        level = current_priority()
+        units = METHOD_UNITS.get(method, DEFAULT_UNITS)
+        queued = time.monotonic()
+        entry = (level, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = None
+                    if self._waiters[0] == entry and self.inflight < int(self.limit):
+                        wait = max(self.paused_until - now,
+                                   self.requests.wait_time(1, now) if self.requests else 0.0,
+                                   self.units.wait_time(units, now) if self.units else 0.0)
+                        if wait <= 0:
+                            break
+                    left = dragon_resilience.remaining()
+                    if left is not None:
+                        if left <= 0:
+                            dragon_resilience.DEADLINES_EXCEEDED.inc(self.name)
+                            raise dragon_resilience.DeadlineExceeded(
+                                f"Deadline exceeded waiting to call {method} on {self.name}")
+                        wait = left if wait is None else min(wait, left)
+                    self._cond.wait(wait)
+            except BaseException:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+                raise
+            heapq.heappop(self._waiters)
+            if self.requests:
+                self.requests.take(1)
+            if self.units:
+                self.units.take(units)
+            self.inflight += 1
+            self.admitted += 1
+            # The next waiter may fit too (limit not reached yet)
+            self._cond.notify_all()
+        QUEUE_WAIT.observe(now - queued, self.name, PRIORITY_NAMES.get(level, str(level)))
+        return now
+
+    def release(self, admitted_at: float, retry_after: Optional[float] = None) -> None:
+        """
+        Free the slot taken at `admitted_at`. `retry_after` is None for a call
+        the provider accepted, or the seconds it asked us to back off (0 if
+        unspecified) when it rate limited the call.
+        """
+        with self._cond:
+            self.inflight -= 1
+            now = time.monotonic()
+            if retry_after is None:
+                self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+            else:
+                self.rate_limited += 1
+                RATE_LIMITED.inc(self.name)
+                self.paused_until = max(self.paused_until, now + (retry_after or self.backoff))
+                # Calls admitted before the last decrease were sent under the old limit
+                if admitted_at >= self.last_decrease:
+                    self.limit = max(float(self.min_concurrency), self.limit / 2)
+                    self.last_decrease = now
+            CONCURRENCY_LIMIT.set(self.name, value=self.limit)
+            self._cond.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            waiting: Dict[str, int] = {}
+            for level, _ in self._waiters:
+                name = PRIORITY_NAMES.get(level, str(level))
+                waiting[name] = waiting.get(name, 0) + 1
+            report = {
+                "concurrency_limit": round(self.limit, 2),
+                "inflight": self.inflight,
+                "queued": waiting,
+                "admitted": self.admitted,
+                "rate_limited": self.rate_limited,
+            }
+            if self.requests:
+                report["requests_per_second"] = self.requests.rate
+            if self.units:
+                report["units_per_second"] = self.units.rate
+            paused = self.paused_until - time.monotonic()
+            if paused > 0:
+                report["paused_seconds"] = round(paused, 2)
+            return report
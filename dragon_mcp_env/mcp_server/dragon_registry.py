@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Dragon Registry Discovery
+Contract addresses discovered on-chain, kept in a versioned snapshot file.
+
+Per chain, one Multicall3 batch asks OmniDragonRegistry for the price
+oracle, wrapped native token and LayerZero endpoint, and omniDRAGON for its
+jackpot vault, lottery manager and revenue distributor. The results are
+written (checksummed) to a JSON snapshot so the next process can load them
+without any RPC or checksum work, then revalidate them in the background.
+
+A chain's snapshot entry is only trusted while its roots (chain id, registry
+and omniDRAGON addresses) match the current configuration.
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Any, Dict, List, Tuple
+
+FORMAT = "dragon-registry-snapshot"
+VERSION = 1
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+# contract_type -> (source contract, function, takes the chain id as argument)
+DISCOVERY_CALLS: Dict[str, Tuple[str, str, bool]] = {
+    "oracle": ("registry", "getPriceOracle", True),
+    "wrapped_native": ("registry", "getWrappedNativeToken", True),
+    "layerzero_endpoint": ("registry", "getLayerZeroEndpoint", True),
+    "jackpot": ("omnidragon", "jackpotVault", False),
+    "lottery": ("omnidragon", "lotteryManager", False),
+    "revenue_distributor": ("omnidragon", "revenueDistributor", False),
+}
+
+def discovery_calls(chain_id: int) -> List[Tuple[str, str, Tuple]]:
+    """(contract_type, function, args) triples for Web3Manager.multicall"""
+    return [
+        (source, function, (chain_id,) if with_chain_id else ())
+        for source, function, with_chain_id in DISCOVERY_CALLS.values()
+    ]
+
+def parse_discovery(results: List[Tuple[bool, Any]]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Addresses per contract type from multicall results, plus per-type errors"""
+    addresses, errors = {}, {}
+    for contract_type, (ok, value) in zip(DISCOVERY_CALLS, results):
+        if not ok:
+            errors[contract_type] = str(value)
+        elif value.lower() == ZERO_ADDRESS:
+            errors[contract_type] = "not set in registry"
+        else:
+            addresses[contract_type] = value
+    return addresses, errors
+
+class RegistrySnapshot:
+    """Thread-safe view of the snapshot file"""
+
+    def __init__(self, path: str, roots: Dict[str, List[Any]]):
+        self.path = path
+        self.roots = roots
+        self.chains: Dict[str, Dict[str, Any]] = {}
+        self.loaded_from_disk = False
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Entries whose roots still match the configuration; missing or stale files load as empty"""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("format") != FORMAT or data.get("version") != VERSION:
+            return {}
+        with self._lock:
+            self.chains = {
+                chain: entry for chain, entry in data.get("chains", {}).items()
+                if entry.get("roots") == self.roots.get(chain)
+            }
+            self.loaded_from_disk = bool(self.chains)
+            return dict(self.chains)
+
+    def update(self, chain: str, block: int, addresses: Dict[str, str], errors: Dict[str, str]) -> bool:
+        """Record a fresh discovery for `chain` and persist; True if any address changed"""
+        with self._lock:
+            previous = self.chains.get(chain, {}).get("addresses")
+            self.chains[chain] = {
+                "roots": self.roots.get(chain),
+                "block": block,
+                "validated_at": int(time.time()),
+                "addresses": addresses,
+                "errors": errors,
+            }
+            self._save()
+            return previous != addresses
+
+    def _save(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            json.dump({"format": FORMAT, "version": VERSION, "chains": self.chains}, f, indent=2, sort_keys=True)
+        os.replace(temporary, self.path)
+
+    def describe(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "path": self.path,
+                "loaded_from_disk": self.loaded_from_disk,
+                "chains": {
+                    chain: {
+                        "block": entry.get("block"),
+                        "validated_at": entry.get("validated_at"),
+                        "addresses": entry.get("addresses", {}),
+                        "errors": entry.get("errors", {}),
+                    }
+                    for chain, entry in self.chains.items()
+                },
+            }
+
+def snapshot_path(data_dir: str) -> str:
+    return os.path.join(data_dir, "registry_snapshot.json")
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Dragon RPC Record/Replay
+Capture every JSON-RPC exchange Web3Manager makes and serve it back later.
+
+- RpcRecorder appends one compact JSON line per request/response pair
+  (chain, method, params, response, offset and duration) to a session file.
+  Files ending in .gz are gzip-compressed.
+- RpcReplayer loads a session and answers requests from it without any
+  network access. Identical requests are answered in recorded order; once a
+  request's recordings run out the last response is repeated, so replays are
+  deterministic even when a tool is called more often than during capture.
+  With speed > 0 each response is delayed by its recorded duration divided
+  by speed (1 = original timing); 0 serves at full speed.
+
+Enable from the environment (mutually exclusive):
+
+    DRAGON_MCP_RPC_RECORD=session.jsonl      # record against live RPCs
+    DRAGON_MCP_RPC_REPLAY=session.jsonl      # replay offline
+    DRAGON_MCP_RPC_REPLAY_SPEED=1            # replay with original timing
+
+Summarize a session with:
+
+    python dragon_replay.py session.jsonl [--slowest N]
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import atexit
+import argparse
+import threading
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, IO, List, Optional, Tuple
+
+FORMAT = "dragon-rpc-session"
+VERSION = 1
+
+class ReplayMissError(LookupError):
+    """Raised when a replayed session has no response for a request"""
+
+def request_key(chain: str, method: str, params: Any) -> Tuple[str, str, str]:
+    """Canonical lookup key; params are JSON-encoded with sorted keys"""
+    return chain, method, json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+class RpcRecorder:
+    """Append-only writer for JSON-RPC exchanges"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = _open(path, "a")
+        self._write({"format": FORMAT, "version": VERSION, "started": time.time()})
+        atexit.register(self.close)
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, separators=(",", ":"), default=str)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def record(self, chain: str, method: str, params: Any, response: Any,
+               started: float, duration: float) -> None:
+        self.count += 1
+        self._write({
+            "t": round(started - self._started, 6),
+            "d": round(duration, 6),
+            "c": chain,
+            "m": method,
+            "p": params,
+            "r": response,
+        })
+
+    def wrap(self, chain: str, send: Callable) -> Callable:
+        """`send` with every successful exchange recorded"""
+        def recording_send(method, params):
+            started = time.monotonic()
+            response = send(method, params)
+            self.record(chain, method, params, response, started, time.monotonic() - started)
+            return response
+        return recording_send
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+def load_session(path: str) -> List[Dict[str, Any]]:
+    """Exchange records from a session file (header lines skipped)"""
+    records = []
+    with _open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if record.get("format") == FORMAT:
+                if record.get("version") != VERSION:
+                    raise ValueError(f"Unsupported session version {record.get('version')} in {path}")
+                continue
+            records.append(record)
+    return records
+
+class RpcReplayer:
+    """Serves recorded responses keyed by (chain, method, params)"""
+
+    def __init__(self, path: str, speed: float = 0.0):
+        self.path = path
+        self.speed = speed
+        self.served = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._queues: Dict[Tuple[str, str, str], Deque[Tuple[Any, float]]] = defaultdict(deque)
+        for record in load_session(path):
+            key = request_key(record["c"], record["m"], record["p"])
+            self._queues[key].append((record["r"], record.get("d", 0.0)))
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def lookup(self, chain: str, method: str, params: Any) -> Tuple[Any, float]:
+        key = request_key(chain, method, params)
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                self.misses += 1
+                raise ReplayMissError(f"No recorded response for {method} on {chain} with params {key[2]}")
+            self.served += 1
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def sender(self, chain: str) -> Callable:
+        """Drop-in replacement for a provider's make_request"""
+        def replay_send(method, params):
+            response, duration = self.lookup(chain, method, params)
+            if self.speed > 0 and duration > 0:
+                time.sleep(duration / self.speed)
+            return response
+        return replay_send
+
+def from_env() -> Tuple[Optional[RpcRecorder], Optional[RpcReplayer]]:
+    """Recorder and replayer configured by DRAGON_MCP_RPC_RECORD / DRAGON_MCP_RPC_REPLAY"""
+    record_path = os.getenv("DRAGON_MCP_RPC_RECORD")
+    replay_path = os.getenv("DRAGON_MCP_RPC_REPLAY")
+    if record_path and replay_path:
+        raise ValueError("DRAGON_MCP_RPC_RECORD and DRAGON_MCP_RPC_REPLAY cannot both be set")
+    if replay_path:
+        speed = float(os.getenv("DRAGON_MCP_RPC_REPLAY_SPEED", "0"))
+        return None, RpcReplayer(replay_path, speed=speed)
+    if record_path:
+        return RpcRecorder(record_path), None
+    return None, None
+
+# ================================
+# SESSION SUMMARY
+# ================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize a recorded Dragon MCP RPC session")
+    parser.add_argument("path", help="Session file written via DRAGON_MCP_RPC_RECORD")
+    parser.add_argument("--slowest", type=int, default=10, help="Show the N slowest requests")
+    args = parser.parse_args(argv)
+
+    records = load_session(args.path)
+    if not records:
+        print("Empty session", file=sys.stderr)
+        return 1
+
+    by_method: Dict[Tuple[str, str], List[float]] = defaultdict(list)
+    for record in records:
+        by_method[(record["c"], record["m"])].append(record["d"])
+    span = max(r["t"] + r["d"] for r in records) - min(r["t"] for r in records)
+    print(f"{len(records)} requests over {span:.2f}s, {sum(r['d'] for r in records):.2f}s waiting on RPCs")
+    print(f"\n{'chain':<10} {'method':<28} {'count':>6} {'total ms':>10} {'max ms':>9}")
+    for (chain, method), durations in sorted(by_method.items(), key=lambda item: -sum(item[1])):
+        print(f"{chain:<10} {method:<28} {len(durations):>6} {sum(durations) * 1000:>10.1f} "
+              f"{max(durations) * 1000:>9.1f}")
+
+    print(f"\nSlowest {args.slowest}:")
+    for record in sorted(records, key=lambda r: -r["d"])[:args.slowest]:
+        params = json.dumps(record["p"], default=str)
+        print(f"  {record['d'] * 1000:>9.1f}ms @+{record['t']:.3f}s {record['c']} {record['m']} "
+              f"{params[:80]}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Dragon Resilience
+Per-chain circuit breakers and request deadlines for upstream RPC calls.
+
+- CircuitBreaker trips open after consecutive transport failures (connection
+  errors, timeouts, HTTP errors) so calls to a dead endpoint fail
+  immediately instead of waiting for the HTTP timeout. After a cool-down it
+  lets a single probe through (half-open); success closes it, failure
+  re-opens it with a doubled cool-down.
+- deadline() sets an absolute deadline in a context variable. It flows into
+  worker threads started with asyncio.to_thread, nested deadlines can only
+  shorten it, and Web3Manager caps every RPC's HTTP timeout at the time
+  remaining so no RPC outlives the tool call or HTTP request that made it.
+- write_deadline() replaces the caller's deadline with a budget of its own,
+  for transaction writes: once a transaction is broadcast, waiting for its
+  receipt must not be cut short by a read-sized request deadline.
+"""
+
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+import dragon_metrics
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+BREAKER_STATE = dragon_metrics.REGISTRY.register(dragon_metrics.Gauge(
+    "dragon_circuit_state", "Per-chain RPC circuit breaker state (0 closed, 1 half-open, 2 open)", ["chain"]))
+BREAKER_REJECTIONS = dragon_metrics.REGISTRY.register(dragon_metrics.Counter(
+    "dragon_circuit_rejections_total", "RPC calls rejected by an open circuit breaker", ["chain"]))
+DEADLINES_EXCEEDED = dragon_metrics.REGISTRY.register(dragon_metrics.Counter(
+    "dragon_deadline_exceeded_total", "RPC calls abandoned because the caller's deadline passed", ["chain"]))
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of calling a chain whose circuit breaker is open"""
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the caller's deadline passes before an RPC can complete"""
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one chain"""
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 15.0,
+                 max_reset_timeout: float = 300.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.last_error: Optional[str] = None
+        self._probing = False
+        self._lock = threading.Lock()
+        BREAKER_STATE.set(name, value=0)
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        BREAKER_STATE.set(self.name, value=_STATE_VALUES[state])
+
+    def raise_if_open(self) -> None:
+        """Fail fast while open and cooling down, without taking the probe slot"""
+        with self._lock:
+            if self.state != OPEN or time.monotonic() - self.opened_at >= self.reset_timeout:
+                return
+        self._reject()
+
+    def _reject(self) -> None:
+        retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+        BREAKER_REJECTIONS.inc(self.name)
+        raise CircuitOpenError(
+            f"RPC circuit for {self.name} is open after {self.failures} consecutive failures "
+            f"(last: {self.last_error}); retrying in {retry_in:.1f}s"
+        )
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go through now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self._set_state(HALF_OPEN)
+            if self.state == HALF_OPEN and not self._probing:
+                # Exactly one probe at a time; everyone else keeps failing fast
+                self._probing = True
+                return
+        self._reject()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            self.reset_timeout = self.base_reset_timeout
+            if self.state != CLOSED:
+                self._set_state(CLOSED)
+
+    def record_failure(self, error: BaseException) -> None:
+        with self._lock:
+            self.failures += 1
+            self.last_error = f"{type(error).__name__}: {error}"[:200]
+            if self.state == HALF_OPEN:
+                # Failed probe: back off further before the next one
+                self._probing = False
+                self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+                self.opened_at = time.monotonic()
+                self._set_state(OPEN)
+            elif self.state == CLOSED and self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+    def release_probe(self) -> None:
+        """Give up a probe slot without a verdict (e.g. the caller's deadline passed)"""
+        with self._lock:
+            self._probing = False
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            report = {"state": self.state, "consecutive_failures": self.failures}
+            if self.state != CLOSED:
+                report["retry_in_seconds"] = round(
+                    max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at)), 2)
+                report["last_error"] = self.last_error
+            return report
+
+def is_transport_failure(error: BaseException) -> bool:
+    """Errors that say the endpoint is unhealthy (not that the call itself was bad)"""
+    if isinstance(error, (DeadlineExceeded, CircuitOpenError)):
+        return False
+    # requests' ConnectionError/Timeout/HTTPError derive from OSError, as do socket errors
+    return isinstance(error, OSError)
+
+# ================================
+# DEADLINES
+# ================================
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("dragon_deadline", default=None)
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """Run the block with at most `seconds` left (never extends an outer deadline)"""
+    if seconds is None or seconds <= 0:
+        yield _deadline.get()
+        return
+    candidate = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(candidate if current is None else min(current, candidate))
+    try:
+        yield _deadline.get()
+    finally:
+        _deadline.reset(token)
+
+@contextmanager
+def write_deadline(seconds: float) -> Iterator[float]:
+    """Run the block with exactly `seconds` left, whatever the outer deadline"""
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield _deadline.get()
+    finally:
+        _deadline.reset(token)
+
+def remaining() -> Optional[float]:
+    """Seconds until the current deadline, or None if there is none"""
+    current = _deadline.get()
+    return None if current is None else current - time.monotonic()
+
+def check_deadline(chain: str, method: str) -> Optional[float]:
+    """Remaining seconds, raising DeadlineExceeded if none are left"""
+    left = remaining()
+    if left is not None and left <= 0:
+        DEADLINES_EXCEEDED.inc(chain)
+        raise DeadlineExceeded(f"Deadline exceeded before {method} on {chain}")
+    return left
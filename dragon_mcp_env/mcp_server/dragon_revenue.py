@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Dragon Revenue Claims
+Bulk veDRAGONRevenueDistributor claimable amounts for payout reports.
+
+For every user x epoch x token, `getClaimable` and `hasUserClaimed` are
+batched into Multicall3 chunks pinned to one block, and rows are yielded
+chunk by chunk so callers can stream them.
+
+A closed epoch (below `currentEpoch`) can no longer receive fees, and its
+total supply snapshot and each user's voting power at its end are fixed, so
+a user's entitlement for it never changes. It is cached permanently in the
+shared chain cache the first time it is seen unclaimed. Only the claimed
+flag can still flip, and only from false to true: claimed rows are never
+read again, unclaimed ones need just `hasUserClaimed` (or nothing, with
+recheck_unclaimed=False). `getClaimable` is always zero for the live epoch,
+so it is not queried.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+KIND = "ve_claim"
+
+def claim_key(distributor: str, user: str, epoch: int, token: str) -> str:
+    return f"{distributor}:{user.lower()}:{epoch}:{token.lower()}"
+
+def iter_claimable(manager: Any, chain: str, users: Sequence[str], epochs: Optional[Sequence[int]] = None,
+                   tokens: Optional[Sequence[str]] = None, chunk_size: int = 200,
+                   recheck_unclaimed: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    Yield one header dict, then lists of rows per chunk:
+    {"user", "epoch", "token", "claimable", "claimed", "source"} where source
+    is "cache" or "chain" (or "error" with an "error" message).
+    """
+    distributor = manager.resolve_address(chain, "revenue_distributor")
+    block, values = manager.multicall(chain, [
+        ("revenue_distributor", "currentEpoch", ()),
+        ("revenue_distributor", "wrappedNativeToken", ()),
+        ("revenue_distributor", "rewardToken", ()),
+    ])
+    (ok, current_epoch), wrapped, reward = values
+    if not ok:
+        raise ValueError(f"Could not read currentEpoch from the revenue distributor on {chain}: {current_epoch}")
+    if tokens is None:
+        tokens = [value for ok, value in (wrapped, reward) if ok and int(value, 16) != 0]
+    if epochs is None:
+        epochs = range(current_epoch)
+    closed = sorted({int(e) for e in epochs if 0 <= int(e) < current_epoch})
+
+    yield {"chain": chain, "distributor": distributor, "block": block, "current_epoch": current_epoch,
+           "epochs": closed, "tokens": list(tokens), "users": len(users)}
+
+    cache = manager.chain_cache
+    triples = [(user, epoch, token) for user in users for epoch in closed for token in tokens]
+    for start in range(0, len(triples), chunk_size):
+        chunk = triples[start:start + chunk_size]
+        keys = [claim_key(distributor, *triple) for triple in chunk]
+        cached = cache.get_many(chain, KIND, keys) if cache is not None else {}
+
+        calls: List[Tuple[str, str, Tuple]] = []
+        plan = []  # per triple: (needs getClaimable, needs hasUserClaimed)
+        for key, (user, epoch, token) in zip(keys, chunk):
+            entry = cached.get(key)
+            full = entry is None
+            recheck = not full and not entry["claimed"] and recheck_unclaimed
+            if full:
+                calls.append(("revenue_distributor", "getClaimable", (user, epoch, token)))
+            if full or recheck:
+                calls.append(("revenue_distributor", "hasUserClaimed", (user, epoch, token)))
+            plan.append((full, full or recheck))
+
+        results = iter(manager.multicall(chain, calls, block)[1] if calls else [])
+        rows, updates = [], {}
+        for key, (user, epoch, token), (full, check) in zip(keys, chunk, plan):
+            entry = cached.get(key)
+            row = {"user": user, "epoch": epoch, "token": token, "source": "chain" if check else "cache"}
+            try:
+                amount = None
+                if full:
+                    ok, amount = next(results)
+                    if not ok:
+                        raise ValueError(amount)
+                if check:
+                    ok, claimed = next(results)
+                    if not ok:
+                        raise ValueError(claimed)
+                else:
+                    claimed = entry["claimed"]
+                if full:
+                    # A claimed row reports 0, so its entitlement is unknown (None)
+                    entry = {"amount": None if claimed else amount, "claimed": claimed}
+                    updates[key] = entry
+                elif claimed and not entry["claimed"]:
+                    entry = {"amount": entry["amount"], "claimed": True}
+                    updates[key] = entry
+                row["claimed"] = claimed
+                row["claimable"] = 0 if claimed else entry["amount"]
+            except (ValueError, StopIteration) as e:
+                row.update(source="error", error=str(e))
+            rows.append(row)
+
+        if cache is not None:
+            cache.put_many(chain, KIND, updates)
+        yield rows
+
+def summarize(rows: Sequence[Dict[str, Any]], totals: Dict[str, Dict[str, Any]]) -> None:
+    """Accumulate per-token claimable totals and row counts into `totals`"""
+    for row in rows:
+        stats = totals.setdefault(row["token"], {"claimable": 0, "unclaimed_rows": 0, "claimed_rows": 0,
+                                                 "errors": 0, "cached_rows": 0})
+        if row["source"] == "error":
+            stats["errors"] += 1
+            continue
+        if row["source"] == "cache":
+            stats["cached_rows"] += 1
+        if row["claimed"]:
+            stats["claimed_rows"] += 1
+        else:
+            stats["unclaimed_rows"] += 1
+            stats["claimable"] += row["claimable"] or 0
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Dragon Sidecar
+One shared Dragon MCP backend per host, reached over a Unix socket.
+
+Every editor window starts its own stdio server. With DRAGON_MCP_SIDECAR
+set, those processes become thin clients: tool calls are forwarded to this
+daemon, which owns the only Web3Manager, RPC connections, caches and
+background work on the host, so upstream traffic and memory stay flat as
+windows are added. The clients never import the web3 stack.
+
+The protocol is newline-delimited JSON over a stream socket:
+
+    -> {"id": 1, "tool": "get_dragon_price", "kwargs": {"chain": "sonic"}, "timeout": 60}
+    <- {"id": 1, "result": {...}}
+
+Requests on one connection may be answered out of order. Identical
+concurrent calls to read-only tools share one execution, and their results
+are reused for `ttl` seconds. A lock file next to the socket keeps a single
+daemon per socket path, so several clients may try to start one at once.
+
+Usage:
+    python dragon_sidecar.py [--socket PATH] [--ttl SECONDS] [--idle-exit SECONDS]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import itertools
+import subprocess
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+import dragon_metrics
+
+# Results can be large (Prometheus text, price history samples)
+LINE_LIMIT = 16 << 20
+
+SIDECAR_REQUESTS = dragon_metrics.REGISTRY.register(dragon_metrics.Counter(
+    "dragon_sidecar_requests_total", "Tool calls served by the sidecar, by how they were answered",
+    ["tool", "outcome"]))
+SIDECAR_CLIENTS = dragon_metrics.REGISTRY.register(dragon_metrics.Gauge(
+    "dragon_sidecar_clients", "Client connections open to the sidecar"))
+
+class SidecarUnavailable(ConnectionError):
+    """The sidecar could not be reached; the call was not sent"""
+
+class SidecarError(RuntimeError):
+    """The call was sent but no result came back"""
+
+# ================================
+# SERVER
+# ================================
+
+class SidecarServer:
+    """Serve tool calls from many clients with one backend"""
+
+    def __init__(self, tools: Dict[str, Callable[..., Awaitable[Any]]], path: str,
+                 shared_tools: Set[str], ttl: float = 1.0, idle_exit: float = 0.0):
+        self.tools = tools
+        self.path = path
+        self.shared_tools = shared_tools
+        self.ttl = ttl
+        self.idle_exit = idle_exit
+        self.clients = 0
+        self.started = time.time()
+        self._results: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._inflight: Dict[Tuple[str, str], "asyncio.Future"] = {}
+        self._idle_since = time.monotonic()
+
+    async def serve(self) -> None:
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # Stale socket; the lock file says nobody else owns it
+        server = await asyncio.start_unix_server(self._client, path=self.path, limit=LINE_LIMIT)
+        os.chmod(self.path, 0o600)
+        async with server:
+            if self.idle_exit > 0:
+                while not (self.clients == 0 and time.monotonic() - self._idle_since > self.idle_exit):
+                    await asyncio.sleep(min(self.idle_exit, 5.0))
+            else:
+                await server.serve_forever()
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.clients += 1
+        SIDECAR_CLIENTS.set(value=self.clients)
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.ensure_future(self._answer(line, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            for task in pending:
+                task.cancel()
+            self.clients -= 1
+            SIDECAR_CLIENTS.set(value=self.clients)
+            self._idle_since = time.monotonic()
+            writer.close()
+
+    async def _answer(self, line: bytes, writer: asyncio.StreamWriter) -> None:
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            response = {"id": request_id, "result": await self.call(
+                request["tool"], request.get("kwargs") or {}, request.get("timeout"))}
+        except Exception as e:
+            response = {"id": request_id, "error": f"{type(e).__name__}: {e}"}
+        writer.write(json.dumps(response, default=str).encode() + b"\n")
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def call(self, tool: str, kwargs: Dict[str, Any], timeout: Optional[float] = None) -> Any:
+        func = self.tools.get(tool)
+        if func is None:
+            raise KeyError(f"Unknown tool: {tool}")
+        if tool not in self.shared_tools:
+            SIDECAR_REQUESTS.inc(tool, "executed")
+            return await self._run(func, kwargs, timeout)
+
+        key = (tool, json.dumps(kwargs, sort_keys=True, default=str))
+        cached = self._results.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self.ttl:
+            SIDECAR_REQUESTS.inc(tool, "cached")
+            dragon_metrics.cache_lookup("sidecar", True)
+            return cached[1]
+
+        future = self._inflight.get(key)
+        if future is not None:
+            SIDECAR_REQUESTS.inc(tool, "coalesced")
+            dragon_metrics.cache_lookup("sidecar", True)
+            return await asyncio.shield(future)
+
+        dragon_metrics.cache_lookup("sidecar", False)
+        SIDECAR_REQUESTS.inc(tool, "executed")
+        future = asyncio.ensure_future(self._run(func, kwargs, timeout))
+        self._inflight[key] = future
+        try:
+            result = await asyncio.shield(future)
+        finally:
+            self._inflight.pop(key, None)
+        if not (isinstance(result, dict) and "error" in result):
+            self._results[key] = (time.monotonic(), result)
+            if len(self._results) > 1024:
+                now = time.monotonic()
+                self._results = {k: v for k, v in self._results.items() if now - v[0] < self.ttl}
+        return result
+
+    async def _run(self, func: Callable[..., Awaitable[Any]], kwargs: Dict[str, Any],
+                   timeout: Optional[float]) -> Any:
+        import dragon_resilience
+        # The client's deadline travels with the request
+        with dragon_resilience.deadline(timeout):
+            return await func(**kwargs)
+
+# ================================
+# CLIENT
+# ================================
+
+class SidecarClient:
+    """Forward tool calls to the sidecar over one multiplexed connection"""
+
+    def __init__(self, path: str, spawn: bool = False, connect_timeout: float = 10.0):
+        self.path = path
+        self.spawn = spawn
+        self.connect_timeout = connect_timeout
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, "asyncio.Future"] = {}
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._spawned = False
+
+    async def call(self, tool: str, kwargs: Dict[str, Any], timeout: Optional[float] = None) -> Any:
+        """Tool result from the sidecar; SidecarUnavailable means nothing was sent"""
+        writer = await self._connect()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            writer.write(json.dumps({"id": request_id, "tool": tool, "kwargs": kwargs,
+                                     "timeout": timeout}).encode() + b"\n")
+            await writer.drain()
+            # A little slack so the sidecar's own deadline answers first
+            response = await asyncio.wait_for(future, None if timeout is None else timeout + 1.0)
+        except asyncio.TimeoutError:
+            raise SidecarError(f"No answer from sidecar for {tool} within {timeout}s")
+        except ConnectionError as e:
+            raise SidecarError(f"Lost sidecar connection during {tool}: {e}")
+        finally:
+            self._pending.pop(request_id, None)
+        if "error" in response:
+            raise SidecarError(response["error"])
+        return response["result"]
+
+    async def _connect(self) -> asyncio.StreamWriter:
+        if self._writer is not None and not self._writer.is_closing():
+            return self._writer
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._writer is not None and not self._writer.is_closing():
+                return self._writer
+            deadline = time.monotonic() + self.connect_timeout
+            while True:
+                try:
+                    self._reader, self._writer = await asyncio.open_unix_connection(self.path, limit=LINE_LIMIT)
+                    break
+                except OSError as e:
+                    if not self.spawn or time.monotonic() > deadline:
+                        raise SidecarUnavailable(f"Sidecar not reachable at {self.path}: {e}")
+                    if not self._spawned:
+                        self._spawned = True
+                        spawn_sidecar(self.path)
+                    await asyncio.sleep(0.1)
+            asyncio.ensure_future(self._read(self._reader))
+            return self._writer
+
+    async def _read(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.get(response.get("id"))
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self._writer = None
+            for future in list(self._pending.values()):
+                if not future.done():
+                    future.set_exception(ConnectionError("sidecar closed the connection"))
+
+def spawn_sidecar(path: str, idle_exit: float = 600.0) -> subprocess.Popen:
+    """Start a detached sidecar that exits after `idle_exit` seconds without clients"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    log = open(os.path.join(directory, "sidecar.log"), "ab")
+    return subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--socket", path, "--idle-exit", str(idle_exit)],
+        stdin=subprocess.DEVNULL, stdout=log, stderr=log, start_new_session=True,
+        env={**os.environ, "DRAGON_MCP_SIDECAR": "off"},
+    )
+
+# ================================
+# DAEMON
+# ================================
+
+# Tools without side effects; identical concurrent calls are answered once
+SHARED_TOOLS = {
+    "get_dragon_price", "check_oracle_health", "get_price_history", "get_lottery_stats",
+    "get_global_jackpot", "simulate_lottery", "check_layerzero_status", "estimate_layerzero_fee",
+    "get_contract_registry", "get_vrf_request", "get_vrf_stats",
+}
+
+def main() -> int:
+    # This process is the backend; it must never forward to itself
+    os.environ["DRAGON_MCP_SIDECAR"] = "off"
+    import fcntl
+    import dragon_mcp
+
+    parser = argparse.ArgumentParser(description="Shared Dragon MCP backend for stdio clients")
+    parser.add_argument("--socket", default=dragon_mcp.SIDECAR_SOCKET, help="Unix socket path")
+    parser.add_argument("--ttl", type=float, default=dragon_mcp.SIDECAR_TTL,
+                        help="Seconds to reuse read-only tool results")
+    parser.add_argument("--idle-exit", type=float, default=0.0,
+                        help="Exit after this many seconds without clients (0 = never)")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.socket)), exist_ok=True)
+    lock = open(args.socket + ".lock", "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        print(f"🔒 A sidecar already serves {args.socket}")
+        return 0
+
+    dragon_mcp.start_warmup()
+    server = SidecarServer(dragon_mcp.TOOLS, args.socket, SHARED_TOOLS, ttl=args.ttl, idle_exit=args.idle_exit)
+    print(f"🐉 Dragon MCP sidecar listening on {args.socket} (pid {os.getpid()})", flush=True)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+    print("👋 Sidecar stopped", flush=True)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
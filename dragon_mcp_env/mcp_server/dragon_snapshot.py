@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Dragon Balance Snapshot
+Bulk balanceOf snapshots of DRAGON, redDRAGON and veDRAGON holders.
+
+Each chain is pinned to one block up front, then the holder list is read in
+chunks: per chunk and chain, one Multicall3 batch reads every token's
+balanceOf for every address in the chunk, and the chains run in parallel.
+Only one chunk is held at a time, so a 100k-holder snapshot streams from the
+address file to the output in bounded memory and costs a few hundred
+eth_calls instead of one per holder and token.
+
+Output is columnar, one record per chunk:
+
+    {"offset": 0, "addresses": [...], "balances": {"sonic": {"dragon": [...], ...}}}
+
+Each balance list lines up with `addresses`; a failed read is null.
+"""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+# Token name -> contract type in Web3Manager
+TOKENS = {
+    "dragon": "omnidragon",
+    "reddragon": "reddragon",
+    "vedragon": "vedragon",
+}
+
+def normalize_address(address: str) -> str:
+    address = address.strip().lower()
+    if len(address) != 42 or not address.startswith("0x"):
+        raise ValueError(f"Invalid holder address: {address!r}")
+    int(address, 16)
+    return address
+
+def read_addresses(path: str) -> Iterator[str]:
+    """
+    Holder addresses from a text or CSV file, one per line (first column);
+    blank lines, `#` comments and a non-address header row are skipped
+    """
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            value = line.split(",", 1)[0].strip().strip('"')
+            if not value or value.startswith("#"):
+                continue
+            if number == 1 and not value.lower().startswith("0x"):
+                continue  # CSV header
+            try:
+                yield normalize_address(value)
+            except ValueError:
+                raise ValueError(f"{path}:{number}: invalid address {value!r}")
+
+def _chunks(addresses: Iterable[str], size: int) -> Iterator[List[str]]:
+    chunk: List[str] = []
+    for address in addresses:
+        chunk.append(address)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _read_chunk(manager: Any, chain: str, block: int, tokens: Sequence[str],
+                addresses: List[str]) -> Dict[str, List[Optional[int]]]:
+    calls = [(TOKENS[token], "balanceOf", (address,)) for token in tokens for address in addresses]
+    _, values = manager.multicall(chain, calls, block)
+    columns = {}
+    for i, token in enumerate(tokens):
+        column = values[i * len(addresses):(i + 1) * len(addresses)]
+        columns[token] = [value if ok else None for ok, value in column]
+    return columns
+
+def iter_snapshot(manager: Any, chains: Sequence[str], addresses: Iterable[str],
+                  tokens: Optional[Sequence[str]] = None, chunk_size: int = 250,
+                  blocks: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield a header {"chains": {chain: {"block", "tokens"}}}, then one
+    columnar record per chunk of addresses. Chains with none of the tokens
+    deployed are left out of the snapshot.
+    """
+    tokens = list(tokens or TOKENS)
+    unknown = [token for token in tokens if token not in TOKENS]
+    if unknown:
+        raise ValueError(f"Unknown tokens: {', '.join(unknown)} (choose from {', '.join(TOKENS)})")
+
+    plan: Dict[str, Dict[str, Any]] = {}
+    for chain in chains:
+        deployed = [token for token in tokens if manager.has_address(chain, TOKENS[token])]
+        if not deployed:
+            continue
+        block = (blocks or {}).get(chain)
+        if block is None:
+            block = int(manager.request(chain, "eth_blockNumber", []), 16)
+        plan[chain] = {"block": block, "tokens": deployed}
+    yield {"chains": plan}
+    if not plan:
+        return
+
+    offset = 0
+    with ThreadPoolExecutor(max_workers=len(plan), thread_name_prefix="dragon-snapshot") as pool:
+        for chunk in _chunks(addresses, chunk_size):
+            # Pool threads do not inherit context: carry the caller's deadline over
+            futures = {
+                chain: pool.submit(contextvars.copy_context().run, _read_chunk,
+                                   manager, chain, entry["block"], entry["tokens"], chunk)
+                for chain, entry in plan.items()
+            }
+            balances, errors = {}, {}
+            for chain, future in futures.items():
+                try:
+                    balances[chain] = future.result()
+                except Exception as e:
+                    # Keep the columns aligned; the whole chunk failed on this chain
+                    balances[chain] = {token: [None] * len(chunk) for token in plan[chain]["tokens"]}
+                    errors[chain] = str(e)
+            record = {"offset": offset, "addresses": chunk, "balances": balances}
+            if errors:
+                record["errors"] = errors
+            yield record
+            offset += len(chunk)
+
+def summarize(record: Dict[str, Any], totals: Dict[str, Dict[str, Dict[str, int]]]) -> None:
+    """Accumulate per chain and token supply held, holder count and failed reads into `totals`"""
+    for chain, columns in record["balances"].items():
+        for token, column in columns.items():
+            stats = totals.setdefault(chain, {}).setdefault(token, {"total": 0, "holders": 0, "failed": 0})
+            for balance in column:
+                if balance is None:
+                    stats["failed"] += 1
+                elif balance:
+                    stats["total"] += balance
+                    stats["holders"] += 1
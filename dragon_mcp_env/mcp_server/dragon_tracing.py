@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Dragon Tracing
+OpenTelemetry-compatible spans with a local JSONL exporter.
+
+A root span is opened per MCP tool call or hosted HTTP request, and child
+spans per Web3Manager RPC, Multicall3 batch and cache lookup. Span records
+follow the OTLP/JSON field names (traceId, spanId, parentSpanId,
+startTimeUnixNano, ...) so they can be loaded into OpenTelemetry tooling,
+and W3C `traceparent` headers carry trace IDs across the hosted API.
+
+Tracing is off unless DRAGON_MCP_TRACE_FILE is set; disabled spans are a
+shared no-op object. View exported traces offline with:
+
+    python dragon_tracing.py traces.jsonl [--trace TRACE_ID] [--slowest N]
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import secrets
+import argparse
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+SERVICE_NAME = "dragon-mcp"
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("dragon_span", default=None)
+
+class Span:
+    """One timed operation; attributes follow OpenTelemetry naming where one exists"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns",
+                 "attributes", "status", "status_message")
+    recording = True
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], kind: str,
+                 attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes
+        self.status = "UNSET"
+        self.status_message = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        self.status = "ERROR"
+        self.status_message = message
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": f"SPAN_KIND_{self.kind.upper()}",
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": self.attributes,
+            "status": {"code": f"STATUS_CODE_{self.status}"},
+            "resource": {"service.name": SERVICE_NAME},
+        }
+        if self.status_message:
+            record["status"]["message"] = self.status_message
+        return record
+
+class _NoopSpan:
+    """Returned when tracing is disabled; every operation is free"""
+    recording = False
+    trace_id = None
+    traceparent = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_error(self, message: str) -> None:
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+class JsonlExporter:
+    """Appends finished spans to a JSONL file, flushing when a root span ends"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        atexit.register(self.flush)
+
+    def export(self, span: Span, flush: bool = False) -> None:
+        line = json.dumps(span.to_dict(), separators=(",", ":"), default=str)
+        with self._lock:
+            self._buffer.append(line)
+            pending = len(self._buffer)
+        if flush or pending >= 256:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+        if lines:
+            with open(self.path, "a") as f:
+                f.write("\n".join(lines) + "\n")
+
+_exporter: Optional[JsonlExporter] = None
+
+def configure(path: Optional[str]) -> None:
+    """Enable tracing to `path` (None disables it)"""
+    global _exporter
+    if _exporter is not None:
+        _exporter.flush()
+    _exporter = JsonlExporter(path) if path else None
+
+def enabled() -> bool:
+    return _exporter is not None
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str]]:
+    """(trace_id, parent_span_id) from a W3C traceparent header, or None if invalid"""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return parts[1].lower(), parts[2].lower()
+
+@contextmanager
+def span(name: str, kind: str = "internal", traceparent: Optional[str] = None,
+         **attributes: Any) -> Iterator[Any]:
+    """
+    Time a block as a span. It becomes a child of the current span, or of the
+    remote parent in `traceparent`, or starts a new trace.
+    """
+    if _exporter is None:
+        yield NOOP_SPAN
+        return
+
+    parent = _current_span.get()
+    remote = parse_traceparent(traceparent) if parent is None else None
+    if parent is not None:
+        trace_id, parent_id = parent.trace_id, parent.span_id
+    elif remote is not None:
+        trace_id, parent_id = remote
+    else:
+        trace_id, parent_id = secrets.token_hex(16), None
+
+    current = Span(name, trace_id, parent_id, kind, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.set_error(f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end_ns = time.time_ns()
+        exporter = _exporter
+        if exporter is not None:
+            # Flush when the local root ends so a finished trace is on disk
+            exporter.export(current, flush=parent is None)
+
+configure(os.getenv("DRAGON_MCP_TRACE_FILE"))
+
+# ================================
+# OFFLINE VIEWER
+# ================================
+
+def load_traces(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Spans from a JSONL export grouped by trace ID"""
+    traces: Dict[str, List[Dict[str, Any]]] = {}
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                traces.setdefault(record["traceId"], []).append(record)
+    return traces
+
+def _duration_ms(record: Dict[str, Any]) -> float:
+    return (record["endTimeUnixNano"] - record["startTimeUnixNano"]) / 1e6
+
+def format_trace(spans: List[Dict[str, Any]]) -> str:
+    """Indented span tree with durations and offsets from the trace start"""
+    ids = {s["spanId"] for s in spans}
+    children: Dict[str, List[Dict[str, Any]]] = {}
+    roots = []
+    for record in sorted(spans, key=lambda s: s["startTimeUnixNano"]):
+        parent = record.get("parentSpanId")
+        if parent and parent in ids:
+            children.setdefault(parent, []).append(record)
+        else:
+            roots.append(record)
+
+    trace_start = min(s["startTimeUnixNano"] for s in spans)
+    lines = []
+
+    def walk(record: Dict[str, Any], depth: int) -> None:
+        offset = (record["startTimeUnixNano"] - trace_start) / 1e6
+        attrs = " ".join(f"{k}={v}" for k, v in record.get("attributes", {}).items())
+        error = " ERROR" if record.get("status", {}).get("code") == "STATUS_CODE_ERROR" else ""
+        lines.append(f"{'  ' * depth}{record['name']}  {_duration_ms(record):.2f}ms "
+                     f"@+{offset:.2f}ms{error}  {attrs}".rstrip())
+        for child in children.get(record["spanId"], []):
+            walk(child, depth + 1)
+
+    for root in roots:
+        walk(root, 0)
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="View Dragon MCP traces exported as JSONL")
+    parser.add_argument("path", help="JSONL file written via DRAGON_MCP_TRACE_FILE")
+    parser.add_argument("--trace", help="Show only this trace ID")
+    parser.add_argument("--slowest", type=int, default=10, help="Show the N slowest traces")
+    args = parser.parse_args(argv)
+
+    traces = load_traces(args.path)
+    if args.trace:
+        selected = [args.trace] if args.trace in traces else []
+    else:
+        def trace_ms(spans):
+            return (max(s["endTimeUnixNano"] for s in spans) - min(s["startTimeUnixNano"] for s in spans)) / 1e6
+        selected = sorted(traces, key=lambda t: trace_ms(traces[t]), reverse=True)[:args.slowest]
+
+    if not selected:
+        print("No matching traces", file=sys.stderr)
+        return 1
+    for trace_id in selected:
+        print(f"trace {trace_id}")
+        print(format_trace(traces[trace_id]))
+        print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Dragon VRF Tracking
+Follow Chainlink VRF requests from submission to delivery in the background.
+
+Cross-chain requests go through ChainlinkVRFIntegratorV2_5 on the source
+chain and OmniDragonVRFConsumerV2_5 on Arbitrum:
+
+    source   RandomWordsRequested(sequence)       requested
+    arbitrum VRFRequestSent(sequence, requestId)  vrf_requested  (LayerZero hop)
+    arbitrum RandomnessFulfilled(requestId)       fulfilled      (Chainlink VRF)
+    source   RandomWordsReceived(sequence)        delivered      (LayerZero hop back)
+             or RequestExpired(sequence) / checkRequestStatus().expired
+
+Local Arbitrum requests stop at RandomnessFulfilled. Stage times are block
+timestamps, so latencies measure the chains rather than our polling. Each
+stage's latency is exported as dragon_vrf_stage_seconds{stage} and kept in a
+short window for exact percentiles. Finished requests stay queryable for
+`retention` seconds, and at most `max_finished` of them are kept.
+"""
+
+import time
+import functools
+import threading
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from typing import Any, Deque, Dict, List, Optional
+
+import dragon_metrics
+import dragon_ratelimit
+from dragon_codec import keccak256, decode_uint, WORD
+
+EVENTS = {
+    "requested": "RandomWordsRequested(uint64,address,uint32)",        # integrator, source chain
+    "received": "RandomWordsReceived(uint256[],uint64,address)",       # integrator, source chain
+    "expired": "RequestExpired(uint64,address)",                        # integrator, source chain
+    "local_requested": "LocalRandomWordsRequested(uint256,address,uint256)",  # consumer, Arbitrum
+    "vrf_sent": "VRFRequestSent(uint256,uint256,uint32)",               # consumer, Arbitrum
+    "fulfilled": "RandomnessFulfilled(uint256,uint256[],uint32)",       # consumer, Arbitrum
+}
+
+# Latency of each stage, measured from the source-chain request
+STAGES = ("lz_request", "vrf_fulfilment", "lz_response", "end_to_end")
+
+VRF_BUCKETS = (5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0, 3600.0)
+
+VRF_STAGE_LATENCY = dragon_metrics.REGISTRY.register(dragon_metrics.Histogram(
+    "dragon_vrf_stage_seconds", "VRF request latency per stage (block timestamps)", ["stage"],
+    buckets=VRF_BUCKETS))
+VRF_REQUESTS = dragon_metrics.REGISTRY.register(dragon_metrics.Counter(
+    "dragon_vrf_requests_total", "Tracked VRF requests by final outcome", ["chain", "outcome"]))
+VRF_PENDING = dragon_metrics.REGISTRY.register(dragon_metrics.Gauge(
+    "dragon_vrf_pending", "VRF requests still being tracked"))
+
+@functools.lru_cache(maxsize=None)
+def topic(event: str) -> str:
+    return "0x" + keccak256(EVENTS[event].encode()).hex()
+
+def topic_int(value: int) -> str:
+    return "0x" + value.to_bytes(WORD, "big").hex()
+
+def decode_words(data: str) -> List[int]:
+    """The uint256[] that is the first non-indexed parameter of an event"""
+    raw = bytes.fromhex(data[2:])
+    start = decode_uint(raw[:WORD])
+    count = decode_uint(raw[start:start + WORD])
+    return [decode_uint(raw[start + WORD * (i + 1):start + WORD * (i + 2)]) for i in range(count)]
+
+@dataclass
+class VRFRequest:
+    handle: str
+    chain: str
+    mode: str                   # "cross_chain" or "local"
+    tx_hash: str
+    submitted_at: float
+    status: str = "submitted"   # -> requested -> vrf_requested -> fulfilled -> delivered | expired | failed | timed_out
+    sequence: Optional[int] = None
+    vrf_request_id: Optional[int] = None
+    random_words: List[int] = field(default_factory=list)
+    times: Dict[str, int] = field(default_factory=dict)
+    blocks: Dict[str, int] = field(default_factory=dict)
+    latencies: Dict[str, int] = field(default_factory=dict)
+    cursors: Dict[str, int] = field(default_factory=dict)
+    error: Optional[str] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("delivered", "expired", "failed", "timed_out")
+
+    def report(self) -> Dict[str, Any]:
+        report = asdict(self)
+        report.pop("cursors")
+        return report
+
+class VRFTracker:
+    """
+    Background poller advancing VRF requests through their stages.
+
+    `manager` is the Web3Manager (request, get_receipt, get_block_header,
+    get_logs, call_view, resolve_address). The polling thread runs only
+    while requests are pending.
+    """
+
+    def __init__(self, manager: Any, consumer_chain: str = "arbitrum", poll_interval: float = 5.0,
+                 timeout: float = 3600.0, max_range: int = 5000, lookback: int = 100, window: int = 1000,
+                 retention: float = 86400.0, max_finished: int = 1000):
+        self.manager = manager
+        self.consumer_chain = consumer_chain
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.max_range = max_range
+        self.lookback = lookback
+        self.retention = retention
+        self.max_finished = max_finished
+        self.requests: Dict[str, VRFRequest] = {}
+        # Outcome counts of requests evicted from `requests`, for stats()
+        self.evicted: Dict[str, int] = {}
+        self.samples: Dict[str, Deque[int]] = {stage: deque(maxlen=window) for stage in STAGES}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def track(self, chain: str, mode: str, tx_hash: str) -> VRFRequest:
+        request = VRFRequest(handle=f"{chain}:{tx_hash}", chain=chain, mode=mode, tx_hash=tx_hash,
+                             submitted_at=time.time())
+        with self._lock:
+            self._evict()
+            self.requests[request.handle] = request
+            VRF_PENDING.inc()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="dragon-vrf-tracker", daemon=True)
+                self._thread.start()
+        return request
+
+    def get(self, handle: str) -> Optional[VRFRequest]:
+        return self.requests.get(handle)
+
+    def pending(self) -> List[VRFRequest]:
+        with self._lock:
+            return [r for r in self.requests.values() if not r.done]
+
+    def _run(self) -> None:
+        # Polling yields to interactive tool calls on the same endpoints
+        with dragon_ratelimit.priority(dragon_ratelimit.BACKGROUND):
+            self._poll()
+
+    def _poll(self) -> None:
+        while True:
+            pending = self.pending()
+            if not pending:
+                with self._lock:
+                    if not any(not r.done for r in self.requests.values()):
+                        self._thread = None
+                        return
+                continue
+            heads: Dict[str, int] = {}
+            for request in pending:
+                try:
+                    self.advance(request, heads)
+                except Exception as e:
+                    request.error = f"{type(e).__name__}: {e}"[:300]
+                if not request.done and time.time() - request.submitted_at > self.timeout:
+                    self._finish(request, "timed_out")
+            time.sleep(self.poll_interval)
+
+    # ================================
+    # STAGES
+    # ================================
+
+    def advance(self, request: VRFRequest, heads: Optional[Dict[str, int]] = None) -> None:
+        """Move `request` through every stage whose event is already on chain"""
+        heads = {} if heads is None else heads
+        while not request.done:
+            status = request.status
+            step = getattr(self, f"_after_{status}")
+            step(request, heads)
+            if request.status == status:
+                return
+
+    def _after_submitted(self, request: VRFRequest, heads: Dict[str, int]) -> None:
+        receipt = self.manager.get_receipt(request.chain, request.tx_hash)
+        if receipt is None:
+            return
+        if int(receipt["status"], 16) != 1:
+            request.error = "transaction reverted"
+            self._finish(request, "failed")
+            return
+        wanted = topic("local_requested" if request.mode == "local" else "requested")
+        for log in receipt["logs"]:
+            if log["topics"] and log["topics"][0] == wanted:
+                number = int(log["blockNumber"], 16)
+                self._stage(request, "requested", request.chain, number)
+                if request.mode == "local":
+                    request.vrf_request_id = int(log["topics"][1], 16)
+                    request.status = "vrf_requested"
+                    request.times["vrf_requested"] = request.times["requested"]
+                else:
+                    request.sequence = int(log["topics"][1], 16)
+                    request.cursors[request.chain] = number
+                return
+        request.error = "no VRF request event in receipt"
+        self._finish(request, "failed")
+
+    def _after_requested(self, request: VRFRequest, heads: Dict[str, int]) -> None:
+        consumer = self.manager.resolve_address(self.consumer_chain, "vrf_consumer")
+        log = self._scan(request, self.consumer_chain, consumer, [topic("vrf_sent"), topic_int(request.sequence)], heads)
+        if log is not None:
+            request.vrf_request_id = int(log["topics"][2], 16)
+            self._stage(request, "vrf_requested", self.consumer_chain, int(log["blockNumber"], 16))
+            self._observe(request, "lz_request", "requested", "vrf_requested")
+
+    def _after_vrf_requested(self, request: VRFRequest, heads: Dict[str, int]) -> None:
+        consumer = self.manager.resolve_address(self.consumer_chain, "vrf_consumer")
+        log = self._scan(request, self.consumer_chain, consumer,
+                         [topic("fulfilled"), topic_int(request.vrf_request_id)], heads)
+        if log is None:
+            return
+        request.random_words = decode_words(log["data"])
+        self._stage(request, "fulfilled", self.consumer_chain, int(log["blockNumber"], 16))
+        self._observe(request, "vrf_fulfilment", "vrf_requested", "fulfilled")
+        if request.mode == "local":
+            self._observe(request, "end_to_end", "requested", "fulfilled")
+            self._finish(request, "delivered")
+
+    def _after_fulfilled(self, request: VRFRequest, heads: Dict[str, int]) -> None:
+        # One cheap view says whether there is anything to find in the logs yet
+        fulfilled, exists, _, _, _, expired = self.manager.call_view(
+            request.chain, "vrf_integrator", "checkRequestStatus", request.sequence)
+        if not fulfilled and exists and not expired:
+            return
+        integrator = self.manager.resolve_address(request.chain, "vrf_integrator")
+        log = self._scan(request, request.chain, integrator,
+                         [[topic("received"), topic("expired")], topic_int(request.sequence)], heads)
+        if log is None:
+            if expired or not exists:
+                # Timed out on chain (or cleaned up) without a delivery event in range
+                self._finish(request, "expired")
+            return
+        if log["topics"][0] == topic("expired"):
+            self._finish(request, "expired")
+            return
+        request.random_words = decode_words(log["data"])
+        self._stage(request, "delivered", request.chain, int(log["blockNumber"], 16))
+        self._observe(request, "lz_response", "fulfilled", "delivered")
+        self._observe(request, "end_to_end", "requested", "delivered")
+        self._finish(request, "delivered")
+
+    # ================================
+    # HELPERS
+    # ================================
+
+    def _head(self, chain: str, heads: Dict[str, int]) -> int:
+        if chain not in heads:
+            heads[chain] = int(self.manager.request(chain, "eth_blockNumber", []), 16)
+        return heads[chain]
+
+    def _scan(self, request: VRFRequest, chain: str, address: str, topics: List[Any],
+              heads: Dict[str, int]) -> Optional[Dict[str, Any]]:
+        """First matching log after the request's cursor on `chain`, advancing the cursor"""
+        head = self._head(chain, heads)
+        start = request.cursors.setdefault(chain, max(0, head - self.lookback))
+        while start <= head:
+            end = min(head, start + self.max_range - 1)
+            logs = self.manager.get_logs(chain, {"address": address, "topics": topics,
+                                                 "fromBlock": start, "toBlock": end})
+            if logs:
+                return logs[0]
+            start = request.cursors[chain] = end + 1
+        return None
+
+    def _stage(self, request: VRFRequest, status: str, chain: str, number: int) -> None:
+        header = self.manager.get_block_header(chain, number)
+        request.status = status
+        request.blocks[status] = number
+        request.times[status] = int(header["timestamp"], 16)
+
+    def _observe(self, request: VRFRequest, stage: str, start: str, end: str) -> None:
+        seconds = max(0, request.times[end] - request.times[start])
+        request.latencies[stage] = seconds
+        VRF_STAGE_LATENCY.observe(seconds, stage)
+        self.samples[stage].append(seconds)
+
+    def _finish(self, request: VRFRequest, outcome: str) -> None:
+        with self._lock:
+            if request.done:
+                return
+            request.status = outcome
+            request.finished_at = time.time()
+            VRF_PENDING.dec()
+            self._evict()
+        VRF_REQUESTS.inc(request.chain, outcome)
+
+    def _evict(self) -> None:
+        """Forget finished requests past `retention`, then the oldest beyond `max_finished` (lock held)"""
+        finished = sorted((r for r in self.requests.values() if r.done), key=lambda r: r.finished_at or 0)
+        cutoff = time.time() - self.retention
+        stale = [r for r in finished if (r.finished_at or 0) < cutoff]
+        overflow = finished[len(stale):][:max(0, len(finished) - len(stale) - self.max_finished)]
+        for request in stale + overflow:
+            del self.requests[request.handle]
+            self.evicted[request.status] = self.evicted.get(request.status, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Outcome counts and exact latency percentiles over the recent window"""
+        outcomes: Dict[str, int] = dict(self.evicted)
+        for request in list(self.requests.values()):
+            outcomes[request.status] = outcomes.get(request.status, 0) + 1
+        latencies = {}
+        for stage, values in self.samples.items():
+            ordered = sorted(values)
+            if not ordered:
+                continue
+            pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+            latencies[stage] = {"count": len(ordered), "p50": pick(0.5), "p90": pick(0.9),
+                                "p99": pick(0.99), "max": ordered[-1]}
+        return {"requests": outcomes, "latency_seconds": latencies}
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Dragon Write Queue
+Per-signer, per-chain serialization and admission control for transactions.
+
+Every transaction from one signer on one chain runs through a single
+SignerQueue, one at a time, so concurrent admin requests can no longer read
+the same nonce or broadcast duplicate updates:
+- A write with a merge key (e.g. oracle updatePrice) joins an identical
+  write that is still waiting instead of queueing another; both callers get
+  the same result.
+- At most `capacity` writes may wait. Beyond that submit() raises QueueFull
+  at once, with a Retry-After estimate from recent run times, instead of
+  letting requests pile up behind slow confirmations.
+- Each write runs as its own task with deadlines of its own rather than
+  the request's: it may wait `wait_timeout` seconds for its turn (beyond
+  that it is dropped before anything is signed), then gets `run_timeout`
+  seconds to send and confirm, however long it queued. Callers that give
+  up do not cancel a write that has started.
+
+Each submit returns the result with a report of queue position at
+admission, whether it was merged, and time spent queued and running.
+"""
+
+import time
+import math
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import dragon_metrics
+import dragon_resilience
+
+WRITE_REQUESTS = dragon_metrics.REGISTRY.register(dragon_metrics.Counter(
+    "dragon_write_requests_total", "Transaction write requests by admission outcome",
+    ["chain", "outcome"]))
+WRITE_QUEUE_DEPTH = dragon_metrics.REGISTRY.register(dragon_metrics.Gauge(
+    "dragon_write_queue_depth", "Writes waiting or running per signer and chain", ["signer", "chain"]))
+WRITE_LATENCY = dragon_metrics.REGISTRY.register(dragon_metrics.Histogram(
+    "dragon_write_seconds", "Write queue wait and run time", ["chain", "phase"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)))
+
+class QueueFull(Exception):
+    """Raised when a signer's queue is saturated; retry_after is a whole-second estimate"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+@dataclass
+class _Write:
+    merge_key: Optional[str]
+    submitted: float
+    task: Optional["asyncio.Task"] = None
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    waiters: int = 1
+
+class SignerQueue:
+    """FIFO of writes for one signer on one chain, run one at a time"""
+
+    def __init__(self, signer: str, chain: str, capacity: int = 8,
+                 wait_timeout: Optional[float] = None, run_timeout: Optional[float] = None):
+        self.signer = signer
+        self.chain = chain
+        self.capacity = capacity
+        self.wait_timeout = wait_timeout
+        self.run_timeout = run_timeout
+        self.waiting: List[_Write] = []
+        self.running: Optional[_Write] = None
+        self.completed = 0
+        self.merged = 0
+        self.rejected = 0
+        self.avg_run_seconds: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def _depth(self) -> int:
+        return len(self.waiting) + (1 if self.running else 0)
+
+    def _queued(self) -> int:
+        """Writes waiting behind another; an idle queue's head is about to run, not waiting"""
+        return len(self.waiting) - (1 if self.waiting and not self.running else 0)
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely to free up"""
+        return max(1, math.ceil((self.avg_run_seconds or 1.0) * max(1, self._depth() - self.capacity + 1)))
+
+    async def submit(self, run: Callable[[], Awaitable[Any]],
+                     merge_key: Optional[str] = None) -> Tuple[Any, Dict[str, Any]]:
+        """Run `run()` in turn; returns (its result, queue report)"""
+        for position, write in enumerate(self.waiting):
+            if merge_key is not None and write.merge_key == merge_key:
+                write.waiters += 1
+                self.merged += 1
+                WRITE_REQUESTS.inc(self.chain, "merged")
+                position += 1 if self.running else 0
+                result = await asyncio.shield(write.task)
+                return result, self._report(write, position, merged=True)
+
+        if self._queued() >= self.capacity:
+            self.rejected += 1
+            WRITE_REQUESTS.inc(self.chain, "rejected")
+            raise QueueFull(
+                f"Write queue for {self.signer} on {self.chain} is full "
+                f"({self._queued()} waiting)", self.retry_after())
+
+        position = self._depth()
+        write = _Write(merge_key=merge_key, submitted=time.monotonic())
+        self.waiting.append(write)
+        WRITE_REQUESTS.inc(self.chain, "admitted")
+        WRITE_QUEUE_DEPTH.set(self.signer, self.chain, value=self._depth())
+        # A task of its own that the caller only waits on: a disconnecting
+        # client cannot cancel a write
+        write.task = asyncio.ensure_future(self._run(write, run))
+        result = await asyncio.shield(write.task)
+        return result, self._report(write, position, merged=False)
+
+    async def _run(self, write: _Write, run: Callable[[], Awaitable[Any]]) -> Any:
+        async with self._lock:
+            self.waiting.remove(write)
+            self.running = write
+            write.started = time.monotonic()
+            WRITE_LATENCY.observe(write.started - write.submitted, self.chain, "queued")
+            try:
+                waited = write.started - write.submitted
+                if self.wait_timeout is not None and waited > self.wait_timeout:
+                    raise dragon_resilience.DeadlineExceeded(
+                        f"Queued {waited:.1f}s behind other writes on {self.chain} "
+                        f"(limit {self.wait_timeout:g}s); not sent")
+                if self.run_timeout is None:
+                    return await run()
+                # Not the request's deadline: a write that waited its turn still
+                # gets the whole budget to send and confirm
+                with dragon_resilience.write_deadline(self.run_timeout):
+                    return await run()
+            finally:
+                write.finished = time.monotonic()
+                elapsed = write.finished - write.started
+                WRITE_LATENCY.observe(elapsed, self.chain, "run")
+                self.avg_run_seconds = elapsed if self.avg_run_seconds is None else \
+                    0.8 * self.avg_run_seconds + 0.2 * elapsed
+                self.running = None
+                self.completed += 1
+                WRITE_QUEUE_DEPTH.set(self.signer, self.chain, value=self._depth())
+
+    def _report(self, write: _Write, position: int, merged: bool) -> Dict[str, Any]:
+        now = time.monotonic()
+        started = write.started or now
+        return {
+            "position": position,
+            "merged": merged,
+            "shared_with": write.waiters - 1,
+            "queued_ms": round((started - write.submitted) * 1000, 2),
+            "run_ms": round(((write.finished or now) - started) * 1000, 2),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        report = {
+            "waiting": len(self.waiting),
+            "running": self.running is not None,
+            "capacity": self.capacity,
+            "completed": self.completed,
+            "merged": self.merged,
+            "rejected": self.rejected,
+        }
+        if self.avg_run_seconds is not None:
+            report["avg_run_seconds"] = round(self.avg_run_seconds, 3)
+        return report
+
+class WriteQueues:
+    """One SignerQueue per (signer, chain), created on first use"""
+
+    def __init__(self, capacity: int = 8, wait_timeout: Optional[float] = None,
+                 run_timeout: Optional[float] = None):
+        self.capacity = capacity
+        self.wait_timeout = wait_timeout
+        self.run_timeout = run_timeout
+        self.queues: Dict[Tuple[str, str], SignerQueue] = {}
+
+    def get(self, signer: str, chain: str) -> SignerQueue:
+        key = (signer.lower(), chain)
+        queue = self.queues.get(key)
+        if queue is None:
+            queue = self.queues[key] = SignerQueue(key[0], chain, self.capacity,
+                                                   self.wait_timeout, self.run_timeout)
+        return queue
+
+    async def submit(self, signer: str, chain: str, run: Callable[[], Awaitable[Any]],
+                     merge_key: Optional[str] = None) -> Tuple[Any, Dict[str, Any]]:
+        submitted = time.monotonic()
+        result, report = await self.get(signer, chain).submit(run, merge_key)
+        report["total_ms"] = round((time.monotonic() - submitted) * 1000, 2)
+        return result, report
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {f"{signer}:{chain}": queue.snapshot() for (signer, chain), queue in self.queues.items()}
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Dragon MCP Load Test
+Async load generator for the hosted API (deploy_hosted_dragon_mcp.py).
+
+Replays a weighted mix of /oracle/price, /lottery/stats, /lottery/simulate
+and /mcp/call traffic either at a fixed arrival rate (open loop, --rate) or
+with a fixed number of concurrent clients (closed loop, --concurrency),
+rotating through the given API keys. Reports throughput, latency
+percentiles, error and 429 rates, and server-side RPC amplification (RPCs
+sent upstream per request, from the server's /metrics).
+
+With --offline it starts the fake JSON-RPC node and the hosted server
+in-process, so a release check needs no network:
+
+    python loadtest_dragon_mcp.py --offline --concurrency 20 --duration 30
+    python loadtest_dragon_mcp.py --url https://mcp.example --api-keys k1,k2 --rate 50
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import random
+import tempfile
+import asyncio
+import logging
+import argparse
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_dragon_mcp import percentile
+
+DEFAULT_MIX = "oracle_price=4,lottery_stats=3,lottery_simulate=2,mcp_call=1"
+OFFLINE_API_KEYS = ["load-dev-key", "load-team-key", "load-admin-key"]
+
+def parse_mix(spec: str) -> List[Tuple[str, float]]:
+    mix = []
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in REQUEST_BUILDERS:
+            raise ValueError(f"Unknown request type '{name}' (choose from {', '.join(REQUEST_BUILDERS)})")
+        mix.append((name.strip(), float(weight or 1)))
+    return mix
+
+def _oracle_price(rng: random.Random, chains: List[str]) -> Tuple[str, str, Optional[Dict]]:
+    return "POST", "/oracle/price", {"chain": rng.choice(chains)}
+
+def _lottery_stats(rng: random.Random, chains: List[str]) -> Tuple[str, str, Optional[Dict]]:
+    return "GET", f"/lottery/stats/{rng.choice(chains)}", None
+
+def _lottery_simulate(rng: random.Random, chains: List[str]) -> Tuple[str, str, Optional[Dict]]:
+    return "POST", "/lottery/simulate", {"usd_amount": round(rng.uniform(10, 5000), 2), "chain": rng.choice(chains)}
+
+def _mcp_call(rng: random.Random, chains: List[str]) -> Tuple[str, str, Optional[Dict]]:
+    return "POST", "/mcp/call/get_dragon_price", {"chain": rng.choice(chains)}
+
+REQUEST_BUILDERS = {
+    "oracle_price": _oracle_price,
+    "lottery_stats": _lottery_stats,
+    "lottery_simulate": _lottery_simulate,
+    "mcp_call": _mcp_call,
+}
+
+class LoadStats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.transport_errors = 0
+
+    def record(self, kind: str, status: int, seconds: float) -> None:
+        self.latencies[kind].append(seconds)
+        self.statuses[kind][status] += 1
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        def summarize(latencies: List[float], statuses: Dict[int, int]) -> Dict[str, Any]:
+            total = sum(statuses.values())
+            return {
+                "requests": total,
+                "throughput_rps": round(total / elapsed, 2),
+                "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+                "p90_ms": round(percentile(latencies, 90) * 1000, 2),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+                "max_ms": round(max(latencies, default=0) * 1000, 2),
+                "error_rate": round(sum(c for s, c in statuses.items() if s >= 400 or s == 0) / total, 4) if total else 0,
+                "rate_429": round(statuses.get(429, 0) / total, 4) if total else 0,
+            }
+
+        all_latencies = [l for values in self.latencies.values() for l in values]
+        all_statuses: Dict[int, int] = defaultdict(int)
+        for statuses in self.statuses.values():
+            for status, count in statuses.items():
+                all_statuses[status] += count
+        return {
+            "overall": summarize(all_latencies, all_statuses),
+            "by_request": {kind: summarize(self.latencies[kind], self.statuses[kind]) for kind in self.latencies},
+            "status_codes": {str(s): c for s, c in sorted(all_statuses.items())},
+            "transport_errors": self.transport_errors,
+        }
+
+async def scrape_rpc_total(client: httpx.AsyncClient, api_key: str) -> Optional[float]:
+    """Sum of dragon_rpc_requests_total from the server's /metrics, or None if unavailable"""
+    try:
+        response = await client.get("/metrics", headers={"Authorization": f"Bearer {api_key}"})
+    except httpx.HTTPError:
+        return None
+    if response.status_code != 200:
+        return None
+    return sum(
+        float(line.rsplit(" ", 1)[1])
+        for line in response.text.splitlines()
+        if line.startswith("dragon_rpc_requests_total{")
+    )
+
+async def run_load(args: argparse.Namespace, base_url: str, api_keys: List[str]) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    mix = parse_mix(args.mix)
+    names, weights = [m[0] for m in mix], [m[1] for m in mix]
+    chains = args.chains.split(",")
+    stats = LoadStats()
+    key_index = 0
+
+    limits = httpx.Limits(max_connections=max(args.concurrency, 100), max_keepalive_connections=max(args.concurrency, 100))
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        rpc_before = await scrape_rpc_total(client, api_keys[-1])
+
+        async def one_request():
+            nonlocal key_index
+            kind = rng.choices(names, weights)[0]
+            method, path, body = REQUEST_BUILDERS[kind](rng, chains)
+            api_key = api_keys[key_index % len(api_keys)]
+            key_index += 1
+            started = time.perf_counter()
+            try:
+                response = await client.request(
+                    method, path, json=body, headers={"Authorization": f"Bearer {api_key}"}
+                )
+                status = response.status_code
+            except httpx.HTTPError:
+                stats.transport_errors += 1
+                status = 0
+            stats.record(kind, status, time.perf_counter() - started)
+
+        started = time.perf_counter()
+        deadline = started + args.duration
+        if args.rate:
+            # Open loop: arrivals on a fixed schedule regardless of response times
+            pending = set()
+            interval = 1.0 / args.rate
+            next_at = started
+            while next_at < deadline:
+                await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+                task = asyncio.create_task(one_request())
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+                next_at += interval
+            if pending:
+                await asyncio.wait(pending)
+        else:
+            # Closed loop: each simulated client sends its next request when the last one returns
+            async def client_loop():
+                while time.perf_counter() < deadline:
+                    await one_request()
+            await asyncio.gather(*(client_loop() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+        rpc_after = await scrape_rpc_total(client, api_keys[-1])
+
+    report = stats.report(elapsed)
+    report["duration_s"] = round(elapsed, 2)
+    served = report["overall"]["requests"]
+    if rpc_before is not None and rpc_after is not None and served:
+        report["rpc_amplification"] = round((rpc_after - rpc_before) / served, 3)
+    return report
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_offline_stack(args: argparse.Namespace):
+    """Fake RPC node plus the hosted server on a local port; returns (base_url, api_keys, node, server)"""
+    from dragon_fake_node import FakeNode, use_fake_node
+
+    node = FakeNode(latency=args.rpc_latency_ms / 1000, error_rate=args.rpc_error_rate, seed=args.seed).start()
+    use_fake_node(node)
+    os.environ["DRAGON_MCP_API_KEY"], os.environ["TEAM_API_KEY"], os.environ["ADMIN_API_KEY"] = OFFLINE_API_KEYS
+    os.environ["DRAGON_MCP_RATE_LIMIT"] = str(args.server_rate_limit)
+    os.environ.setdefault("DRAGON_MCP_DATA_DIR", tempfile.mkdtemp(prefix="dragon-load-"))
+    # Configured addresses keep per-tool RPC counts free of background discovery
+    os.environ.setdefault("DRAGON_MCP_ADDRESS_SOURCE", "config")
+
+    import uvicorn
+    import dragon_mcp
+    import deploy_hosted_dragon_mcp
+
+    node.register_abis(list(dragon_mcp.CONTRACT_ABIS.values()))
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(
+        deploy_hosted_dragon_mcp.app, host="127.0.0.1", port=port, log_level="warning"
+    ))
+    threading.Thread(target=server.run, name="dragon-loadtest-server", daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    # Let the web3 warm-up finish so it isn't counted as load latency
+    dragon_mcp.ensure_web3_stack()
+    return f"http://127.0.0.1:{port}", OFFLINE_API_KEYS, node, server
+
+def print_report(report: Dict[str, Any]) -> None:
+    overall = report["overall"]
+    print(f"\n📊 {overall['requests']} requests in {report['duration_s']}s "
+          f"→ {overall['throughput_rps']} req/s")
+    print(f"   latency p50 {overall['p50_ms']}ms  p90 {overall['p90_ms']}ms  "
+          f"p99 {overall['p99_ms']}ms  max {overall['max_ms']}ms")
+    print(f"   errors {overall['error_rate']:.2%}  429s {overall['rate_429']:.2%}  "
+          f"transport errors {report['transport_errors']}")
+    if "rpc_amplification" in report:
+        print(f"   RPC amplification {report['rpc_amplification']} upstream calls/request")
+    print(f"\n{'request':<18} {'count':>7} {'rps':>8} {'p50':>8} {'p99':>8} {'err':>7} {'429':>7}")
+    for kind, r in report["by_request"].items():
+        print(f"{kind:<18} {r['requests']:>7} {r['throughput_rps']:>8} {r['p50_ms']:>8} "
+              f"{r['p99_ms']:>8} {r['error_rate']:>7.2%} {r['rate_429']:>7.2%}")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load test the hosted Dragon MCP API")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Base URL of a running hosted server")
+    target.add_argument("--offline", action="store_true", help="Start fake node + hosted server locally")
+    parser.add_argument("--api-keys", help="Comma-separated keys, rotated per request (--url mode)")
+    pace = parser.add_mutually_exclusive_group()
+    pace.add_argument("--rate", type=float, help="Target arrival rate in requests/second (open loop)")
+    pace.add_argument("--concurrency", type=int, default=10, help="Concurrent clients (closed loop)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate load")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Weighted request mix (default {DEFAULT_MIX})")
+    parser.add_argument("--chains", default="sonic", help="Comma-separated chains to spread requests over")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rpc-latency-ms", type=float, default=20.0, help="Fake node latency (--offline)")
+    parser.add_argument("--rpc-error-rate", type=float, default=0.0, help="Fake node error rate (--offline)")
+    parser.add_argument("--server-rate-limit", type=int, default=10**9, help="Server rate limit (--offline)")
+    parser.add_argument("--output", help="Write the report as JSON")
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    node = server = None
+    if args.offline:
+        base_url, api_keys, node, server = start_offline_stack(args)
+    else:
+        if not args.api_keys:
+            parser.error("--api-keys is required with --url")
+        base_url, api_keys = args.url.rstrip("/"), args.api_keys.split(",")
+
+    mode = f"{args.rate} req/s open loop" if args.rate else f"{args.concurrency} concurrent clients"
+    print(f"🐉 Dragon MCP load test → {base_url} ({mode}, {args.duration}s, {len(api_keys)} API keys)")
+    try:
+        report = asyncio.run(run_load(args, base_url, api_keys))
+        if node is not None:
+            report["fake_node_requests"] = node.total_requests()
+    finally:
+        if server is not None:
+            server.should_exit = True
+        if node is not None:
+            node.stop()
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📄 Report written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests for dragon_activity.ActivityRing and event decoding (offline).
+
+    python test_dragon_activity.py   (or pytest)
+"""
+
+import dragon_activity
+from dragon_activity import ActivityRing, event_values
+
+ENTRIES = dragon_activity._COLUMN["entries"]
+VOLUME = dragon_activity._COLUMN["usd_volume"]
+T0 = 1_700_000_040.0  # on a bucket boundary
+
+def _entry(ring: ActivityRing, timestamp: float, usd: float = 10.0) -> bool:
+    return ring.add(timestamp, {ENTRIES: 1, VOLUME: usd})
+
+def _window(ring: ActivityRing, window: int, now: float):
+    ring.advance(now)
+    return ring.window(window, now)
+
+def test_event_counted_in_every_window():
+    ring = ActivityRing()
+    assert _entry(ring, T0)
+    for window in (300, 3600, 86400):
+        report = _window(ring, window, T0 + 1)
+        assert report["entries"] == 1 and report["usd_volume"] == 10.0
+
+def test_buckets_leaving_a_window_are_subtracted():
+    ring = ActivityRing()
+    _entry(ring, T0, 10.0)
+    _entry(ring, T0 + 240, 5.0)
+    # 6 minutes later the first entry has left the 5 minute window only
+    now = T0 + 360
+    assert _window(ring, 300, now)["usd_volume"] == 5.0
+    assert _window(ring, 3600, now)["usd_volume"] == 15.0
+    # After an hour both have left the hour window but not the day
+    now = T0 + 3600 + 300
+    assert _window(ring, 300, now)["entries"] == 0
+    assert _window(ring, 3600, now)["entries"] == 0
+    assert _window(ring, 86400, now)["entries"] == 2
+    # And after a day nothing is left; totals never go negative
+    now = T0 + 86400 + 600
+    report = _window(ring, 86400, now)
+    assert report["entries"] == 0 and report["usd_volume"] == 0.0
+
+def test_subtraction_matches_a_rescan():
+    ring = ActivityRing(bucket_seconds=60, buckets=60, windows=(300, 3600))
+    events = [(T0 + i * 37, 1.0 + i % 5) for i in range(200)]
+    for timestamp, usd in events:
+        _entry(ring, timestamp, usd)
+    now = events[-1][0] + 1
+    for window, span in ((300, 5), (3600, 60)):
+        first_bucket = int(now // 60) - span + 1
+        expected = sum(usd for timestamp, usd in events if int(timestamp // 60) >= first_bucket)
+        assert abs(_window(ring, window, now)["usd_volume"] - expected) < 1e-9
+
+def test_events_older_than_the_ring_are_rejected():
+    ring = ActivityRing(bucket_seconds=60, buckets=10, windows=(300, 600))
+    _entry(ring, T0 + 3600)
+    assert not _entry(ring, T0)
+    assert _window(ring, 600, T0 + 3601)["entries"] == 1
+
+def test_idle_longer_than_the_ring_resets():
+    ring = ActivityRing(bucket_seconds=60, buckets=10, windows=(300, 600))
+    _entry(ring, T0)
+    report = _window(ring, 600, T0 + 86400)
+    assert report["entries"] == 0 and report["entries_per_minute"] == 0.0
+
+def test_window_must_fit_the_ring():
+    try:
+        ActivityRing(bucket_seconds=60, buckets=10, windows=(3600,))
+        raise AssertionError("a window longer than the ring should be refused")
+    except ValueError:
+        pass
+
+def _log(*words: int, topics=("0x0", "0x" + "00" * 12 + "11" * 20)):
+    return {"data": "0x" + "".join(f"{word:064x}" for word in words), "topics": list(topics)}
+
+def test_payout_confirmation_is_not_a_second_entry():
+    assert event_values("entry", _log(0, 1, 3 * 10**18), None) is None
+    values = event_values("entry", _log(50_000_000, 1, 3 * 10**18), None)
+    assert values[ENTRIES] == 1 and values[VOLUME] == 50.0
+    assert values[dragon_activity._COLUMN["wins"]] == 1
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ PASS: {name}")
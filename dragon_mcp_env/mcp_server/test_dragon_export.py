@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests for dragon_export round trips (offline; needs numpy and pyarrow).
+
+    python test_dragon_export.py   (or pytest)
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pyarrow as pa
+
+import dragon_export
+from dragon_activity import EVENT_COLUMNS
+from dragon_columns import ColumnStore
+from dragon_fees import CATEGORIES, FeeStore
+from dragon_history import PriceHistory
+
+DAY = 86400.0
+DAY0 = 19_700 * DAY  # 2023-12-09 00:00 UTC
+USER = bytes.fromhex("11" * 20)
+WNATIVE = bytes.fromhex("22" * 20)
+
+def _fees(store: FeeStore, days, next_block: int) -> None:
+    times = np.array([DAY0 + d * DAY + 3600 for d in days], dtype=np.float64)
+    store.append({"time": times, "block": np.arange(len(days), dtype=np.uint64) + next_block,
+                  "category": np.array([d % len(CATEGORIES) for d in days], dtype=np.uint8),
+                  "amount": np.array([1.5 + d for d in days])}, next_block + len(days))
+
+def _data_dir(directory: str) -> str:
+    data = os.path.join(directory, "data")
+    _fees(FeeStore(os.path.join(data, "fee_flows", "sonic"), "0xdragon"), [0, 0, 1, 2], 100)
+    activity = ColumnStore(os.path.join(data, "activity_events", "sonic"), "0xlottery,0xjackpot", EVENT_COLUMNS)
+    rows = [(DAY0 + 60, 1, 0, USER, b"", 25.0, 1, 3.0, 0.0),          # entry
+            (DAY0 + 120, 2, 1, b"", bytes(20), 0.0, 0, 2.0, 0.0),     # added, DRAGON
+            (DAY0 + 180, 3, 2, USER, WNATIVE, 0.0, 0, 10.0, 4.0),     # paid
+            (DAY0 + DAY + 60, 4, 0, USER, b"", 5.0, 0, 0.0, 0.0)]
+    activity.append({name: [row[i] for row in rows] for i, name in enumerate(EVENT_COLUMNS)}, 5)
+    history = PriceHistory(os.path.join(data, "price_history", "sonic.prices"), capacity=8)
+    for k in range(12):  # wraps: the oldest four samples are overwritten
+        history.append(0.4 + k / 100, True, int(DAY0), "primary_oracle", sample_time=DAY0 + k * DAY / 4)
+    history.flush()
+    return data
+
+def test_only_complete_days_are_exported():
+    with tempfile.TemporaryDirectory() as directory:
+        data, out = _data_dir(directory), os.path.join(directory, "out")
+        summary = dragon_export.export(data, out)["datasets"]
+        # Fee rows on days 0, 1, 2: day 2 may still be filling
+        assert summary["fees"]["sonic"]["partitions"] == ["2023-12-09", "2023-12-10"]
+        assert summary["fees"]["sonic"]["rows"] == 3
+        assert summary["activity"]["sonic"]["partitions"] == ["2023-12-09"]
+        # Price samples 4..11 survive the ring (days 1 and 2); day 2 holds the newest
+        assert summary["prices"]["sonic"] == {"partitions": ["2023-12-10"], "rows": 4}
+
+def test_round_trip_values():
+    with tempfile.TemporaryDirectory() as directory:
+        data, out = _data_dir(directory), os.path.join(directory, "out")
+        dragon_export.export(data, out)
+        fees = dragon_export.read_dataset(out, "fees").to_pylist()
+        assert [(row["category"], row["amount"], row["chain"]) for row in fees] == [
+            ("buy_jackpot", 1.5, "sonic"), ("buy_jackpot", 1.5, "sonic"), ("buy_revenue", 2.5, "sonic")]
+        assert fees[0]["time"].timestamp() == DAY0 + 3600
+        activity = dragon_export.read_dataset(out, "activity").to_pylist()
+        entry, added, paid = activity
+        assert entry["event"] == "entry" and entry["account"] == "0x" + USER.hex() and entry["token"] is None
+        assert entry["won"] is True and entry["usd"] == 25.0
+        assert added["account"] is None and added["token"] == "0x" + "00" * 20  # DRAGON
+        assert paid["token"] == "0x" + WNATIVE.hex() and paid["rollover"] == 4.0
+        prices = dragon_export.read_dataset(out, "prices", start="2023-12-10", end="2023-12-10")
+        assert prices.column("price").to_pylist() == [0.4 + k / 100 for k in range(4, 8)]
+        assert set(prices.column("source").to_pylist()) == {"primary_oracle"}
+
+def test_incremental_export_only_adds_partitions():
+    with tempfile.TemporaryDirectory() as directory:
+        data, out = _data_dir(directory), os.path.join(directory, "out")
+        dragon_export.export(data, out, datasets=["fees"])
+        first = os.path.join(out, "fees", "chain=sonic", "date=2023-12-09", "part-0.arrow")
+        written = os.stat(first).st_mtime_ns
+        assert dragon_export.export(data, out, datasets=["fees"])["datasets"]["fees"]["sonic"]["rows"] == 0
+        # New rows complete day 2 and fill day 4; day 3 has no rows
+        _fees(FeeStore(os.path.join(data, "fee_flows", "sonic"), "0xdragon"), [2, 4], 200)
+        summary = dragon_export.export(data, out, datasets=["fees"])["datasets"]["fees"]["sonic"]
+        assert summary == {"partitions": ["2023-12-11"], "rows": 2}
+        assert os.stat(first).st_mtime_ns == written
+        assert not any(name.endswith(".tmp") for _, _, names in os.walk(out) for name in names)
+
+def test_arrow_partitions_are_memory_mapped():
+    with tempfile.TemporaryDirectory() as directory:
+        data, out = _data_dir(directory), os.path.join(directory, "out")
+        dragon_export.export(data, out)
+        before = pa.total_allocated_bytes()
+        table = dragon_export.read_dataset(out, "fees")
+        # Only the small chain tag column is allocated; data buffers point into the maps
+        assert pa.total_allocated_bytes() - before <= table.num_rows * 4 + 1024
+        del table
+
+def test_parquet_round_trip():
+    with tempfile.TemporaryDirectory() as directory:
+        data, out = _data_dir(directory), os.path.join(directory, "out")
+        dragon_export.export(data, out, datasets=["activity"], fmt="parquet")
+        assert os.path.exists(os.path.join(out, "activity", "chain=sonic", "date=2023-12-09", "part-0.parquet"))
+        assert dragon_export.read_dataset(out, "activity").num_rows == 3
+
+def test_unknown_dataset_and_format():
+    for kwargs in ({"datasets": ["nope"]}, {"fmt": "csv"}):
+        try:
+            dragon_export.export("/nonexistent", "/nonexistent", **kwargs)
+            raise AssertionError("unknown names should be refused")
+        except ValueError:
+            pass
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ PASS: {name}")
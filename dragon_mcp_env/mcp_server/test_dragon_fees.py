@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests for dragon_fees.fee_report bucketing and FeeStore (offline).
+
+    python test_dragon_fees.py   (or pytest)
+"""
+
+import tempfile
+
+import numpy as np
+
+import dragon_fees
+from dragon_fees import CATEGORIES, FeeStore, fee_report
+
+START = 1_700_000_000.0
+HOUR = 3600.0
+
+def _rows(*rows):
+    """(seconds after START, category name, amount) -> column selection"""
+    return {
+        "time": np.array([START + t for t, _, _ in rows], dtype=np.float64),
+        "block": np.arange(len(rows), dtype=np.uint64),
+        "category": np.array([CATEGORIES.index(c) for _, c, _ in rows], dtype=np.uint8),
+        "amount": np.array([a for _, _, a in rows], dtype=np.float64),
+    }
+
+def test_rows_land_in_their_period_and_chain():
+    selections = {
+        "sonic": _rows((0, "buy_jackpot", 6.9), (10, "buy_burn", 1.0), (HOUR, "sell_revenue", 2.4)),
+        "arbitrum": _rows((2 * HOUR + 5, "buy_jackpot", 3.0)),
+    }
+    report = fee_report(selections, START, START + 3 * HOUR, HOUR)
+    periods = {p["start"]: p for p in report["periods"]}
+    assert sorted(periods) == [START, START + HOUR, START + 2 * HOUR]
+    assert periods[START]["events"] == 2 and periods[START]["jackpot"] == 6.9 and periods[START]["burn"] == 1.0
+    assert periods[START + HOUR]["sell"]["veDRAGON"] == 2.4
+    # Periods sum over chains
+    assert periods[START + 2 * HOUR]["buy"]["jackpot"] == 3.0
+    assert report["chains"]["sonic"]["events"] == 3 and report["chains"]["arbitrum"]["total"] == 3.0
+    assert report["totals"]["total"] == round(6.9 + 1.0 + 2.4 + 3.0, 6)
+
+def test_period_boundaries_are_half_open():
+    report = fee_report({"sonic": _rows((HOUR - 1e-3, "buy_burn", 1.0), (HOUR, "buy_burn", 2.0))},
+                        START, START + 2 * HOUR, HOUR)
+    assert [(p["start"], p["burn"]) for p in report["periods"]] == [(START, 1.0), (START + HOUR, 2.0)]
+
+def test_partial_last_period_is_kept():
+    report = fee_report({"sonic": _rows((HOUR + 60, "sell_burn", 1.0))}, START, START + HOUR + 120, HOUR)
+    assert [p["start"] for p in report["periods"]] == [START + HOUR]
+
+def test_empty_periods_are_omitted():
+    report = fee_report({"sonic": _rows()}, START, START + 24 * HOUR, HOUR)
+    assert report["periods"] == [] and report["totals"]["total"] == 0.0
+    assert report["chains"]["sonic"]["events"] == 0
+
+def test_actual_split_against_configured():
+    selections = {"sonic": _rows((0, "buy_jackpot", 69.0), (1, "buy_revenue", 24.1), (2, "buy_burn", 6.9))}
+    configured = {"sonic": {"buy": [690, 241, 69, 1000], "sell": [690, 241, 69, 1000]}}
+    buy = fee_report(selections, START, START + HOUR, HOUR, configured)["chains"]["sonic"]["vs_configured"]["buy"]
+    assert buy["flows"]["jackpot"]["actual_share"] == 0.69
+    assert abs(buy["flows"]["burn"]["deviation_bps"]) < 0.01
+    assert "flows" not in fee_report(selections, START, START + HOUR, HOUR, configured)[
+        "chains"]["sonic"]["vs_configured"]["sell"]
+
+def test_range_and_period_limits():
+    for start, end, interval in ((START, START, HOUR), (START + 1, START, HOUR), (START, START + HOUR, 0)):
+        try:
+            fee_report({}, start, end, interval)
+            raise AssertionError("an empty range or zero interval should be refused")
+        except ValueError:
+            pass
+    try:
+        fee_report({}, 0, START, 1)
+        raise AssertionError("too many periods should be refused")
+    except ValueError:
+        pass
+    fee_report({}, START, START + dragon_fees.MAX_PERIODS, 1)
+
+def test_store_range_and_monotonic_times():
+    with tempfile.TemporaryDirectory() as directory:
+        store = FeeStore(directory, "0xDRAGON")
+        store.append(_rows((0, "buy_burn", 1.0), (HOUR, "buy_burn", 2.0)), next_block=10)
+        # A row timed before the last stored one is clamped, never reordered
+        store.append(_rows((HOUR - 5, "sell_burn", 3.0)), next_block=11)
+        assert store.columns()["time"].tolist() == [START, START + HOUR, START + HOUR]
+        assert store.range(START, START + HOUR)["amount"].tolist() == [1.0]
+        assert FeeStore(directory, "0xdragon").rows == 3 and FeeStore(directory, "0xdragon").next_block == 11
+        # Another contract's rows do not belong with these
+        assert FeeStore(directory, "0xOTHER").rows == 0
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ PASS: {name}")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests for dragon_history price ring buffers (offline; needs numpy).
+
+    python test_dragon_history.py   (or pytest)
+"""
+
+import os
+import tempfile
+
+import dragon_history
+from dragon_history import PriceHistory
+
+def _history(capacity: int) -> PriceHistory:
+    return PriceHistory(os.path.join(tempfile.mkdtemp(prefix="dragon-history-"), "sonic.prices"), capacity)
+
+def _fill(history: PriceHistory, count: int) -> None:
+    for i in range(count):
+        history.append(1.0 + i, True, 1000 + i, "primary_oracle", block=i, sample_time=100.0 + i)
+
+def test_wrapped_ring_keeps_the_newest_samples_in_order():
+    history = _history(5)
+    _fill(history, 8)
+    assert history.written == 8 and len(history) == 5
+    # Oldest three were overwritten in place; reads come back chronological
+    assert list(history.range()["block"]) == [3, 4, 5, 6, 7]
+    assert [s["price_usd"] for s in dragon_history.samples(history.range(), 2)] == [7.0, 8.0]
+
+def test_range_spans_the_wrap_point():
+    history = _history(5)
+    _fill(history, 8)
+    # 8 % 5: samples 3 and 4 sit at the end of the file, 5..7 at the start
+    assert list(history.range(104.0, 106.0)["block"]) == [4, 5, 6]
+    assert list(history.range(start=106.0)["block"]) == [6, 7]
+    assert list(history.range(end=103.5)["block"]) == [3]
+    assert len(history.range(200.0)) == 0
+
+def test_wrapped_ring_maps_back_after_reopening():
+    history = _history(5)
+    _fill(history, 12)
+    history.flush()
+    reopened = PriceHistory(history.path, capacity=99)
+    # The file's own capacity wins over the argument
+    assert reopened.capacity == 5 and reopened.written == 12
+    assert list(reopened.range()["block"]) == list(dragon_history.load(history.path)["block"]) == [7, 8, 9, 10, 11]
+    reopened.append(50.0, True, 0, "primary_oracle", block=12, sample_time=1.0)
+    # A sample older than the newest is clamped so times stay sorted
+    assert float(reopened.range()["time"][-1]) == 111.0
+    assert list(reopened.range()["block"]) == [8, 9, 10, 11, 12]
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ PASS: {name}")
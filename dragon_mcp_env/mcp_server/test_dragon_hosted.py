@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests for the hosted API's write queue and deadlines (offline;
+the server runs in-process against dragon_fake_node, needs httpx).
+
+    python test_dragon_hosted.py   (or pytest)
+"""
+
+import os
+import json
+import time
+import asyncio
+from contextlib import contextmanager
+
+import httpx
+
+from dragon_fake_node import fake_dragon_mcp
+
+ADMIN_KEY = "test-admin-key"
+USER = "0x1234567890123456789012345678901234567890"
+
+def _hosted():
+    """(node, deploy_hosted_dragon_mcp) with an admin key and no request quota"""
+    node, _ = fake_dragon_mcp()
+    os.environ.setdefault("ADMIN_API_KEY", ADMIN_KEY)
+    os.environ.setdefault("DRAGON_MCP_RATE_LIMIT", str(10**9))
+    import deploy_hosted_dragon_mcp
+    return node, deploy_hosted_dragon_mcp
+
+@contextmanager
+def _settings(target, **values):
+    saved = {name: getattr(target, name) for name in values}
+    for name, value in values.items():
+        setattr(target, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(target, name, value)
+
+def _client(hosted) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=hosted.app), base_url="http://test",
+                             headers={"Authorization": f"Bearer {ADMIN_KEY}"}, timeout=30)
+
+def test_queued_write_behind_slow_confirmation_is_sent_once():
+    node, hosted = _hosted()
+
+    async def main():
+        async with _client(hosted) as client:
+            update = asyncio.ensure_future(client.post("/oracle/update", json={"chain": "sonic"}))
+            await asyncio.sleep(0.05)
+            entry = asyncio.ensure_future(client.post(
+                "/lottery/entry", json={"chain": "sonic", "user_address": USER, "dragon_amount": 10}))
+            return await update, await entry
+
+    sent_before = len(node.sent)
+    # Each confirmation takes longer than the whole request deadline
+    with _settings(node, receipt_delay=0.6), _settings(hosted, REQUEST_TIMEOUT=0.3):
+        update, entry = asyncio.run(main())
+    assert update.status_code == 200 and entry.status_code == 200
+    update, entry = update.json(), entry.json()
+    for response in (update, entry):
+        assert response["data"].get("success") is True and "status" not in response["data"], response
+    # The entry waited its turn behind the update, then was confirmed
+    assert entry["queue"]["position"] == 1 and entry["queue"]["queued_ms"] >= 400
+    assert len(node.sent) - sent_before == 2
+
+def test_hosted_keeper_records_reverted_update_as_failure():
+    node, hosted = _hosted()
+    state = hosted.keeper.states["sonic"]
+
+    async def main():
+        # Startup wires keeper updates into the write queue
+        await hosted.warm_up_web3()
+        try:
+            with _settings(node, receipt_status=0):
+                await asyncio.to_thread(hosted.keeper._send, "sonic")
+            reverted = dict(state.decisions[-1], failures=state.failures)
+            await asyncio.to_thread(hosted.keeper._send, "sonic")
+            return reverted, dict(state.decisions[-1], failures=state.failures)
+        finally:
+            # Its heartbeat dies with this event loop
+            if hosted.loop_watchdog:
+                hosted.loop_watchdog.stop()
+
+    reverted, sent = asyncio.run(main())
+    assert reverted["decision"] == "failed" and "reverted" in reverted["reason"] and reverted["failures"] == 1
+    # A confirmed update resets the backoff
+    assert sent["decision"] == "sent" and sent["reason"] and sent["failures"] == 0
+    assert hosted.write_queues.get(hosted.signer_address(), "sonic").completed >= 2
+
+def _stream(hosted, path: str, body) -> list:
+    async def main():
+        async with _client(hosted) as client:
+            response = await client.post(path, json=body)
+            assert response.status_code == 200, response.text
+            return [json.loads(line) for line in response.text.splitlines()]
+    return asyncio.run(main())
+
+def test_claimable_stream_outlasts_the_request_deadline():
+    node, hosted = _hosted()
+    users = ["0x" + f"{i:040x}" for i in range(1, 13)]
+    started = time.monotonic()
+    # 12 batches of one slow multicall each: far longer than the request deadline
+    with _settings(node, latency=0.05), _settings(hosted, REQUEST_TIMEOUT=0.3):
+        lines = _stream(hosted, "/revenue/claimable", {"users": users, "chunk_size": 6})
+    assert time.monotonic() - started > 0.6
+    assert not any("error" in line for line in lines), lines[-1]
+    header, rows = lines[0], lines[1:]
+    assert len(rows) == len(users) * len(header["epochs"]) * len(header["tokens"]) == 72
+
+def test_snapshot_stream_outlasts_the_request_deadline():
+    node, hosted = _hosted()
+    holders = ["0x" + f"{i:040x}" for i in range(1, 31)]
+    started = time.monotonic()
+    with _settings(node, latency=0.05), _settings(hosted, REQUEST_TIMEOUT=0.3):
+        lines = _stream(hosted, "/snapshot/balances", {"addresses": holders, "chains": ["sonic"], "chunk_size": 2})
+    assert time.monotonic() - started > 0.6
+    assert not any("error" in line or "errors" in line for line in lines), lines[-1]
+    header, records = lines[0], lines[1:]
+    assert header["chains"]["sonic"]["tokens"]
+    assert sum(len(record["addresses"]) for record in records) == len(holders)
+    assert all(None not in column for record in records for column in record["balances"]["sonic"].values())
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ PASS: {name}")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests for dragon_keeper scheduling decisions (offline; the check,
+gas price and update are stubs).
+
+    python test_dragon_keeper.py   (or pytest)
+"""
+
+import time
+import threading
+
+from dragon_keeper import Keeper
+
+CALM = {"deviation_bps": 10.0, "age_seconds": 60, "is_fresh": True}
+
+def _keeper(snapshot=None, gas=20.0, ceiling=0.0, results=None, **options):
+    """Keeper over one chain; `results` are returned by successive updates"""
+    sent = []
+    results = list(results or [{"success": True, "tx_hash": "0xabc"}])
+
+    def update(chain):
+        sent.append(chain)
+        return results.pop(0) if len(results) > 1 else results[0]
+
+    def gas_price(chain):
+        if isinstance(gas, Exception):
+            raise gas
+        return gas
+
+    keeper = Keeper(lambda chain: dict(snapshot or CALM), gas_price, update, ["sonic"],
+                    max_gas_gwei=lambda chain: ceiling, **options)
+    return keeper, sent
+
+def _settle(keeper: Keeper, chain: str = "sonic") -> None:
+    """Wait for an update thread started by tick() to finish"""
+    deadline = time.monotonic() + 5
+    while keeper.states[chain].inflight and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not keeper.states[chain].inflight
+
+def test_deviation_and_staleness_trigger_updates():
+    keeper, _ = _keeper(dry_run=True)
+    assert keeper.tick("sonic") == "ok"
+    cases = [
+        ({"deviation_bps": -150.0}, "deviation 150.0 bps >= 100"),
+        ({"age_seconds": 3000}, "price age 3000s >= 3000s"),
+        ({"is_fresh": False}, "isFresh() is false"),
+    ]
+    for change, reason in cases:
+        keeper, sent = _keeper(dict(CALM, **change), dry_run=True)
+        assert keeper.tick("sonic") == "would_update"
+        assert keeper.states["sonic"].decisions[-1]["reason"] == reason and not sent
+    keeper, _ = _keeper(dict(CALM, deviation_bps=99.9, age_seconds=2999), dry_run=True)
+    assert keeper.tick("sonic") == "ok"
+
+def test_breaker_and_emergency_block_updates():
+    for flag in ("emergency_mode", "circuit_breaker_active", "would_trip_breaker"):
+        keeper, sent = _keeper(dict(CALM, is_fresh=False, **{flag: True}))
+        assert keeper.tick("sonic") == "blocked" and not sent
+
+def test_gas_ceiling_holds_updates_back():
+    stale = dict(CALM, is_fresh=False)
+    keeper, sent = _keeper(stale, gas=80.0, ceiling=50.0)
+    assert keeper.tick("sonic") == "gas_too_high" and not sent
+    assert "gas 80.00 gwei > 50" in keeper.states["sonic"].decisions[-1]["reason"]
+    keeper, sent = _keeper(stale, gas=ConnectionError("refused"), ceiling=50.0)
+    assert keeper.tick("sonic") == "check_failed" and not sent
+    # Below the ceiling, or with no ceiling, the gas price does not matter
+    for gas, ceiling in ((20.0, 50.0), (500.0, 0.0)):
+        keeper, sent = _keeper(stale, gas=gas, ceiling=ceiling)
+        assert keeper.tick("sonic") == "update"
+        _settle(keeper)
+        assert sent == ["sonic"]
+
+def test_failures_back_off_exponentially_and_success_resets():
+    failed = {"error": "updatePrice reverted"}
+    keeper, sent = _keeper(dict(CALM, is_fresh=False), results=[failed, failed, failed, failed, {"success": True}],
+                           backoff=10.0, max_backoff=25.0, min_interval=60.0)
+    state = keeper.states["sonic"]
+    for failures, delay in ((1, 10.0), (2, 20.0), (3, 25.0), (4, 25.0)):
+        now = time.time()
+        assert keeper.tick("sonic", now=max(now, state.next_attempt)) == "update"
+        _settle(keeper)
+        assert state.failures == failures and state.decisions[-1]["decision"] == "failed"
+        # Jittered down to half the delay, never up
+        assert now + delay * 0.5 - 1 <= state.next_attempt <= time.time() + delay
+        assert keeper.tick("sonic") == "deferred" and "backing off" in state.decisions[-1]["reason"]
+    assert keeper.tick("sonic", now=state.next_attempt) == "update"
+    _settle(keeper)
+    assert state.failures == 0 and state.last_update is not None and len(sent) == 5
+    # After a success the chain cools down for min_interval
+    assert keeper.tick("sonic") == "deferred" and "cooling down" in state.decisions[-1]["reason"]
+
+def test_trigger_during_an_update_is_coalesced():
+    release = threading.Event()
+    keeper, sent = _keeper(dict(CALM, is_fresh=False))
+    update = keeper.update
+
+    def slow_update(chain):
+        release.wait(5)
+        return update(chain)
+
+    keeper.update = slow_update
+    assert keeper.tick("sonic") == "update"
+    assert keeper.tick("sonic") == "coalesced"
+    release.set()
+    _settle(keeper)
+    assert sent == ["sonic"] and keeper.states["sonic"].coalesced == 1
+
+def test_failed_check_is_recorded_without_sending():
+    def check(chain):
+        raise TimeoutError("rpc timed out")
+
+    keeper, sent = _keeper()
+    keeper.check = check
+    assert keeper.tick("sonic") == "check_failed" and not sent
+    assert "TimeoutError" in keeper.states["sonic"].decisions[-1]["reason"]
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ PASS: {name}")
@@ -215,17 +215,34 @@ async def test_vrf_tools():
     try:
         import dragon_mcp
         
-        # Test VRF request (simulation mode)
-        print("Testing VRF randomness request...")
-        result = await dragon_mcp.request_vrf_randomness("arbitrum", 2)
+        # Tracker state is read locally and never sends anything
+        print("Testing VRF stats...")
+        stats = await dragon_mcp.get_vrf_stats()
+        if "error" in stats:
+            print_test_result(False, f"VRF stats error: {stats['error']}")
+        else:
+            print_test_result(True, f"VRF stats collected")
+            print(f"   Requests: {stats.get('requests')}")
+        
+        print("Testing unknown VRF request handle...")
+        result = await dragon_mcp.get_vrf_request("not-a-handle")
+        print_test_result("error" in result, "Unknown handle properly handled")
+        
+        # A real request is a paid transaction, so it only runs when asked for
+        if os.getenv("DRAGON_MCP_TEST_SEND_VRF") != "1":
+            print("Skipping VRF randomness request (set DRAGON_MCP_TEST_SEND_VRF=1 to send a paid request)")
+            return True
+        
+        print("Testing VRF randomness request (sends a transaction)...")
+        result = await dragon_mcp.request_vrf_randomness("arbitrum")
         
         if "error" in result:
             print_test_result(False, f"VRF error: {result['error']}")
         else:
-            print_test_result(True, f"VRF request simulated")
+            print_test_result(True, f"VRF request sent")
             print(f"   Chain: {result.get('chain')}")
-            print(f"   Words: {result.get('num_words')}")
-            print(f"   Cost: {result.get('estimated_cost')}")
+            print(f"   Handle: {result.get('handle')}")
+            print(f"   Fee: {result.get('fee_native')}")
             print(f"   Note: {result.get('note')}")
         
         return True
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests for Web3Manager.multicall block pinning (offline; runs
+against dragon_fake_node).
+
+    python test_dragon_multicall.py   (or pytest)
+"""
+
+from dragon_fake_node import fake_dragon_mcp, FINALITY_LAG
+
+CALLS = [("oracle", "getAggregatedPrice", ()), ("oracle", "isFresh", ())]
+
+def test_block_tags_without_multicall3_pin_the_tagged_block():
+    node, dragon_mcp = fake_dragon_mcp()
+    manager = dragon_mcp.web3_manager
+    manager._no_multicall.add("sonic")
+    try:
+        for tag in ("finalized", "safe"):
+            before = node.block_number("sonic")
+            block, results = manager.multicall("sonic", CALLS, block=tag)
+            assert before - FINALITY_LAG <= block <= node.block_number("sonic") - FINALITY_LAG, (tag, block)
+            assert all(ok for ok, _ in results), results
+        block, _ = manager.multicall("sonic", CALLS, block=hex(before - 1))
+        assert block == before - 1
+    finally:
+        manager._no_multicall.discard("sonic")
+
+def test_block_tags_pass_through_to_multicall3():
+    node, dragon_mcp = fake_dragon_mcp()
+    block, results = dragon_mcp.web3_manager.multicall("sonic", CALLS, block="finalized")
+    assert block > 0 and all(ok for ok, _ in results), results
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ PASS: {name}")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests for dragon_ratelimit.EndpointLimiter (offline; tools run against
+dragon_fake_node).
+
+    python test_dragon_ratelimit.py   (or pytest)
+"""
+
+import time
+import asyncio
+import threading
+
+import dragon_ratelimit
+import dragon_resilience
+from dragon_ratelimit import EndpointLimiter
+
+def _call(limiter: EndpointLimiter, retry_after=None) -> None:
+    limiter.release(limiter.acquire("eth_call"), retry_after)
+
+def test_additive_increase():
+    limiter = EndpointLimiter("test-aimd-up", concurrency=4)
+    for _ in range(4):
+        _call(limiter)
+    # +1/limit per success: about +1 per window of `limit` calls
+    assert 4.9 < limiter.limit < 5.0
+
+def test_increase_capped():
+    limiter = EndpointLimiter("test-aimd-cap", concurrency=4, max_concurrency=5)
+    for _ in range(50):
+        _call(limiter)
+    assert limiter.limit == 5
+
+def test_one_decrease_per_round_trip():
+    limiter = EndpointLimiter("test-aimd-down", concurrency=8, backoff=0.01)
+    admitted = [limiter.acquire("eth_call") for _ in range(4)]
+    # A burst of 429s for calls sent under the same limit halves it once
+    for at in admitted:
+        limiter.release(at, 0)
+    assert limiter.limit == 4
+    assert limiter.rate_limited == 4
+    # A call admitted after the decrease that is limited again halves again
+    time.sleep(0.02)
+    _call(limiter, 0)
+    assert limiter.limit == 2
+
+def test_decrease_floor():
+    limiter = EndpointLimiter("test-aimd-floor", concurrency=2, min_concurrency=2, backoff=0.01)
+    for _ in range(3):
+        _call(limiter, 0)
+        time.sleep(0.02)
+    assert limiter.limit == 2
+
+def test_rate_limit_pauses_endpoint():
+    limiter = EndpointLimiter("test-pause", concurrency=4, backoff=0.05)
+    _call(limiter, 0)
+    started = time.monotonic()
+    _call(limiter)
+    assert time.monotonic() - started >= 0.04
+    # An explicit Retry-After wins over the default back-off
+    _call(limiter, 0.1)
+    started = time.monotonic()
+    _call(limiter)
+    assert time.monotonic() - started >= 0.09
+
+def test_requests_per_second_bucket():
+    limiter = EndpointLimiter("test-rps", rps=20, concurrency=8)
+    started = time.monotonic()
+    for _ in range(30):  # 20 from the full bucket, 10 more at 20/s
+        _call(limiter)
+    assert time.monotonic() - started >= 0.4
+
+def test_interactive_overtakes_background():
+    limiter = EndpointLimiter("test-priority", concurrency=1)
+    held = limiter.acquire("eth_call")
+    order = []
+
+    def waiter(level: int, name: str) -> None:
+        with dragon_ratelimit.priority(level):
+            at = limiter.acquire("eth_call")
+        order.append(name)
+        limiter.release(at)
+
+    background = threading.Thread(target=waiter, args=(dragon_ratelimit.BACKGROUND, "background"))
+    background.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=waiter, args=(dragon_ratelimit.INTERACTIVE, "interactive"))
+    interactive.start()
+    time.sleep(0.05)
+    limiter.release(held)
+    background.join(2)
+    interactive.join(2)
+    assert order == ["interactive", "background"]
+
+def test_deadline_while_queued():
+    limiter = EndpointLimiter("test-deadline", concurrency=1)
+    held = limiter.acquire("eth_call")
+    try:
+        with dragon_resilience.deadline(0.05):
+            limiter.acquire("eth_call")
+        raise AssertionError("acquire should have hit the deadline")
+    except dragon_resilience.DeadlineExceeded:
+        pass
+    finally:
+        limiter.release(held)
+    # The abandoned waiter left the queue
+    assert limiter.snapshot()["queued"] == {}
+    _call(limiter)
+
+def test_throttled_endpoint_does_not_stall_the_event_loop():
+    from dragon_fake_node import fake_dragon_mcp
+    _, dragon_mcp = fake_dragon_mcp()
+    limiter = dragon_mcp.web3_manager.limiter("sonic")
+
+    async def main():
+        gaps, last = [], time.monotonic()
+
+        async def heartbeat():
+            nonlocal last
+            while True:
+                await asyncio.sleep(0.01)
+                now = time.monotonic()
+                gaps.append(now - last)
+                last = now
+
+        beat = asyncio.ensure_future(heartbeat())
+        # As after a 429 with Retry-After: every sonic RPC waits in acquire()
+        limiter.paused_until = time.monotonic() + 0.3
+        results = await asyncio.gather(
+            dragon_mcp.get_dragon_price("sonic"),
+            dragon_mcp.get_lottery_stats("sonic"),
+            dragon_mcp.simulate_lottery(1000.0, "sonic"),
+            dragon_mcp.check_layerzero_status("0x" + "ab" * 32, "sonic"),
+        )
+        beat.cancel()
+        return gaps, results
+
+    started = time.monotonic()
+    gaps, results = asyncio.run(main())
+    assert time.monotonic() - started >= 0.3
+    assert all("error" not in result for result in results), results
+    # The loop kept running other coroutines while the tools waited
+    assert len(gaps) >= 15 and max(gaps) < 0.1
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ PASS: {name}")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests for dragon_resilience circuit breakers and deadlines, and
+the write tools that escape them (offline; write tools run against
+dragon_fake_node).
+
+    python test_dragon_resilience.py   (or pytest)
+"""
+
+import time
+import asyncio
+from contextlib import contextmanager
+
+import dragon_resilience
+from dragon_resilience import CircuitBreaker, CircuitOpenError, CLOSED, HALF_OPEN, OPEN
+from dragon_fake_node import fake_dragon_mcp
+
+USER = "0x1234567890123456789012345678901234567890"
+
+@contextmanager
+def _settings(node, module, **values):
+    """Temporarily override node attributes (receipt_*) and module settings"""
+    saved = {}
+    for name, value in values.items():
+        target = node if name.startswith("receipt_") else module
+        saved[name] = (target, getattr(target, name))
+        setattr(target, name, value)
+    try:
+        yield
+    finally:
+        for name, (target, value) in saved.items():
+            setattr(target, name, value)
+
+def _rejected(breaker: CircuitBreaker) -> bool:
+    try:
+        breaker.before_call()
+    except CircuitOpenError:
+        return True
+    return False
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=0.1)
+    for _ in range(2):
+        breaker.record_failure(ConnectionError("refused"))
+    breaker.record_success()
+    # A success in between resets the count
+    for _ in range(2):
+        breaker.record_failure(ConnectionError("refused"))
+    assert breaker.state == CLOSED and not _rejected(breaker)
+    breaker.record_failure(ConnectionError("refused"))
+    assert breaker.state == OPEN and _rejected(breaker)
+    assert breaker.snapshot()["last_error"] == "ConnectionError: refused"
+
+def test_breaker_lets_one_probe_through_then_closes_on_success():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure(ConnectionError("refused"))
+    time.sleep(0.06)
+    assert not _rejected(breaker) and breaker.state == HALF_OPEN
+    # Only one probe at a time
+    assert _rejected(breaker)
+    breaker.record_success()
+    assert breaker.state == CLOSED and not _rejected(breaker) and not _rejected(breaker)
+
+def test_failed_probe_reopens_with_a_doubled_cool_down():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05, max_reset_timeout=0.15)
+    breaker.record_failure(ConnectionError("refused"))
+    for expected in (0.1, 0.15, 0.15):
+        time.sleep(breaker.reset_timeout + 0.01)
+        assert not _rejected(breaker)
+        breaker.record_failure(TimeoutError("timed out"))
+        assert breaker.state == OPEN and breaker.reset_timeout == expected and _rejected(breaker)
+    # A released probe leaves the breaker half-open for the next caller
+    time.sleep(breaker.reset_timeout + 0.01)
+    assert not _rejected(breaker)
+    breaker.release_probe()
+    assert breaker.state == HALF_OPEN and not _rejected(breaker)
+    breaker.record_success()
+    assert breaker.reset_timeout == 0.05
+
+def test_nested_deadline_only_shortens_the_outer_one():
+    assert dragon_resilience.remaining() is None
+    with dragon_resilience.deadline(1.0):
+        with dragon_resilience.deadline(10.0):
+            assert dragon_resilience.remaining() <= 1.0
+        with dragon_resilience.deadline(0.2):
+            assert dragon_resilience.remaining() <= 0.2
+        assert 0.2 < dragon_resilience.remaining() <= 1.0
+        with dragon_resilience.deadline(None):
+            assert 0.2 < dragon_resilience.remaining() <= 1.0
+        # Only a write deadline replaces the outer one
+        with dragon_resilience.write_deadline(5.0):
+            assert dragon_resilience.remaining() > 1.0
+    assert dragon_resilience.remaining() is None
+
+def test_deadline_flows_into_worker_threads_and_expires():
+    async def main():
+        with dragon_resilience.deadline(0.05):
+            inner = await asyncio.to_thread(dragon_resilience.remaining)
+            await asyncio.sleep(0.06)
+            try:
+                await asyncio.to_thread(dragon_resilience.check_deadline, "sonic", "eth_call")
+            except dragon_resilience.DeadlineExceeded:
+                return inner, True
+            return inner, False
+
+    inner, expired = asyncio.run(main())
+    assert inner is not None and 0 < inner <= 0.05 and expired
+
+def test_write_tool_outlives_the_tool_deadline():
+    node, dragon_mcp = fake_dragon_mcp()
+    # Confirmation takes longer than a read tool may run
+    with _settings(node, dragon_mcp, receipt_delay=0.8, TOOL_TIMEOUT=0.3):
+        result = asyncio.run(dragon_mcp.update_oracle_price("sonic"))
+    assert result.get("success") is True and "status" not in result, result
+    assert result["gas_used"] == 120_000
+
+def test_broadcast_without_receipt_reports_pending():
+    node, dragon_mcp = fake_dragon_mcp()
+    with _settings(node, dragon_mcp, receipt_delay=30, RECEIPT_TIMEOUT=0.5):
+        update = asyncio.run(dragon_mcp.update_oracle_price("sonic"))
+        entry = asyncio.run(dragon_mcp.test_lottery_entry("sonic", USER, 100.0))
+    for result in (update, entry):
+        assert "error" not in result and result["status"] == "pending", result
+        assert result["tx_hash"].startswith("0x") and len(result["tx_hash"]) == 66
+    assert entry["user_address"] == USER
+
+def test_reverted_update_is_an_error_with_its_hash():
+    node, dragon_mcp = fake_dragon_mcp()
+    with _settings(node, dragon_mcp, receipt_status=0):
+        result = asyncio.run(dragon_mcp.update_oracle_price("sonic"))
+        keeper = dragon_mcp.keeper_update("sonic")
+    assert "reverted" in result["error"] and result["status"] == "reverted" and result["tx_hash"]
+    assert "reverted" in keeper["error"]
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ PASS: {name}")
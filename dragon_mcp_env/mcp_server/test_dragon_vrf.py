@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests for dragon_vrf request tracking (offline; the manager never
+has a receipt, so requests only finish when a test finishes them).
+
+    python test_dragon_vrf.py   (or pytest)
+"""
+
+import time
+
+import dragon_vrf
+
+class _NoReceipts:
+    def get_receipt(self, chain, tx_hash):
+        return None
+
+def _tracker(**options) -> dragon_vrf.VRFTracker:
+    return dragon_vrf.VRFTracker(_NoReceipts(), poll_interval=0.01, **options)
+
+def _tx(i: int) -> str:
+    return "0x" + f"{i:064x}"
+
+def test_finished_requests_beyond_the_cap_are_evicted_oldest_first():
+    tracker = _tracker(max_finished=2)
+    requests = [tracker.track("sonic", "cross_chain", _tx(i)) for i in range(4)]
+    for request, outcome in zip(requests[:3], ("delivered", "expired", "delivered")):
+        tracker._finish(request, outcome)
+    # The oldest finished request went; the pending one is never evicted
+    assert tracker.get(requests[0].handle) is None
+    assert all(tracker.get(r.handle) is r for r in requests[1:])
+    tracker._finish(requests[3], "timed_out")
+    assert [r.handle for r in tracker.requests.values()] == [requests[2].handle, requests[3].handle]
+    # Outcome counts still cover evicted requests
+    assert tracker.stats()["requests"] == {"delivered": 2, "expired": 1, "timed_out": 1}
+
+def test_finished_requests_past_retention_are_evicted():
+    tracker = _tracker(retention=60)
+    old, recent = tracker.track("sonic", "cross_chain", _tx(1)), tracker.track("sonic", "cross_chain", _tx(2))
+    tracker._finish(old, "delivered")
+    tracker._finish(recent, "delivered")
+    old.finished_at = time.time() - 120
+    # Eviction runs as new requests come in
+    pending = tracker.track("base", "cross_chain", _tx(3))
+    assert tracker.get(old.handle) is None
+    assert tracker.get(recent.handle) is recent and tracker.get(pending.handle) is pending
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ PASS: {name}")
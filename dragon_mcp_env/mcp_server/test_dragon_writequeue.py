@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests for dragon_writequeue.SignerQueue (offline, nothing is signed).
+
+    python test_dragon_writequeue.py   (or pytest)
+"""
+
+import asyncio
+
+import dragon_resilience
+from dragon_writequeue import QueueFull, SignerQueue, WriteQueues
+
+class Recorder:
+    """Fake transaction sender that records calls and overlap"""
+
+    def __init__(self, seconds: float = 0.05):
+        self.seconds = seconds
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    def write(self, name: str):
+        async def run():
+            self.calls.append(name)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            try:
+                await asyncio.sleep(self.seconds)
+            finally:
+                self.active -= 1
+            return {"success": True, "tx": name}
+        return run
+
+def test_writes_run_one_at_a_time():
+    async def main():
+        queue, sender = SignerQueue("0xsigner", "sonic"), Recorder()
+        results = await asyncio.gather(*(queue.submit(sender.write(f"w{i}")) for i in range(4)))
+        assert sender.max_active == 1
+        assert sender.calls == ["w0", "w1", "w2", "w3"]
+        assert [report["position"] for _, report in results] == [0, 1, 2, 3]
+        # The last write waited for the three before it
+        assert results[3][1]["queued_ms"] >= 3 * sender.seconds * 1000 * 0.8
+        assert queue.completed == 4
+    asyncio.run(main())
+
+def test_waiting_writes_with_same_key_merge():
+    async def main():
+        queue, sender = SignerQueue("0xsigner", "sonic"), Recorder()
+        first = asyncio.ensure_future(queue.submit(sender.write("running"), merge_key="updatePrice"))
+        await asyncio.sleep(0.01)
+        # The running write is not joined; the two waiting ones share one transaction
+        second = asyncio.ensure_future(queue.submit(sender.write("a"), merge_key="updatePrice"))
+        await asyncio.sleep(0)
+        third = asyncio.ensure_future(queue.submit(sender.write("b"), merge_key="updatePrice"))
+        other = asyncio.ensure_future(queue.submit(sender.write("entry")))
+        (r1, _), (r2, rep2), (r3, rep3), _ = await asyncio.gather(first, second, third, other)
+        assert sender.calls == ["running", "a", "entry"]
+        assert r2 is r3 and r2["tx"] == "a"
+        assert rep2["merged"] is False and rep2["shared_with"] == 1
+        assert rep3["merged"] is True and rep3["position"] == 1
+        assert queue.merged == 1
+    asyncio.run(main())
+
+def test_writes_without_key_never_merge():
+    async def main():
+        queue, sender = SignerQueue("0xsigner", "sonic"), Recorder(0.01)
+        await asyncio.gather(*(queue.submit(sender.write(f"entry{i}")) for i in range(3)))
+        assert len(sender.calls) == 3 and queue.merged == 0
+    asyncio.run(main())
+
+def test_saturated_queue_rejects_at_once():
+    async def main():
+        queue, sender = SignerQueue("0xsigner", "sonic", capacity=2), Recorder(0.1)
+        # A burst on an idle queue: w0 is about to run, w1 and w2 wait
+        admitted = [asyncio.ensure_future(queue.submit(sender.write(f"w{i}"))) for i in range(3)]
+        await asyncio.sleep(0.01)
+        try:
+            await queue.submit(sender.write("overflow"))
+            raise AssertionError("a full queue should reject")
+        except QueueFull as e:
+            assert e.retry_after >= 1
+        await asyncio.gather(*admitted)
+        assert queue.rejected == 1
+        assert "overflow" not in sender.calls
+    asyncio.run(main())
+
+def test_queued_write_does_not_inherit_the_request_deadline():
+    async def main():
+        queue, sender = SignerQueue("0xsigner", "sonic", run_timeout=5.0), Recorder(0.1)
+        budgets = []
+
+        async def confirm():
+            budgets.append(dragon_resilience.remaining())
+            return await sender.write("queued")()
+
+        # A request deadline far shorter than the write ahead of it takes
+        with dragon_resilience.deadline(0.02):
+            slow = asyncio.ensure_future(queue.submit(sender.write("slow")))
+            queued = asyncio.ensure_future(queue.submit(confirm))
+        (_, _), (result, report) = await asyncio.gather(slow, queued)
+        assert sender.calls == ["slow", "queued"] and result["tx"] == "queued"
+        assert report["queued_ms"] >= 80
+        # The queued write got its whole run budget, not what was left of the request's
+        assert budgets[0] > 4.5
+    asyncio.run(main())
+
+def test_write_queued_past_its_wait_limit_is_not_sent():
+    async def main():
+        queue, sender = SignerQueue("0xsigner", "sonic", wait_timeout=0.02), Recorder(0.1)
+        blocker = asyncio.ensure_future(queue.submit(sender.write("slow")))
+        await asyncio.sleep(0.01)
+        try:
+            await queue.submit(sender.write("late"))
+            raise AssertionError("the queued write should have given up waiting")
+        except dragon_resilience.DeadlineExceeded:
+            pass
+        await blocker
+        assert sender.calls == ["slow"]
+    asyncio.run(main())
+
+def test_caller_cancellation_does_not_cancel_started_write():
+    async def main():
+        queue, sender = SignerQueue("0xsigner", "sonic"), Recorder(0.05)
+        caller = asyncio.ensure_future(queue.submit(sender.write("tx")))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        await asyncio.sleep(0.1)
+        assert sender.calls == ["tx"] and queue.completed == 1
+    asyncio.run(main())
+
+def test_queues_are_per_signer_and_chain():
+    async def main():
+        queues, sender = WriteQueues(), Recorder(0.05)
+        await asyncio.gather(
+            queues.submit("0xA", "sonic", sender.write("a-sonic")),
+            queues.submit("0xa", "sonic", sender.write("a-sonic-2")),
+            queues.submit("0xA", "arbitrum", sender.write("a-arbitrum")),
+        )
+        # Same signer in any case shares a queue; another chain runs alongside it
+        assert sender.max_active == 2
+        assert set(queues.snapshot()) == {"0xa:sonic", "0xa:arbitrum"}
+    asyncio.run(main())
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ PASS: {name}")